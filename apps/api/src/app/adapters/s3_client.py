@@ -3,6 +3,8 @@ S3/MinIO adapter with proper error handling and timeouts
 """
 from __future__ import annotations
 import asyncio
+import hashlib
+import io
 from app.core.logging import get_logger
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, BinaryIO
@@ -129,6 +131,21 @@ class S3Client:
             logger.error(f"Unexpected error uploading {key}: {e}")
             return False
     
+    def open_multipart_writer(self, bucket: str, key: str, *,
+                              content_type: str = "application/octet-stream",
+                              metadata: Optional[Dict[str, str]] = None,
+                              max_bytes: Optional[int] = None) -> "S3MultipartWriter":
+        """Blocking streamed upload sink; use from a worker thread."""
+        return S3MultipartWriter(
+            self._get_client(),
+            bucket,
+            key,
+            content_type=content_type,
+            metadata=metadata,
+            part_size=self._settings.S3_MULTIPART_PART_BYTES,
+            max_bytes=max_bytes,
+        )
+
     async def download_file(self, bucket: str, key: str, file_path: str) -> bool:
         """Download file from S3/MinIO"""
         try:
@@ -172,7 +189,41 @@ class S3Client:
         except Exception as e:
             logger.error(f"Unexpected error getting {key}: {e}")
             return None
-    
+
+    async def get_object_range(self, bucket: str, key: str, start: int = 0,
+                               end: Optional[int] = None) -> Optional[bytes]:
+        """Get an inclusive byte range of an object; None when the object is absent.
+
+        A missing key is an expected outcome for cache-style lookups, so it is
+        logged at debug level instead of as an error.
+        """
+        try:
+            client = self._get_client()
+            byte_range = f"bytes={max(0, int(start))}-" + ("" if end is None else str(int(end)))
+
+            # Run in executor to avoid blocking event loop
+            loop = asyncio.get_event_loop()
+            response = await loop.run_in_executor(
+                None,
+                lambda: client.get_object(Bucket=bucket, Key=key, Range=byte_range)
+            )
+
+            logger.debug(f"Retrieved range {byte_range} of s3://{bucket}/{key}")
+            return response['Body'].read()
+
+        except ClientError as e:
+            code = str(e.response.get('Error', {}).get('Code') or '')
+            if code in {'NoSuchKey', '404', 'NotFound'}:
+                logger.debug(f"S3 object s3://{bucket}/{key} not found")
+                return None
+            if code == 'InvalidRange':
+                return b""
+            logger.error(f"S3 get object range error for {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error getting range of {key}: {e}")
+            return None
+
     async def delete_object(self, bucket: str, key: str) -> bool:
         """Delete object from S3/MinIO"""
         try:
@@ -416,6 +467,135 @@ class S3Client:
             return False
 
 
+class S3MultipartWriter(io.RawIOBase):
+    """Write-only, non-seekable stream backed by an S3 multipart upload.
+
+    Blocking: meant for producers running in a worker thread. Bytes are
+    buffered up to ``part_size`` and sent as one part, so memory stays at
+    one part regardless of the object size. Objects smaller than a part
+    are sent with a single ``put_object``. ``close()`` completes the
+    upload; ``abort()`` discards it.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[Dict[str, str]] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.part_size = int(part_size)
+        self.max_bytes = max_bytes
+        self.bytes_written = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: list[Dict[str, Any]] = []
+        self._finished = False
+
+    @property
+    def checksum(self) -> str:
+        """Same 16-char SHA256 prefix as ``calculate_file_checksum``."""
+        return self._sha256.hexdigest()[:16]
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self._finished:
+            raise ValueError("I/O operation on a finished upload")
+        chunk = bytes(data)
+        if self.max_bytes is not None and self.bytes_written + len(chunk) > self.max_bytes:
+            raise ValueError(f"Generated file exceeds limit of {self.max_bytes} bytes")
+        self._buffer.extend(chunk)
+        self._sha256.update(chunk)
+        self.bytes_written += len(chunk)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(chunk)
+
+    def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+                Metadata=self.metadata,
+            )
+            self._upload_id = response["UploadId"]
+        number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": number})
+
+    def close(self) -> None:
+        if self._finished or self.closed:
+            super().close()
+            return
+        try:
+            if self._upload_id is None:
+                self._client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type,
+                    Metadata=self.metadata,
+                )
+            else:
+                if self._buffer:
+                    self._upload_part(bytes(self._buffer))
+                self._client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._parts},
+                )
+            logger.debug(
+                f"Streamed {self.bytes_written} bytes in {max(len(self._parts), 1)} part(s) "
+                f"to s3://{self.bucket}/{self.key}"
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._finished = True
+            self._buffer = bytearray()
+            super().close()
+
+    def __del__(self) -> None:
+        # IOBase.__del__ would close(), i.e. publish a half-written object.
+        if not self._finished:
+            self.abort()
+
+    def abort(self) -> None:
+        """Discard uploaded parts; safe to call more than once."""
+        upload_id, self._upload_id = self._upload_id, None
+        self._finished = True
+        self._buffer = bytearray()
+        if upload_id is None:
+            return
+        try:
+            self._client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=upload_id)
+        except Exception as e:
+            logger.error(f"Failed to abort multipart upload for {self.key}: {e}")
+
+
 @dataclass
 class PresignOptions:
     """Options for presigned URL generation"""
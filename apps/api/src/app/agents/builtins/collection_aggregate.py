@@ -10,6 +10,7 @@ from app.core.logging import get_logger
 from app.agents.handlers.versioned_tool import VersionedTool, tool_version, register_tool
 from app.agents.context import ToolContext, ToolResult
 from app.agents.builtins.collection_aggregate_sql_builder import CollectionAggregateSQLBuilder
+from app.services.collection.index_advisor import get_query_shape_recorder, shape_from_dsl
 
 logger = get_logger(__name__)
 
@@ -277,13 +278,31 @@ class CollectionAggregateTool(VersionedTool):
                 if order_error:
                     return ToolResult.fail(order_error, logs=log.entries_dict())
 
-                # Build SQL
-                sql, params = self._build_aggregate_sql(
-                    collection, metrics, group_by, filters, time_bucket,
+                # Build SQL: prefer the rollup table when it covers the query
+                planned = await self._build_rollup_sql(
+                    session, collection, metrics, group_by, filters, time_bucket,
                     having=having, order_by=order_by,
                 )
+                if planned:
+                    sql, params, source_table = planned
+                    log.info("Answering from rollup", table=source_table)
+                else:
+                    sql, params = self._build_aggregate_sql(
+                        collection, metrics, group_by, filters, time_bucket,
+                        having=having, order_by=order_by,
+                    )
+                    source_table = collection.table_name
+                    await get_query_shape_recorder().record(
+                        collection.table_name,
+                        shape_from_dsl(
+                            "aggregate",
+                            filters,
+                            group=[*group_by, *([time_bucket.get("field")] if time_bucket else [])],
+                            include=[m.get("field") for m in metrics if m.get("field") not in (None, "id")],
+                        ),
+                    )
                 
-                log.debug("Executing aggregate SQL", table=collection.table_name)
+                log.debug("Executing aggregate SQL", table=source_table)
                 
                 # Execute with timeout
                 timeout_sql = f"SET LOCAL statement_timeout = '{collection.query_timeout_seconds}s'"
@@ -425,6 +444,39 @@ class CollectionAggregateTool(VersionedTool):
             order_by=order_by,
         )
 
+    async def _build_rollup_sql(
+        self,
+        session,
+        collection,
+        metrics: List[Dict],
+        group_by: List[str],
+        filters: Dict,
+        time_bucket: Optional[Dict],
+        having: Optional[List[Dict]] = None,
+        order_by: Optional[str] = None,
+    ) -> Optional[tuple[str, Dict, str]]:
+        """Rollup SQL if the collection has a built rollup covering the query."""
+        from app.services.collection.rollup_service import CollectionRollupService, rollup_spec_for
+
+        spec = rollup_spec_for(collection)
+        if spec is None:
+            return None
+        planned = SQL_BUILDER.build_rollup_aggregate_sql(
+            spec=spec,
+            metrics=metrics,
+            group_by=group_by,
+            filters=filters,
+            time_bucket=time_bucket,
+            having=having,
+            order_by=order_by,
+        )
+        if planned is None:
+            return None
+        if not await CollectionRollupService(session).table_exists(spec.table_name):
+            return None
+        sql, params = planned
+        return sql, params, spec.table_name
+
     def _build_where_clause(
         self,
         filters: Dict,
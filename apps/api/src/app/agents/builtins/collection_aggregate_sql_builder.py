@@ -2,6 +2,25 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
+from app.services.collection.rollup_service import (
+    BUCKET_COLUMN,
+    ROLLUP_BUCKET_INTERVALS,
+    ROWS_COLUMN,
+    RollupSpec,
+)
+
+# Filter operators that keep their meaning on a day bucket of a date column.
+_DATE_BUCKET_FILTER_OPS = {"eq", "neq", "in", "not_in", "gt", "gte", "lt", "lte", "range", "is_null"}
+
+_HAVING_OPS = {
+    "eq": "=",
+    "neq": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+
 
 class CollectionAggregateSQLBuilder:
     """Build SQL for collection aggregate tool from validated inputs."""
@@ -108,6 +127,156 @@ class CollectionAggregateSQLBuilder:
 
         return sql.strip(), params
 
+    def build_rollup_aggregate_sql(
+        self,
+        spec: RollupSpec,
+        metrics: List[Dict],
+        group_by: List[str],
+        filters: Dict,
+        time_bucket: Optional[Dict],
+        having: Optional[List[Dict]] = None,
+        order_by: Optional[str] = None,
+    ) -> Optional[tuple[str, Dict]]:
+        """Rewrite a validated aggregate onto the rollup table.
+
+        Returns None when the query is not covered by ``spec``; the caller
+        then runs ``build_aggregate_sql`` against the base table.  Results
+        match the base-table query row for row.
+        """
+        dimensions = set(spec.dimension_names)
+        if not set(group_by) <= dimensions:
+            return None
+
+        bucket_expr: Optional[str] = None
+        if time_bucket:
+            interval = time_bucket.get("interval", "day")
+            if time_bucket.get("field") != spec.time_column or interval not in ROLLUP_BUCKET_INTERVALS:
+                return None
+            bucket_expr = f"date_trunc('{interval}', {BUCKET_COLUMN})"
+
+        rollup_filters = self._rollup_filters(spec, filters)
+        if rollup_filters is None:
+            return None
+
+        select_parts: List[str] = list(group_by)
+        group_exprs: List[str] = list(group_by)
+        if bucket_expr:
+            select_parts.append(f"{bucket_expr} as time_bucket")
+            group_exprs.append(bucket_expr)
+
+        for i, metric in enumerate(metrics):
+            expr = self._rollup_metric_expr(spec, metric.get("function"), metric.get("field"))
+            if expr is None:
+                return None
+            select_parts.append(f"{expr} as {metric.get('alias', f'metric_{i}')}")
+
+        params: Dict[str, object] = {}
+        where_parts, params, param_idx = self.build_where_clause(rollup_filters, params, 0)
+        where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
+
+        group_clause = ""
+        having_clause = ""
+        if group_exprs:
+            group_clause = f"GROUP BY {', '.join(group_exprs)}"
+            # Groups whose rows were all deleted stay in the rollup with a
+            # zero count until the next rebuild; the base table has no such
+            # group.
+            having_parts = [f"SUM({ROWS_COLUMN}) > 0"]
+            for cond in having or []:
+                expr = self._rollup_metric_expr(spec, cond.get("function"), cond.get("field"))
+                sql_op = _HAVING_OPS.get(cond.get("op", "gt"))
+                if expr is None or sql_op is None:
+                    return None
+                param_name = f"h{param_idx}"
+                param_idx += 1
+                params[param_name] = cond.get("value")
+                having_parts.append(f"{expr} {sql_op} :{param_name}")
+            having_clause = f"HAVING {' AND '.join(having_parts)}"
+
+        order_clause = ""
+        if order_by:
+            direction = "DESC" if order_by.startswith("-") else "ASC"
+            order_clause = f"ORDER BY {order_by.lstrip('-')} {direction}"
+        elif group_exprs:
+            order_clause = f"ORDER BY {group_exprs[0]}"
+
+        sql = f"""
+            SELECT {', '.join(select_parts)}
+            FROM {spec.table_name}
+            {where_clause}
+            {group_clause}
+            {having_clause}
+            {order_clause}
+            LIMIT {self.max_result_groups}
+        """
+        return sql.strip(), params
+
+    @staticmethod
+    def _rollup_metric_expr(spec: RollupSpec, func: Optional[str], field: Optional[str]) -> Optional[str]:
+        dimensions = set(spec.dimension_names)
+        measures = set(spec.measure_names)
+        if func == "count":
+            if not field or field == "id":
+                return f"COALESCE(SUM({ROWS_COLUMN}), 0)::bigint"
+            if field in measures:
+                return f"COALESCE(SUM({spec.count_column(field)}), 0)::bigint"
+            if field in dimensions:
+                column = field
+            elif field == spec.time_column:
+                column = BUCKET_COLUMN
+            else:
+                return None
+            return f"COALESCE(SUM({ROWS_COLUMN}) FILTER (WHERE {column} IS NOT NULL), 0)::bigint"
+        if func == "count_distinct" and field in dimensions:
+            return f"COUNT(DISTINCT {field}) FILTER (WHERE {ROWS_COLUMN} > 0)"
+        if func == "sum" and field in measures:
+            return (
+                f"CASE WHEN SUM({spec.count_column(field)}) > 0 "
+                f"THEN SUM({spec.sum_column(field)}) END"
+            )
+        if func == "avg" and field in measures:
+            return f"SUM({spec.sum_column(field)}) / NULLIF(SUM({spec.count_column(field)}), 0)"
+        return None
+
+    @staticmethod
+    def _rollup_filters(spec: RollupSpec, filters: Dict) -> Optional[Dict]:
+        """Map filters onto rollup columns, or None if any is not covered."""
+        if not filters:
+            return {}
+        dimensions = set(spec.dimension_names)
+        # Day buckets of a DATE column are exactly the dates themselves;
+        # a DATETIME column loses its time of day.
+        bucket_field = spec.time_column if spec.time_column_type == "date" else None
+
+        def _map(cond: Dict) -> Optional[Dict]:
+            field = cond.get("field")
+            if field in dimensions:
+                return cond
+            if field and field == bucket_field and cond.get("op", "eq") in _DATE_BUCKET_FILTER_OPS:
+                return {**cond, "field": f"{BUCKET_COLUMN}::date"}
+            return None
+
+        mapped: Dict = {}
+        for key in ("and", "or"):
+            conditions = []
+            for cond in filters.get(key, []):
+                mapped_cond = _map(cond)
+                if mapped_cond is None:
+                    return None
+                conditions.append(mapped_cond)
+            if conditions:
+                mapped[key] = conditions
+        for key, value in filters.items():
+            if key in ("and", "or"):
+                continue
+            if key in dimensions:
+                mapped[key] = value
+            elif key == bucket_field:
+                mapped.setdefault("and", []).append({"field": f"{BUCKET_COLUMN}::date", "op": "eq", "value": value})
+            else:
+                return None
+        return mapped
+
     def build_where_clause(
         self,
         filters: Dict,
@@ -220,14 +389,7 @@ class CollectionAggregateSQLBuilder:
     ) -> tuple[List[str], Dict, int]:
         parts: List[str] = []
 
-        op_map = {
-            "eq": "=",
-            "neq": "!=",
-            "gt": ">",
-            "gte": ">=",
-            "lt": "<",
-            "lte": "<=",
-        }
+        op_map = _HAVING_OPS
 
         for cond in having:
             func = cond.get("function")
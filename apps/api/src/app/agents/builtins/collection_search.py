@@ -2,19 +2,29 @@
 Collection Search Tool - универсальный поиск по SQL-коллекциям с DSL фильтрами (VersionedTool)
 """
 from __future__ import annotations
-from typing import Any, Dict, List, ClassVar, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, ClassVar, Optional, Tuple
+import base64
+import hashlib
+import json
 import uuid
 
 from app.core.logging import get_logger
 from app.agents.handlers.versioned_tool import VersionedTool, tool_version, register_tool
 from app.agents.context import ToolContext, ToolResult
 from app.models.collection import Collection, FieldType
+from app.services.collection.index_advisor import get_query_shape_recorder, shape_from_dsl
 
 logger = get_logger(__name__)
 
 DEFAULT_LIMIT = 50
 MAX_LIMIT = 100
 MAX_OFFSET = 1000
+# Capped counts stop after this many matches instead of scanning everything.
+COUNT_CAP = 10_000
+COUNT_MODES = ("auto", "exact", "estimate", "capped")
+PAGE_TOKEN_VERSION = 1
 
 _INPUT_SCHEMA_V1 = {
     "type": "object",
@@ -93,6 +103,94 @@ _OUTPUT_SCHEMA_V1 = {
 }
 
 
+_INPUT_SCHEMA_V1_1 = {
+    **_INPUT_SCHEMA_V1,
+    "properties": {
+        **_INPUT_SCHEMA_V1["properties"],
+        "page_token": {
+            "type": "string",
+            "description": (
+                "Opaque token from a previous call's next_page_token. Continues the same "
+                "search after the last returned row; prefer it over offset for paging."
+            ),
+        },
+        "count": {
+            "type": "string",
+            "enum": list(COUNT_MODES),
+            "description": (
+                "How to compute total: auto (planner estimate when unfiltered, capped count "
+                f"up to {COUNT_CAP} otherwise), exact, estimate or capped"
+            ),
+            "default": "auto",
+        },
+    },
+}
+
+_OUTPUT_SCHEMA_V1_1 = {
+    "type": "object",
+    "properties": {
+        **_OUTPUT_SCHEMA_V1["properties"],
+        "total_is_exact": {"type": "boolean"},
+        "count_mode": {"type": "string"},
+        "next_page_token": {"type": ["string", "null"]},
+    },
+}
+
+
+class PageTokenError(ValueError):
+    """page_token is malformed or belongs to a different search."""
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": "dt", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": "d", "v": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"t": "uuid", "v": str(value)}
+    if isinstance(value, Decimal):
+        return {"t": "dec", "v": str(value)}
+    return value
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    kind, raw = value.get("t"), value.get("v")
+    if kind == "dt":
+        return datetime.fromisoformat(raw)
+    if kind == "d":
+        return date.fromisoformat(raw)
+    if kind == "uuid":
+        return uuid.UUID(raw)
+    if kind == "dec":
+        return Decimal(raw)
+    raise PageTokenError("Unsupported page_token value")
+
+
+def encode_page_token(signature: str, values: List[Any]) -> str:
+    payload = {"v": PAGE_TOKEN_VERSION, "s": signature, "k": [_encode_cursor_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str, signature: str) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_decode_cursor_value(v) for v in payload["k"]]
+    except PageTokenError:
+        raise
+    except Exception as exc:
+        raise PageTokenError("Malformed page_token") from exc
+    if payload.get("v") != PAGE_TOKEN_VERSION or payload.get("s") != signature:
+        raise PageTokenError(
+            "page_token does not match this search (collection, filters, query or sort changed); "
+            "repeat the search without page_token"
+        )
+    return values
+
+
 @register_tool
 class CollectionSearchTool(VersionedTool):
     """
@@ -185,6 +283,21 @@ class CollectionSearchTool(VersionedTool):
         """
         Выполнить поиск по коллекции с DSL фильтрами и guardrails.
         """
+        return await self._search(ctx, {**args, "count": "exact", "page_token": None})
+
+    @tool_version(
+        version="1.1.0",
+        input_schema=_INPUT_SCHEMA_V1_1,
+        output_schema=_OUTPUT_SCHEMA_V1_1,
+        description="Keyset pagination via opaque page_token; estimated/capped totals by default",
+    )
+    async def v1_1_0(self, ctx: ToolContext, args: Dict[str, Any]) -> ToolResult:
+        """
+        Поиск с keyset-пагинацией (page_token) и дешёвым подсчётом total.
+        """
+        return await self._search(ctx, args)
+
+    async def _search(self, ctx: ToolContext, args: Dict[str, Any]) -> ToolResult:
         from sqlalchemy import text
         from app.core.db import get_session_factory
         from app.services.collection_service import CollectionService
@@ -218,12 +331,17 @@ class CollectionSearchTool(VersionedTool):
             offset = min(int(args.get("offset", 0)), MAX_OFFSET)
         except (TypeError, ValueError):
             offset = 0
+        page_token = str(args.get("page_token") or "").strip() or None
+        count_mode = str(args.get("count") or "auto").strip().lower()
+        if count_mode not in COUNT_MODES:
+            count_mode = "auto"
         
         log.info("Starting collection search",
                  collection=collection_slug,
                  query=query[:50] if query else None,
                  has_filters=bool(filters),
-                 limit=limit, offset=offset)
+                 limit=limit, offset=offset,
+                 has_page_token=bool(page_token), count_mode=count_mode)
         
         try:
             session_factory = get_session_factory()
@@ -274,10 +392,30 @@ class CollectionSearchTool(VersionedTool):
                     log.warning("Filter validation failed", error=validation_error)
                     return ToolResult.fail(validation_error,
                                            logs=log.entries_dict())
+
+                order_keys = self._resolve_order_keys(collection, sort)
+                await get_query_shape_recorder().record(
+                    collection.table_name,
+                    shape_from_dsl("search", filters, sort=[field for field, _ in order_keys]),
+                )
+                signature = self._search_signature(collection, filters, query, order_keys)
+                after: Optional[List[Any]] = None
+                if page_token:
+                    try:
+                        after = decode_page_token(page_token, signature)
+                    except PageTokenError as exc:
+                        log.warning("Invalid page token", error=str(exc))
+                        return ToolResult.fail(str(exc), logs=log.entries_dict())
+                    if len(after) != len(order_keys):
+                        return ToolResult.fail(
+                            "page_token does not match this search; repeat the search without page_token",
+                            logs=log.entries_dict(),
+                        )
+                    offset = 0
                 
-                # Build SQL query
+                # Build SQL query: one extra row tells whether another page exists
                 sql, params = self._build_search_sql(
-                    collection, filters, query, sort, effective_limit, offset
+                    collection, filters, query, sort, effective_limit + 1, offset, after=after
                 )
                 
                 log.debug("Executing SQL query", table=collection.table_name)
@@ -288,25 +426,38 @@ class CollectionSearchTool(VersionedTool):
                 
                 result = await session.execute(text(sql), params)
                 rows = [dict(r) for r in result.mappings().all()]
+                has_more = len(rows) > effective_limit
+                rows = rows[:effective_limit]
+                next_page_token = None
+                if has_more and rows:
+                    next_page_token = encode_page_token(
+                        signature, [rows[-1].get(field) for field, _ in order_keys]
+                    )
                 
-                # Get total count (without limit/offset)
-                count_sql, count_params = self._build_count_sql(collection, filters, query)
-                count_result = await session.execute(text(count_sql), count_params)
-                total = count_result.scalar() or 0
+                if not has_more and after is None and (rows or offset == 0):
+                    # The rest of the result fit on this page: the total is known exactly.
+                    total, total_is_exact = offset + len(rows), True
+                else:
+                    total, total_is_exact, count_mode = await self._count(
+                        session, collection, filters, query, count_mode=count_mode, has_filters=has_filters,
+                    )
                 
                 formatted_rows = self._format_rows(rows, collection)
                 
                 log.info("Search completed",
                          returned=len(formatted_rows), total=total,
-                         has_more=(offset + len(formatted_rows)) < total)
+                         total_is_exact=total_is_exact, has_more=has_more)
                 
                 return ToolResult.ok(
                     data={
                         "rows": formatted_rows,
                         "total": total,
+                        "total_is_exact": total_is_exact,
+                        "count_mode": count_mode,
                         "returned": len(formatted_rows),
                         "collection": collection.slug,
-                        "has_more": (offset + len(formatted_rows)) < total,
+                        "has_more": has_more,
+                        "next_page_token": next_page_token,
                     },
                     logs=log.entries_dict(),
                 )
@@ -317,6 +468,41 @@ class CollectionSearchTool(VersionedTool):
             return ToolResult.fail(f"Search failed: {str(e)}",
                                    logs=log.entries_dict())
 
+    async def _count(
+        self,
+        session: Any,
+        collection: Collection,
+        filters: Dict,
+        query: Optional[str],
+        *,
+        count_mode: str,
+        has_filters: bool,
+    ) -> Tuple[int, bool, str]:
+        """Return (total, is_exact, mode actually used)."""
+        from sqlalchemy import text
+
+        if count_mode == "auto":
+            count_mode = "capped" if has_filters else "estimate"
+        if count_mode == "estimate":
+            if not has_filters:
+                estimate = (await session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                    {"table_name": collection.table_name},
+                )).scalar()
+                # reltuples is -1/0 until the table has been analyzed.
+                if estimate is not None and int(estimate) > 0:
+                    return int(estimate), False, "estimate"
+            # Planner estimates for ILIKE predicates are unreliable; cap instead.
+            count_mode = "capped"
+        if count_mode == "capped":
+            count_sql, count_params = self._build_count_sql(collection, filters, query, cap=COUNT_CAP)
+            counted = int((await session.execute(text(count_sql), count_params)).scalar() or 0)
+            if counted > COUNT_CAP:
+                return COUNT_CAP, False, "capped"
+            return counted, True, "capped"
+        count_sql, count_params = self._build_count_sql(collection, filters, query)
+        return int((await session.execute(text(count_sql), count_params)).scalar() or 0), True, "exact"
+
     def _validate_filters(self, collection: Collection, filters: Dict) -> Optional[str]:
         """Validate filters against collection schema"""
         if not filters:
@@ -347,22 +533,16 @@ class CollectionSearchTool(VersionedTool):
         
         return None
 
-    def _build_search_sql(
+    def _build_where(
         self,
         collection: Collection,
         filters: Dict,
         query: Optional[str],
-        sort: List[Dict],
-        limit: int,
-        offset: int
-    ) -> tuple[str, Dict]:
-        """Build search SQL with DSL filters"""
-        table_name = collection.table_name
-        params = {}
+    ) -> tuple[List[str], Dict, int]:
+        """WHERE parts shared by the search and count queries."""
+        params: Dict[str, Any] = {}
         param_idx = 0
-        
-        # Build WHERE clause
-        where_parts = []
+        where_parts: List[str] = []
         
         # Process DSL filters
         if filters:
@@ -383,37 +563,132 @@ class CollectionSearchTool(VersionedTool):
                     text_conditions.append(f"{tf} ILIKE :query_{param_idx}")
                 where_parts.append(f"({' OR '.join(text_conditions)})")
                 param_idx += 1
-        
-        where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
-        
-        # Build ORDER BY (validate sort fields against collection schema + system columns)
+        return where_parts, params, param_idx
+
+    def _resolve_order_keys(self, collection: Collection, sort: List[Dict]) -> List[Tuple[str, str]]:
+        """Validated (field, ASC|DESC) keys, always ending with the ``id`` tiebreaker."""
+        # Map common LLM hallucinated field names to real columns
+        _SORT_ALIASES = {"created_at": "_created_at", "updated_at": "_updated_at"}
         allowed_sort_fields = {f["name"] for f in collection.get_sortable_fields()}
         allowed_sort_fields.update({"id", "_created_at", "_updated_at"})
-        order_parts = []
-        if sort:
-            for s in sort:
-                field = s.get("field")
-                order = s.get("order", "asc").upper()
-                if field and order in ("ASC", "DESC"):
-                    # Map common LLM hallucinated field names to real columns
-                    _SORT_ALIASES = {"created_at": "_created_at", "updated_at": "_updated_at"}
-                    field = _SORT_ALIASES.get(field, field)
-                    if field in allowed_sort_fields:
-                        order_parts.append(f"{field} {order}")
-                    else:
-                        logger.warning(f"Sort field '{field}' not in collection schema, skipping")
-        
-        if not order_parts and collection.default_sort:
+        keys: List[Tuple[str, str]] = []
+        for s in sort or []:
+            field = s.get("field")
+            order = s.get("order", "asc").upper()
+            if field and order in ("ASC", "DESC"):
+                field = _SORT_ALIASES.get(field, field)
+                if field in allowed_sort_fields:
+                    if all(field != existing for existing, _ in keys):
+                        keys.append((field, order))
+                else:
+                    logger.warning(f"Sort field '{field}' not in collection schema, skipping")
+        
+        if not keys and collection.default_sort:
             ds = collection.default_sort
-            order_parts.append(f"{ds.get('field', 'id')} {ds.get('order', 'desc').upper()}")
+            field = ds.get("field", "id")
+            order = str(ds.get("order", "desc")).upper()
+            # default_sort is admin-configured, so it is not limited to sortable fields.
+            if field and order in ("ASC", "DESC"):
+                keys.append((field, order))
+        
+        # Unique tiebreaker: makes ordering deterministic and keysets unambiguous.
+        if all(field != "id" for field, _ in keys):
+            keys.append(("id", keys[-1][1] if keys else "ASC"))
+        return keys
+
+    @staticmethod
+    def _search_signature(
+        collection: Collection,
+        filters: Dict,
+        query: Optional[str],
+        order_keys: List[Tuple[str, str]],
+    ) -> str:
+        raw = json.dumps(
+            [str(collection.slug), filters or {}, query or "", order_keys],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _build_keyset_predicate(
+        order_keys: List[Tuple[str, str]],
+        after: List[Any],
+        params: Dict,
+    ) -> str:
+        """Rows strictly after ``after`` in ``ORDER BY order_keys`` (NULLS LAST/FIRST aware)."""
+        for idx, value in enumerate(after):
+            if value is not None:
+                params[f"k{idx}"] = value
+        directions = {order for _, order in order_keys}
+        # Row comparison lets Postgres use a composite index range scan.  A
+        # NULL key makes the comparison NULL (row skipped), which matches
+        # DESC NULLS FIRST; for ASC NULLS LAST it is only patched up for the
+        # common (key, id) shape.
+        if (
+            len(directions) == 1
+            and all(value is not None for value in after)
+            and (directions == {"DESC"} or len(order_keys) <= 2)
+        ):
+            op = ">" if directions == {"ASC"} else "<"
+            columns = ", ".join(field for field, _ in order_keys)
+            placeholders = ", ".join(f":k{idx}" for idx in range(len(order_keys)))
+            if directions == {"ASC"} and len(order_keys) == 2:
+                return f"(({columns}) {op} ({placeholders}) OR {order_keys[0][0]} IS NULL)"
+            return f"({columns}) {op} ({placeholders})"
+
+        def _after(field: str, order: str, idx: int) -> str:
+            if after[idx] is None:
+                # ASC puts NULLs last (nothing follows); DESC puts them first.
+                return "FALSE" if order == "ASC" else f"{field} IS NOT NULL"
+            if order == "ASC":
+                return f"({field} > :k{idx} OR {field} IS NULL)"
+            return f"{field} < :k{idx}"
+
+        def _equal(field: str, idx: int) -> str:
+            return f"{field} IS NULL" if after[idx] is None else f"{field} = :k{idx}"
+
+        branches = []
+        for idx, (field, order) in enumerate(order_keys):
+            terms = [_equal(prev_field, prev_idx) for prev_idx, (prev_field, _) in enumerate(order_keys[:idx])]
+            terms.append(_after(field, order, idx))
+            branches.append("(" + " AND ".join(terms) + ")")
+        return "(" + " OR ".join(branches) + ")"
+
+    def _build_search_sql(
+        self,
+        collection: Collection,
+        filters: Dict,
+        query: Optional[str],
+        sort: List[Dict],
+        limit: int,
+        offset: int,
+        *,
+        after: Optional[List[Any]] = None,
+    ) -> tuple[str, Dict]:
+        """Build search SQL with DSL filters.
+
+        With ``after`` (decoded page_token values) the page starts right after
+        that keyset instead of using OFFSET, so deep pages cost the same as
+        the first one.
+        """
+        table_name = collection.table_name
+        where_parts, params, _ = self._build_where(collection, filters, query)
+        order_keys = self._resolve_order_keys(collection, sort)
+        if after is not None:
+            where_parts.append(self._build_keyset_predicate(order_keys, after, params))
+            offset = 0
         
-        order_clause = f"ORDER BY {', '.join(order_parts)}" if order_parts else ""
+        where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
+        order_clause = "ORDER BY " + ", ".join(f"{field} {order}" for field, order in order_keys)
+        offset_clause = f" OFFSET {offset}" if offset else ""
         
         sql = f"""
             SELECT * FROM {table_name}
             {where_clause}
             {order_clause}
-            LIMIT {limit} OFFSET {offset}
+            LIMIT {limit}{offset_clause}
         """
         
         return sql.strip(), params
@@ -422,35 +697,19 @@ class CollectionSearchTool(VersionedTool):
         self,
         collection: Collection,
         filters: Dict,
-        query: Optional[str]
+        query: Optional[str],
+        *,
+        cap: Optional[int] = None,
     ) -> tuple[str, Dict]:
-        """Build count SQL"""
+        """Build count SQL; with ``cap`` stop counting after ``cap + 1`` matches."""
         table_name = collection.table_name
-        params = {}
-        param_idx = 0
-        
-        where_parts = []
-        
-        if filters:
-            filter_parts, params, param_idx = self._build_where_from_dsl(filters, params, param_idx)
-            where_parts.extend(filter_parts)
-        
-        if query:
-            text_fields = [
-                f["name"]
-                for f in collection.get_filterable_fields()
-                if f.get("data_type") in (FieldType.STRING.value, FieldType.TEXT.value, FieldType.ENUM.value)
-            ]
-            if text_fields:
-                text_conditions = []
-                params[f"query_{param_idx}"] = f"%{query}%"
-                for tf in text_fields:
-                    text_conditions.append(f"{tf} ILIKE :query_{param_idx}")
-                where_parts.append(f"({' OR '.join(text_conditions)})")
-        
+        where_parts, params, _ = self._build_where(collection, filters, query)
         where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
         
-        sql = f"SELECT COUNT(*) FROM {table_name} {where_clause}"
+        if cap is not None:
+            sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {table_name} {where_clause} LIMIT {int(cap) + 1}) AS capped"
+        else:
+            sql = f"SELECT COUNT(*) FROM {table_name} {where_clause}"
         return sql.strip(), params
 
     def _build_where_from_dsl(
@@ -4,8 +4,9 @@ File Generate Tool — saves a generated file and returns canonical artifact inf
 The agent (not the orchestrator) owns content creation. This tool delegates
 serialization and canonical artifact persistence to shared services.
 
-Supported formats: csv, json, txt, md, docx.
-Excel support is TODO — it requires binary generation (e.g. openpyxl/xlsxwriter).
+Supported formats: csv, json, txt, md, docx. Since 1.1.0 tabular exports
+(``columns`` + ``rows``) are streamed row by row into storage as csv, jsonl
+or xlsx, so large exports never hold the whole file in memory.
 """
 from __future__ import annotations
 
@@ -14,11 +15,12 @@ from typing import Any, ClassVar, Dict
 from app.agents.context import ToolContext, ToolResult
 from app.agents.handlers.versioned_tool import VersionedTool, register_tool, tool_version
 from app.core.logging import get_logger
-from app.services.file_formats import FileCodecRegistry
+from app.services.file_formats import FileCodecRegistry, TabularCodecRegistry
 
 logger = get_logger(__name__)
 
 _SUPPORTED_FORMATS = set(FileCodecRegistry.supported_formats())
+_TABLE_FORMATS = set(TabularCodecRegistry.supported_formats())
 
 _INPUT_SCHEMA_V1 = {
     "type": "object",
@@ -50,6 +52,41 @@ _OUTPUT_SCHEMA_V1 = {
     },
 }
 
+_INPUT_SCHEMA_V1_1 = {
+    "type": "object",
+    "properties": {
+        "filename": _INPUT_SCHEMA_V1["properties"]["filename"],
+        "content": {
+            "type": "string",
+            "description": "Full file body as a UTF-8 string. Omit when passing 'columns' and 'rows'.",
+        },
+        "columns": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Header of a tabular export. Use with 'rows' for csv, jsonl or xlsx.",
+        },
+        "rows": {
+            "type": "array",
+            "items": {"type": ["object", "array"]},
+            "description": "Table rows: objects keyed by column or arrays in column order.",
+        },
+        "format": {
+            "type": "string",
+            "description": "File format. Text body: csv, json, txt, md, docx. Table: csv, jsonl, xlsx.",
+            "enum": sorted(_SUPPORTED_FORMATS | _TABLE_FORMATS),
+        },
+    },
+    "required": ["filename", "format"],
+}
+
+_OUTPUT_SCHEMA_V1_1 = {
+    "type": "object",
+    "properties": {
+        **_OUTPUT_SCHEMA_V1["properties"],
+        "row_count": {"type": "integer", "description": "Data rows written (tabular exports only)"},
+    },
+}
+
 
 @register_tool
 class FileGenerateTool(VersionedTool):
@@ -75,6 +112,18 @@ class FileGenerateTool(VersionedTool):
         description="Save generated file body to S3/MinIO and return download metadata",
     )
     async def v1_0_0(self, ctx: ToolContext, args: Dict[str, Any]) -> ToolResult:
+        return await self._generate(ctx, {**args, "columns": None, "rows": None})
+
+    @tool_version(
+        version="1.1.0",
+        input_schema=_INPUT_SCHEMA_V1_1,
+        output_schema=_OUTPUT_SCHEMA_V1_1,
+        description="Adds tabular exports (columns + rows) streamed to storage as csv, jsonl or xlsx",
+    )
+    async def v1_1_0(self, ctx: ToolContext, args: Dict[str, Any]) -> ToolResult:
+        return await self._generate(ctx, args)
+
+    async def _generate(self, ctx: ToolContext, args: Dict[str, Any]) -> ToolResult:
         from app.core.db import get_session_factory
         from app.services.file_generation_service import FileGenerationService
 
@@ -83,20 +132,36 @@ class FileGenerateTool(VersionedTool):
         filename = str(args.get("filename") or "").strip()
         content = str(args.get("content") or "")
         fmt = str(args.get("format") or "").strip().lower()
+        columns = args.get("columns")
+        rows = args.get("rows")
+        tabular = columns is not None or rows is not None
 
         if not filename:
             log.error("Missing filename")
             return ToolResult.fail("Missing 'filename' argument", logs=log.entries_dict())
 
-        if not content:
+        if tabular:
+            if not isinstance(columns, list) or not columns or not isinstance(rows, list):
+                log.error("Invalid table arguments")
+                return ToolResult.fail(
+                    "Tabular export requires non-empty 'columns' and a 'rows' array",
+                    logs=log.entries_dict(),
+                )
+            if fmt not in _TABLE_FORMATS:
+                log.error("Unsupported table format", requested=fmt, supported=list(_TABLE_FORMATS))
+                return ToolResult.fail(
+                    f"Unsupported table format '{fmt}'. Supported: {', '.join(sorted(_TABLE_FORMATS))}.",
+                    logs=log.entries_dict(),
+                )
+        elif not content:
             log.error("Empty content")
             return ToolResult.fail("Missing 'content' argument", logs=log.entries_dict())
-
-        if fmt not in _SUPPORTED_FORMATS:
+        elif fmt not in _SUPPORTED_FORMATS:
             log.error("Unsupported format", requested=fmt, supported=list(_SUPPORTED_FORMATS))
             return ToolResult.fail(
                 f"Unsupported format '{fmt}'. Supported: {', '.join(sorted(_SUPPORTED_FORMATS))}. "
-                "Excel (.xlsx) and legacy Word (.doc) support are not implemented here.",
+                "Excel (.xlsx) is available for tabular exports (columns + rows); "
+                "legacy Word (.doc) is not implemented here.",
                 logs=log.entries_dict(),
             )
 
@@ -119,32 +184,47 @@ class FileGenerateTool(VersionedTool):
             "Generating file",
             filename=output_filename,
             format=fmt,
+            rows=len(rows) if tabular else None,
             chat_id=str(chat_id) if chat_id else None,
         )
 
         try:
             session_factory = get_session_factory()
             async with session_factory() as session:
-                artifact = await FileGenerationService(session).generate(
-                    chat_id=str(chat_id),
-                    owner_id=str(user_id),
-                    filename=output_filename,
-                    content=content,
-                    format_name=fmt,
-                )
+                service = FileGenerationService(session)
+                if tabular:
+                    artifact = await service.generate_table(
+                        chat_id=str(chat_id),
+                        owner_id=str(user_id),
+                        filename=output_filename,
+                        format_name=fmt,
+                        columns=[str(column) for column in columns],
+                        rows=rows,
+                    )
+                else:
+                    artifact = await service.generate(
+                        chat_id=str(chat_id),
+                        owner_id=str(user_id),
+                        filename=output_filename,
+                        content=content,
+                        format_name=fmt,
+                    )
                 await session.commit()
                 log.info(
                     "File saved",
                     artifact_id=artifact.artifact_id,
                     size_bytes=artifact.size_bytes,
                 )
+                data = {
+                    "artifact_id": artifact.artifact_id,
+                    "file_name": artifact.file_name,
+                    "content_type": artifact.content_type,
+                    "size_bytes": artifact.size_bytes,
+                }
+                if tabular:
+                    data["row_count"] = artifact.metadata.get("row_count", len(rows))
                 return ToolResult.ok(
-                    data={
-                        "artifact_id": artifact.artifact_id,
-                        "file_name": artifact.file_name,
-                        "content_type": artifact.content_type,
-                        "size_bytes": artifact.size_bytes,
-                    },
+                    data=data,
                     message=f"File '{output_filename}' generated successfully.",
                     logs=log.entries_dict(),
                 )
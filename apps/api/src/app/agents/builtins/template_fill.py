@@ -7,6 +7,7 @@ final output of the fill operation.
 """
 from __future__ import annotations
 
+import asyncio
 import io
 import re
 from pathlib import PurePosixPath
@@ -304,7 +305,8 @@ class TemplateFillTool(VersionedTool):
                     )
 
                 engine = TemplateFillEngine(contract)
-                result = engine.fill(content, values, filename, assume_valid=True)
+                # openpyxl work is CPU-bound; keep it off the event loop.
+                result = await asyncio.to_thread(engine.fill, content, values, filename, assume_valid=True)
                 if not result.success:
                     return ToolResult.fail(
                         f"Failed to fill template: {result.error}",
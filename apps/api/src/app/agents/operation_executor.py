@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -12,8 +11,12 @@ from app.agents.contracts import OperationCredentialContext, ProviderExecutionTa
 from app.agents.registry import ToolRegistry
 from app.agents.runtime_graph import OperationExecutionBinding, RuntimeExecutionGraph
 from app.core.config import get_settings
-from app.core.http.tls import outbound_http_verify
 from app.services.mcp_credential_broker_service import MCPCredentialBrokerService
+from app.services.mcp_client_manager import (
+    SESSION_EXPIRED_STATUSES,
+    MCPClientManager,
+    get_mcp_client_manager,
+)
 from app.services.mcp_jsonrpc_client import parse_mcp_response as _parse_mcp_response_body
 from app.runtime.events import OrchestrationPhase, RuntimeEvent, RuntimeEventType
 
@@ -28,16 +31,19 @@ class _UnifiedToolCall:
 
 
 class DirectOperationExecutor:
-    def __init__(self, *, tool_registry: Optional["ToolRegistry"] = None) -> None:
+    def __init__(
+        self,
+        *,
+        tool_registry: Optional["ToolRegistry"] = None,
+        mcp_clients: Optional[MCPClientManager] = None,
+    ) -> None:
         self._tool_registry = tool_registry or ToolRegistry.get_instance()
-        self._clients: Dict[str, httpx.AsyncClient] = {}
-        self._mcp_sessions: Dict[str, tuple[str, float]] = {}
-        self._client_lock = asyncio.Lock()
-        self._mcp_session_lock = asyncio.Lock()
+        # Connections and sessions are shared process-wide with discovery and
+        # health probes instead of being cached per executor instance.
+        self._mcp_clients = mcp_clients or get_mcp_client_manager()
         settings = get_settings()
         self._http_max_retries = max(0, int(getattr(settings, "HTTP_MAX_RETRIES", 0) or 0))
         self._retry_base_delay_ms = 200
-        self._mcp_session_ttl_s: int = max(30, int(getattr(settings, "MCP_SESSION_TTL_S", 300) or 300))
         self._mcp_credential_broker_enabled = bool(
             getattr(settings, "MCP_CREDENTIAL_BROKER_ENABLED", False)
         )
@@ -135,7 +141,8 @@ class DirectOperationExecutor:
         if not provider_url:
             raise ValueError(f"MCP provider URL missing for '{target.operation_slug}'")
 
-        session_id = await self._mcp_initialize(provider_url, timeout_s=target.timeout_s)
+        timeout = target.timeout_s or 30
+        session_id = await self._mcp_clients.get_session_id(provider_url, timeout)
         payload = {
             "jsonrpc": "2.0",
             "id": 2,
@@ -145,8 +152,7 @@ class DirectOperationExecutor:
                 "arguments": call.arguments,
             },
         }
-        timeout = target.timeout_s or 30
-        client = await self._get_client(provider_url, timeout)
+        client = self._mcp_clients.get_client(provider_url)
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream",
@@ -160,11 +166,9 @@ class DirectOperationExecutor:
             timeout_s=timeout,
             ctx=ctx,
         )
-        if response.status_code in {400, 401, 403, 410}:
-            self._mcp_sessions.pop(provider_url, None)
-            session_id = await self._mcp_initialize_fresh(provider_url, timeout_s=target.timeout_s)
-            async with self._mcp_session_lock:
-                self._mcp_sessions[provider_url] = (session_id, time.monotonic() + self._mcp_session_ttl_s)
+        if response.status_code in SESSION_EXPIRED_STATUSES:
+            self._mcp_clients.invalidate_session(provider_url, session_id)
+            session_id = await self._mcp_clients.get_session_id(provider_url, timeout)
             headers["mcp-session-id"] = session_id
             response, attempts = await self._post_with_retry(
                 client=client,
@@ -340,65 +344,6 @@ class DirectOperationExecutor:
             "expires_at": access_ctx.expires_at,
         }
 
-    async def _mcp_initialize(self, provider_url: str, timeout_s: Optional[int]) -> str:
-        now = time.monotonic()
-        cached = self._mcp_sessions.get(provider_url)
-        if cached and cached[1] > now:
-            return cached[0]
-
-        async with self._mcp_session_lock:
-            cached = self._mcp_sessions.get(provider_url)
-            if cached and cached[1] > time.monotonic():
-                return cached[0]
-
-            session_id = await self._mcp_initialize_fresh(provider_url, timeout_s)
-            self._mcp_sessions[provider_url] = (session_id, time.monotonic() + self._mcp_session_ttl_s)
-            return session_id
-
-    async def _mcp_initialize_fresh(self, provider_url: str, timeout_s: Optional[int]) -> str:
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "ml-portal", "version": "1.0"},
-            },
-        }
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
-        }
-        timeout = timeout_s or 30
-        client = await self._get_client(provider_url, timeout)
-        response, _ = await self._post_with_retry(
-            client=client,
-            provider_url=provider_url,
-            headers=headers,
-            payload=payload,
-            timeout_s=timeout,
-        )
-        if response.status_code >= 400:
-            raise ValueError(f"MCP initialize failed with HTTP {response.status_code}")
-        session_id = response.headers.get("mcp-session-id")
-        if not session_id:
-            raise ValueError("MCP initialize response missing mcp-session-id")
-        return session_id
-
-    async def _get_client(self, provider_url: str, timeout_s: int) -> httpx.AsyncClient:
-        existing = self._clients.get(provider_url)
-        if existing is not None:
-            return existing
-
-        async with self._client_lock:
-            existing = self._clients.get(provider_url)
-            if existing is not None:
-                return existing
-            client = httpx.AsyncClient(timeout=timeout_s, verify=outbound_http_verify())
-            self._clients[provider_url] = client
-            return client
-
     async def _post_with_retry(
         self,
         *,
@@ -415,7 +360,7 @@ class DirectOperationExecutor:
 
         for attempt in range(1, max_attempts + 1):
             try:
-                response = await client.post(provider_url, headers=headers, json=payload)
+                response = await client.post(provider_url, headers=headers, json=payload, timeout=timeout_s)
                 last_response = response
                 if not self._is_retryable_status(response.status_code) or attempt == max_attempts:
                     return response, attempt
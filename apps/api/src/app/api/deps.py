@@ -53,7 +53,7 @@ def get_current_user_optional(request: Request) -> UserCtx | None:
     
     Use ONLY for non-critical endpoints like SSE in dev mode.
     """
-    from app.core.security import decode_jwt
+    from app.core.security import decode_jwt_for_request
     from app.core.config import get_settings
     
     settings = get_settings()
@@ -94,7 +94,7 @@ def get_current_user_optional(request: Request) -> UserCtx | None:
         )
     
     try:
-        payload = decode_jwt(token)
+        payload = decode_jwt_for_request(request.scope.setdefault("state", {}), token)
         if payload.get("type") != "access":
             return None
         
@@ -115,7 +115,7 @@ def get_current_user(request: Request) -> UserCtx:
     For SSE: EventSource automatically sends cookies with withCredentials: true.
     NO tokens in URL query params for security.
     """
-    from app.core.security import decode_jwt
+    from app.core.security import decode_jwt_for_request
     
     token = None
     
@@ -135,7 +135,7 @@ def get_current_user(request: Request) -> UserCtx:
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    payload = decode_jwt(token)
+    payload = decode_jwt_for_request(request.scope.setdefault("state", {}), token)
     
     # Validate token type
     if payload.get("type") != "access":
@@ -164,7 +164,7 @@ async def get_current_user_sse(request: Request) -> UserCtx:
     EventSource automatically sends cookies with credentials: 'include'.
     DO NOT use query params for tokens - they leak in logs and browser history.
     """
-    from app.core.security import decode_jwt
+    from app.core.security import decode_jwt_for_request
     from app.core.config import get_settings
 
     token = None
@@ -191,7 +191,7 @@ async def get_current_user_sse(request: Request) -> UserCtx:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    payload = decode_jwt(token)
+    payload = decode_jwt_for_request(request.scope.setdefault("state", {}), token)
 
     if payload.get("type") != "access":
         raise HTTPException(
@@ -13,11 +13,13 @@ from .collections_audit import router as audit_router
 from .collections_core import router as core_router
 from .collections_core import create_collection as create_collection_core
 from .collections_core import list_all_collections as list_all_collections_core
+from .collections_indexes import router as indexes_router
 from .collections_versions import router as versions_router
 
 router = APIRouter(tags=["collections"])
 router.include_router(audit_router)
 router.include_router(core_router)
+router.include_router(indexes_router)
 router.include_router(versions_router)
 
 
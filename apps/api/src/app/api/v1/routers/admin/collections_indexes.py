@@ -0,0 +1,92 @@
+"""
+Admin collection index advice endpoints.
+"""
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import db_uow, require_admin
+from app.models.collection import Collection
+from app.schemas.collections import (
+    ApplyCollectionIndexRequest,
+    CollectionIndexAdviceResponse,
+    CollectionIndexBuildStatus,
+)
+from app.services.collection.index_advisor import (
+    DEFAULT_MIN_HITS,
+    DEFAULT_MIN_TABLE_ROWS,
+    CollectionIndexAdvisor,
+)
+from app.services.collection_service import CollectionService
+from app.workers.tasks_collection_indexes import (
+    ACTIVE_INDEX_BUILD_STATUSES,
+    build_collection_index,
+    get_index_build_meta,
+    set_index_build_meta,
+)
+
+router = APIRouter()
+
+
+async def _local_collection(session: AsyncSession, collection_id: uuid.UUID) -> Collection:
+    collection = await CollectionService(session).get_by_id(collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    if not collection.is_local or not collection.table_name:
+        raise HTTPException(status_code=400, detail="Index advice is only available for local collections")
+    return collection
+
+
+@router.get("/{collection_id}/index-advice", response_model=CollectionIndexAdviceResponse)
+async def get_collection_index_advice(
+    collection_id: uuid.UUID,
+    min_hits: int = Query(DEFAULT_MIN_HITS, ge=1),
+    min_table_rows: int = Query(DEFAULT_MIN_TABLE_ROWS, ge=0),
+    session: AsyncSession = Depends(db_uow),
+    admin_user=Depends(require_admin),
+):
+    collection = await _local_collection(session, collection_id)
+    return await CollectionIndexAdvisor(session).advise(
+        collection,
+        min_hits=min_hits,
+        min_table_rows=min_table_rows,
+    )
+
+
+@router.post("/{collection_id}/indexes", response_model=CollectionIndexBuildStatus, status_code=202)
+async def apply_collection_index(
+    collection_id: uuid.UUID,
+    body: ApplyCollectionIndexRequest,
+    session: AsyncSession = Depends(db_uow),
+    admin_user=Depends(require_admin),
+):
+    """Queue a ``CREATE INDEX CONCURRENTLY`` build; poll the status endpoint."""
+    collection = await _local_collection(session, collection_id)
+    meta = await get_index_build_meta(str(collection.id), body.name)
+    if meta and meta.get("status") in ACTIVE_INDEX_BUILD_STATUSES:
+        return meta
+    proposal = await CollectionIndexAdvisor(session).find_proposal(collection, body.name)
+    if proposal is None:
+        raise HTTPException(status_code=404, detail="Index proposal not found")
+    await set_index_build_meta(
+        str(collection.id), body.name, status="pending", proposal=proposal, error=None, duration_s=None,
+    )
+    async_result = build_collection_index.delay(collection_id=str(collection.id), name=body.name)
+    return await set_index_build_meta(str(collection.id), body.name, task_id=str(async_result.id))
+
+
+@router.get("/{collection_id}/indexes/{name}", response_model=CollectionIndexBuildStatus)
+async def get_collection_index_build(
+    collection_id: uuid.UUID,
+    name: str,
+    session: AsyncSession = Depends(db_uow),
+    admin_user=Depends(require_admin),
+):
+    collection = await _local_collection(session, collection_id)
+    meta = await get_index_build_meta(str(collection.id), name)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Index build not found or expired")
+    return meta
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import db_session, require_admin
 from app.core.security import UserCtx
 from app.models.project import Project
+from app.services.glossary_service import GlossaryService
 
 router = APIRouter(prefix="/projects")
 
@@ -42,5 +43,6 @@ async def create_project(data: ProjectInput, db: AsyncSession = Depends(db_sessi
     project = Project(key=key, name=data.name.strip(), aliases=[item.strip() for item in data.aliases if item.strip()], description=data.description)
     db.add(project)
     await db.commit()
+    await GlossaryService.invalidate_index()
     await db.refresh(project)
     return project
@@ -1,6 +1,6 @@
 """Messages: list, SSE stream, resume run."""
 import uuid
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
@@ -17,9 +17,11 @@ from app.api.deps import (
     rate_limit_dependency,
     resolve_chat_context,
 )
+from app.core.config import get_settings
 from app.core.http.clients import LLMClientProtocol
 from app.core.logging import get_logger
 from app.core.security import UserCtx
+from app.core.sse import accepts_gzip, gzip_sse_stream, last_event_id
 from app.models.chat import Chats
 from app.models.chat_turn import ChatTurn
 from app.repositories.chats_repo import AsyncChatMessagesRepository
@@ -30,6 +32,8 @@ from app.schemas.confirmations import ConfirmationIssueRequest, ConfirmationIssu
 from app.schemas.runtime_continuation import RuntimeResumeAction, RuntimeResumeRequest
 from app.services.chat_router_event_mapper import build_resume_content, map_service_event_to_sse
 from app.services.runtime_hitl_protocol_service import RuntimeHitlProtocolService
+from app.services.chat_stream_batcher import ChatStreamBatcher
+from app.services.chat_stream_replay import ChatStreamReplayBuffer
 from app.services.chat_stream_service import ChatStreamService
 from app.services.runtime_resume_checkpoint_service import RuntimeResumeCheckpointService
 from app.services.runtime_resume_checkpoint_service import RuntimeResumeValidationError
@@ -97,6 +101,32 @@ async def list_messages(
     return {"items": items, "next_cursor": next_cursor, "limit": limit}
 
 
+async def _coalesced_sse(events: AsyncIterator[Dict[str, Any]], label: str) -> AsyncGenerator[str, None]:
+    """Map service events to SSE, merging deltas and writing each batch of frames at once."""
+    async for batch in ChatStreamBatcher.from_settings().batches(events):
+        frames = []
+        for event in batch:
+            try:
+                sse_text = map_service_event_to_sse(event)
+            except Exception as exc:
+                logger.warning("Failed to map %s event to SSE: %s", label, exc)
+                sse_text = None
+            if sse_text:
+                frames.append(sse_text)
+        if frames:
+            yield "".join(frames)
+
+
+def _chat_sse_response(chunks: AsyncIterator[str], request: Request) -> StreamingResponse:
+    if get_settings().CHAT_SSE_GZIP_ENABLED and accepts_gzip(request):
+        return StreamingResponse(
+            gzip_sse_stream(chunks),
+            media_type="text/event-stream",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return StreamingResponse(chunks, media_type="text/event-stream")
+
+
 @router.post("/{chat_id}/messages")
 async def send_message_stream(
     chat_id: str,
@@ -132,9 +162,12 @@ async def send_message_stream(
         messages_repo=repo_factory.get_chat_messages_repository(),
     )
 
+    replay = ChatStreamReplayBuffer(redis, chat_ctx.chat_id)
+
     async def _gen() -> AsyncGenerator[str, None]:
+        await replay.reset()
         try:
-            async for event in service.send_message_stream(
+            async for frames in _coalesced_sse(service.send_message_stream(
                 chat_id=chat_ctx.chat_id,
                 user_id=chat_ctx.user_id,
                 tenant_id=chat_ctx.tenant_id,
@@ -145,21 +178,31 @@ async def send_message_stream(
                 idempotency_key=idempotency_key,
                 model=model,
                 agent_slug=agent_slug,
-            ):
-                try:
-                    sse_text = map_service_event_to_sse(event)
-                except Exception as exc:
-                    logger.warning("Failed to map chat event to SSE: %s", exc)
-                    sse_text = None
-                if sse_text:
-                    yield sse_text
-            yield format_chat_sse_done()
+            ), "chat"):
+                yield await replay.record(frames)
+            yield await replay.record(format_chat_sse_done(), end=True)
         except Exception as e:
             logger.error(f"Error in chat stream: {e}", exc_info=True)
-            yield format_chat_sse(ChatSSEEventType.ERROR, ErrorPayload(error=str(e)))
-            yield format_chat_sse_done()
+            yield await replay.record(
+                format_chat_sse(ChatSSEEventType.ERROR, ErrorPayload(error=str(e))) + format_chat_sse_done(),
+                end=True,
+            )
 
-    return StreamingResponse(_gen(), media_type="text/event-stream")
+    return _chat_sse_response(_gen(), request)
+
+
+@router.get("/{chat_id}/messages/stream")
+async def reconnect_message_stream(
+    chat_id: str,
+    request: Request,
+    chat_ctx: ChatContext = Depends(resolve_chat_context),
+    redis: Redis = Depends(get_redis),
+) -> StreamingResponse:
+    """Re-attach to the chat's latest SSE stream, replaying chunks after Last-Event-ID."""
+    replay = ChatStreamReplayBuffer(redis, chat_ctx.chat_id)
+    if not await replay.exists():
+        raise HTTPException(status_code=404, detail="No stream to resume")
+    return _chat_sse_response(replay.follow(last_event_id(request)), request)
 
 
 @router.post(
@@ -305,17 +348,21 @@ async def resume_run(
     user_uuid_val = uuid.UUID(str(current_user.id))
     chats_repo = AsyncChatsRepository(session, tenant_uuid_val, user_uuid_val)
     messages_repo = AsyncChatMessagesRepository(session, tenant_uuid_val, user_uuid_val)
+    redis_client = get_redis()
     service = ChatStreamService(
         session=session,
-        redis=get_redis(),
+        redis=redis_client,
         llm_client=get_llm_client(),
         chats_repo=chats_repo,
         messages_repo=messages_repo,
     )
 
+    replay = ChatStreamReplayBuffer(redis_client, str(turn.chat_id))
+
     async def _resume_gen() -> AsyncGenerator[str, None]:
+        await replay.reset()
         try:
-            async for event in service.send_message_stream(
+            async for frames in _coalesced_sse(service.send_message_stream(
                 chat_id=str(turn.chat_id),
                 user_id=str(current_user.id),
                 tenant_id=str(tenant_uuid_val),
@@ -331,18 +378,14 @@ async def resume_run(
                 resumed_turn_id=str(turn.id),
                 confirmation_tokens=confirmation_tokens,
                 persist_user_message=False,
-            ):
-                try:
-                    sse_text = map_service_event_to_sse(event)
-                except Exception as exc:
-                    logger.warning("Failed to map resume event to SSE: %s", exc)
-                    sse_text = None
-                if sse_text:
-                    yield sse_text
-            yield format_chat_sse_done()
+            ), "resume"):
+                yield await replay.record(frames)
+            yield await replay.record(format_chat_sse_done(), end=True)
         except Exception as e:
             logger.error(f"Error in resume stream: {e}", exc_info=True)
-            yield format_chat_sse(ChatSSEEventType.ERROR, ErrorPayload(error=str(e)))
-            yield format_chat_sse_done()
+            yield await replay.record(
+                format_chat_sse(ChatSSEEventType.ERROR, ErrorPayload(error=str(e))) + format_chat_sse_done(),
+                end=True,
+            )
 
     return StreamingResponse(_resume_gen(), media_type="text/event-stream")
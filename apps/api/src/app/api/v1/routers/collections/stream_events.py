@@ -5,10 +5,9 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional
 import uuid
 
-import redis.asyncio as aioredis
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +20,7 @@ from app.core.security import UserCtx
 from app.core.sse import format_sse
 from app.repositories.factory import AsyncRepositoryFactory
 from app.services.rag_event_publisher import RAGEventSubscriber
+from app.services.redis_pubsub_hub import get_pubsub_hub
 from app.services.rag_status_snapshot import build_collection_snapshot, build_document_snapshot
 
 from .stream_shared import (
@@ -48,16 +48,12 @@ _SSE_HEADERS = {
 }
 
 
-def _make_agg_subscriber(settings: Any, is_admin: bool, tenant_id: Optional[uuid.UUID]) -> tuple[Any, Any]:
-    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-    subscriber = RAGEventSubscriber(redis_client=redis_client, tenant_id=tenant_id, is_admin=is_admin)
-    return redis_client, subscriber
+def _make_agg_subscriber(is_admin: bool, tenant_id: Optional[uuid.UUID]) -> RAGEventSubscriber:
+    return RAGEventSubscriber(redis_client=None, tenant_id=tenant_id, is_admin=is_admin, hub=get_pubsub_hub())
 
 
-def _make_doc_subscriber(settings: Any, doc_id: uuid.UUID) -> tuple[Any, Any]:
-    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-    subscriber = RAGEventSubscriber.for_document(redis_client=redis_client, doc_id=doc_id)
-    return redis_client, subscriber
+def _make_doc_subscriber(doc_id: uuid.UUID) -> RAGEventSubscriber:
+    return RAGEventSubscriber.for_document(redis_client=None, doc_id=doc_id, hub=get_pubsub_hub())
 
 
 @router.get("/{collection_id}/status/events")
@@ -97,7 +93,7 @@ async def stream_collection_aggregate_status(
                 await s.close()
 
     async def event_generator() -> AsyncGenerator[str, None]:
-        redis_client, subscriber = _make_agg_subscriber(settings, is_admin, tenant_id)
+        subscriber = _make_agg_subscriber(is_admin, tenant_id)
         try:
             await subscriber.subscribe()
             logger.info(f"User {user.id} subscribed to collection {cid_str} aggregate stream")
@@ -150,10 +146,6 @@ async def stream_collection_aggregate_status(
             yield format_sse(data={"error": "Internal server error"}, event="error")
         finally:
             await subscriber.unsubscribe()
-            try:
-                await redis_client.aclose()
-            except Exception:
-                pass
 
     return StreamingResponse(event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
@@ -186,7 +178,7 @@ async def stream_document_status(
     _session_factory = get_session_factory()
 
     async def event_generator() -> AsyncGenerator[str, None]:
-        redis_client, subscriber = _make_doc_subscriber(settings, doc_id)
+        subscriber = _make_doc_subscriber(doc_id)
         try:
             await subscriber.subscribe()
             logger.info(f"User {user.id} subscribed to doc {doc_id_str} status stream")
@@ -227,10 +219,6 @@ async def stream_document_status(
             yield format_sse(data={"error": "Internal server error"}, event="error")
         finally:
             await subscriber.unsubscribe()
-            try:
-                await redis_client.aclose()
-            except Exception:
-                pass
 
     return StreamingResponse(event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
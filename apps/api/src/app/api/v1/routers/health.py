@@ -13,6 +13,7 @@ from app.core.db import (
     health_check as db_health_check,
     is_startup_ready,
 )
+from app.core.startup import get_startup_status
 from app.adapters.s3_client import get_s3_client
 from app.adapters.qdrant_client import get_qdrant_adapter
 from app.core.cache import get_cache
@@ -182,6 +183,7 @@ async def readiness_check_endpoint(session: AsyncSession = Depends(db_session)):
             "timestamp": now,
             "infra": infra,
             "startup_ready": startup_ready,
+            "startup_tasks": get_startup_status(),
             "db_pool": get_pool_stats(),
             "app_services": app_services,
         }
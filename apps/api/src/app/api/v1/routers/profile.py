@@ -320,6 +320,8 @@ async def create_user_fact(
             first_confirmed_at=now, last_confirmed_at=now,
         )
         session.add(row)
+        await session.flush()
+        await FactReconciler(session).sync_vector_index(confirmed=[row])
         await session.commit()
         await session.refresh(row)
     return UserFactResponse(id=str(row.id), scope=row.scope, subject=row.subject, value=row.value,
@@ -11,6 +11,7 @@ from app.api.deps import get_current_user, get_current_user_sse, db_session, db_
 from app.core.security import UserCtx
 from app.core.sse import format_sse
 from app.services.rag_event_publisher import RAGEventSubscriber
+from app.services.redis_pubsub_hub import get_pubsub_hub
 from app.core.logging import get_logger
 import asyncio
 
@@ -107,7 +108,8 @@ async def stream_rag_status(
         subscriber = RAGEventSubscriber(
             redis_client=redis,
             tenant_id=tenant_id,
-            is_admin=is_admin
+            is_admin=is_admin,
+            hub=get_pubsub_hub(),
         )
         
         try:
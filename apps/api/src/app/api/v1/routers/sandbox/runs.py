@@ -4,7 +4,7 @@ import json
 import uuid
 from typing import Any, AsyncGenerator, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,6 +20,7 @@ from app.core.di import get_llm_client
 from app.core.http.clients import LLMClientProtocol
 from app.core.logging import get_logger
 from app.core.security import UserCtx
+from app.core.sse import last_event_id
 from app.models.chat import Chats
 from app.models.sandbox import SandboxBranch, SandboxOverrideSnapshot
 from app.models.agent import Agent
@@ -64,8 +65,10 @@ _JOURNAL_WIRE_FIELDS = {
 }
 
 
-def _format_sse(event: str, payload: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+def _format_sse(event: str, payload: dict, *, event_id: object = None) -> str:
+    # Journal frames carry their run sequence as the SSE id for Last-Event-ID replay.
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
 
 
 def _journal_payload(*, event_id: object, run_id: object, sequence: object, event_type: object,
@@ -117,7 +120,78 @@ def _tail_sse_frame(message: dict) -> str | None:
             "status": message.get("status"),
         })
     journal = _journal_from_tail(message)
-    return _format_sse("journal", journal) if journal is not None else None
+    return _format_sse("journal", journal, event_id=journal["sequence"]) if journal is not None else None
+
+
+def _runner_sse_frame(run_id: uuid.UUID, message: dict) -> str | None:
+    if message.get("type") == "delta":
+        return _format_sse("delta", {"run_id": str(run_id), "content": str(message.get("content") or "")})
+    if message.get("type") == "final":
+        return _format_sse("final", {
+            "run_id": str(run_id),
+            "content": str(message.get("content") or ""),
+            "sources": message.get("sources") or [],
+            "attachments": message.get("attachments") or [],
+        })
+    if message.get("type") == "pause":
+        return _format_sse("pause", {
+            "run_id": str(run_id),
+            "reason": message.get("reason"),
+            "action": message.get("action"),
+            "context": message.get("context"),
+            "contract_version": message.get("contract_version"),
+        })
+    return _tail_sse_frame(message)
+
+
+async def _closing_frames(
+    run_id: uuid.UUID, stream_db: AsyncSession, emitted_event_ids: set[str], *, after_sequence: Optional[int] = None,
+) -> AsyncGenerator[str, None]:
+    """Journal rows the tail did not deliver, then the run's terminal outcome."""
+    rows = await RuntimeEventJournalService(stream_db).list_run_events(run_id, after_sequence=after_sequence)
+    for row in rows:
+        event_id = str(row.id)
+        if event_id in emitted_event_ids:
+            continue
+        emitted_event_ids.add(event_id)
+        yield _format_sse("journal", _journal_from_row(row), event_id=row.sequence)
+    current_run = await SandboxService(stream_db).get_run(run_id)
+    if current_run is not None and current_run.status == "failed":
+        yield _format_sse("error", {"run_id": str(run_id), "error": "Sandbox execution failed"})
+    elif current_run is not None and current_run.status == "cancelled":
+        yield _format_sse("final", {"run_id": str(run_id), "status": "cancelled"})
+
+
+_TERMINAL_TAIL_TYPES = {"final", "run_end"}
+
+
+async def _remaining_tail(
+    subscriber: RuntimeTailSubscriber, queue: asyncio.Queue, listener_task: Optional[asyncio.Task],
+) -> AsyncGenerator[dict, None]:
+    """Tail messages still owed to the client once the run stopped.
+
+    Pub/sub has only what already reached the local queue. A stream may
+    hold more in Redis than the bounded queue took, so it is read to its
+    end, or to the run's terminal entry, before the response closes.
+    """
+    if not subscriber.is_stream or listener_task is None:
+        while not queue.empty():
+            yield queue.get_nowait()
+        return
+    subscriber.stop_at_end()
+    while True:
+        getter = asyncio.ensure_future(queue.get())
+        done, _ = await asyncio.wait({getter, listener_task}, return_when=asyncio.FIRST_COMPLETED)
+        if getter not in done:
+            getter.cancel()
+            await asyncio.gather(getter, return_exceptions=True)
+            while not queue.empty():
+                yield queue.get_nowait()
+            return
+        message = getter.result()
+        yield message
+        if message.get("type") in _TERMINAL_TAIL_TYPES:
+            return
 
 
 async def _observe_sandbox_runner(
@@ -130,7 +204,9 @@ async def _observe_sandbox_runner(
 ) -> AsyncGenerator[str, None]:
     """Stream canonical tail/journal data without owning runtime execution."""
     subscriber = RuntimeTailSubscriber(stream_key=str(run_id))
-    queue: asyncio.Queue[dict] = asyncio.Queue()
+    # Bounded only for streams: a slow client then pauses the tail reader and
+    # the backlog waits in Redis. A paused pub/sub reader would lose events.
+    queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=subscriber.consumer_buffer)
     emitted_event_ids: set[str] = set()
     listener_task: Optional[asyncio.Task] = None
     heartbeat_seconds = get_settings().SANDBOX_SSE_HEARTBEAT_SECONDS
@@ -139,26 +215,6 @@ async def _observe_sandbox_runner(
         async for message in subscriber.listen():
             await queue.put(message)
 
-    def frame_for(message: dict) -> str | None:
-        if message.get("type") == "delta":
-            return _format_sse("delta", {"run_id": str(run_id), "content": str(message.get("content") or "")})
-        if message.get("type") == "final":
-            return _format_sse("final", {
-                "run_id": str(run_id),
-                "content": str(message.get("content") or ""),
-                "sources": message.get("sources") or [],
-                "attachments": message.get("attachments") or [],
-            })
-        if message.get("type") == "pause":
-            return _format_sse("pause", {
-                "run_id": str(run_id),
-                "reason": message.get("reason"),
-                "action": message.get("action"),
-                "context": message.get("context"),
-                "contract_version": message.get("contract_version"),
-            })
-        return _tail_sse_frame(message)
-
     try:
         await subscriber.subscribe()
         listener_task = asyncio.create_task(listen())
@@ -174,7 +230,11 @@ async def _observe_sandbox_runner(
             llm_client=llm_client,
             session_factory=session_factory,
         )
-        yield _format_sse("run_started", {"run_id": str(run_id)})
+        # The id makes a Last-Event-ID reconnect skip the earlier segment as well.
+        yield _format_sse(
+            "run_started", {"run_id": str(run_id)},
+            event_id=existing_rows[-1].sequence if existing_rows else 0,
+        )
         while not runner_task.done():
             try:
                 message = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
@@ -183,30 +243,96 @@ async def _observe_sandbox_runner(
                 continue
             if message.get("event_id"):
                 emitted_event_ids.add(str(message["event_id"]))
-            frame = frame_for(message)
+            frame = _runner_sse_frame(run_id, message)
             if frame is not None:
                 yield frame
 
-        while not queue.empty():
-            message = queue.get_nowait()
+        async for message in _remaining_tail(subscriber, queue, listener_task):
             if message.get("event_id"):
                 emitted_event_ids.add(str(message["event_id"]))
-            frame = frame_for(message)
+            frame = _runner_sse_frame(run_id, message)
             if frame is not None:
                 yield frame
 
-        rows = await RuntimeEventJournalService(stream_db).list_run_events(run_id)
+        async for frame in _closing_frames(run_id, stream_db, emitted_event_ids):
+            yield frame
+    finally:
+        if listener_task is not None:
+            listener_task.cancel()
+            await asyncio.gather(listener_task, return_exceptions=True)
+        await subscriber.unsubscribe()
+        yield _format_sse("done", {"run_id": str(run_id)})
+
+
+_ACTIVE_RUN_STATUSES = {"running", "cancelling"}
+_SETTLE_POLL_SECONDS = 0.5
+
+
+async def _follow_sandbox_run(
+    *, run_id: uuid.UUID, after_sequence: Optional[int], stream_db: AsyncSession,
+) -> AsyncGenerator[str, None]:
+    """Replay journal events after ``after_sequence``, then tail the run until it stops.
+
+    Used by reconnecting clients: the runner owns execution, so a dropped
+    connection only loses frames, and the journal has every persisted one.
+    """
+    subscriber = RuntimeTailSubscriber(stream_key=str(run_id))
+    queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=subscriber.consumer_buffer)
+    emitted_event_ids: set[str] = set()
+    listener_task: Optional[asyncio.Task] = None
+    heartbeat_seconds = get_settings().SANDBOX_SSE_HEARTBEAT_SECONDS
+
+    async def listen() -> None:
+        async for message in subscriber.listen():
+            await queue.put(message)
+
+    async def run_active() -> bool:
+        # End the read transaction so the runner's terminal commit is visible.
+        await stream_db.rollback()
+        run = await SandboxService(stream_db).get_run(run_id)
+        return run is not None and run.status in _ACTIVE_RUN_STATUSES
+
+    try:
+        await subscriber.subscribe()
+        listener_task = asyncio.create_task(listen())
+        rows = await RuntimeEventJournalService(stream_db).list_run_events(run_id, after_sequence=after_sequence)
         for row in rows:
-            event_id = str(row.id)
-            if event_id in emitted_event_ids:
+            emitted_event_ids.add(str(row.id))
+            yield _format_sse("journal", _journal_from_row(row), event_id=row.sequence)
+
+        active = await run_active()
+        settling = False
+        while active:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=_SETTLE_POLL_SECONDS if settling else heartbeat_seconds,
+                )
+            except asyncio.TimeoutError:
+                active = await run_active()
+                if active and not settling:
+                    yield ": ping\n\n"
                 continue
-            emitted_event_ids.add(event_id)
-            yield _format_sse("journal", _journal_from_row(row))
-        current_run = await SandboxService(stream_db).get_run(run_id)
-        if current_run is not None and current_run.status == "failed":
-            yield _format_sse("error", {"run_id": str(run_id), "error": "Sandbox execution failed"})
-        elif current_run is not None and current_run.status == "cancelled":
-            yield _format_sse("final", {"run_id": str(run_id), "status": "cancelled"})
+            event_id = message.get("event_id")
+            if event_id:
+                if str(event_id) in emitted_event_ids:
+                    continue
+                emitted_event_ids.add(str(event_id))
+            frame = _runner_sse_frame(run_id, message)
+            if frame is not None:
+                yield frame
+            # The runner persists the terminal status right after these.
+            settling = settling or message.get("type") in {"final", "pause", "run_end"}
+
+        async for message in _remaining_tail(subscriber, queue, listener_task):
+            if message.get("event_id"):
+                if str(message["event_id"]) in emitted_event_ids:
+                    continue
+                emitted_event_ids.add(str(message["event_id"]))
+            frame = _runner_sse_frame(run_id, message)
+            if frame is not None:
+                yield frame
+        async for frame in _closing_frames(run_id, stream_db, emitted_event_ids, after_sequence=after_sequence):
+            yield frame
     finally:
         if listener_task is not None:
             listener_task.cancel()
@@ -316,6 +442,43 @@ async def get_run_detail(
     )
 
 
+def _after_sequence(request: Request) -> Optional[int]:
+    """Journal sequence a reconnecting client saw last (its ``Last-Event-ID``)."""
+    cursor = last_event_id(request)
+    return int(cursor) if cursor and cursor.isdigit() else None
+
+
+@router.get("/sessions/{session_id}/runs/{run_id}/events")
+async def stream_run_events(
+    session_id: uuid.UUID,
+    run_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(db_session),
+    user: UserCtx = Depends(require_admin),
+):
+    """Re-attach to a run's SSE stream, replaying journal events after Last-Event-ID."""
+    svc = SandboxService(db)
+    await check_session_owner(svc, session_id, user)
+    run = await svc.get_run(run_id)
+    if not run or run.session_id != session_id:
+        raise HTTPException(status_code=404, detail="Run not found")
+    after_sequence = _after_sequence(request)
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        async with get_session_factory()() as stream_db:
+            async for frame in _follow_sandbox_run(run_id=run_id, after_sequence=after_sequence, stream_db=stream_db):
+                yield frame
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.post("/sessions/{session_id}/run")
 async def run_sandbox(
     session_id: uuid.UUID,
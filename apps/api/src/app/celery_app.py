@@ -20,6 +20,8 @@ app = Celery(
         "app.workers.tasks_collection_vectorize",
         # Collection export tasks
         "app.workers.tasks_collection_export",
+        # Collection index builds
+        "app.workers.tasks_collection_indexes",
         # Template analysis tasks
         "app.workers.tasks_template_analysis",
         # RAG model/status reconcile tasks
@@ -28,6 +30,8 @@ app = Celery(
         "app.workers.tasks_rag_reindex",
         # Vector index consistency audit tasks
         "app.workers.tasks_vector_index_audit",
+        # Collection aggregate rollup maintenance
+        "app.workers.tasks_collection_rollups",
         # Health monitoring tasks (new)
         "app.workers.tasks_health",
         # Cleanup tasks for retention policies
@@ -85,6 +89,10 @@ def build_default_beat_schedule() -> dict:
             "task": "app.workers.tasks_vector_index_audit.audit_collection_vector_indexes",
             "schedule": 3600.0,  # 1 hour
         },
+        "collection-rollups-refresh": {
+            "task": "app.workers.tasks_collection_rollups.refresh_collection_rollups",
+            "schedule": 300.0,  # 5 minutes
+        },
         # LDAP sync (daily at 03:30 UTC by default, configurable via AUTH_LDAP_SYNC_CRON)
         "ldap-users-sync": {
             "task": "app.workers.tasks_ldap_sync.sync_ldap_users",
@@ -170,6 +178,7 @@ app.conf.task_routes = {
     "app.workers.tasks_collection_vectorize.vectorize_collection_rows": {"queue": "ingest.embed", "priority": 4},
     "app.workers.tasks_collection_vectorize.reconcile_collection_vectorization": {"queue": "maintenance.default", "priority": 1},
     "app.workers.tasks_collection_export.export_collection_csv": {"queue": "analyze_medium", "priority": 5},
+    "app.workers.tasks_collection_indexes.build_collection_index": {"queue": "maintenance.default", "priority": 2},
     "app.workers.tasks_template_analysis.generate_template_description": {"queue": "analyze_medium", "priority": 5},
     "app.workers.tasks_template_analysis.generate_template_schema": {"queue": "analyze_medium", "priority": 5},
     "app.workers.tasks_rag_model_reconcile.reconcile_rag_statuses_for_embedding_model": {
@@ -191,11 +200,13 @@ app.conf.task_routes = {
     
     # Memory writeback tasks
     "app.workers.tasks_memory.finalize_memory": {"queue": "memory", "priority": 1},
+    "app.workers.tasks_memory.backfill_fact_vector_index": {"queue": "memory", "priority": 0},
     "app.workers.tasks_cleanup.cleanup_deprecated_entities": {"queue": "cleanup_low", "priority": 1},
 
     # Reindex tasks
     "app.workers.tasks_rag_reindex.reconcile_stale_rag_reindex": {"queue": "maintenance.default", "priority": 1},
     "app.workers.tasks_vector_index_audit.audit_collection_vector_indexes": {"queue": "maintenance.default", "priority": 1},
+    "app.workers.tasks_collection_rollups.refresh_collection_rollups": {"queue": "maintenance.default", "priority": 1},
 }
 
 app.conf.update(
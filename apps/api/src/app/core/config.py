@@ -15,6 +15,45 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
+    REDIS_PUBSUB_QUEUE_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Per-subscriber message buffer of the process-wide pub/sub hub; oldest messages are dropped beyond it",
+    )
+    RUNTIME_TAIL_TRANSPORT: str = Field(
+        default="pubsub",
+        description="Runtime tail delivery: 'pubsub' (fire-and-forget) or 'streams' (per-run Redis stream with replay)",
+    )
+    RUNTIME_TAIL_STREAM_MAXLEN: int = Field(
+        default=2000,
+        ge=1,
+        description="Approximate number of tail events kept per run stream",
+    )
+    RUNTIME_TAIL_STREAM_TTL_SECONDS: int = Field(
+        default=3600,
+        ge=1,
+        description="A run's tail stream expires this long after its last event",
+    )
+    RUNTIME_TAIL_STREAM_BLOCK_MS: int = Field(
+        default=5000,
+        ge=1,
+        description="Longest XREAD BLOCK wait of a tail stream subscriber",
+    )
+    RUNTIME_TAIL_STREAM_READ_COUNT: int = Field(
+        default=100,
+        ge=1,
+        description="Tail stream entries fetched per XREAD",
+    )
+    RUNTIME_TAIL_STREAM_MAX_CONNECTIONS: int = Field(
+        default=64,
+        ge=1,
+        description="Size of the per-process Redis pool reserved for tail stream XREAD BLOCK; readers beyond it wait for a connection",
+    )
+    RUNTIME_TAIL_CONSUMER_BUFFER: int = Field(
+        default=256,
+        ge=1,
+        description="Tail events a local consumer buffers under the streams transport before it stops reading (Redis keeps the rest); pub/sub consumers are unbounded",
+    )
 
     # JWT - Asymmetric (RSA) for production, symmetric (HS256) for dev
     JWT_SECRET: str = Field(default="change-me-in-production", description="Symmetric secret for HS256 (dev only)")
@@ -27,6 +66,11 @@ class Settings(BaseSettings):
     JWT_REFRESH_TTL_DAYS: int = Field(default=30)
     JWT_JWKS_JSON: str | None = Field(default=None, description="Optional JWKS JSON string for key discovery")
     JWT_KID: str | None = Field(default=None, description="Key ID for key rotation")
+    JWT_VERIFIED_CACHE_SIZE: int = Field(
+        default=4096,
+        ge=0,
+        description="Verified JWT claims kept in-process until token expiry (0 disables)",
+    )
 
     # Authentication
     PAT_ENABLED: bool = Field(default=True)
@@ -95,12 +139,75 @@ class Settings(BaseSettings):
         description="Maximum wall time for resolving one agent's runtime capabilities",
     )
     SANDBOX_SSE_HEARTBEAT_SECONDS: int = Field(default=15, ge=1)
+    CHAT_SSE_COALESCE_MAX_BYTES: int = Field(
+        default=512,
+        ge=0,
+        description="Merge streamed answer deltas into SSE frames of up to this many bytes (0 = one frame per chunk)",
+    )
+    CHAT_SSE_COALESCE_MAX_DELAY_MS: int = Field(
+        default=40,
+        ge=1,
+        description="Longest time a merged delta is held back before it is flushed",
+    )
+    CHAT_SSE_COALESCE_SENTENCE_FLUSH: bool = Field(
+        default=True,
+        description="Flush a merged delta as soon as a chunk ends a sentence or line",
+    )
+    CHAT_SSE_GZIP_ENABLED: bool = Field(
+        default=False,
+        description="Gzip chat SSE streams for clients that accept it (flushed per frame batch)",
+    )
+    CHAT_SSE_REPLAY_MAXLEN: int = Field(
+        default=2000,
+        ge=0,
+        description="SSE chunks kept per chat for Last-Event-ID reconnects (0 = no replay buffer)",
+    )
+    CHAT_SSE_REPLAY_TTL_SECONDS: int = Field(
+        default=900,
+        ge=1,
+        description="How long a chat's replay buffer outlives its last chunk",
+    )
+    CHAT_SSE_REPLAY_IDLE_SECONDS: int = Field(
+        default=120,
+        ge=1,
+        description="A reconnected chat stream gives up after this long without new chunks",
+    )
     DB_SLOW_QUERY_LOG_ENABLED: bool = Field(default=True)
     DB_SLOW_QUERY_THRESHOLD_MS: int = Field(default=500)
     DB_SLOW_QUERY_TEXT_MAX_LEN: int = Field(default=1200)
     GLOBAL_RATE_LIMIT_ENABLED: bool = Field(default=True)
     GLOBAL_RATE_LIMIT_RPM: int = Field(default=240)
     GLOBAL_RATE_LIMIT_RPH: int = Field(default=2400)
+    GLOBAL_RATE_LIMIT_ROUTE_CLASSES: str = Field(
+        default="",
+        description="Per-route limits as 'path_prefix=rpm/rph,...' (per client IP, longest prefix wins)",
+    )
+    GLOBAL_RATE_LIMIT_TENANT_CLASSES: str = Field(
+        default="",
+        description="Per-tenant limits as 'tenant_uuid=rpm/rph,...' (one budget per tenant from verified JWT/API-key claims, charged on top of the per-IP default)",
+    )
+    GLOBAL_RATE_LIMIT_LOCAL_BATCH: int = Field(
+        default=1,
+        ge=1,
+        description="Requests leased from Redis per round trip and spent locally (1 = check every request)",
+    )
+
+    # Startup
+    STARTUP_TASK_TIMEOUT_SECONDS: float = Field(
+        default=180.0,
+        gt=0,
+        description="Wall time allowed for each startup task",
+    )
+    STARTUP_LEADER_LOCK_TTL_SECONDS: int = Field(
+        default=600,
+        ge=1,
+        description="Lifetime of the Redis lock held by the replica running cluster-wide startup sync",
+    )
+    STARTUP_CLUSTER_SYNC_TTL_SECONDS: int = Field(
+        default=3600,
+        ge=0,
+        description="Replicas of the same build skip cluster-wide startup sync this long after one completed it (0 = always run)",
+    )
 
     # Circuit Breaker
     CB_LLM_FAILURES_THRESHOLD: int = Field(default=5)
@@ -119,10 +226,35 @@ class Settings(BaseSettings):
     S3_BUCKET_RAG: str = Field(default="rag")
     S3_BUCKET_ARTIFACTS: str = Field(default="artifacts")
     S3_BUCKET_CHAT_UPLOADS: str = Field(default="chat-uploads")
+    S3_MULTIPART_PART_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        description="Part size for streamed multipart uploads (S3 minimum is 5 MiB)",
+    )
+    GENERATED_FILE_STREAM_MAX_BYTES: int = Field(
+        default=512 * 1024 * 1024,
+        description="Upper bound for generated files streamed to S3 (tabular exports)",
+    )
     SAVE_EMB_TO_S3: bool = Field(default=False)
     UPLOAD_MAX_BYTES: int = Field(default=100 * 1024 * 1024)
     UPLOAD_ALLOWED_MIME: str = Field(default="application/pdf,image/png,image/jpeg,application/octet-stream")
 
+    # Document extraction worker pool (heavy formats are parsed out of process)
+    EXTRACTION_POOL_ENABLED: bool = Field(default=True, description="Parse PDF/DOC/DOCX/XLSX in a process pool")
+    EXTRACTION_POOL_MAX_WORKERS: int = Field(default=0, ge=0, description="Pool size; 0 means one per CPU core")
+    EXTRACTION_POOL_MIN_BYTES: int = Field(
+        default=256 * 1024,
+        ge=0,
+        description="Smaller payloads are parsed in a thread; process hand-off is not worth it",
+    )
+    EXTRACTION_JOB_TIMEOUT_SECONDS: float = Field(default=300.0, gt=0)
+    EXTRACTION_JOB_MEMORY_LIMIT_MB: int = Field(
+        default=2048,
+        ge=0,
+        description="Address-space limit per extraction worker process; 0 disables the limit",
+    )
+    EXTRACTION_PDF_PAGES_PER_JOB: int = Field(default=16, ge=1)
+
     # Qdrant
     QDRANT_URL: str = Field(default="http://localhost:6333")
 
@@ -179,6 +311,26 @@ class Settings(BaseSettings):
         default=300,
         description="TTL for cached MCP session IDs in seconds",
     )
+    MCP_POOL_MAX_CONNECTIONS: int = Field(
+        default=20,
+        description="Max concurrent HTTP connections per MCP provider URL (process-wide pool)",
+    )
+    MCP_POOL_MAX_KEEPALIVE: int = Field(
+        default=10,
+        description="Max idle keep-alive connections kept per MCP provider URL",
+    )
+    MCP_POOL_KEEPALIVE_EXPIRY_S: float = Field(
+        default=60.0,
+        description="Idle keep-alive connection expiry for MCP providers in seconds",
+    )
+    TOOL_DISCOVERY_MAX_CONCURRENCY: int = Field(
+        default=8,
+        description="Max MCP providers fetched in parallel during a discovery rescan",
+    )
+    TOOL_DISCOVERY_PROVIDER_TIMEOUT_S: float = Field(
+        default=45.0,
+        description="Wall-clock limit for fetching one MCP provider's tools list during discovery",
+    )
     MCP_CREDENTIAL_TOKEN_TTL_SECONDS: int = Field(
         default=90,
         description="TTL for MCP credential access tokens in seconds",
@@ -212,6 +364,41 @@ class Settings(BaseSettings):
         default=24,
         description="How old discovered collection schema can be before runtime marks it stale",
     )
+    COLLECTION_ROLLUPS_ENABLED: bool = Field(
+        default=True,
+        description="Maintain rollup tables for collections that declare rollup dimensions/measures",
+    )
+    COLLECTION_ROLLUP_REBUILD_HOURS: float = Field(
+        default=24.0,
+        description="How often the background task rebuilds an existing collection rollup from scratch",
+    )
+    COLLECTION_INDEX_ADVISOR_ENABLED: bool = Field(
+        default=True,
+        description="Record collection query shapes for the admin index advisor",
+    )
+    RUNTIME_FACT_VECTOR_INDEX_ENABLED: bool = Field(
+        default=False,
+        description="Embed runtime memory facts on write into Qdrant and use them for hybrid fact retrieval",
+    )
+    RUNTIME_FACT_EMBEDDING_MODEL: str = Field(
+        default="",
+        description="Embedding model alias for runtime facts; empty uses the tenant's primary embedding model",
+    )
+    RUNTIME_FACT_VECTOR_CANDIDATES: int = Field(
+        default=40,
+        ge=0,
+        description="Nearest facts per owner added to the recency and lexical candidate pool",
+    )
+    RUNTIME_MEMORY_FAST_PATH_MAX_FACTS: int = Field(
+        default=8,
+        ge=0,
+        description="Memory preparation skips the LLM when at most this many facts are available and terminology matches are unambiguous (0 = always call the LLM)",
+    )
+    RUNTIME_MEMORY_PREPARATION_CACHE_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        description="In-process LRU of LLM memory preparations keyed by request and candidate-set hash (0 disables)",
+    )
     
     model_config = ConfigDict(
         env_file=".env",
@@ -236,6 +423,14 @@ class Settings(BaseSettings):
             raise ValueError("S3_SECRET_KEY must be set in non-local environments")
         return v
 
+    @field_validator("RUNTIME_TAIL_TRANSPORT")
+    @classmethod
+    def validate_runtime_tail_transport(cls, v: str) -> str:
+        transport = str(v or "").strip().lower()
+        if transport not in {"pubsub", "streams"}:
+            raise ValueError("RUNTIME_TAIL_TRANSPORT must be 'pubsub' or 'streams'")
+        return transport
+
     @field_validator("CONFIRMATION_SECRET")
     @classmethod
     def validate_confirmation_secret(cls, v: str | None, info: ValidationInfo) -> str | None:
@@ -0,0 +1,215 @@
+"""
+Versioned in-process cache for hot configuration lookups.
+
+Config rows (platform settings, orchestration settings, model aliases) are
+read on almost every request but change only through admin writes.  Each
+process keeps them in memory; a Redis generation counter per namespace tells
+every replica — API pods and Celery workers alike — when to drop its copy.
+
+Guarantees:
+- reads are served from memory; Redis is consulted at most once per
+  ``generation_check_s`` per namespace, never per lookup;
+- ``invalidate()`` bumps the generation, so other replicas reload within
+  ``generation_check_s``;
+- ``invalidate_on_commit(session)`` defers that bump until the writer's
+  transaction commits, so no peer can reload the old row under the new
+  generation and keep it for ``ttl_s``;
+- entries also expire after ``ttl_s`` as a safety net for lost bumps or an
+  unavailable Redis;
+- concurrent misses for the same key share one loader call (no stampede).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+GENERATION_KEY_PREFIX = "config_cache:gen:"
+
+_PENDING_INFO_KEY = "config_cache_pending_invalidations"
+# Generation bumps scheduled from commit hooks; kept referenced until done.
+_background: Set[asyncio.Task] = set()
+
+
+def _default_redis() -> Any:
+    from app.core.redis import get_redis
+
+    return get_redis()
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    generation: Optional[int]
+    expires_at: float
+
+
+class VersionedConfigCache(Generic[T]):
+    """Process-local cache invalidated cluster-wide via a Redis generation."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_s: float = 60.0,
+        generation_check_s: float = 2.0,
+        redis_factory: Callable[[], Any] = _default_redis,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_s = float(ttl_s)
+        self.generation_check_s = float(generation_check_s)
+        self._redis_factory = redis_factory
+        self._entries: Dict[str, _Entry[T]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generation: Optional[int] = None
+        self._generation_checked_at: float = 0.0
+        # Bumped on every local invalidation so a loader that started before
+        # it cannot store its (possibly stale) result afterwards.
+        self._epoch = 0
+
+    @property
+    def generation_key(self) -> str:
+        return f"{GENERATION_KEY_PREFIX}{self.namespace}"
+
+    @property
+    def generation(self) -> Optional[int]:
+        """Last generation seen in Redis; ``None`` until Redis has answered."""
+        return self._generation
+
+    def peek(self, key: str = "") -> Optional[T]:
+        """Return a cached value without loading or checking freshness."""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        await self._sync_generation()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            return entry.value
+
+        pending = self._inflight.get(key)
+        if pending is not None and not pending.done():
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        version = (self._generation, self._epoch)
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if not future.cancelled():
+                future.set_exception(exc)
+                # Waiters re-raise; mark retrieved so the loop does not warn.
+                future.exception()
+            raise
+        else:
+            # Do not store a value loaded under a generation that was bumped
+            # while the loader ran; waiters still get it for this request.
+            if version == (self._generation, self._epoch):
+                self._entries[key] = _Entry(
+                    value=value,
+                    generation=self._generation,
+                    expires_at=time.monotonic() + self.ttl_s,
+                )
+            if not future.done():
+                future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                self._inflight.pop(key, None)
+
+    def invalidate_local(self, key: Optional[str] = None) -> None:
+        self._epoch += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop the entry locally and signal every other replica."""
+        self.invalidate_local(key)
+        try:
+            generation = await self._redis_factory().incr(self.generation_key)
+        except Exception as exc:
+            logger.warning(
+                "Config cache %s: failed to publish invalidation, peers rely on TTL: %r",
+                self.namespace,
+                exc,
+            )
+            return
+        self._generation = int(generation)
+        self._generation_checked_at = time.monotonic()
+
+    async def invalidate_on_commit(self, session: Any, key: Optional[str] = None) -> None:
+        """Invalidate once ``session``'s current transaction commits.
+
+        Nothing happens on rollback. Objects that are not SQLAlchemy sessions
+        (tests, ad-hoc callers) get an immediate ``invalidate()``.
+        """
+        sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+        if not isinstance(sync_session, Session):
+            await self.invalidate(key)
+            return
+        pending = sync_session.info.get(_PENDING_INFO_KEY)
+        if pending is None:
+            pending = sync_session.info[_PENDING_INFO_KEY] = []
+            event.listen(sync_session, "after_commit", _run_pending_invalidations)
+            event.listen(sync_session, "after_rollback", _drop_pending_invalidations)
+        if (self, key) not in pending:
+            pending.append((self, key))
+
+    async def _sync_generation(self) -> None:
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.generation_check_s:
+            return
+        self._generation_checked_at = now
+        try:
+            raw = await self._redis_factory().get(self.generation_key)
+        except Exception as exc:
+            logger.debug("Config cache %s: generation check failed: %r", self.namespace, exc)
+            return
+        generation = int(raw or 0)
+        if generation != self._generation:
+            if self._generation is not None:
+                logger.debug(
+                    "Config cache %s: generation %s -> %s, dropping %d entries",
+                    self.namespace,
+                    self._generation,
+                    generation,
+                    len(self._entries),
+                )
+            self._entries.clear()
+            self._generation = generation
+
+
+def _run_pending_invalidations(session: Session) -> None:
+    pending: List[Tuple[VersionedConfigCache, Optional[str]]] = session.info.get(_PENDING_INFO_KEY) or []
+    session.info[_PENDING_INFO_KEY] = []
+    if not pending:
+        return
+    for cache, key in pending:
+        cache.invalidate_local(key)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("Config cache: commit outside an event loop, peers rely on TTL")
+        return
+    for cache, key in pending:
+        task = loop.create_task(cache.invalidate(key))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+
+def _drop_pending_invalidations(session: Session) -> None:
+    session.info[_PENDING_INFO_KEY] = []
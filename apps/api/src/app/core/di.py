@@ -36,3 +36,19 @@ async def cleanup_clients() -> None:
     if _llm_client is not None:
         await _llm_client.aclose()
         _llm_client = None
+
+    from app.services.mcp_client_manager import get_mcp_client_manager
+
+    await get_mcp_client_manager().aclose()
+
+    from app.services.redis_pubsub_hub import get_pubsub_hub
+
+    await get_pubsub_hub().aclose()
+
+    from app.services.runtime_tail_event_bus import close_stream_reader
+
+    await close_stream_reader()
+
+    from app.services.extraction_pool import shutdown_extraction_pool
+
+    shutdown_extraction_pool()
@@ -3,18 +3,20 @@ from __future__ import annotations
 import asyncio
 import os
 import re
-import time
 import uuid
 from typing import Optional
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_logger
-from app.core.security import decode_jwt
+from app.core.security import decode_jwt_for_request
 from app.core.config import get_settings
+from app.core.rate_limit import GlobalRateLimiter
 from app.core.redis import get_redis
 
 _REQUEST_ID_CTX_KEY = "request_id"
@@ -27,28 +29,36 @@ def get_request_id(request: Optional[Request] = None) -> str | None:
     return None
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
-        request.state.tenant_id = request.headers.get("X-Tenant-Id")
-        try:
-            response = await call_next(request)
-        except RuntimeError as exc:
-            # Starlette may raise this on client disconnect while streaming/request body upload.
-            if "No response returned." in str(exc):
-                logger.info(
-                    "Client disconnected before response was returned: %s %s",
-                    request.method,
-                    request.url.path,
-                )
-                return Response(status_code=204)
-            raise
-        response.headers["X-Request-Id"] = request.state.request_id
-        return response
+class RequestContextMiddleware:
+    """Assign ``request.state.request_id`` and echo it as ``X-Request-Id``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        request_id = headers.get("X-Request-Id") or str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["tenant_id"] = headers.get("X-Tenant-Id")
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-Id"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
 
+class TimeoutMiddleware:
+    """Cancel non-streaming requests that exceed configured timeout.
 
-class TimeoutMiddleware(BaseHTTPMiddleware):
-    """Cancel non-streaming requests that exceed configured timeout."""
+    The deadline covers the time until the response starts; once headers
+    are sent the body is never cut off.
+    """
 
     _STREAM_PATHS = ("/stream", "/sse", "/events")
     _SANDBOX_STREAM_PATHS = (
@@ -56,8 +66,8 @@ class TimeoutMiddleware(BaseHTTPMiddleware):
         re.compile(r"^/api/v1/sandbox/sessions/[^/]+/runs/[^/]+/resume$"),
     )
 
-    def __init__(self, app, timeout_seconds: float | None = None) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, timeout_seconds: float | None = None) -> None:
+        self.app = app
         self.timeout_seconds = timeout_seconds or float(
             os.getenv("HTTP_REQUEST_TIMEOUT_SECONDS", "120")
         )
@@ -68,26 +78,40 @@ class TimeoutMiddleware(BaseHTTPMiddleware):
             or any(pattern.fullmatch(path) for pattern in self._SANDBOX_STREAM_PATHS)
         )
 
-    async def dispatch(self, request: Request, call_next):
-        if self._is_streaming(request.url.path):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_streaming(scope["path"]):
+            await self.app(scope, receive, send)
+            return
         try:
-            return await asyncio.wait_for(call_next(request), timeout=self.timeout_seconds)
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(self.timeout_seconds) as deadline:
+
+                async def send_disarming_deadline(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        deadline.reschedule(None)
+                    await send(message)
+
+                await self.app(scope, receive, send_disarming_deadline)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
             logger.warning(
                 "Request timeout after %.0fs: %s %s",
                 self.timeout_seconds,
-                request.method,
-                request.url.path,
+                scope["method"],
+                scope["path"],
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_504_GATEWAY_TIMEOUT,
                 content={"detail": f"Request timed out after {self.timeout_seconds:.0f}s"},
             )
+            await response(scope, receive, send)
+
 
+class StartupReadinessMiddleware:
+    """Reject non-health requests until startup tasks are complete.
 
-class StartupReadinessMiddleware(BaseHTTPMiddleware):
-    """Reject non-health requests until startup tasks are complete."""
+    The 503 body lists each startup task's state (``core.startup``).
+    """
 
     _ALLOW_PATH_PREFIXES = (
         "/healthz",
@@ -102,22 +126,28 @@ class StartupReadinessMiddleware(BaseHTTPMiddleware):
         "/metrics",
     )
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path or ""
-        if any(path.startswith(prefix) for prefix in self._ALLOW_PATH_PREFIXES):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self._ALLOW_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
         from app.core.db import is_startup_ready
+        from app.core.startup import get_startup_status
 
         if not is_startup_ready():
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={"detail": "Service is starting up, retry shortly"},
+                content={"detail": "Service is starting up, retry shortly", "startup_tasks": get_startup_status()},
             )
-        return await call_next(request)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
 
-class GlobalRateLimitMiddleware(BaseHTTPMiddleware):
-    """Global fallback rate limiter for API requests."""
+class GlobalRateLimitMiddleware:
+    """Global fallback rate limiter for API requests (see ``app.core.rate_limit``)."""
 
     _EXCLUDE_PREFIXES = (
         "/healthz",
@@ -132,58 +162,66 @@ class GlobalRateLimitMiddleware(BaseHTTPMiddleware):
         "/metrics",
     )
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, limiter: GlobalRateLimiter | None = None) -> None:
+        self.app = app
         settings = get_settings()
         self.enabled = bool(getattr(settings, "GLOBAL_RATE_LIMIT_ENABLED", True))
-        self.rpm = int(max(getattr(settings, "GLOBAL_RATE_LIMIT_RPM", 240), 1))
-        self.rph = int(max(getattr(settings, "GLOBAL_RATE_LIMIT_RPH", 2400), 1))
+        self.limiter = limiter or GlobalRateLimiter.from_settings(redis_factory=lambda: get_redis())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.enabled
+            or scope["path"].startswith(self._EXCLUDE_PREFIXES)
+            or scope["method"] == "OPTIONS"
+        ):
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        retry_after = await self.limiter.hit(
+            path=scope["path"],
+            client_ip=client[0] if client else "unknown",
+            tenant_id=self._verified_tenant_id(scope) if self.limiter.tenant_classes else None,
+        )
+        if retry_after is not None:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": f"Rate limit exceeded. Retry after {retry_after} seconds."},
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path or ""
-        if not self.enabled or any(path.startswith(prefix) for prefix in self._EXCLUDE_PREFIXES):
-            return await call_next(request)
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        now = int(time.time())
-        ip = request.client.host if request.client else "unknown"
-        minute_key = f"ratelimit:global:ip:{ip}:minute:{now // 60}"
-        hour_key = f"ratelimit:global:ip:{ip}:hour:{now // 3600}"
-        try:
-            redis = get_redis()
-            minute_count = await redis.incr(minute_key)
-            if minute_count == 1:
-                await redis.expire(minute_key, 60)
-            if minute_count > self.rpm:
-                retry_after = 60 - (now % 60)
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": f"Rate limit exceeded. Retry after {retry_after} seconds."},
-                    headers={"Retry-After": str(retry_after)},
-                )
+    @staticmethod
+    def _verified_tenant_id(scope: Scope) -> Optional[str]:
+        """Tenant from verified JWT or API-key claims; ``X-Tenant-Id`` only picks among them."""
+        connection = HTTPConnection(scope)
+        state = scope.setdefault("state", {})
+        auth_header = connection.headers.get("Authorization") or ""
+        token = auth_header.split(" ", 1)[1] if auth_header.startswith("Bearer ") else connection.cookies.get("access_token")
+        tenant_ids: list[str] = []
+        if token:
+            try:
+                tenant_ids = [str(item) for item in decode_jwt_for_request(state, token).get("tenant_ids") or []]
+            except Exception as exc:
+                logger.debug("Rate limit tenant claims unavailable: %r", exc)
+        else:
+            from app.services.api_key_service import APIKeyService
 
-            hour_count = await redis.incr(hour_key)
-            if hour_count == 1:
-                await redis.expire(hour_key, 3600)
-            if hour_count > self.rph:
-                retry_after = 3600 - (now % 3600)
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": f"Rate limit exceeded. Retry after {retry_after} seconds."},
-                    headers={"Retry-After": str(retry_after)},
-                )
-        except Exception:
-            # Fail-open fallback for platform availability.
-            pass
-        return await call_next(request)
+            api_key_tenant = APIKeyService.cached_tenant_id(connection.headers.get("X-API-Key"))
+            tenant_ids = [api_key_tenant] if api_key_tenant else []
+        if not tenant_ids:
+            return None
+        requested = (connection.headers.get("X-Tenant-Id") or "").strip()
+        return requested if requested in tenant_ids else tenant_ids[0]
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """Middleware to resolve tenant from header or JWT for protected API paths."""
 
-    def __init__(self, app, exclude_paths: list[str] | None = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, exclude_paths: list[str] | None = None) -> None:
+        self.app = app
         self.exclude_paths = exclude_paths or [
             "/docs",
             "/redoc",
@@ -195,19 +233,22 @@ class TenantMiddleware(BaseHTTPMiddleware):
             "/metrics",
         ]
 
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
 
-        tenant_id = request.headers.get("X-Tenant-Id")
+        connection = HTTPConnection(scope)
+        state = scope.setdefault("state", {})
+        tenant_id = connection.headers.get("X-Tenant-Id")
         if tenant_id:
             tenant_id = tenant_id.strip()
 
         if not tenant_id:
-            auth_header = request.headers.get("Authorization")
+            auth_header = connection.headers.get("Authorization")
             if auth_header and auth_header.startswith("Bearer "):
                 try:
-                    payload = decode_jwt(auth_header.split(" ", 1)[1])
+                    payload = decode_jwt_for_request(state, auth_header.split(" ", 1)[1])
                     tenant_ids = payload.get("tenant_ids", []) or []
                     if tenant_ids:
                         tenant_id = str(tenant_ids[0])
@@ -215,10 +256,10 @@ class TenantMiddleware(BaseHTTPMiddleware):
                     logger.warning("Failed to extract tenant from JWT: %s", exc)
             else:
                 # Cookie-based auth path (SSE/web apps) — align with get_current_user().
-                access_cookie = request.cookies.get("access_token")
+                access_cookie = connection.cookies.get("access_token")
                 if access_cookie:
                     try:
-                        payload = decode_jwt(access_cookie)
+                        payload = decode_jwt_for_request(state, access_cookie)
                         tenant_ids = payload.get("tenant_ids", []) or []
                         if tenant_ids:
                             tenant_id = str(tenant_ids[0])
@@ -227,25 +268,26 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
         if tenant_id:
             try:
-                import uuid as _uuid
-
-                _uuid.UUID(str(tenant_id))
+                uuid.UUID(str(tenant_id))
             except ValueError:
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     content={"detail": "Invalid tenant ID format"},
                 )
+                await response(scope, receive, send)
+                return
 
-        request.state.tenant_id = tenant_id
+        state["tenant_id"] = tenant_id
 
-        if not tenant_id and self._is_protected_endpoint(request.url.path):
-            return JSONResponse(
+        if not tenant_id and self._is_protected_endpoint(scope["path"]):
+            response = JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": "Tenant ID required"},
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
     @staticmethod
     def _is_protected_endpoint(path: str) -> bool:
@@ -257,6 +299,26 @@ class TenantMiddleware(BaseHTTPMiddleware):
         return any(path.startswith(prefix) for prefix in protected_prefixes)
 
 
+class ApiMiddlewarePipeline:
+    """The API's request middleware, composed once as plain ASGI callables.
+
+    Outermost first: request context, startup readiness, global rate limit,
+    tenant resolution, timeout. Each layer is a direct ``await`` of the next
+    one; nothing wraps the response stream in extra tasks or memory
+    streams, so SSE chunks pass straight through to the server.
+    """
+
+    def __init__(self, app: ASGIApp, *, timeout_seconds: float | None = None) -> None:
+        inner: ASGIApp = TimeoutMiddleware(app, timeout_seconds=timeout_seconds)
+        inner = TenantMiddleware(inner)
+        inner = GlobalRateLimitMiddleware(inner)
+        inner = StartupReadinessMiddleware(inner)
+        self.app = RequestContextMiddleware(inner)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+
+
 class TracingMiddleware(BaseHTTPMiddleware):
     """Middleware for adding trace IDs to requests."""
 
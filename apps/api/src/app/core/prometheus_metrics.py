@@ -219,6 +219,30 @@ db_pool_overflow = Gauge(
     registry=_registry,
 )
 
+# MCP client pool (process-wide; cumulative counters are exported as gauges
+# because they are sampled from the manager snapshot at scrape time)
+mcp_client_pool_stat = Gauge(
+    "mcp_client_pool_stat",
+    "MCP client manager pool statistics",
+    ["stat"],
+    registry=_registry,
+)
+
+# Process-wide Redis pub/sub hub (sampled from RedisPubSubHub.metrics())
+redis_pubsub_hub_stat = Gauge(
+    "redis_pubsub_hub_stat",
+    "Redis pub/sub hub statistics",
+    ["stat"],
+    registry=_registry,
+)
+
+redis_pubsub_fanout_lag_seconds = Histogram(
+    "redis_pubsub_fanout_lag_seconds",
+    "Time between the pub/sub hub receiving a message and a subscriber consuming it",
+    registry=_registry,
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
 
 def record_task_duration(step: str, duration: float, tenant_id: Optional[str] = None):
     """Record task duration"""
@@ -298,6 +322,28 @@ def record_db_pool_stats(stats: dict) -> None:
         db_pool_overflow.set(float(stats["overflow"]))
 
 
+def record_mcp_pool_stats(stats: dict) -> None:
+    """Update MCP pool gauges from MCPClientManager.metrics() output."""
+    if not isinstance(stats, dict):
+        return
+    for stat, value in stats.items():
+        if isinstance(value, (int, float)):
+            mcp_client_pool_stat.labels(stat=stat).set(float(value))
+
+
+def record_pubsub_hub_stats(stats: dict) -> None:
+    """Update pub/sub hub gauges from RedisPubSubHub.metrics() output."""
+    if not isinstance(stats, dict):
+        return
+    for stat, value in stats.items():
+        if isinstance(value, (int, float)):
+            redis_pubsub_hub_stat.labels(stat=stat).set(float(value))
+
+
+def record_pubsub_fanout_lag(lag_seconds: float) -> None:
+    redis_pubsub_fanout_lag_seconds.observe(lag_seconds)
+
+
 def get_metrics_text() -> str:
     """Get Prometheus metrics as text"""
     return generate_latest(_registry).decode('utf-8')
@@ -0,0 +1,210 @@
+"""
+Global API rate limiter: minute + hour fixed windows in one Redis round trip.
+
+All windows of a request are checked and charged by a single Lua script,
+so a request costs one ``EVALSHA`` instead of several INCR/EXPIRE calls.
+Rejected requests are not charged to any window.
+
+Limit classes
+    ``default``  ``GLOBAL_RATE_LIMIT_RPM`` / ``_RPH`` per client IP.
+    route        ``GLOBAL_RATE_LIMIT_ROUTE_CLASSES="/api/v1/auth/=30/600,..."``;
+                 longest matching path prefix wins, counted per client IP.
+    tenant       ``GLOBAL_RATE_LIMIT_TENANT_CLASSES="<tenant-uuid>=2000/40000,..."``;
+                 one budget shared by the whole tenant, charged on top of
+                 the per-IP default. The caller passes only a tenant id
+                 taken from verified credentials, never a raw header.
+    Route classes take precedence over tenant classes.
+
+Local pre-checks (per process)
+    * A rejection holds until its window rolls over (counters only grow
+      within a window), so a rejected key is answered locally until then.
+    * With ``GLOBAL_RATE_LIMIT_LOCAL_BATCH`` > 1 a key leases that many
+      requests from Redis at once and spends them locally. Leased but
+      unused requests still count against the window, so limits stay
+      strict at the cost of rejecting a little early under many pods.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from redis.exceptions import NoScriptError
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# KEYS: minute key, hour key per budget. ARGV: rpm, rph per budget, then cost.
+# Returns {granted, rejected_window} where rejected_window is 1 (minute) or 2 (hour).
+_WINDOWS_LUA = """
+local granted = tonumber(ARGV[#ARGV])
+for i = 1, #KEYS, 2 do
+  local rpm = tonumber(ARGV[i])
+  local rph = tonumber(ARGV[i + 1])
+  local minute = tonumber(redis.call('GET', KEYS[i]) or '0')
+  local hour = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+  if minute >= rpm then return {0, 1} end
+  if hour >= rph then return {0, 2} end
+  granted = math.min(granted, rpm - minute, rph - hour)
+end
+for i = 1, #KEYS, 2 do
+  if redis.call('INCRBY', KEYS[i], granted) == granted then redis.call('EXPIRE', KEYS[i], 60) end
+  if redis.call('INCRBY', KEYS[i + 1], granted) == granted then redis.call('EXPIRE', KEYS[i + 1], 3600) end
+end
+return {granted, 0}
+"""
+_WINDOWS_SHA = hashlib.sha1(_WINDOWS_LUA.encode("utf-8")).hexdigest()
+
+_LOCAL_STATE_MAX_KEYS = 10_000
+
+
+@dataclass(frozen=True)
+class RateLimitClass:
+    name: str
+    rpm: int
+    rph: int
+    per_tenant: bool = False
+
+
+def parse_limit_classes(raw: str, *, per_tenant: bool = False) -> Dict[str, RateLimitClass]:
+    """Parse ``"key=rpm/rph,key=rpm/rph"``; malformed entries are skipped."""
+    classes: Dict[str, RateLimitClass] = {}
+    for entry in (raw or "").split(","):
+        key, _, limits = entry.strip().partition("=")
+        rpm, _, rph = limits.partition("/")
+        try:
+            limit = RateLimitClass(key.strip(), max(int(rpm), 1), max(int(rph), 1), per_tenant)
+        except ValueError:
+            if entry.strip():
+                logger.warning("Ignoring malformed rate limit class: %r", entry)
+            continue
+        if limit.name:
+            classes[limit.name] = limit
+    return classes
+
+
+class GlobalRateLimiter:
+    """Fixed-window limiter with per-process rejection cache and leases."""
+
+    def __init__(
+        self,
+        *,
+        default: RateLimitClass,
+        route_classes: Optional[Dict[str, RateLimitClass]] = None,
+        tenant_classes: Optional[Dict[str, RateLimitClass]] = None,
+        local_batch: int = 1,
+        redis_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.default = default
+        self.route_classes = route_classes or {}
+        self._route_prefixes = sorted(self.route_classes, key=len, reverse=True)
+        self.tenant_classes = tenant_classes or {}
+        self.local_batch = max(1, int(local_batch))
+        self._redis_factory = redis_factory
+        # key -> (window ids, remaining leased requests or -1, retry-at epoch)
+        self._local: "OrderedDict[str, Tuple[Tuple[int, int], int, int]]" = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, **kwargs: Any) -> "GlobalRateLimiter":
+        settings = get_settings()
+        return cls(
+            default=RateLimitClass(
+                "default",
+                int(max(settings.GLOBAL_RATE_LIMIT_RPM, 1)),
+                int(max(settings.GLOBAL_RATE_LIMIT_RPH, 1)),
+            ),
+            route_classes=parse_limit_classes(settings.GLOBAL_RATE_LIMIT_ROUTE_CLASSES),
+            tenant_classes=parse_limit_classes(settings.GLOBAL_RATE_LIMIT_TENANT_CLASSES, per_tenant=True),
+            local_batch=settings.GLOBAL_RATE_LIMIT_LOCAL_BATCH,
+            **kwargs,
+        )
+
+    def classify(self, path: str, tenant_id: Optional[str]) -> RateLimitClass:
+        for prefix in self._route_prefixes:
+            if path.startswith(prefix):
+                return self.route_classes[prefix]
+        if tenant_id:
+            tenant_class = self.tenant_classes.get(tenant_id.strip())
+            if tenant_class is not None:
+                return tenant_class
+        return self.default
+
+    async def hit(
+        self,
+        *,
+        path: str,
+        client_ip: str,
+        tenant_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Optional[int]:
+        """Charge one request; returns ``Retry-After`` seconds when rejected.
+
+        ``tenant_id`` must come from verified credentials: it selects a
+        tenant class, whose budget is charged together with the per-IP
+        default.
+        """
+        limit = self.classify(path, tenant_id)
+        if limit.per_tenant and tenant_id:
+            budgets = [(f"ip:{client_ip}", self.default), (f"{limit.name}:tenant:{tenant_id.strip()}", limit)]
+        else:
+            subject = f"ip:{client_ip}"
+            budgets = [(subject if limit.name == "default" else f"{limit.name}:{subject}", limit)]
+        key = "|".join(budget_key for budget_key, _ in budgets)
+        now_s = int(now if now is not None else time.time())
+        windows = (now_s // 60, now_s // 3600)
+
+        cached = self._local.get(key)
+        if cached is not None and cached[0] == windows:
+            _, remaining, retry_at = cached
+            if retry_at:
+                return max(retry_at - now_s, 1)
+            if remaining > 0:
+                self._remember(key, windows, remaining - 1, 0)
+                return None
+
+        try:
+            granted, rejected_window = await self._charge(budgets, windows)
+        except Exception as exc:
+            # Fail-open fallback for platform availability.
+            logger.debug("Global rate limit check failed open: %r", exc)
+            return None
+        if granted > 0:
+            self._remember(key, windows, granted - 1, 0)
+            return None
+        window_s = 60 if rejected_window == 1 else 3600
+        retry_after = window_s - (now_s % window_s)
+        self._remember(key, windows, 0, now_s + retry_after)
+        return retry_after
+
+    async def _charge(
+        self, budgets: List[Tuple[str, RateLimitClass]], windows: Tuple[int, int]
+    ) -> Tuple[int, int]:
+        redis = self._redis()
+        keys: List[str] = []
+        args: List[int] = []
+        for key, limit in budgets:
+            keys += [f"ratelimit:global:{key}:minute:{windows[0]}", f"ratelimit:global:{key}:hour:{windows[1]}"]
+            args += [limit.rpm, limit.rph]
+        args.append(self.local_batch)
+        try:
+            result = await redis.evalsha(_WINDOWS_SHA, len(keys), *keys, *args)
+        except NoScriptError:
+            result = await redis.eval(_WINDOWS_LUA, len(keys), *keys, *args)
+        return int(result[0]), int(result[1])
+
+    def _remember(self, key: str, windows: Tuple[int, int], remaining: int, retry_at: int) -> None:
+        self._local[key] = (windows, remaining, retry_at)
+        self._local.move_to_end(key)
+        while len(self._local) > _LOCAL_STATE_MAX_KEYS:
+            self._local.popitem(last=False)
+
+    def _redis(self) -> Any:
+        if self._redis_factory is not None:
+            return self._redis_factory()
+        from app.core.redis import get_redis
+
+        return get_redis()
@@ -1,8 +1,11 @@
 from __future__ import annotations
+import hashlib
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Any, Dict, List
+from functools import lru_cache
+from typing import Optional, Any, Dict, List, Tuple
 import jwt
 from argon2 import PasswordHasher
 from .config import get_settings
@@ -47,6 +50,58 @@ def _get_verification_key() -> str:
         return s.JWT_PUBLIC_KEY
     return s.JWT_SECRET
 
+@lru_cache(maxsize=8)
+def _prepared_verification_key(algorithm: str, key: str) -> Any:
+    """Parse a PEM public key once instead of on every ``jwt.decode``."""
+    if algorithm.startswith("RS") or algorithm.startswith("ES"):
+        return jwt.get_algorithm_by_name(algorithm).prepare_key(key)
+    return key
+
+
+class VerifiedClaimsCache:
+    """Bounded LRU of verified JWT claims keyed by token hash.
+
+    An entry is served only until the token's ``exp`` and only while the
+    verification settings (algorithm, key, audience, issuer) are unchanged.
+    Tokens without a numeric ``exp`` are never cached.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[Any, ...], Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str, fingerprint: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, entry_fingerprint, claims = entry
+        if expires_at <= time.time() or entry_fingerprint != fingerprint:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, fingerprint: Tuple[Any, ...], claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (float(exp), fingerprint, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_claims_cache = VerifiedClaimsCache(get_settings().JWT_VERIFIED_CACHE_SIZE)
+
 def create_access_token(user_id: str, email: str, role: str, tenant_ids: List[str], scopes: List[str]) -> str:
     """Create JWT access token with RSA (production) or HS256 (dev)"""
     s = get_settings()
@@ -90,24 +145,47 @@ def create_refresh_token(user_id: str) -> str:
     return jwt.encode(payload, signing_key, algorithm=s.JWT_ALGORITHM, headers=headers)
 
 def decode_jwt(token: str) -> Dict[str, Any]:
-    """Decode and validate JWT token with RSA (production) or HS256 (dev)"""
+    """Decode and validate JWT token with RSA (production) or HS256 (dev)
+
+    Verified claims are cached until the token expires (``verified_claims_cache``).
+    """
     s = get_settings()
     from app.core.exceptions import UnauthorizedError
     try:
         verification_key = _get_verification_key()
+        fingerprint = (s.JWT_ALGORITHM, verification_key, s.JWT_AUDIENCE, s.JWT_ISSUER)
+        cached = verified_claims_cache.get(token, fingerprint)
+        if cached is not None:
+            return cached
         payload = jwt.decode(
             token, 
-            verification_key, 
+            _prepared_verification_key(s.JWT_ALGORITHM, verification_key),
             algorithms=[s.JWT_ALGORITHM], 
             audience=s.JWT_AUDIENCE, 
             issuer=s.JWT_ISSUER
         )
+        verified_claims_cache.put(token, fingerprint, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise UnauthorizedError("Token has expired")
     except jwt.InvalidTokenError as e:
         raise UnauthorizedError(f"Invalid token: {str(e)}")
 
+_REQUEST_CLAIMS_STATE_KEY = "verified_jwt"
+
+def decode_jwt_for_request(state: Dict[str, Any], token: str) -> Dict[str, Any]:
+    """``decode_jwt`` memoized on a request's ``scope["state"]``.
+
+    The tenant middleware and the auth dependencies read the same token;
+    whichever runs first verifies it, the rest reuse the claims.
+    """
+    cached = state.get(_REQUEST_CLAIMS_STATE_KEY)
+    if cached is not None and cached[0] == token:
+        return dict(cached[1])
+    payload = decode_jwt(token)
+    state[_REQUEST_CLAIMS_STATE_KEY] = (token, payload)
+    return dict(payload)
+
 def get_jwks() -> Dict[str, Any]:
     """Generate JWKS (JSON Web Key Set) - only public keys for RSA"""
     s = get_settings()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 import asyncio
 import json
-from typing import Any, AsyncGenerator, Dict, Optional, Callable
+import zlib
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, Optional, Callable
 from fastapi import HTTPException, status
 from fastapi.responses import StreamingResponse
 from app.core.logging import get_logger
@@ -209,3 +210,20 @@ def sse_response(data: dict, event: Optional[str] = None, serialize_func: Callab
 def sse_error(message: str, *, status: int = 500, title: str | None = None) -> str:
     t = title or "error"
     return f"event: {t}\ndata: {{\"status\":{status},\"error\":{message!r}}}\n\n"
+
+
+def last_event_id(request) -> Optional[str]:
+    """The ``Last-Event-ID`` an ``EventSource`` sends when it reconnects"""
+    value = request.headers.get("Last-Event-ID", "").strip()
+    return value or None
+
+def accepts_gzip(request) -> bool:
+    """Whether the client advertised gzip in ``Accept-Encoding``"""
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+async def gzip_sse_stream(chunks: AsyncIterable[str]) -> AsyncGenerator[bytes, None]:
+    """Gzip an SSE stream, sync-flushing after every chunk so frames are never held back"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -7,17 +7,33 @@ All one-time initialization that runs during lifespan (after DB is ready):
   3. sync_tool_catalog       — sync ToolRegistry → tools table
   4. sync_tool_backend_releases — sync versioned registry → backend_releases table
   5. rescan_local_instances  — reconcile local ToolInstances (RAG, collections)
-  6. validate_connectors     — validate connector subtype/config contracts (fail-fast)
-
-Each task is isolated: failure is logged but does NOT abort startup.
+  6. sync_discovered_tools   — refresh discovered_tools (probes MCP providers)
+  7. validate_connectors     — validate connector subtype/config contracts (fail-fast)
+
+``run_all`` schedules them by declared dependencies (``STARTUP_TASKS``):
+independent tasks run concurrently, each under ``STARTUP_TASK_TIMEOUT_SECONDS``.
+Tasks marked ``cluster`` write shared state; only the replica holding the
+Redis leader lock runs them, and replicas of the same build (see
+``cluster_build_identity``) skip them for ``STARTUP_CLUSTER_SYNC_TTL_SECONDS``
+after all of them succeeded. Cluster tasks therefore let errors propagate.
+
+Each task is isolated: failure is logged but does NOT abort startup, except
+for ``fail_fast`` tasks, whose failure stops scheduling and is re-raised.
+Per-task state is exposed via ``get_startup_status()``.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Callable
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -25,84 +41,81 @@ logger = get_logger(__name__)
 
 async def ensure_default_admin(session_factory: async_sessionmaker[AsyncSession]) -> None:
     """Create default admin user and default tenant if they do not exist."""
-    try:
-        from app.models.user import Users
-        from app.models.tenant import Tenants, UserTenants
-        from app.core.security import hash_password
-        from sqlalchemy import select
-        import uuid as _uuid
+    from app.models.user import Users
+    from app.models.tenant import Tenants, UserTenants
+    from app.core.security import hash_password
+    from sqlalchemy import select
+    import uuid as _uuid
 
-        admin_login = os.getenv("DEFAULT_ADMIN_LOGIN", "admin")
-        admin_password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
-        admin_email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@example.com")
+    admin_login = os.getenv("DEFAULT_ADMIN_LOGIN", "admin")
+    admin_password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
+    admin_email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@example.com")
 
-        async with session_factory() as session:
-            tenant_result = await session.execute(
-                select(Tenants).where(Tenants.name == "default")
+    async with session_factory() as session:
+        tenant_result = await session.execute(
+            select(Tenants).where(Tenants.name == "default")
+        )
+        default_tenant = tenant_result.scalar_one_or_none()
+
+        if not default_tenant:
+            default_tenant = Tenants(
+                id=_uuid.uuid4(),
+                name="default",
+                description="Default tenant",
+                is_active=True,
             )
-            default_tenant = tenant_result.scalar_one_or_none()
+            session.add(default_tenant)
+            await session.flush()
+            logger.info("Created default tenant")
 
-            if not default_tenant:
-                default_tenant = Tenants(
-                    id=_uuid.uuid4(),
-                    name="default",
-                    description="Default tenant",
-                    is_active=True,
-                )
-                session.add(default_tenant)
+        result = await session.execute(
+            select(Users).where(Users.login == admin_login)
+        )
+        admin = result.scalar_one_or_none()
+
+        if not admin:
+            admin = Users(
+                id=_uuid.uuid4(),
+                login=admin_login,
+                email=admin_email,
+                password_hash=hash_password(admin_password),
+                role="admin",
+                is_active=True,
+            )
+            session.add(admin)
+            await session.flush()
+            logger.info(f"Created default admin user: {admin_login}")
+        else:
+            updated = False
+            if admin.role != "admin":
+                admin.role = "admin"
+                updated = True
+            if not admin.is_active:
+                admin.is_active = True
+                updated = True
+            if updated:
                 await session.flush()
-                logger.info("Created default tenant")
+                logger.info(f"Normalized role for default admin user: {admin_login}")
 
-            result = await session.execute(
-                select(Users).where(Users.login == admin_login)
+        link_result = await session.execute(
+            select(UserTenants).where(
+                UserTenants.user_id == admin.id,
+                UserTenants.tenant_id == default_tenant.id,
             )
-            admin = result.scalar_one_or_none()
-
-            if not admin:
-                admin = Users(
+        )
+        if not link_result.scalar_one_or_none():
+            session.add(
+                UserTenants(
                     id=_uuid.uuid4(),
-                    login=admin_login,
-                    email=admin_email,
-                    password_hash=hash_password(admin_password),
-                    role="admin",
-                    is_active=True,
-                )
-                session.add(admin)
-                await session.flush()
-                logger.info(f"Created default admin user: {admin_login}")
-            else:
-                updated = False
-                if admin.role != "admin":
-                    admin.role = "admin"
-                    updated = True
-                if not admin.is_active:
-                    admin.is_active = True
-                    updated = True
-                if updated:
-                    await session.flush()
-                    logger.info(f"Normalized role for default admin user: {admin_login}")
-
-            link_result = await session.execute(
-                select(UserTenants).where(
-                    UserTenants.user_id == admin.id,
-                    UserTenants.tenant_id == default_tenant.id,
+                    user_id=admin.id,
+                    tenant_id=default_tenant.id,
+                    is_default=True,
                 )
             )
-            if not link_result.scalar_one_or_none():
-                session.add(
-                    UserTenants(
-                        id=_uuid.uuid4(),
-                        user_id=admin.id,
-                        tenant_id=default_tenant.id,
-                        is_default=True,
-                    )
-                )
-                logger.info("Linked admin user to default tenant")
+            logger.info("Linked admin user to default tenant")
 
-            await session.commit()
-            logger.info(f"Admin user '{admin_login}' ready with tenant '{default_tenant.name}'")
-    except Exception as exc:
-        logger.error(f"Failed to create default admin: {exc}")
+        await session.commit()
+        logger.info(f"Admin user '{admin_login}' ready with tenant '{default_tenant.name}'")
 
 
 async def register_embedding_models(session_factory: async_sessionmaker[AsyncSession]) -> None:
@@ -169,51 +182,44 @@ async def register_embedding_models(session_factory: async_sessionmaker[AsyncSes
 
 async def sync_tool_catalog(session_factory: async_sessionmaker[AsyncSession]) -> None:
     """Sync runtime ToolRegistry entries into the tools table."""
-    try:
-        from app.agents.registry import ToolRegistry
-        from app.services.tool_catalog_sync_service import ToolCatalogSyncService
+    from app.agents.registry import ToolRegistry
+    from app.services.tool_catalog_sync_service import ToolCatalogSyncService
 
-        ToolRegistry._ensure_initialized()
+    ToolRegistry._ensure_initialized()
 
-        async with session_factory() as session:
-            stats = await ToolCatalogSyncService(session).sync_tools()
-            await session.commit()
-            logger.info(f"Tool catalog sync: {stats}")
-    except Exception as exc:
-        logger.error(f"Failed to sync tool catalog: {exc}")
+    async with session_factory() as session:
+        stats = await ToolCatalogSyncService(session).sync_tools()
+        await session.commit()
+        logger.info(f"Tool catalog sync: {stats}")
 
 
 async def sync_tool_backend_releases(session_factory: async_sessionmaker[AsyncSession]) -> None:
     """Sync versioned registry tools into backend_releases table."""
-    try:
-        from app.services.tool_backend_release_sync_service import ToolBackendReleaseSyncService
+    from app.services.tool_backend_release_sync_service import ToolBackendReleaseSyncService
 
-        async with session_factory() as session:
-            service = ToolBackendReleaseSyncService(
-                session,
-                worker_build_id=os.getenv("WORKER_BUILD_ID"),
-            )
-            stats = await service.sync_backend_releases()
-            await session.commit()
-            logger.info(f"Tool backend release sync: {stats}")
-    except Exception as exc:
-        logger.error(f"Failed to sync tool backend releases: {exc}")
+    async with session_factory() as session:
+        service = ToolBackendReleaseSyncService(
+            session,
+            worker_build_id=os.getenv("WORKER_BUILD_ID"),
+        )
+        stats = await service.sync_backend_releases()
+        await session.commit()
+        logger.info(f"Tool backend release sync: {stats}")
 
 
 async def rescan_local_instances(session_factory: async_sessionmaker[AsyncSession]) -> None:
     """Reconcile local ToolInstances (RAG global, collection instances)."""
-    try:
-        from app.services.tool_instance_service import ToolInstanceService
+    from app.services.tool_instance_service import ToolInstanceService
 
-        async with session_factory() as session:
-            result = await ToolInstanceService(session).rescan_local_instances()
-            await session.commit()
-            logger.info(
-                f"Local instance rescan: created={result.created}, "
-                f"deleted={result.deleted}, errors={result.errors}"
-            )
-    except Exception as exc:
-        logger.error(f"Failed to rescan local instances: {exc}")
+    async with session_factory() as session:
+        result = await ToolInstanceService(session).rescan_local_instances()
+        await session.commit()
+        logger.info(
+            f"Local instance rescan: created={result.created}, "
+            f"deleted={result.deleted}, errors={result.errors}"
+        )
+    if result.errors:
+        raise RuntimeError(f"local instance rescan reported {result.errors} error(s)")
 
 
 async def sync_discovered_tools(session_factory: async_sessionmaker[AsyncSession]) -> None:
@@ -223,20 +229,17 @@ async def sync_discovered_tools(session_factory: async_sessionmaker[AsyncSession
     Prevents runtime NO_OPERATIONS drift when local capabilities are not yet
     present/active in discovered_tools after restart.
     """
-    try:
-        from app.services.tool_discovery_service import ToolDiscoveryService
+    from app.services.tool_discovery_service import ToolDiscoveryService
 
-        async with session_factory() as session:
-            stats = await ToolDiscoveryService(session).rescan_all()
-            await session.commit()
-            logger.info(
-                "Discovery rescan: local_upserted=%s mcp_upserted=%s marked_inactive=%s",
-                stats.get("local_upserted"),
-                stats.get("mcp_upserted"),
-                stats.get("marked_inactive"),
-            )
-    except Exception as exc:
-        logger.error(f"Failed to sync discovered tools: {exc}")
+    async with session_factory() as session:
+        stats = await ToolDiscoveryService(session).rescan_all()
+        await session.commit()
+        logger.info(
+            "Discovery rescan: local_upserted=%s mcp_upserted=%s marked_inactive=%s",
+            stats.get("local_upserted"),
+            stats.get("mcp_upserted"),
+            stats.get("marked_inactive"),
+        )
 
 
 async def seed_default_agents(session_factory: async_sessionmaker[AsyncSession]) -> None:
@@ -326,19 +329,203 @@ async def sync_periodic_tasks(session_factory: async_sessionmaker[AsyncSession])
     logger.info("Periodic tasks synced from beat schedule")
 
 
-async def run_all(session_factory: async_sessionmaker[AsyncSession]) -> None:
-    """Run all startup tasks in order. Each failure is isolated."""
-    tasks: list[tuple[str, Callable]] = [
-        ("validate_role_contracts", validate_role_contracts_task),
-        ("ensure_default_admin", ensure_default_admin),
-        ("register_embedding_models", register_embedding_models),
-        ("sync_tool_catalog", sync_tool_catalog),
-        ("sync_tool_backend_releases", sync_tool_backend_releases),
-        ("rescan_local_instances", rescan_local_instances),
-        ("sync_discovered_tools", sync_discovered_tools),
-        ("validate_connectors", validate_connectors),
-        ("sync_periodic_tasks", sync_periodic_tasks),
-    ]
-    for name, task in tasks:
-        logger.info(f"[startup] Running {name}...")
-        await task(session_factory)
+@dataclass(frozen=True)
+class StartupTask:
+    name: str
+    run: Callable[[async_sessionmaker[AsyncSession]], Awaitable[None]]
+    depends_on: Tuple[str, ...] = ()
+    # Writes cluster-wide state: run by one replica per build (leader lock).
+    cluster: bool = False
+    # Failure (or timeout) aborts startup.
+    fail_fast: bool = False
+
+
+STARTUP_TASKS: Tuple[StartupTask, ...] = (
+    StartupTask("validate_role_contracts", validate_role_contracts_task, fail_fast=True),
+    StartupTask("ensure_default_admin", ensure_default_admin, cluster=True),
+    StartupTask("register_embedding_models", register_embedding_models),
+    StartupTask("sync_tool_catalog", sync_tool_catalog, cluster=True),
+    StartupTask("sync_tool_backend_releases", sync_tool_backend_releases, ("sync_tool_catalog",), cluster=True),
+    StartupTask("rescan_local_instances", rescan_local_instances, ("ensure_default_admin",), cluster=True),
+    StartupTask(
+        "sync_discovered_tools",
+        sync_discovered_tools,
+        ("sync_tool_catalog", "rescan_local_instances"),
+        cluster=True,
+    ),
+    StartupTask("validate_connectors", validate_connectors, ("rescan_local_instances",), fail_fast=True),
+    StartupTask("sync_periodic_tasks", sync_periodic_tasks, cluster=True, fail_fast=True),
+)
+
+# name -> {"state": pending|running|ok|failed|timeout|skipped, "duration_ms": ...}
+_status: Dict[str, Dict[str, Any]] = {}
+
+
+def get_startup_status() -> Dict[str, Dict[str, Any]]:
+    """Per-task startup state of this replica (empty before ``run_all``)."""
+    return {name: dict(entry) for name, entry in _status.items()}
+
+
+def cluster_build_identity() -> str:
+    """Fingerprint of everything the ``cluster`` tasks sync from code.
+
+    Hashes the deployed revision (``GIT_SHA`` / ``WORKER_BUILD_ID`` when the
+    image sets them), the tool registry with each versioned tool's schemas
+    and the default beat schedule, so a deploy that changes any of them runs
+    the sync again even when no build id is configured.
+    """
+    from app.agents.handlers.versioned_tool import tool_registry
+    from app.agents.registry import ToolRegistry
+    from app.celery_app import build_default_beat_schedule
+    from app.core.schema_hash import compute_schema_hash
+
+    ToolRegistry._ensure_initialized()
+    tools = {
+        versioned.tool_slug: [
+            [info.version, info.deprecated, compute_schema_hash(info.input_schema, info.output_schema)]
+            for info in versioned.get_versions()
+        ]
+        for versioned in tool_registry.get_all()
+    }
+    payload = {
+        "revision": [os.getenv("GIT_SHA") or "", os.getenv("WORKER_BUILD_ID") or ""],
+        "tools": sorted(ToolRegistry.list_slugs()),
+        "versioned_tools": tools,
+        "beat_schedule": build_default_beat_schedule(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class _ClusterLeadership:
+    """Decides once whether this replica runs the ``cluster`` tasks.
+
+    The first replica to take the Redis lock runs them and, only if every
+    one of them succeeded, records a marker keyed on
+    ``cluster_build_identity()``; the others wait for the lock, see the marker
+    and skip. Without Redis every replica runs them, as before.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Optional[Callable[[], Any]] = None,
+        build_identity: Optional[Callable[[], str]] = None,
+    ) -> None:
+        settings = get_settings()
+        self._redis_factory = redis_factory
+        self._lock_ttl = int(settings.STARTUP_LEADER_LOCK_TTL_SECONDS)
+        self._marker_ttl = int(settings.STARTUP_CLUSTER_SYNC_TTL_SECONDS)
+        self._build_identity = build_identity
+        self._marker_key: Optional[str] = None
+        self._lock: Any = None
+        self._decision: Optional[asyncio.Task] = None
+
+    def should_run(self) -> Awaitable[bool]:
+        if self._decision is None:
+            self._decision = asyncio.create_task(self._decide())
+        return asyncio.shield(self._decision)
+
+    async def _decide(self) -> bool:
+        if self._marker_ttl <= 0:
+            return True
+        try:
+            self._marker_key = f"startup:cluster_sync:{(self._build_identity or cluster_build_identity)()}"
+            redis = self._redis()
+            lock = redis.lock("startup:leader", timeout=self._lock_ttl, blocking_timeout=self._lock_ttl)
+            if not await lock.acquire():
+                logger.warning("[startup] Leader lock wait expired, running cluster tasks anyway")
+                return True
+            if await redis.get(self._marker_key):
+                await lock.release()
+                logger.info("[startup] Cluster sync already done for this build, skipping")
+                return False
+            self._lock = lock
+            return True
+        except Exception as exc:
+            logger.warning(f"[startup] Leader lock unavailable, running cluster tasks: {exc!r}")
+            return True
+
+    async def finish(self, succeeded: bool) -> None:
+        lock, self._lock = self._lock, None
+        if lock is None:
+            return
+        try:
+            if succeeded and self._marker_key:
+                await self._redis().set(self._marker_key, str(int(time.time())), ex=self._marker_ttl)
+            await lock.release()
+        except Exception as exc:
+            logger.warning(f"[startup] Failed to release leader lock: {exc!r}")
+
+    def _redis(self) -> Any:
+        if self._redis_factory is not None:
+            return self._redis_factory()
+        from app.core.redis import get_redis
+
+        return get_redis()
+
+
+async def run_all(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    tasks: Tuple[StartupTask, ...] = STARTUP_TASKS,
+    redis_factory: Optional[Callable[[], Any]] = None,
+    build_identity: Optional[Callable[[], str]] = None,
+) -> None:
+    """Run startup tasks concurrently in dependency order.
+
+    Raises the first ``fail_fast`` failure once in-flight tasks settle;
+    tasks not yet started at that point are skipped.
+    """
+    # Declaration order must be a topological order (which also rules out
+    # cycles), so every dependency has a runner before its dependents.
+    declared: set[str] = set()
+    for task in tasks:
+        missing = [name for name in task.depends_on if name not in declared]
+        if missing:
+            raise ValueError(f"startup task {task.name} depends on unknown or later tasks: {missing}")
+        declared.add(task.name)
+
+    timeout_s = float(get_settings().STARTUP_TASK_TIMEOUT_SECONDS)
+    leadership = _ClusterLeadership(redis_factory, build_identity)
+    aborted = asyncio.Event()
+    errors: list[BaseException] = []
+    _status.clear()
+    _status.update({task.name: {"state": "pending"} for task in tasks})
+    runners: Dict[str, asyncio.Task] = {}
+
+    async def _run(task: StartupTask) -> None:
+        deps = [runners[name] for name in task.depends_on]
+        if deps:
+            await asyncio.gather(*deps, return_exceptions=True)
+        if aborted.is_set() or (task.cluster and not await leadership.should_run()):
+            _status[task.name] = {"state": "skipped"}
+            return
+        logger.info(f"[startup] Running {task.name}...")
+        _status[task.name] = {"state": "running"}
+        started = time.perf_counter()
+        state = "ok"
+        try:
+            async with asyncio.timeout(timeout_s):
+                await task.run(session_factory)
+        except Exception as exc:
+            state = "timeout" if isinstance(exc, TimeoutError) else "failed"
+            if task.fail_fast:
+                errors.append(exc)
+                aborted.set()
+            logger.error(f"[startup] {task.name} {state}: {exc!r}")
+        finally:
+            _status[task.name] = {
+                "state": state,
+                "duration_ms": round((time.perf_counter() - started) * 1000.0, 1),
+            }
+
+    for task in tasks:
+        runners[task.name] = asyncio.create_task(_run(task), name=f"startup:{task.name}")
+
+    try:
+        await asyncio.gather(*runners.values())
+    finally:
+        cluster_ok = all(_status[t.name]["state"] == "ok" for t in tasks if t.cluster)
+        await leadership.finish(cluster_ok)
+    if errors:
+        raise errors[0]
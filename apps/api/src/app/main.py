@@ -3,13 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_v1
 from app.core.db import lifespan
 from app.core.exceptions import install_exception_handlers
-from app.core.middleware import (
-    GlobalRateLimitMiddleware,
-    RequestContextMiddleware,
-    StartupReadinessMiddleware,
-    TenantMiddleware,
-    TimeoutMiddleware,
-)
+from app.core.middleware import ApiMiddlewarePipeline
 
 app = FastAPI(title="ML-Portal API", lifespan=lifespan)
 
@@ -38,11 +32,9 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "Idempotency-Key", "X-Tenant-Id", "X-Request-ID", "Last-Event-ID"],
     expose_headers=["X-Total-Count", "X-Page", "X-Page-Size"],
 )
-app.add_middleware(TimeoutMiddleware)
-app.add_middleware(TenantMiddleware)
-app.add_middleware(GlobalRateLimitMiddleware)
-app.add_middleware(StartupReadinessMiddleware)
-app.add_middleware(RequestContextMiddleware)
+# Request context → readiness → global rate limit → tenant → timeout, as one
+# pure-ASGI layer outside CORS.
+app.add_middleware(ApiMiddlewarePipeline)
 
 
 @app.get("/version")
@@ -52,10 +44,19 @@ async def version():
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
-    from app.core.prometheus_metrics import get_metrics_text, record_db_pool_stats
+    from app.core.prometheus_metrics import (
+        get_metrics_text,
+        record_db_pool_stats,
+        record_mcp_pool_stats,
+        record_pubsub_hub_stats,
+    )
     from app.core.db import get_pool_stats
+    from app.services.mcp_client_manager import get_mcp_client_manager
+    from app.services.redis_pubsub_hub import get_pubsub_hub
     from fastapi.responses import Response
     record_db_pool_stats(get_pool_stats())
+    record_mcp_pool_stats(get_mcp_client_manager().metrics())
+    record_pubsub_hub_stats(get_pubsub_hub().metrics())
     return Response(
         content=get_metrics_text(),
         media_type="text/plain; version=0.0.4"
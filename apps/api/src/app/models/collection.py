@@ -108,6 +108,7 @@ class Collection(Base, LifecycleMixin):
     - `sortable`
     - `used_in_retrieval`
     - `used_in_prompt_context`
+    - `rollup` (optional): "dimension" or "measure" for aggregate rollups
 
     System/platform fields exist logically, but are not persisted in `fields`.
     """
@@ -30,6 +30,7 @@ from app.runtime.synthesizer import Synthesizer
 from app.runtime.orchestrator import GraphOrchestrator
 from app.runtime.plan_store import SqlPlanStore
 from app.runtime.stages.graph_planning_stage import GraphPlanningStage
+from app.runtime.stages.turn_bootstrap_stage import TurnBootstrapStage
 from app.services.runtime_budget_service import RuntimeBudgetService
 
 
@@ -88,6 +89,13 @@ class PipelineAssembler:
     # Stage factories (fresh per turn)                                   #
     # ------------------------------------------------------------------ #
 
+    def build_turn_bootstrap_stage(self, *, session_factory: Optional[object] = None) -> TurnBootstrapStage:
+        return TurnBootstrapStage(
+            session=self._session,
+            memory_builder=self.memory_builder,
+            session_factory=session_factory,
+        )
+
     def build_graph_planning_stage(self, *, max_steps: int) -> GraphPlanningStage:
         store = SqlPlanStore(self._session)
         return GraphPlanningStage(
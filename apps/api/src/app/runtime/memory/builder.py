@@ -113,6 +113,7 @@ class MemoryBuilder:
             user_id=user_id,
             tenant_id=tenant_id,
             limit=max(self._fact_limit, effective_budget.max_items_per_section) * 4,
+            query=goal,
         )
         if sandbox_branch_id is not None:
             durable_snapshot = self._apply_snapshot_fact_overrides(
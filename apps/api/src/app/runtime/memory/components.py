@@ -6,6 +6,8 @@ turn, and returns a bounded, explainable section.
 """
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
 from uuid import UUID
@@ -13,7 +15,7 @@ from uuid import UUID
 from app.models.memory import FactScope
 from app.runtime.contracts import AttachmentContext
 from app.runtime.memory.dto import FactDTO, SummaryDTO
-from app.runtime.memory.fact_selection import FactSelectionPolicy, LexicalFactRanker
+from app.runtime.memory.fact_selection import FactSelectionPolicy, HybridFactRanker, LexicalFactRanker
 from app.runtime.memory.service import MemoryService
 from app.runtime.memory.service import MemorySnapshot
 
@@ -23,6 +25,7 @@ DEFAULT_SECTION_BUDGET_CHARS = 2_000
 DEFAULT_SECTION_ITEMS = 12
 FACT_RETRIEVAL_POOL_MULTIPLIER = 4
 PROMPT_ITEM_PREVIEW_CHARS = 500
+DEFAULT_COMPONENT_TIMEOUT_MS = 1_500
 
 
 @dataclass(frozen=True)
@@ -199,7 +202,12 @@ class MemoryBundle:
 
 
 class MemoryComponent(Protocol):
-    """Read-side component contract."""
+    """Read-side component contract.
+
+    ``collect`` runs concurrently with the other enabled components and is
+    cancelled when it exceeds its deadline, so it must not share mutable
+    state (including a database session) with another component.
+    """
 
     name: str
     priority: int
@@ -212,6 +220,7 @@ class MemoryComponentBinding:
     component: MemoryComponent
     enabled: bool
     priority: int
+    timeout_ms: int = DEFAULT_COMPONENT_TIMEOUT_MS
 
 
 class MemoryComponentRegistry:
@@ -224,55 +233,62 @@ class MemoryComponentRegistry:
         memory_cfg = (platform_config or {}).get("memory")
         component_cfg = memory_cfg.get("components") if isinstance(memory_cfg, dict) else {}
         disabled = set(memory_cfg.get("disabled_components") or []) if isinstance(memory_cfg, dict) else set()
+        default_timeout_ms = DEFAULT_COMPONENT_TIMEOUT_MS
+        if isinstance(memory_cfg, dict):
+            default_timeout_ms = _int_or_default(memory_cfg.get("component_timeout_ms"), default_timeout_ms)
 
         bindings: List[MemoryComponentBinding] = []
         for name, component in self._components.items():
             raw_cfg = component_cfg.get(name) if isinstance(component_cfg, dict) else None
             enabled = True
             priority = int(getattr(component, "priority", 100))
+            timeout_ms = default_timeout_ms
             if isinstance(raw_cfg, dict):
                 enabled = bool(raw_cfg.get("enabled", True))
                 priority = _int_or_default(raw_cfg.get("priority"), priority)
+                timeout_ms = _int_or_default(raw_cfg.get("timeout_ms"), timeout_ms)
             if name in disabled:
                 enabled = False
-            bindings.append(MemoryComponentBinding(component=component, enabled=enabled, priority=priority))
+            bindings.append(
+                MemoryComponentBinding(
+                    component=component,
+                    enabled=enabled,
+                    priority=priority,
+                    timeout_ms=timeout_ms,
+                )
+            )
 
         bindings.sort(key=lambda item: (item.priority, item.component.name))
         return bindings
 
 
 class MemoryAssembler:
-    """Runs memory components and enforces a total prompt budget."""
+    """Runs memory components and enforces a total prompt budget.
+
+    Enabled components are collected concurrently, each under its own
+    deadline; a component that fails or times out degrades to an empty
+    section instead of delaying or failing the turn. Sections are kept in
+    binding (priority) order regardless of completion order, so the total
+    budget trim stays deterministic.
+    """
 
     def __init__(self, *, registry: MemoryComponentRegistry) -> None:
         self._registry = registry
 
     async def assemble(self, ctx: MemoryQueryContext) -> MemoryBundle:
-        sections: List[MemorySection] = []
         diagnostics: Dict[str, Any] = {}
-        used = 0
 
         bindings = self._registry.resolve(ctx.platform_config)
         diagnostics["component_count"] = len(bindings)
         diagnostics["enabled_components"] = [b.component.name for b in bindings if b.enabled]
         diagnostics["disabled_components"] = [b.component.name for b in bindings if not b.enabled]
 
-        for binding in bindings:
-            if not binding.enabled:
-                continue
-            try:
-                section = await binding.component.collect(ctx)
-                section.priority = binding.priority
-            except Exception as exc:  # noqa: BLE001 - component failure must degrade the turn
-                section = MemorySection(
-                    name=getattr(binding.component, "name", binding.component.__class__.__name__),
-                    priority=binding.priority,
-                    status="degraded",
-                    error=str(exc),
-                    selection_reason="component_failed",
-                )
-            used += section.budget_used_chars
-            sections.append(section)
+        enabled = [binding for binding in bindings if binding.enabled]
+        timings: Dict[str, float] = {}
+        sections: List[MemorySection] = list(
+            await asyncio.gather(*(self._collect(binding, ctx, timings) for binding in enabled))
+        )
+        used = sum(section.budget_used_chars for section in sections)
 
         if used > ctx.budget.total_chars:
             used = self._trim_to_total_budget(sections, ctx.budget.total_chars)
@@ -280,12 +296,49 @@ class MemoryAssembler:
         diagnostics["degraded_components"] = [
             section.name for section in sections if section.status != "ok"
         ]
+        diagnostics["timed_out_components"] = [
+            section.name for section in sections if section.selection_reason == "component_timeout"
+        ]
+        diagnostics["component_timings_ms"] = timings
         return MemoryBundle(
             sections=sections,
             total_budget_used_chars=used,
             diagnostics=diagnostics,
         )
 
+    @staticmethod
+    async def _collect(
+        binding: MemoryComponentBinding,
+        ctx: MemoryQueryContext,
+        timings: Dict[str, float],
+    ) -> MemorySection:
+        name = getattr(binding.component, "name", binding.component.__class__.__name__)
+        started = time.perf_counter()
+        try:
+            section = await asyncio.wait_for(
+                binding.component.collect(ctx),
+                timeout=max(binding.timeout_ms, 1) / 1000.0,
+            )
+            section.priority = binding.priority
+        except asyncio.TimeoutError:
+            section = MemorySection(
+                name=name,
+                priority=binding.priority,
+                status="degraded",
+                error=f"timed out after {binding.timeout_ms} ms",
+                selection_reason="component_timeout",
+            )
+        except Exception as exc:  # noqa: BLE001 - component failure must degrade the turn
+            section = MemorySection(
+                name=name,
+                priority=binding.priority,
+                status="degraded",
+                error=str(exc),
+                selection_reason="component_failed",
+            )
+        timings[name] = round((time.perf_counter() - started) * 1000.0, 1)
+        return section
+
     @staticmethod
     def _trim_to_total_budget(sections: List[MemorySection], limit: int) -> int:
         used = 0
@@ -426,16 +479,20 @@ class FactMemoryComponent:
     async def collect(self, ctx: MemoryQueryContext) -> MemorySection:
         pool_limit = max(self._fact_limit, ctx.budget.max_items_per_section) * FACT_RETRIEVAL_POOL_MULTIPLIER
         snapshot = ctx.durable_snapshot or await self._memory_service.read_snapshot(
-            user_id=ctx.user_id, tenant_id=ctx.tenant_id, limit=pool_limit
+            user_id=ctx.user_id, tenant_id=ctx.tenant_id, limit=pool_limit, query=ctx.goal
         )
         facts = list(snapshot.entries)
         facts_cfg = ((ctx.platform_config or {}).get("memory") or {}).get("facts")
-        ranker_name = "lexical"
+        ranker_name = "auto"
         if isinstance(facts_cfg, dict):
-            ranker_name = str(facts_cfg.get("ranker") or "lexical").strip().lower()
-        # Embedding ranker can be plugged later; for now config is explicit and
-        # deterministic: unknown/embedding values degrade to lexical.
-        ranker = LexicalFactRanker()
+            ranker_name = str(facts_cfg.get("ranker") or "auto").strip().lower()
+        # Vector similarity is available when the fact index is enabled; an
+        # explicit "lexical" keeps the keyword-only ranking. Without
+        # similarities every other value degrades to lexical.
+        if snapshot.similarity and ranker_name != "lexical":
+            ranker = HybridFactRanker(similarity=snapshot.similarity)
+        else:
+            ranker = LexicalFactRanker()
         policy = FactSelectionPolicy(ranker=ranker)
         selection = policy.select(
             query=ctx.goal,
@@ -460,7 +517,10 @@ class FactMemoryComponent:
                     "lexical_hits": ranked_item.lexical_hits,
                     "ranker": ranker.__class__.__name__,
                     "ranker_requested": ranker_name,
-                    "ranker_degraded_to_lexical": ranker_name not in {"", "lexical"},
+                    "ranker_degraded_to_lexical": (
+                        ranker_name not in {"auto", "lexical"} and not isinstance(ranker, HybridFactRanker)
+                    ),
+                    "similarity": ranked_item.similarity,
                     "contradiction": ranked_item.fact.subject in contradiction_subjects,
                 },
                 private_payload=ranked_item.fact,
@@ -0,0 +1,281 @@
+"""FactVectorIndex — embeddings of active facts in a Qdrant collection.
+
+The ``facts`` table stays the source of truth. The index is derived
+state, written by ``FactStore`` and ``FactReconciler`` when a fact is
+confirmed, superseded or replaced, and read by
+``FactStore.retrieve_relevant``. Those writers use ``index_after_commit``
+/ ``remove_after_commit``: embeddings are computed inside the transaction,
+but Qdrant is only touched once it commits, and nothing is written when
+it rolls back. Facts that predate the index are loaded by the
+``backfill_fact_vector_index`` worker task. Search hits are only ids;
+every hit is re-read from ``facts`` with the usual active/ownership
+filters, so a stale point is never surfaced.
+
+One Qdrant collection per embedding model (``runtime_facts__<alias>``).
+The model is ``RUNTIME_FACT_EMBEDDING_MODEL`` or, when empty, the tenant's
+primary embedding model. Index failures are logged and swallowed, and
+retrieval falls back to recency + lexical candidates.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.memory import FactScope
+from app.runtime.memory.dto import FactDTO
+
+logger = get_logger(__name__)
+
+COLLECTION_PREFIX = "runtime_facts__"
+
+_PENDING_INFO_KEY = "fact_vector_index_pending_writes"
+# Index writes scheduled from commit hooks; kept referenced until done.
+_background: Set[asyncio.Task] = set()
+
+_IndexWrite = Callable[[], Awaitable[None]]
+
+
+def fact_embedding_text(fact: FactDTO) -> str:
+    return f"{fact.subject}: {fact.value}"
+
+
+def fact_collection_name(model_alias: str) -> str:
+    return COLLECTION_PREFIX + re.sub(r"[^a-zA-Z0-9_]+", "_", model_alias).strip("_").lower()
+
+
+class FactVectorIndex:
+    """Embeds facts on write and answers similarity queries per owner."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        model_alias: Optional[str] = None,
+        vector_store: Any = None,
+        embedder: Any = None,
+    ) -> None:
+        self._session = session
+        self._configured_alias = model_alias if model_alias is not None else get_settings().RUNTIME_FACT_EMBEDDING_MODEL
+        self._vector_store = vector_store
+        self._embedder = embedder
+        self._aliases: Dict[Optional[UUID], Optional[str]] = {}
+        self._ensured: set[str] = set()
+
+    @classmethod
+    def from_settings(cls, session: AsyncSession) -> Optional["FactVectorIndex"]:
+        if not get_settings().RUNTIME_FACT_VECTOR_INDEX_ENABLED:
+            return None
+        return cls(session)
+
+    # --------------------------------------------------------- write ---
+
+    async def index(self, facts: Sequence[FactDTO]) -> None:
+        for write in await self._upserts(facts):
+            await write()
+
+    async def remove(self, fact_ids: Sequence[UUID], *, tenant_id: Optional[UUID]) -> None:
+        write = await self._delete(fact_ids, tenant_id=tenant_id)
+        if write is not None:
+            await write()
+
+    async def index_after_commit(self, facts: Sequence[FactDTO]) -> None:
+        """Embed ``facts`` now; upsert them once the session commits."""
+        for write in await self._upserts(facts):
+            await self._after_commit(write)
+
+    async def remove_after_commit(self, fact_ids: Sequence[UUID], *, tenant_id: Optional[UUID]) -> None:
+        """Drop the points of ``fact_ids`` once the session commits."""
+        write = await self._delete(fact_ids, tenant_id=tenant_id)
+        if write is not None:
+            await self._after_commit(write)
+
+    async def _upserts(self, facts: Sequence[FactDTO]) -> List[_IndexWrite]:
+        by_alias: Dict[str, list[FactDTO]] = {}
+        for fact in facts:
+            if fact.id is None:
+                continue
+            alias = await self._model_alias(fact.tenant_id)
+            if alias:
+                by_alias.setdefault(alias, []).append(fact)
+        writes: List[_IndexWrite] = []
+        for alias, batch in by_alias.items():
+            try:
+                vectors = await self._embed(alias, [fact_embedding_text(fact) for fact in batch])
+            except Exception as exc:
+                logger.warning("Fact vector index write failed (%s): %r", alias, exc)
+                continue
+            writes.append(self._upsert_write(alias, batch, vectors))
+        return writes
+
+    def _upsert_write(self, alias: str, batch: list[FactDTO], vectors: list[list[float]]) -> _IndexWrite:
+        async def write() -> None:
+            try:
+                collection = fact_collection_name(alias)
+                store = self._store()
+                if collection not in self._ensured:
+                    await store.ensure_collection(collection, len(vectors[0]))
+                    self._ensured.add(collection)
+                await store.upsert(
+                    collection,
+                    vectors,
+                    [
+                        {
+                            "fact_id": str(fact.id),
+                            "owner_type": fact.owner_type,
+                            "owner_id": str(fact.owner_id) if fact.owner_id else None,
+                            "scope": fact.scope.value,
+                            "tenant_id": str(fact.tenant_id) if fact.tenant_id else None,
+                        }
+                        for fact in batch
+                    ],
+                    ids=[str(fact.id) for fact in batch],
+                )
+            except Exception as exc:
+                logger.warning("Fact vector index write failed (%s): %r", alias, exc)
+
+        return write
+
+    async def _delete(self, fact_ids: Sequence[UUID], *, tenant_id: Optional[UUID]) -> Optional[_IndexWrite]:
+        ids = [str(fact_id) for fact_id in fact_ids if fact_id is not None]
+        alias = await self._model_alias(tenant_id)
+        if not ids or not alias:
+            return None
+
+        async def write() -> None:
+            try:
+                await self._store().delete_by_filter(
+                    fact_collection_name(alias), {"must": [("fact_id", ids)]}
+                )
+            except Exception as exc:
+                logger.warning("Fact vector index delete failed (%s): %r", alias, exc)
+
+        return write
+
+    async def _after_commit(self, write: _IndexWrite) -> None:
+        # Outside a transaction (or without a real session) there is nothing
+        # to wait for.
+        sync_session = self._session.sync_session if isinstance(self._session, AsyncSession) else self._session
+        if not isinstance(sync_session, Session) or not sync_session.in_transaction():
+            await write()
+            return
+        pending = sync_session.info.get(_PENDING_INFO_KEY)
+        if pending is None:
+            pending = sync_session.info[_PENDING_INFO_KEY] = []
+            event.listen(sync_session, "after_commit", _run_pending_writes)
+            event.listen(sync_session, "after_rollback", _drop_pending_writes)
+        pending.append(write)
+
+    # ---------------------------------------------------------- read ---
+
+    async def similar(
+        self,
+        query: str,
+        *,
+        scopes: Sequence[FactScope],
+        owner_type: str,
+        owner_id: UUID,
+        tenant_id: Optional[UUID],
+        limit: int,
+    ) -> Dict[UUID, float]:
+        """Cosine similarity of the closest facts of one owner, by fact id."""
+        alias = await self._model_alias(tenant_id)
+        if not alias or not (query or "").strip() or limit <= 0:
+            return {}
+        try:
+            vector = (await self._embed(alias, [query]))[0]
+            hits = await self._store().search(
+                collection=fact_collection_name(alias),
+                query=vector,
+                top_k=limit,
+                filter={"must": [
+                    ("owner_type", owner_type),
+                    ("owner_id", str(owner_id)),
+                    ("scope", [scope.value for scope in scopes]),
+                ]},
+            )
+        except Exception as exc:
+            logger.warning("Fact vector search failed (%s): %r", alias, exc)
+            return {}
+        similarities: Dict[UUID, float] = {}
+        for hit in hits:
+            try:
+                similarities[UUID(str((hit.get("payload") or {}).get("fact_id") or hit.get("id")))] = float(hit.get("score") or 0.0)
+            except (TypeError, ValueError):
+                continue
+        return similarities
+
+    # -------------------------------------------------------- helpers ---
+
+    def _store(self) -> Any:
+        if self._vector_store is None:
+            from app.adapters.impl.qdrant import QdrantVectorStore
+
+            self._vector_store = QdrantVectorStore()
+        return self._vector_store
+
+    async def _embed(self, alias: str, texts: list[str]) -> list[list[float]]:
+        embedder = self._embedder
+        if embedder is None:
+            from app.adapters.embeddings import EmbeddingServiceFactory
+            from app.services.embedding_model_config_service import EmbeddingModelConfigService
+
+            await EmbeddingModelConfigService.ensure_registered(self._session, alias)
+            embedder = EmbeddingServiceFactory.get_service(alias)
+        return await asyncio.to_thread(embedder.embed_texts, texts)
+
+    async def _model_alias(self, tenant_id: Optional[UUID]) -> Optional[str]:
+        if self._configured_alias:
+            return self._configured_alias
+        if tenant_id in self._aliases:
+            return self._aliases[tenant_id]
+        alias: Optional[str] = None
+        if tenant_id is not None:
+            from app.services.collection.vector_lifecycle import CollectionVectorLifecycleService
+
+            alias = await CollectionVectorLifecycleService(self._session).resolve_primary_vector_model(tenant_id)
+        self._aliases[tenant_id] = alias
+        return alias
+
+
+def _run_pending_writes(session: Session) -> None:
+    pending: List[_IndexWrite] = session.info.get(_PENDING_INFO_KEY) or []
+    session.info[_PENDING_INFO_KEY] = []
+    if not pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("Fact vector index: commit outside an event loop, %d writes dropped", len(pending))
+        return
+
+    async def _run() -> None:
+        for write in pending:
+            await write()
+
+    task = loop.create_task(_run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def _drop_pending_writes(session: Session) -> None:
+    session.info[_PENDING_INFO_KEY] = []
+
+
+async def wait_for_index_writes() -> None:
+    """Wait for index writes scheduled by commits on this event loop.
+
+    Celery tasks call this before ``asyncio.run`` returns, which would
+    otherwise cancel them.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _background if task.get_loop() is loop]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
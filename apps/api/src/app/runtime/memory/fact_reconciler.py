@@ -1,9 +1,14 @@
-"""Deterministic persistence for compacted fact candidates."""
+"""Deterministic persistence for compacted fact candidates.
+
+When a ``FactVectorIndex`` is configured, facts that become confirmed are
+embedded and facts that are superseded, demoted or replaced are dropped
+from the index, mirroring ``FactStore.upsert_with_supersede``.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Sequence
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import or_, select, update
@@ -13,6 +18,8 @@ from app.models.memory import Fact, FactObservation, FactScope, FactStatus
 from app.models.memory import FactSource
 from app.models.project import Project
 from app.runtime.memory.dto import FactDTO
+from app.runtime.memory.fact_index import FactVectorIndex
+from app.services.glossary_service import GlossaryService
 
 
 @dataclass(frozen=True)
@@ -33,8 +40,9 @@ class FactReconciliationChange:
 
 
 class FactReconciler:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, *, vector_index: Optional[FactVectorIndex] = None) -> None:
         self._session = session
+        self._vector_index = vector_index if vector_index is not None else FactVectorIndex.from_settings(session)
 
     async def current_for(
         self,
@@ -68,6 +76,7 @@ class FactReconciler:
         validation, therefore this operation never creates a project from an
         agent conclusion alone.
         """
+        created = False
         for candidate in candidates:
             if candidate.scope != FactScope.PROJECT:
                 continue
@@ -77,7 +86,10 @@ class FactReconciler:
             exists = await self._session.execute(select(Project.id).where(Project.key == key))
             if exists.scalar_one_or_none() is None:
                 self._session.add(Project(key=key, name=key, aliases=[key]))
+                created = True
         await self._session.flush()
+        if created:
+            await GlossaryService.invalidate_index(self._session)
 
     async def apply(
         self,
@@ -104,6 +116,8 @@ class FactReconciler:
     ) -> list[FactReconciliationChange]:
         await self.ensure_projects(candidates)
         changes: list[FactReconciliationChange] = []
+        confirmed: list[Fact] = []
+        retired: list[tuple[UUID, UUID | None]] = []
         for candidate in candidates:
             compaction_action = str(candidate.metadata.get("compaction_action") or "add")
             owner_type, owner_id, project_id = await self._owner_for(candidate, user_id=user_id, tenant_id=tenant_id)
@@ -138,9 +152,13 @@ class FactReconciler:
                 self._session.add(existing)
                 await self._session.flush()
                 if compaction_action in {"rewrite", "supersede"}:
-                    await self._supersede_targets(existing, candidate.metadata.get("compaction_target_ids") or [])
+                    retired.extend(await self._supersede_targets(
+                        existing, candidate.metadata.get("compaction_target_ids") or [],
+                    ))
             added = await self._add_observations(existing, candidate.metadata.get("evidence") or [])
             if not added:
+                if is_new and existing.status == FactStatus.CONFIRMED.value:
+                    confirmed.append(existing)
                 continue
             existing.support_count += added
             existing.observed_at = datetime.now(timezone.utc)
@@ -159,6 +177,10 @@ class FactReconciler:
                 await self._apply_confirmed_project_aliases(existing, candidate.metadata.get("project_aliases") or [])
             self._session.add(existing)
             status_after = str(existing.status)
+            if status_after == FactStatus.CONFIRMED.value and status_before != status_after:
+                confirmed.append(existing)
+            elif status_before == FactStatus.CONFIRMED.value and status_after != status_before:
+                retired.append((existing.id, existing.tenant_id))
             if is_new:
                 change_type = "confirmed" if status_after == FactStatus.CONFIRMED.value else "candidate_created"
             elif status_before != status_after and status_after == FactStatus.CONFIRMED.value:
@@ -179,8 +201,33 @@ class FactReconciler:
                 compaction_action=compaction_action,
             ))
         await self._session.flush()
+        await self.sync_vector_index(confirmed=confirmed, retired=retired)
         return changes
 
+    async def sync_vector_index(
+        self,
+        *,
+        confirmed: Sequence[Fact] = (),
+        retired: Sequence[tuple[UUID, UUID | None]] = (),
+        after_commit: bool = True,
+    ) -> None:
+        """Embed newly confirmed facts and drop ``(fact_id, tenant_id)`` pairs.
+
+        Qdrant is written once the session commits (nothing on rollback);
+        ``after_commit=False`` writes right away, for read-only passes.
+        """
+        if self._vector_index is None:
+            return
+        index = self._vector_index.index_after_commit if after_commit else self._vector_index.index
+        remove = self._vector_index.remove_after_commit if after_commit else self._vector_index.remove
+        if confirmed:
+            await index([_dto(row) for row in confirmed])
+        by_tenant: dict[UUID | None, list[UUID]] = {}
+        for fact_id, fact_tenant_id in retired:
+            by_tenant.setdefault(fact_tenant_id, []).append(fact_id)
+        for fact_tenant_id, ids in by_tenant.items():
+            await remove(ids, tenant_id=fact_tenant_id)
+
     async def _apply_confirmed_project_aliases(self, fact: Fact, raw_aliases: Sequence[object]) -> None:
         if fact.project_id is None:
             return
@@ -190,13 +237,19 @@ class FactReconciler:
             return
         aliases = list(project.aliases or [])
         known = {item.casefold() for item in aliases}
+        changed = False
         for raw in raw_aliases:
             alias = " ".join(str(raw or "").strip().split())[:120]
             if alias and alias.casefold() not in known and alias.casefold() != project.name.casefold():
                 aliases.append(alias)
                 known.add(alias.casefold())
+                changed = True
+        if not changed:
+            return
         project.aliases = aliases
         self._session.add(project)
+        # Project aliases are glossary terms of the compiled index.
+        await GlossaryService.invalidate_index(self._session)
 
     async def _owner_for(self, candidate: FactDTO, *, user_id: UUID | None, tenant_id: UUID | None) -> tuple[str | None, UUID | None, UUID | None]:
         if candidate.scope == FactScope.USER:
@@ -231,8 +284,11 @@ class FactReconciler:
         stmt = stmt.where(Fact.project_id == inserted.project_id) if inserted.project_id else stmt.where(Fact.owner_type == inserted.owner_type, Fact.owner_id == inserted.owner_id)
         await self._session.execute(stmt)
 
-    async def _supersede_targets(self, replacement: Fact, raw_ids: Sequence[object]) -> None:
-        """Apply an LLM-selected semantic replacement without key heuristics."""
+    async def _supersede_targets(self, replacement: Fact, raw_ids: Sequence[object]) -> list[tuple[UUID, UUID | None]]:
+        """Apply an LLM-selected semantic replacement without key heuristics.
+
+        Returns ``(fact_id, tenant_id)`` of the superseded rows.
+        """
         ids: list[UUID] = []
         for raw in raw_ids:
             try:
@@ -242,7 +298,7 @@ class FactReconciler:
             if parsed != replacement.id:
                 ids.append(parsed)
         if not ids:
-            return
+            return []
         stmt = update(Fact).where(
             Fact.id.in_(ids),
             Fact.superseded_by.is_(None),
@@ -251,7 +307,10 @@ class FactReconciler:
         stmt = stmt.where(Fact.project_id == replacement.project_id) if replacement.project_id else stmt.where(
             Fact.owner_type == replacement.owner_type, Fact.owner_id == replacement.owner_id,
         )
-        await self._session.execute(stmt.values(superseded_by=replacement.id))
+        result = await self._session.execute(
+            stmt.values(superseded_by=replacement.id).returning(Fact.id, Fact.tenant_id)
+        )
+        return [(fact_id, fact_tenant_id) for fact_id, fact_tenant_id in result.all()]
 
     async def _add_observations(self, fact: Fact, raw: Sequence[dict[str, Any]]) -> int:
         added = 0
@@ -284,11 +343,12 @@ class FactReconciler:
         if previous is None:
             return None
         now = datetime.now(timezone.utc)
-        await self._session.execute(update(Fact).where(
+        demoted = await self._session.execute(update(Fact).where(
             Fact.owner_type == "user", Fact.owner_id == user_id,
             Fact.scope == FactScope.USER.value, Fact.subject == subject,
             Fact.superseded_by.is_(None), Fact.id != fact_id,
-        ).values(status=FactStatus.UNCONFIRMED.value))
+        ).values(status=FactStatus.UNCONFIRMED.value).returning(Fact.id, Fact.tenant_id))
+        retired = [(previous.id, previous.tenant_id), *demoted.all()]
         previous.status = FactStatus.UNCONFIRMED.value
         replacement = Fact(
             tenant_id=previous.tenant_id,
@@ -319,6 +379,7 @@ class FactReconciler:
             source_label="Manual profile edit",
         ))
         await self._session.flush()
+        await self.sync_vector_index(confirmed=[replacement], retired=retired)
         return replacement
 
 
@@ -340,6 +401,8 @@ def _dto(row: Fact) -> FactDTO:
         kind=row.kind or "fact",
         metadata=dict(row.entry_metadata or {}),
         confidence=row.confidence,
+        id=row.id,
+        status=FactStatus(row.status),
     )
 
 
@@ -4,12 +4,17 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Protocol, Sequence
+from typing import Dict, List, Mapping, Protocol, Sequence
+from uuid import UUID
 
 from app.models.memory import FactScope
 from app.runtime.memory.dto import FactDTO
 
 
+SEMANTIC_WEIGHT = 2.0
+SEMANTIC_SUPPORT_THRESHOLD = 0.55
+
+
 @dataclass(frozen=True)
 class RankedFact:
     fact: FactDTO
@@ -17,6 +22,11 @@ class RankedFact:
     lexical_hits: int
     is_stale: bool
     is_low_confidence: bool
+    similarity: float = 0.0
+
+    @property
+    def has_query_support(self) -> bool:
+        return self.lexical_hits > 0 or self.similarity >= SEMANTIC_SUPPORT_THRESHOLD
 
 
 @dataclass(frozen=True)
@@ -44,16 +54,18 @@ class LexicalFactRanker:
         self._low_confidence_threshold = max(0.0, min(float(low_confidence_threshold), 1.0))
 
     def rank(self, *, query: str, facts: Sequence[FactDTO]) -> List[RankedFact]:
-        terms = _query_terms(query)
+        terms = query_terms(query)
         now = datetime.now(timezone.utc)
         ranked: List[RankedFact] = []
         for idx, fact in enumerate(facts):
             text = f"{fact.subject} {fact.value}".lower()
             lexical_hits = sum(1 for term in terms if term in text)
+            similarity = self._similarity(fact)
             if terms and lexical_hits == 0:
                 base = 0.05
             else:
                 base = 1.0 + lexical_hits
+            base += SEMANTIC_WEIGHT * similarity
             scope_boost = 0.20 if fact.scope == FactScope.USER else 0.12
             if fact.scope == FactScope.TENANT and fact.tenant_id is None:
                 scope_boost = 0.10
@@ -71,18 +83,39 @@ class LexicalFactRanker:
                     lexical_hits=lexical_hits,
                     is_stale=is_stale,
                     is_low_confidence=is_low_confidence,
+                    similarity=similarity,
                 )
             )
 
         ranked.sort(key=lambda item: item.score, reverse=True)
         return ranked
 
+    def _similarity(self, fact: FactDTO) -> float:
+        return 0.0
+
+
+class HybridFactRanker(LexicalFactRanker):
+    """Lexical ranking plus vector similarity from the fact index.
+
+    ``similarity`` maps fact id to cosine similarity for the current query
+    (see ``FactStore.retrieve_relevant``); facts without a score rank as in
+    the lexical ranker. ``facts`` must be ordered newest-first.
+    """
+
+    def __init__(self, *, similarity: Mapping[UUID, float], **kwargs: object) -> None:
+        super().__init__(**kwargs)  # type: ignore[arg-type]
+        self._similarities = dict(similarity)
+
+    def _similarity(self, fact: FactDTO) -> float:
+        return max(0.0, min(float(self._similarities.get(fact.id, 0.0)), 1.0))
+
 
 class FactSelectionPolicy:
     """Selection policy for runtime memory facts.
 
     Rules:
-    * low-confidence and stale facts are included only with lexical support;
+    * low-confidence and stale facts are included only with lexical or
+      strong semantic support;
     * contradictions by subject preserve at least one fact per distinct value;
     * selection stays query-ranked and bounded by `limit`.
     """
@@ -103,10 +136,10 @@ class FactSelectionPolicy:
         omitted_stale = 0
 
         for item in ranked:
-            if item.is_low_confidence and item.lexical_hits == 0:
+            if item.is_low_confidence and not item.has_query_support:
                 omitted_low_confidence += 1
                 continue
-            if item.is_stale and item.lexical_hits == 0:
+            if item.is_stale and not item.has_query_support:
                 omitted_stale += 1
                 continue
             prefiltered.append(item)
@@ -150,7 +183,7 @@ class FactSelectionPolicy:
         return FactSelectionResult(selected=selected, diagnostics=diagnostics)
 
 
-def _query_terms(query: str) -> set[str]:
+def query_terms(query: str) -> set[str]:
     return {
         token
         for token in re.findall(r"[\wа-яА-ЯёЁ]{3,}", (query or "").lower())
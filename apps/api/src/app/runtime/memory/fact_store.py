@@ -14,25 +14,39 @@ Conventions
 * Writes are partitioned into tiny primitives
   (`add`, `mark_superseded`) plus one higher-level orchestrator
   (`upsert_with_supersede`). Tests mock the primitives.
+* When a `FactVectorIndex` is configured, `upsert_with_supersede` embeds
+  the inserted fact and drops the superseded one from the index; only the
+  changed fact is re-embedded. Forget operations drop their points too.
 """
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.models.memory import Fact, FactScope, FactSource, FactStatus
 from app.runtime.memory.dto import FactDTO
+from app.runtime.memory.fact_index import FactVectorIndex
+from app.runtime.memory.fact_selection import query_terms
+
+LEXICAL_CANDIDATE_TERMS = 8
 
 
 class FactStore:
     """Repository for the `facts` table."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        vector_index: Optional[FactVectorIndex] = None,
+    ) -> None:
         self._session = session
+        self._vector_index = vector_index if vector_index is not None else FactVectorIndex.from_settings(session)
 
     # ---------------------------------------------------------- read ---
 
@@ -100,6 +114,70 @@ class FactStore:
         result = await self._session.execute(stmt)
         return [_orm_to_dto(r) for r in result.scalars().all()]
 
+    async def retrieve_relevant(
+        self,
+        *,
+        query: str,
+        scopes: Sequence[FactScope],
+        owner_type: Optional[str],
+        owner_id: Optional[UUID],
+        tenant_id: Optional[UUID] = None,
+        limit: int = 20,
+    ) -> Tuple[List[FactDTO], Dict[UUID, float]]:
+        """Hybrid candidate pool for one query.
+
+        Unions the `limit` newest facts, up to `limit` facts whose subject or
+        value contains a query term, and the nearest facts from the vector
+        index. Returns the pool newest-first plus vector similarity by fact
+        id; the ranker combines lexical, similarity, scope and recency.
+        """
+        if not scopes or owner_type is None or owner_id is None:
+            return [], {}
+        pool: Dict[UUID, FactDTO] = {
+            fact.id: fact
+            for fact in await self.retrieve(
+                scopes=scopes, owner_type=owner_type, owner_id=owner_id, limit=limit,
+            )
+        }
+
+        terms = sorted(query_terms(query), key=len, reverse=True)[:LEXICAL_CANDIDATE_TERMS]
+        if terms:
+            conditions = []
+            for term in terms:
+                conditions.append(Fact.normalized_value.contains(term, autoescape=True))
+                conditions.append(Fact.subject.icontains(term, autoescape=True))
+            stmt = self._active_owned(scopes, owner_type, owner_id).where(or_(*conditions))
+            result = await self._session.execute(stmt.order_by(Fact.observed_at.desc()).limit(limit))
+            pool.update({row.id: _orm_to_dto(row) for row in result.scalars().all()})
+
+        similarities: Dict[UUID, float] = {}
+        candidates = int(get_settings().RUNTIME_FACT_VECTOR_CANDIDATES)
+        if self._vector_index is not None and candidates > 0:
+            similarities = await self._vector_index.similar(
+                query, scopes=scopes, owner_type=owner_type, owner_id=owner_id,
+                tenant_id=tenant_id, limit=candidates,
+            )
+            missing = [fact_id for fact_id in similarities if fact_id not in pool]
+            if missing:
+                stmt = self._active_owned(scopes, owner_type, owner_id).where(Fact.id.in_(missing))
+                result = await self._session.execute(stmt)
+                pool.update({row.id: _orm_to_dto(row) for row in result.scalars().all()})
+            similarities = {fact_id: score for fact_id, score in similarities.items() if fact_id in pool}
+
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        facts = sorted(pool.values(), key=lambda fact: fact.observed_at or epoch, reverse=True)
+        return facts, similarities
+
+    @staticmethod
+    def _active_owned(scopes: Sequence[FactScope], owner_type: str, owner_id: UUID):
+        return select(Fact).where(
+            Fact.scope.in_([s.value for s in scopes]),
+            Fact.superseded_by.is_(None),
+            Fact.status == FactStatus.CONFIRMED.value,
+            Fact.owner_type == owner_type,
+            Fact.owner_id == owner_id,
+        )
+
     async def list_user_visible(
         self,
         *,
@@ -175,8 +253,12 @@ class FactStore:
             update(Fact)
             .where(Fact.id == fact_id, Fact.superseded_by.is_(None))
             .values(superseded_by=fact_id)
+            .returning(Fact.tenant_id)
         )
-        await self._session.execute(stmt)
+        result = await self._session.execute(stmt)
+        if self._vector_index is not None:
+            for tenant_id in result.scalars().all():
+                await self._vector_index.remove_after_commit([fact_id], tenant_id=tenant_id)
 
     async def forget_owned(self, *, owner_type: str, owner_id: UUID, fact_ids: Sequence[UUID]) -> int:
         result = await self._session.execute(
@@ -184,9 +266,16 @@ class FactStore:
                 Fact.id.in_(fact_ids), Fact.owner_type == owner_type,
                 Fact.owner_id == owner_id, Fact.user_visible.is_(True),
                 Fact.superseded_by.is_(None),
-            ).values(superseded_by=Fact.id)
+            ).values(superseded_by=Fact.id).returning(Fact.id, Fact.tenant_id)
         )
-        return int(result.rowcount or 0)
+        forgotten = result.all()
+        if self._vector_index is not None:
+            by_tenant: Dict[Optional[UUID], List[UUID]] = {}
+            for fact_id, tenant_id in forgotten:
+                by_tenant.setdefault(tenant_id, []).append(fact_id)
+            for tenant_id, ids in by_tenant.items():
+                await self._vector_index.remove_after_commit(ids, tenant_id=tenant_id)
+        return len(forgotten)
 
     async def reassign_tenant_context(self, *, from_tenant_id: UUID, to_tenant_id: UUID) -> int:
         result = await self._session.execute(
@@ -220,7 +309,10 @@ class FactStore:
         )
 
         if existing is None:
-            return await self.add(new)
+            inserted = await self.add(new)
+            if self._vector_index is not None:
+                await self._vector_index.index_after_commit([inserted])
+            return inserted
 
         if _values_equivalent(existing.value, new.value):
             # Refresh observed_at + take the higher confidence; leave id intact.
@@ -255,6 +347,9 @@ class FactStore:
         # Contradiction — insert new, mark the old as superseded by the new.
         inserted = await self.add(new)
         await self.mark_superseded(old_id=existing.id, new_id=inserted.id)
+        if self._vector_index is not None:
+            await self._vector_index.index_after_commit([inserted])
+            await self._vector_index.remove_after_commit([existing.id], tenant_id=existing.tenant_id)
         return inserted
 
     # --------------------------------------------------------- misc ---
@@ -0,0 +1,86 @@
+"""Compiled project-alias and glossary index shared across turns.
+
+``GlossaryService.load_index`` builds one per process and keeps it in a
+versioned cache until the glossary or project catalogue changes, so turns
+neither reload the catalogue from Postgres nor rescan alias lists.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.runtime.memory.term_matcher import TermMatcher, normalize_term
+
+PROJECT = "project"
+GLOSSARY = "glossary"
+
+
+@dataclass(frozen=True)
+class GlossaryMatch:
+    kind: str  # PROJECT or GLOSSARY
+    index: int  # position in ``project_terms`` / ``global_terms``
+    entry: Dict[str, Any]
+    surface: str
+    start: int
+    end: int
+
+
+class GlossaryIndex:
+    """Project keys, names, aliases and glossary terms compiled into one automaton.
+
+    ``project_terms`` and ``global_terms`` keep the ``GlossaryService``
+    projections and are shared by every reader; treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        project_terms: Sequence[Dict[str, Any]],
+        global_terms: Sequence[Dict[str, Any]],
+        *,
+        version: Optional[int] = None,
+    ) -> None:
+        self.project_terms: List[Dict[str, Any]] = list(project_terms)
+        self.global_terms: List[Dict[str, Any]] = list(global_terms)
+        self.version = version
+        surfaces: List[Tuple[str, Tuple[str, int]]] = [
+            (str(surface), (PROJECT, index))
+            for index, item in enumerate(self.project_terms)
+            for surface in (item["key"], item["name"], *item["aliases"])
+        ] + [
+            (str(surface), (GLOSSARY, index))
+            for index, item in enumerate(self.global_terms)
+            for surface in (item["term"], *item["aliases"])
+        ]
+        self._exact = TermMatcher(surfaces)
+        self._stems = TermMatcher((stem, owner) for surface, owner in surfaces if (stem := _stem(surface)))
+
+    def match(self, text: str) -> List[GlossaryMatch]:
+        """Whole-word occurrences of any surface form, ordered by position."""
+        return [self._resolve(hit.value, hit.surface, hit.start, hit.end) for hit in self._exact.match(text)]
+
+    def near_matches(self, text: str) -> List[GlossaryMatch]:
+        """Words starting with a term's stem where no term matches exactly.
+
+        These are usually inflected forms (``Немы`` for ``Нема``) that only
+        a language model can resolve reliably.
+        """
+        starts = {hit.start for hit in self._exact.match(text)}
+        return [
+            self._resolve(hit.value, hit.surface, hit.start, hit.end)
+            for hit in self._stems.match(text, whole_words=False)
+            if hit.start not in starts
+        ]
+
+    def _resolve(self, owner: Tuple[str, int], surface: str, start: int, end: int) -> GlossaryMatch:
+        kind, index = owner
+        entries = self.project_terms if kind == PROJECT else self.global_terms
+        return GlossaryMatch(kind=kind, index=index, entry=entries[index], surface=surface, start=start, end=end)
+
+
+def _stem(surface: str) -> Optional[str]:
+    term = normalize_term(surface)
+    if len(term) >= 6:
+        return term[:-2]
+    if len(term) >= 4:
+        return term[:-1]
+    return None
@@ -16,6 +16,7 @@ from app.models.glossary import (
 )
 from app.models.memory import FactScope, FactSource
 from app.runtime.memory.dto import FactDTO
+from app.services.glossary_service import GlossaryService
 
 
 GLOSSARY_CONFIRMATION_SUPPORT = 3
@@ -92,6 +93,7 @@ class GlossaryReconciler:
         tenant_id: UUID | None,
     ) -> int:
         changed = 0
+        index_changed = False
         for candidate in candidates:
             if candidate.kind != "glossary":
                 continue
@@ -107,6 +109,7 @@ class GlossaryReconciler:
                 continue
             scope, owner_id = owner
             row = await self._find(scope=scope, owner_id=owner_id, canonical_term=candidate.subject)
+            indexed_before = _index_view(row)
             aliases = _aliases(candidate.metadata.get("aliases") or [], candidate.subject)
             if row is None:
                 row = GlossaryEntry(
@@ -127,18 +130,20 @@ class GlossaryReconciler:
                     row.description = candidate.value
 
             added = await self._add_observations(row, candidate.metadata.get("evidence") or [])
-            if not added:
-                continue
-            now = datetime.now(timezone.utc)
-            row.support_count += added
-            if row.status != GlossaryStatus.CONFIRMED.value and row.support_count >= GLOSSARY_CONFIRMATION_SUPPORT:
-                row.status = GlossaryStatus.CONFIRMED.value
-                row.first_confirmed_at = row.first_confirmed_at or now
-            if row.status == GlossaryStatus.CONFIRMED.value:
-                row.last_confirmed_at = now
-            self._session.add(row)
-            changed += 1
+            if added:
+                now = datetime.now(timezone.utc)
+                row.support_count += added
+                if row.status != GlossaryStatus.CONFIRMED.value and row.support_count >= GLOSSARY_CONFIRMATION_SUPPORT:
+                    row.status = GlossaryStatus.CONFIRMED.value
+                    row.first_confirmed_at = row.first_confirmed_at or now
+                if row.status == GlossaryStatus.CONFIRMED.value:
+                    row.last_confirmed_at = now
+                self._session.add(row)
+                changed += 1
+            index_changed = index_changed or _index_view(row) != indexed_before
         await self._session.flush()
+        if index_changed:
+            await GlossaryService.invalidate_index(self._session)
         return changed
 
     async def _find(
@@ -209,6 +214,13 @@ def _owner_for(
     return None
 
 
+def _index_view(row: GlossaryEntry | None) -> tuple[object, ...] | None:
+    """What ``GlossaryIndex`` sees of a row: confirmed global terms only."""
+    if row is None or row.scope != GlossaryScope.GLOBAL.value or row.status != GlossaryStatus.CONFIRMED.value:
+        return None
+    return (row.canonical_term, row.description, tuple(row.aliases or ()))
+
+
 def _aliases(raw: Sequence[object], canonical_term: str) -> list[str]:
     result: list[str] = []
     seen: set[str] = {" ".join(canonical_term.strip().casefold().split())}
@@ -1,18 +1,33 @@
-"""Pre-planner selection of durable memory and project terminology."""
+"""Pre-planner selection of durable memory and project terminology.
+
+Selection is local when it is clear-cut: few facts, and every project or
+glossary term is either named verbatim in the request or not mentioned at
+all. An inflected or shared alias (``Немы`` for ``Нема``, one alias on two
+projects) or a larger fact set goes to the MEMORY role LLM call, whose
+results are memoized by request and candidate-set hash.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Any, Awaitable, Callable, Sequence
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.http.clients import LLMClientProtocol
 from app.models.system_llm_role import SystemLLMRoleType
 from app.runtime.events import RuntimeEvent
 from app.runtime.llm.structured import StructuredLLMCall
 from app.runtime.memory.dto import FactDTO
+from app.runtime.memory.fact_selection import FactSelectionPolicy, LexicalFactRanker
+from app.runtime.memory.glossary_index import GLOSSARY, PROJECT, GlossaryIndex
+from app.runtime.memory.term_matcher import normalize_term
 
 
 class _PreparationOutput(BaseModel):
@@ -30,13 +45,30 @@ class PreparedMemoryContext:
     selected_glossary_count: int
     ambiguities: list[str]
     fallback: bool = False
+    # "local" (no LLM call), "llm" or "cache" (memoized LLM selection).
+    strategy: str = "llm"
+
+
+_memo: "OrderedDict[str, PreparedMemoryContext]" = OrderedDict()
 
 
 class MemoryPreparer:
-    """One bounded LLM call that prepares Planner's memory input."""
+    """Prepares Planner's memory input locally or with one bounded LLM call."""
 
-    def __init__(self, *, session: AsyncSession, llm_client: LLMClientProtocol) -> None:
+    def __init__(
+        self,
+        *,
+        session: AsyncSession,
+        llm_client: LLMClientProtocol,
+        fast_path_max_facts: int | None = None,
+        cache_size: int | None = None,
+    ) -> None:
+        settings = get_settings()
         self._structured = StructuredLLMCall(session=session, llm_client=llm_client)
+        self._fast_path_max_facts = (
+            settings.RUNTIME_MEMORY_FAST_PATH_MAX_FACTS if fast_path_max_facts is None else fast_path_max_facts
+        )
+        self._cache_size = settings.RUNTIME_MEMORY_PREPARATION_CACHE_SIZE if cache_size is None else cache_size
 
     async def prepare(
         self,
@@ -51,7 +83,19 @@ class MemoryPreparer:
         sandbox_overrides: dict[str, Any] | None,
         event_sink: Callable[[RuntimeEvent], Awaitable[None]] | None = None,
         agent_execution_id: str | None = None,
+        glossary_index: GlossaryIndex | None = None,
     ) -> PreparedMemoryContext:
+        """``glossary_index`` is reused when it was built from these exact lists."""
+        if (
+            glossary_index is None
+            or glossary_index.project_terms is not project_glossary
+            or glossary_index.global_terms is not glossary
+        ):
+            glossary_index = GlossaryIndex(project_glossary, glossary)
+        local = _select_locally(request_text, facts, glossary_index, max_facts=self._fast_path_max_facts)
+        if local is not None:
+            return _build_context(local, facts, project_glossary, glossary, strategy="local")
+
         payload = {
             "request": request_text,
             "facts": [
@@ -72,6 +116,12 @@ class MemoryPreparer:
                 for index, item in enumerate(glossary)
             ],
         }
+        memo_key = _memo_key(payload, sandbox_overrides)
+        cached = _memo.get(memo_key)
+        if cached is not None:
+            _memo.move_to_end(memo_key)
+            return replace(cached, items=copy.deepcopy(cached.items), ambiguities=list(cached.ambiguities), strategy="cache")
+
         try:
             result = await self._structured.invoke(
                 role=SystemLLMRoleType.MEMORY,
@@ -87,33 +137,87 @@ class MemoryPreparer:
         except Exception:  # memory preparation is optional
             return PreparedMemoryContext(items=[], selected_fact_count=0, selected_project_count=0, selected_glossary_count=0, ambiguities=[], fallback=True)
 
-        output = result.value
-        chosen_facts = _by_indexes(facts, output.fact_indexes)
-        chosen_projects = _by_indexes(project_glossary, output.project_indexes)
-        chosen_glossary = _by_indexes(glossary, output.glossary_indexes)
-        items = [
-            {"type": "fact", "scope": item.scope.value, "subject": item.subject, "value": item.value}
-            for item in chosen_facts
-        ] + [
-            {"type": "project", "project_id": str(item["id"]), "key": item["key"], "name": item["name"], "matched_aliases": item["aliases"]}
-            for item in chosen_projects
-        ] + [
-            {
-                "type": "glossary",
-                "scope": "global",
-                "term": item["term"],
-                "description": item["description"],
-                "aliases": item["aliases"],
-            }
-            for item in chosen_glossary
-        ]
-        return PreparedMemoryContext(
-            items=items,
-            selected_fact_count=len(chosen_facts),
-            selected_project_count=len(chosen_projects),
-            selected_glossary_count=len(chosen_glossary),
-            ambiguities=[item[:240] for item in output.ambiguities[:4] if item.strip()],
-        )
+        context = _build_context(result.value, facts, project_glossary, glossary, strategy="llm")
+        if self._cache_size > 0:
+            _memo[memo_key] = replace(context, items=copy.deepcopy(context.items))
+            while len(_memo) > self._cache_size:
+                _memo.popitem(last=False)
+        return context
+
+
+def _build_context(
+    output: _PreparationOutput,
+    facts: Sequence[FactDTO],
+    project_glossary: Sequence[dict[str, Any]],
+    glossary: Sequence[dict[str, Any]],
+    *,
+    strategy: str,
+) -> PreparedMemoryContext:
+    chosen_facts = _by_indexes(facts, output.fact_indexes)
+    chosen_projects = _by_indexes(project_glossary, output.project_indexes)
+    chosen_glossary = _by_indexes(glossary, output.glossary_indexes)
+    items = [
+        {"type": "fact", "scope": item.scope.value, "subject": item.subject, "value": item.value}
+        for item in chosen_facts
+    ] + [
+        {"type": "project", "project_id": str(item["id"]), "key": item["key"], "name": item["name"], "matched_aliases": item["aliases"]}
+        for item in chosen_projects
+    ] + [
+        {
+            "type": "glossary",
+            "scope": "global",
+            "term": item["term"],
+            "description": item["description"],
+            "aliases": item["aliases"],
+        }
+        for item in chosen_glossary
+    ]
+    return PreparedMemoryContext(
+        items=items,
+        selected_fact_count=len(chosen_facts),
+        selected_project_count=len(chosen_projects),
+        selected_glossary_count=len(chosen_glossary),
+        ambiguities=[item[:240] for item in output.ambiguities[:4] if item.strip()],
+        strategy=strategy,
+    )
+
+
+def _select_locally(
+    request_text: str,
+    facts: Sequence[FactDTO],
+    index: GlossaryIndex,
+    *,
+    max_facts: int,
+) -> _PreparationOutput | None:
+    """Index selection without the LLM, or ``None`` when it is not clear-cut."""
+    if max_facts <= 0 or len(facts) > max_facts:
+        return None
+    owners: dict[tuple[int, int], set[tuple[str, int]]] = {}
+    for hit in index.match(request_text):
+        owners.setdefault((hit.start, hit.end), set()).add((hit.kind, hit.index))
+    if any(len(group) > 1 for group in owners.values()):
+        return None  # one surface form names several entries
+    if index.near_matches(request_text):
+        return None  # likely an inflected form of a known term
+
+    matched = {owner for group in owners.values() for owner in group}
+    ranked = FactSelectionPolicy(ranker=LexicalFactRanker()).select(
+        query=request_text, facts=facts, limit=max(len(facts), 1),
+    )
+    positions = {id(fact): position for position, fact in enumerate(facts)}
+    return _PreparationOutput(
+        fact_indexes=[positions[id(item.fact)] for item in ranked.selected],
+        project_indexes=sorted(position for kind, position in matched if kind == PROJECT),
+        glossary_indexes=sorted(position for kind, position in matched if kind == GLOSSARY),
+    )
+
+
+def _memo_key(payload: dict[str, Any], sandbox_overrides: dict[str, Any] | None) -> str:
+    candidates = {key: value for key, value in payload.items() if key != "request"}
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(normalize_term(payload["request"]).encode("utf-8")).digest())
+    digest.update(json.dumps([candidates, sandbox_overrides], sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
 
 
 def _by_indexes(items: Sequence[Any], indexes: Sequence[int]) -> list[Any]:
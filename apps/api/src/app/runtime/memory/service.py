@@ -1,9 +1,9 @@
 """Canonical durable-memory read/write facade for runtime consumers."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from dataclasses import replace
-from typing import Optional, Sequence
+from typing import Dict, Optional, Sequence
 from uuid import UUID
 
 from app.models.memory import FactScope
@@ -27,6 +27,8 @@ class MemorySubject:
 class MemorySnapshot:
     user_facts: tuple[FactDTO, ...] = ()
     tenant_facts: tuple[FactDTO, ...] = ()
+    # fact id -> vector similarity to the query the snapshot was read for
+    similarity: Dict[UUID, float] = field(default_factory=dict)
 
     @property
     def entries(self) -> tuple[FactDTO, ...]:
@@ -47,11 +49,35 @@ class MemoryService:
     def __init__(self, *, fact_store: FactStore) -> None:
         self._facts = fact_store
 
-    async def read_snapshot(self, *, user_id: Optional[UUID], tenant_id: Optional[UUID], limit: int) -> MemorySnapshot:
+    async def read_snapshot(
+        self, *, user_id: Optional[UUID], tenant_id: Optional[UUID], limit: int, query: Optional[str] = None,
+    ) -> MemorySnapshot:
+        if query:
+            return await self._read_relevant(user_id=user_id, tenant_id=tenant_id, limit=limit, query=query)
         user = await self._facts.retrieve(scopes=[FactScope.USER], owner_type="user", owner_id=user_id, limit=limit) if user_id else []
         tenant = await self._facts.retrieve(scopes=[FactScope.TENANT], owner_type="tenant", owner_id=tenant_id, limit=limit) if tenant_id else []
         return MemorySnapshot(user_facts=tuple(user), tenant_facts=tuple(tenant))
 
+    async def _read_relevant(
+        self, *, user_id: Optional[UUID], tenant_id: Optional[UUID], limit: int, query: str,
+    ) -> MemorySnapshot:
+        similarity: Dict[UUID, float] = {}
+        user: list[FactDTO] = []
+        tenant: list[FactDTO] = []
+        if user_id:
+            user, scores = await self._facts.retrieve_relevant(
+                query=query, scopes=[FactScope.USER], owner_type="user", owner_id=user_id,
+                tenant_id=tenant_id, limit=limit,
+            )
+            similarity.update(scores)
+        if tenant_id:
+            tenant, scores = await self._facts.retrieve_relevant(
+                query=query, scopes=[FactScope.TENANT], owner_type="tenant", owner_id=tenant_id,
+                tenant_id=tenant_id, limit=limit,
+            )
+            similarity.update(scores)
+        return MemorySnapshot(user_facts=tuple(user), tenant_facts=tuple(tenant), similarity=similarity)
+
     async def write_extracted(self, *, facts: Sequence[FactDTO], user_id: Optional[UUID], tenant_id: Optional[UUID]) -> int:
         saved = 0
         for fact in facts:
@@ -0,0 +1,113 @@
+"""Aho-Corasick matcher for glossary terms, project keys and aliases.
+
+Patterns and text are compared in a normalized form (lower case, ``ё`` as
+``е``, whitespace runs as one space). A match counts only on word
+boundaries, so ``срк`` does not fire inside ``срки``. Spans index the
+normalized text, which keeps the input's length for ordinary text.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_term(text: str) -> str:
+    """Normalized pattern form: lower case, ``ё`` → ``е``, single spaces."""
+    return " ".join(str(text or "").lower().replace("ё", "е").split())
+
+
+def _normalize_text(text: str) -> str:
+    # Length-preserving, so match spans map back onto the caller's text.
+    return "".join(" " if ch.isspace() else ch for ch in str(text or "").lower().replace("ё", "е"))
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+@dataclass(frozen=True)
+class TermMatch(Generic[T]):
+    start: int
+    end: int
+    surface: str
+    value: T
+
+
+class TermMatcher(Generic[T]):
+    """Finds every registered surface form in a text in one pass.
+
+    Several values may share a surface form (e.g. an alias used by two
+    projects); each of them is reported for a hit.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, T]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._surfaces: List[str] = []
+        self._values: List[List[T]] = []
+        pattern_ids: Dict[str, int] = {}
+        for surface, value in terms:
+            pattern = normalize_term(surface)
+            if not pattern:
+                continue
+            pattern_id = pattern_ids.get(pattern)
+            if pattern_id is None:
+                pattern_id = pattern_ids[pattern] = len(self._surfaces)
+                self._surfaces.append(pattern)
+                self._values.append([])
+                self._insert(pattern, pattern_id)
+            self._values[pattern_id].append(value)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern_id)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text: str, *, whole_words: bool = True) -> List[TermMatch[T]]:
+        """All occurrences ordered by start; ``whole_words=False`` allows prefixes of words."""
+        haystack = _normalize_text(text)
+        matches: List[TermMatch[T]] = []
+        node = 0
+        for index, ch in enumerate(haystack):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern_id in self._out[node]:
+                surface = self._surfaces[pattern_id]
+                start, end = index + 1 - len(surface), index + 1
+                if start > 0 and _is_word_char(haystack[start - 1]):
+                    continue
+                if whole_words and end < len(haystack) and _is_word_char(haystack[end]):
+                    continue
+                matches.extend(TermMatch(start, end, surface, value) for value in self._values[pattern_id])
+        matches.sort(key=lambda item: (item.start, -item.end))
+        return matches
@@ -3,9 +3,9 @@ RuntimePipeline — thin coordinator (no triage).
 
 Responsibilities (and NOTHING else):
     1. Resolve tenant/user/chat ids from the incoming request.
-    2. Load the platform snapshot (config + routable agents + policy).
-    3. Ask `MemoryBuilder` to assemble the turn's memory from the
-       persisted FactStore.
+    2. Run `TurnBootstrapStage`: platform snapshot (config + routable
+       agents + policy), RBAC, the turn's memory from the persisted
+       FactStore, limits and glossary, concurrently where independent.
     4. Initialize `RuntimeTurnState` as the single source of truth.
     5. Run the persisted graph planning stage until the plan pauses or reaches
        a terminal state.
@@ -19,13 +19,12 @@ from __future__ import annotations
 import json
 import os
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.context import ToolContext
-from app.agents.runtime_rbac_resolver import RuntimeRbacResolver
 from app.core.http.clients import LLMClientProtocol
 from app.core.logging import get_logger
 from app.runtime.assembler import PipelineAssembler
@@ -43,20 +42,13 @@ from app.runtime.entity_ids import (
 from app.runtime.events import OrchestrationPhase, RuntimeEvent, RuntimeEventType
 from app.runtime.memory.fact_extractor import AgentResultSnippet, FactEvidence
 from app.runtime.memory.transport import TurnMemory
-from app.runtime.platform_config import PlatformConfigLoader
 from app.runtime.stages.graph_planning_stage import GraphPlanningOutcomeKind
 from app.runtime.turn_state import RuntimeTurnState
 from app.core.prometheus_metrics import memory_writer_finalize_failures_total
-from app.models.system_llm_role import SystemLLMRoleType
-from app.services.agent_service import AgentService
-from app.services.permission_service import PermissionService
-from app.services.system_llm_role_service import SystemLLMRoleService
 from app.services.runtime_event_logger import RuntimeEventJournalFactory, RuntimeLogContext, RuntimeLoggingLevel
-from app.services.glossary_service import GlossaryService
 
 # Memory writeback runs via Celery (single canonical execution mode).
 RUNTIME_MEMORY_INLINE = False
-MEMORY_PREPARATION_PROJECT_LIMIT = 200
 
 logger = get_logger(__name__)
 
@@ -251,42 +243,31 @@ class RuntimePipeline:
         user_id = UUID(request.user_id)
         tenant_id = UUID(request.tenant_id)
 
-        platform = await PlatformConfigLoader(self._session).load()
         resume_checkpoint = _extract_resume_checkpoint(request)
         effective_goal = _extract_effective_goal(request, resume_checkpoint)
         continuation_state = _build_continuation_state(request, resume_checkpoint)
         effective_user_query = _extract_effective_user_query(request, resume_checkpoint)
         execution_mode = _extract_execution_mode(request, resume_checkpoint)
 
-        # --- RBAC resolve FIRST (before memory build) -----------------
-        # If agent_slug is denied by RBAC, we treat it as None (fallback to default)
+        # --- Bootstrap: platform, RBAC, memory read path, limits --------
+        # RBAC resolves before the memory build; if agent_slug is denied by
+        # RBAC, we treat it as None (fallback to default).
         explicit_slug = request.agent_slug
-        available_agents, planner_rbac_audit = await self._resolve_available_agents_for_planner(
-            platform=platform,
-            explicit_slug=explicit_slug,
-            user_id=user_id,
-            tenant_id=tenant_id,
-        )
-        # Sanitize against planner-visible slugs, not raw dict rows.
-        available_agent_slugs = {
-            str(item.get("slug") or "").strip()
-            for item in available_agents
-            if str(item.get("slug") or "").strip()
-        }
-        effective_agent_slug = explicit_slug if explicit_slug in available_agent_slugs else None
-
-        # --- Memory: read path ----------------------------------------
-        turn_mem = await self._assembler.memory_builder.build(
+        bootstrap = await self._assembler.build_turn_bootstrap_stage(
+            session_factory=ctx.get_runtime_deps().session_factory,
+        ).run(
             goal=effective_goal,
+            explicit_slug=explicit_slug,
             chat_id=chat_id,
             user_id=user_id,
             tenant_id=tenant_id,
             messages=list(request.messages or []),
-            agent_slug=effective_agent_slug,  # RBAC-sanitized
             attachments=list(request.attachments or []),
-            platform_config=platform.config,
             sandbox_overrides=request.sandbox_overrides,
         )
+        planner_rbac_audit = bootstrap.planner_rbac_audit
+        effective_agent_slug = bootstrap.effective_agent_slug
+        turn_mem = bootstrap.turn_memory
 
         # Initialize RuntimeTurnState as the single source of truth
         # For resume, use the original run_id; otherwise generate new
@@ -346,6 +327,13 @@ class RuntimePipeline:
         emitter = root_logger
         orchestrator_id = planner_orchestrator_id(run_id_str)
         ctx.extra["runtime_logging_level"] = run_logging_level
+        yield await emitter.emit(
+            bootstrap.trace_event(
+                parent_entity_type="run",
+                parent_entity_id=run_id_str,
+            ),
+            phase=OrchestrationPhase.PIPELINE,
+        )
         yield await emitter.emit(
             RuntimeEvent.status(
                 "memory_snapshot_loaded",
@@ -358,19 +346,11 @@ class RuntimePipeline:
             phase=OrchestrationPhase.PIPELINE,
         )
 
-        # Load planner role config for context snapshot
-        role_service = SystemLLMRoleService(self._session)
-        try:
-            planner_role_config = await role_service.get_role_config(SystemLLMRoleType.PLANNER)
-            planner_prompt = planner_role_config.get("prompt", "")
-            planner_model = planner_role_config.get("model")
-        except Exception:
-            planner_prompt = ""
-            planner_model = None
-
+        planner_prompt = bootstrap.planner_prompt
+        planner_model = bootstrap.planner_model
         budget_resolver = BudgetResolver(self._session)
-        run_limits_v2 = await budget_resolver.resolve_run(platform.config, request.sandbox_overrides)
-        planner_limits = await budget_resolver.resolve_orchestrator("planner", request.sandbox_overrides)
+        run_limits_v2 = bootstrap.run_limits
+        planner_limits = bootstrap.planner_limits
 
         run_context_snapshot = compact_snapshot(
             inputs={
@@ -409,17 +389,13 @@ class RuntimePipeline:
             ),
             phase=OrchestrationPhase.PIPELINE,
         )
-        # --- Memory preparation (single LLM call, no tools) -----------
+        # --- Memory preparation (local or single LLM call, no tools) --
         memory_preparation_orchestrator = _memory_preparation_orchestrator_id(run_id_str)
         memory_preparation_executor = _memory_component_entity_id(
             run_id_str, "memory_preparation", 1,
         )
-        project_glossary = await GlossaryService(self._session).list_project_terms(
-            limit=MEMORY_PREPARATION_PROJECT_LIMIT,
-        )
-        global_glossary = await GlossaryService(self._session).list_confirmed_global_terms(
-            limit=MEMORY_PREPARATION_PROJECT_LIMIT,
-        )
+        project_glossary = bootstrap.project_glossary
+        global_glossary = bootstrap.global_glossary
         yield await emitter.emit(
             RuntimeEvent.orchestrator_start(
                 orchestrator_id=memory_preparation_orchestrator,
@@ -464,6 +440,7 @@ class RuntimePipeline:
             sandbox_overrides=request.sandbox_overrides,
             event_sink=_memory_preparation_event,
             agent_execution_id=memory_preparation_executor,
+            glossary_index=bootstrap.glossary_index,
         )
         turn_mem.planner_memory_context = list(prepared_memory.items)
         yield await emitter.emit(
@@ -477,6 +454,7 @@ class RuntimePipeline:
                 selected_projects=prepared_memory.selected_project_count,
                 ambiguities=prepared_memory.ambiguities,
                 fallback=prepared_memory.fallback,
+                strategy=prepared_memory.strategy,
                 memory_context=prepared_memory.items,
             ),
             phase=OrchestrationPhase.PIPELINE,
@@ -558,8 +536,8 @@ class RuntimePipeline:
             ctx=ctx,
             user_id=user_id,
             tenant_id=tenant_id,
-            available_agents=available_agents,
-            platform_config=platform.config,
+            available_agents=bootstrap.available_agents,
+            platform_config=bootstrap.platform.config,
             planner_rbac_audit=planner_rbac_audit,
             planner_memory_context=turn_mem.planner_memory_context,
             durable_memory_snapshot=turn_mem.durable_snapshot,
@@ -646,7 +624,7 @@ class RuntimePipeline:
                 answer_brief=planning_outcome.answer_brief,
                 final_answer_strategy=planning_outcome.final_answer_strategy,
                 model=request.model,
-                platform_config=platform.config,
+                platform_config=bootstrap.platform.config,
                 sandbox_overrides=request.sandbox_overrides,
                 emitter=emitter,
                 run_id=run_id,
@@ -1152,76 +1130,3 @@ class RuntimePipeline:
             logging_level=logging_level,
         ):
             pass
-
-    async def _resolve_available_agents_for_planner(
-        self,
-        *,
-        platform,
-        explicit_slug: Optional[str],
-        user_id: UUID,
-        tenant_id: UUID,
-    ) -> tuple[List[dict], dict]:
-        """Build planner-visible agents with RBAC and explicit-slug validation.
-
-        Why:
-        - Platform snapshot provides routable agents globally.
-        - Real availability is user/tenant-specific (RBAC + published version existence).
-        - Without this filter planner can select an agent that preflight will reject.
-        """
-        candidates = platform.available_agents_for_planner(explicit_slug)
-
-        # Validate explicit slug: keep pinning behavior, but only if there is
-        # a published version for this tenant context.
-        if explicit_slug:
-            try:
-                await AgentService(self._session).resolve_published_version(
-                    agent_slug=explicit_slug,
-                    tenant_id=tenant_id,
-                )
-            except Exception:
-                logger.warning(
-                    "Explicit agent slug '%s' is not runtime-resolvable",
-                    explicit_slug,
-                )
-                from app.core.exceptions import AgentUnavailableError
-                raise AgentUnavailableError(
-                    f"Agent '{explicit_slug}' is not available or has no published version",
-                    reason_code="agent_not_found",
-                )
-
-        default_collection_allow = bool(
-            (platform.config or {}).get("default_collection_allow", True),
-        )
-        rbac = RuntimeRbacResolver(PermissionService(self._session))
-        effective = await rbac.resolve_effective_permissions(
-            user_id=user_id,
-            tenant_id=tenant_id,
-            default_collection_allow=default_collection_allow,
-        )
-        filtered, denied = rbac.filter_agents_by_slug(
-            candidates,
-            effective_permissions=effective,
-            slug_getter=lambda item: str((item or {}).get("slug") or "").strip() or None,
-            default_allow=False,
-        )
-        candidate_slugs = sorted({
-            str((item or {}).get("slug") or "").strip()
-            for item in candidates
-            if str((item or {}).get("slug") or "").strip()
-        })
-        allowed_slugs = sorted({
-            str((item or {}).get("slug") or "").strip()
-            for item in filtered
-            if str((item or {}).get("slug") or "").strip()
-        })
-        denied_slugs = sorted(set(denied))
-        audit_payload = {
-            "default_collection_allow": default_collection_allow,
-            "candidates": candidate_slugs,
-            "allowed": allowed_slugs,
-            "denied_by_rbac": denied_slugs,
-            "before_count": len(candidates),
-            "after_count": len(filtered),
-        }
-        logger.info("Runtime RBAC planner agent filter: %s", audit_payload)
-        return filtered, audit_payload
@@ -1,8 +1,11 @@
-"""Pipeline stages for persisted graph execution and finalization."""
+"""Pipeline stages for turn bootstrap, persisted graph execution and finalization."""
 from app.runtime.stages.finalization_stage import FinalizationStage
 from app.runtime.stages.graph_planning_stage import GraphPlanningStage
+from app.runtime.stages.turn_bootstrap_stage import TurnBootstrap, TurnBootstrapStage
 
 __all__ = [
     "FinalizationStage",
     "GraphPlanningStage",
+    "TurnBootstrap",
+    "TurnBootstrapStage",
 ]
@@ -7,6 +7,7 @@ from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from app.agents.context import ToolContext
+from app.core.logging import get_logger
 from app.runtime.contracts import PipelineRequest, PipelineStopReason
 from app.runtime.envelope import PhasedEvent
 from app.runtime.events import OrchestrationPhase, RuntimeEvent, RuntimeEventType
@@ -15,6 +16,8 @@ from app.runtime.plan_store import SqlPlanStore
 from app.runtime.turn_state import RuntimeTurnState
 from app.runtime.memory.service import MemorySnapshot
 
+logger = get_logger(__name__)
+
 
 class GraphPlanningOutcomeKind(str, Enum):
     NEEDS_FINAL = "needs_final"
@@ -114,27 +117,40 @@ class GraphPlanningStage:
             "resume_user_response": resume_user_response,
             "runtime_limits": effective_runtime_limits,
         }
-        async for event in self._orchestrator.run(
-            plan_id=plan.id,
-            goal=plan.goal,
-            available_agents=available_agents,
-            available_artifacts=[
-                item.model_dump(mode="json")
-                for item in runtime_state.attachment_contexts
-                if item.ref.artifact_id not in runtime_state.deleted_artifact_ids
-            ],
-            max_steps=self._max_steps,
-            planner_kwargs=planner_kwargs,
-        ):
-            runtime_event = event.to_runtime_event()
-            if runtime_event.type == RuntimeEventType.WAITING_INPUT:
-                pause_question = str(runtime_event.data.get("question") or "").strip() or None
-            elif runtime_event.type == RuntimeEventType.CONFIRMATION_REQUIRED:
-                pause_message = str(
-                    runtime_event.data.get("message") or runtime_event.data.get("summary") or ""
-                ).strip() or None
-                confirmation_context = dict(runtime_event.data or {})
-            yield PhasedEvent(runtime_event, OrchestrationPhase.PLANNER)
+        finished = False
+        try:
+            async for event in self._orchestrator.run(
+                plan_id=plan.id,
+                goal=plan.goal,
+                available_agents=available_agents,
+                available_artifacts=[
+                    item.model_dump(mode="json")
+                    for item in runtime_state.attachment_contexts
+                    if item.ref.artifact_id not in runtime_state.deleted_artifact_ids
+                ],
+                max_steps=self._max_steps,
+                planner_kwargs=planner_kwargs,
+            ):
+                runtime_event = event.to_runtime_event()
+                if runtime_event.type == RuntimeEventType.WAITING_INPUT:
+                    pause_question = str(runtime_event.data.get("question") or "").strip() or None
+                elif runtime_event.type == RuntimeEventType.CONFIRMATION_REQUIRED:
+                    pause_message = str(
+                        runtime_event.data.get("message") or runtime_event.data.get("summary") or ""
+                    ).strip() or None
+                    confirmation_context = dict(runtime_event.data or {})
+                yield PhasedEvent(runtime_event, OrchestrationPhase.PLANNER)
+            finished = True
+        finally:
+            if self._orchestrator.budget_service is not None:
+                # Run end, also on errors (budget exhaustion) and early close:
+                # write buffered budget entries and emit their events.
+                try:
+                    await self._orchestrator.budget_service.checkpoint()
+                except Exception:
+                    if finished:
+                        raise
+                    logger.warning("graph_planning_budget_checkpoint_failed", exc_info=True)
         snapshot = await self._store.snapshot(plan.id)
         status = str(snapshot["status"])
         if status == "completed":
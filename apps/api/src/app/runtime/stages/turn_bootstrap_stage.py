@@ -0,0 +1,357 @@
+"""
+TurnBootstrapStage — every read the pipeline needs before the first LLM call.
+
+The loads form a small dependency graph:
+
+    platform ──> agents + RBAC ──> memory build      (turn session)
+    platform ──> run limits                          (side session)
+    planner role config                              (side session)
+    planner limits                                   (side session)
+    project + global glossary index                  (side session, cached)
+
+Independent branches run concurrently. An ``AsyncSession`` is not safe for
+concurrent use, so only the critical chain runs on the turn session; the
+other branches read through short-lived sessions from ``session_factory``.
+Without a factory every step runs on the turn session, one at a time.
+
+The result (``TurnBootstrap``) is the turn's read snapshot: later steps use
+it instead of querying again. Per-step timings go into the trace event
+built by ``TurnBootstrap.trace_event``.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.runtime_rbac_resolver import RuntimeRbacResolver
+from app.core.logging import get_logger
+from app.models.system_llm_role import SystemLLMRoleType
+from app.runtime.budgets import BudgetResolver, EntityLimits, RunLimits
+from app.runtime.events import RuntimeEvent
+from app.runtime.memory.builder import MemoryBuilder
+from app.runtime.memory.glossary_index import GlossaryIndex
+from app.runtime.memory.transport import TurnMemory
+from app.runtime.platform_config import PlatformConfigLoader, PlatformSnapshot
+from app.services.agent_service import AgentService
+from app.services.glossary_service import GlossaryService
+from app.services.permission_service import PermissionService
+from app.services.system_llm_role_service import SystemLLMRoleService
+
+logger = get_logger(__name__)
+
+MEMORY_PREPARATION_PROJECT_LIMIT = 200
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BootstrapStepTiming:
+    step: str
+    session: str
+    start_ms: float
+    duration_ms: float
+    ok: bool = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "step": self.step,
+            "session": self.session,
+            "start_ms": round(self.start_ms, 1),
+            "duration_ms": round(self.duration_ms, 1),
+            "ok": self.ok,
+        }
+
+
+@dataclass
+class TurnBootstrap:
+    """Per-turn read snapshot produced by ``TurnBootstrapStage``."""
+
+    platform: PlatformSnapshot
+    available_agents: List[Dict[str, Any]]
+    planner_rbac_audit: Dict[str, Any]
+    effective_agent_slug: Optional[str]
+    turn_memory: TurnMemory
+    planner_prompt: str
+    planner_model: Optional[str]
+    run_limits: RunLimits
+    planner_limits: EntityLimits
+    project_glossary: List[Dict[str, object]]
+    global_glossary: List[Dict[str, object]]
+    glossary_index: Optional[GlossaryIndex] = None
+    timings: List[BootstrapStepTiming] = field(default_factory=list)
+    total_ms: float = 0.0
+    concurrent: bool = False
+
+    def trace_event(self, **extra: Any) -> RuntimeEvent:
+        return RuntimeEvent.status(
+            "turn_bootstrap",
+            total_ms=round(self.total_ms, 1),
+            serial_ms=round(sum(t.duration_ms for t in self.timings), 1),
+            concurrent=self.concurrent,
+            steps=[t.as_dict() for t in self.timings],
+            **extra,
+        )
+
+
+class TurnBootstrapStage:
+    """Runs the pre-planner loads of one turn, concurrently where possible."""
+
+    def __init__(
+        self,
+        *,
+        session: AsyncSession,
+        memory_builder: MemoryBuilder,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._session = session
+        self._memory_builder = memory_builder
+        self._session_factory = session_factory
+        # Serializes turn-session use when there is no factory to branch off.
+        self._turn_session_lock = asyncio.Lock()
+        self._timings: List[BootstrapStepTiming] = []
+        self._started_at = 0.0
+
+    async def run(
+        self,
+        *,
+        goal: str,
+        explicit_slug: Optional[str],
+        chat_id: Optional[UUID],
+        user_id: UUID,
+        tenant_id: UUID,
+        messages: List[Dict[str, Any]],
+        attachments: List[Any],
+        sandbox_overrides: Optional[Dict[str, Any]],
+    ) -> TurnBootstrap:
+        self._timings = []
+        self._started_at = time.perf_counter()
+        platform_task = asyncio.ensure_future(
+            self._step("platform", lambda s: PlatformConfigLoader(s).load(), side=False)
+        )
+
+        async def _critical_chain() -> tuple:
+            platform = await platform_task
+            agents, audit = await self._step(
+                "agents_rbac",
+                lambda s: self._resolve_available_agents_for_planner(
+                    s,
+                    platform=platform,
+                    explicit_slug=explicit_slug,
+                    user_id=user_id,
+                    tenant_id=tenant_id,
+                ),
+                side=False,
+            )
+            # Sanitize against planner-visible slugs, not raw dict rows.
+            available_agent_slugs = {
+                str(item.get("slug") or "").strip()
+                for item in agents
+                if str(item.get("slug") or "").strip()
+            }
+            effective_agent_slug = explicit_slug if explicit_slug in available_agent_slugs else None
+            turn_mem = await self._step(
+                "memory_build",
+                lambda _s: self._memory_builder.build(
+                    goal=goal,
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    tenant_id=tenant_id,
+                    messages=messages,
+                    agent_slug=effective_agent_slug,  # RBAC-sanitized
+                    attachments=attachments,
+                    platform_config=platform.config,
+                    sandbox_overrides=sandbox_overrides,
+                ),
+                side=False,
+            )
+            return agents, audit, effective_agent_slug, turn_mem
+
+        async def _run_limits() -> RunLimits:
+            platform = await platform_task
+            return await self._step(
+                "run_limits",
+                lambda s: BudgetResolver(s).resolve_run(platform.config, sandbox_overrides),
+            )
+
+        (
+            (agents, audit, effective_agent_slug, turn_mem),
+            run_limits,
+            (planner_prompt, planner_model),
+            planner_limits,
+            glossary_index,
+        ) = await _gather_or_cancel(
+            _critical_chain(),
+            _run_limits(),
+            self._step("planner_role", self._load_planner_role),
+            self._step(
+                "planner_limits",
+                lambda s: BudgetResolver(s).resolve_orchestrator("planner", sandbox_overrides),
+            ),
+            self._step("glossary", self._load_glossary),
+            also_cancel=[platform_task],
+        )
+        return TurnBootstrap(
+            platform=platform_task.result(),
+            available_agents=agents,
+            planner_rbac_audit=audit,
+            effective_agent_slug=effective_agent_slug,
+            turn_memory=turn_mem,
+            planner_prompt=planner_prompt,
+            planner_model=planner_model,
+            run_limits=run_limits,
+            planner_limits=planner_limits,
+            project_glossary=glossary_index.project_terms,
+            global_glossary=glossary_index.global_terms,
+            glossary_index=glossary_index,
+            timings=sorted(self._timings, key=lambda t: t.start_ms),
+            total_ms=(time.perf_counter() - self._started_at) * 1000.0,
+            concurrent=self._session_factory is not None,
+        )
+
+    # ------------------------------------------------------------------ #
+    # Steps                                                              #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    async def _load_planner_role(session: AsyncSession) -> tuple[str, Optional[str]]:
+        try:
+            config = await SystemLLMRoleService(session).get_role_config(SystemLLMRoleType.PLANNER)
+        except Exception:
+            return "", None
+        return config.get("prompt", ""), config.get("model")
+
+    @staticmethod
+    async def _load_glossary(session: AsyncSession) -> GlossaryIndex:
+        return await GlossaryService(session).load_index(limit=MEMORY_PREPARATION_PROJECT_LIMIT)
+
+    @staticmethod
+    async def _resolve_available_agents_for_planner(
+        session: AsyncSession,
+        *,
+        platform: PlatformSnapshot,
+        explicit_slug: Optional[str],
+        user_id: UUID,
+        tenant_id: UUID,
+    ) -> tuple[List[dict], dict]:
+        """Build planner-visible agents with RBAC and explicit-slug validation.
+
+        Why:
+        - Platform snapshot provides routable agents globally.
+        - Real availability is user/tenant-specific (RBAC + published version existence).
+        - Without this filter planner can select an agent that preflight will reject.
+        """
+        candidates = platform.available_agents_for_planner(explicit_slug)
+
+        # Validate explicit slug: keep pinning behavior, but only if there is
+        # a published version for this tenant context.
+        if explicit_slug:
+            try:
+                await AgentService(session).resolve_published_version(
+                    agent_slug=explicit_slug,
+                    tenant_id=tenant_id,
+                )
+            except Exception:
+                logger.warning(
+                    "Explicit agent slug '%s' is not runtime-resolvable",
+                    explicit_slug,
+                )
+                from app.core.exceptions import AgentUnavailableError
+                raise AgentUnavailableError(
+                    f"Agent '{explicit_slug}' is not available or has no published version",
+                    reason_code="agent_not_found",
+                )
+
+        default_collection_allow = bool(
+            (platform.config or {}).get("default_collection_allow", True),
+        )
+        rbac = RuntimeRbacResolver(PermissionService(session))
+        effective = await rbac.resolve_effective_permissions(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            default_collection_allow=default_collection_allow,
+        )
+        filtered, denied = rbac.filter_agents_by_slug(
+            candidates,
+            effective_permissions=effective,
+            slug_getter=lambda item: str((item or {}).get("slug") or "").strip() or None,
+            default_allow=False,
+        )
+        candidate_slugs = sorted({
+            str((item or {}).get("slug") or "").strip()
+            for item in candidates
+            if str((item or {}).get("slug") or "").strip()
+        })
+        allowed_slugs = sorted({
+            str((item or {}).get("slug") or "").strip()
+            for item in filtered
+            if str((item or {}).get("slug") or "").strip()
+        })
+        denied_slugs = sorted(set(denied))
+        audit_payload = {
+            "default_collection_allow": default_collection_allow,
+            "candidates": candidate_slugs,
+            "allowed": allowed_slugs,
+            "denied_by_rbac": denied_slugs,
+            "before_count": len(candidates),
+            "after_count": len(filtered),
+        }
+        logger.info("Runtime RBAC planner agent filter: %s", audit_payload)
+        return filtered, audit_payload
+
+    # ------------------------------------------------------------------ #
+    # Scheduling                                                         #
+    # ------------------------------------------------------------------ #
+
+    async def _step(
+        self,
+        name: str,
+        load: Callable[[AsyncSession], Awaitable[T]],
+        *,
+        side: bool = True,
+    ) -> T:
+        use_side = side and self._session_factory is not None
+        async with self._session_for(use_side) as session:
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await load(session)
+                ok = True
+                return result
+            finally:
+                self._timings.append(BootstrapStepTiming(
+                    step=name,
+                    session="side" if use_side else "turn",
+                    start_ms=(started - self._started_at) * 1000.0,
+                    duration_ms=(time.perf_counter() - started) * 1000.0,
+                    ok=ok,
+                ))
+
+    @asynccontextmanager
+    async def _session_for(self, side: bool) -> AsyncIterator[AsyncSession]:
+        if not side:
+            async with self._turn_session_lock:
+                yield self._session
+            return
+        async with self._session_factory() as session:
+            yield session
+            # Read-only by intent; commit so get-or-create defaults persist.
+            await session.commit()
+
+
+async def _gather_or_cancel(*aws: Awaitable[Any], also_cancel: List[asyncio.Future]) -> List[Any]:
+    """``asyncio.gather`` that cancels the siblings when one step fails."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        pending = [task for task in [*tasks, *also_cancel] if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
@@ -23,6 +23,7 @@ class FieldSchema(BaseModel):
     sortable: bool = False
     used_in_retrieval: bool = False
     used_in_prompt_context: bool = False
+    rollup: Optional[str] = Field(default=None, pattern="^(dimension|measure)$")
 
     @model_validator(mode="after")
     def validate_field(self) -> "FieldSchema":
@@ -32,6 +33,18 @@ class FieldSchema(BaseModel):
         if self.sortable and self.data_type in (FieldType.FILE.value, FieldType.JSON.value):
             raise ValueError("Sortable fields must not be file/json")
 
+        if self.rollup == "dimension" and self.data_type not in (
+            FieldType.STRING.value,
+            FieldType.ENUM.value,
+            FieldType.BOOLEAN.value,
+            FieldType.INTEGER.value,
+            FieldType.DATE.value,
+        ):
+            raise ValueError("Rollup dimensions must be string/enum/boolean/integer/date")
+
+        if self.rollup == "measure" and self.data_type not in (FieldType.INTEGER.value, FieldType.FLOAT.value):
+            raise ValueError("Rollup measures must be integer/float")
+
         return self
 
 
@@ -232,6 +245,42 @@ class CollectionTypePresetsResponse(BaseModel):
     items: List[CollectionTypePresetResponse] = Field(default_factory=list)
 
 
+class CollectionIndexProposal(BaseModel):
+    name: str
+    kind: str
+    columns: List[str] = Field(default_factory=list)
+    include: List[str] = Field(default_factory=list)
+    predicate: Optional[str] = None
+    sources: List[str] = Field(default_factory=list)
+    hits: int = 0
+    estimated_rows_before: int = 0
+    estimated_rows_after: int = 0
+    estimated_benefit: int = 0
+    sql: str
+
+
+class CollectionIndexAdviceResponse(BaseModel):
+    table_name: str
+    row_estimate: int = 0
+    shapes: List[dict] = Field(default_factory=list)
+    existing_indexes: List[dict] = Field(default_factory=list)
+    proposals: List[CollectionIndexProposal] = Field(default_factory=list)
+
+
+class ApplyCollectionIndexRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=63)
+
+
+class CollectionIndexBuildStatus(BaseModel):
+    name: str
+    status: str
+    task_id: Optional[str] = None
+    proposal: Optional[CollectionIndexProposal] = None
+    error: Optional[str] = None
+    duration_s: Optional[float] = None
+    updated_at: Optional[str] = None
+
+
 class DiscoveredSqlTable(BaseModel):
     schema_name: str
     table_name: str
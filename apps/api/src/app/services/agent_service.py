@@ -29,6 +29,7 @@ from app.models.agent import Agent
 from app.models.agent_version import AgentVersion, AgentVersionStatus
 from app.models.tool_instance import ToolInstance
 from app.services.rbac_service import RbacService
+from app.services.permission_service import PermissionService
 from app.services.rbac_cleanup_service import RbacCleanupService
 from app.repositories.agent_repository import AgentRepository, AgentVersionRepository
 
@@ -384,6 +385,7 @@ class AgentService:
             )
 
         await self.version_repo.update_status(version_id, AgentVersionStatus.PUBLISHED.value)
+        await PermissionService.invalidate_cache(self.session)
 
         return await self.get_version(version_id)
 
@@ -399,6 +401,7 @@ class AgentService:
         agent = await self.agent_repo.get_by_id(version.agent_id)
         if agent.current_version_id == version_id:
             await self.agent_repo.update(agent, {'current_version_id': None})
+        await PermissionService.invalidate_cache(self.session)
 
         return await self.get_version(version_id)
 
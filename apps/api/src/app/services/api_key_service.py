@@ -3,23 +3,61 @@ API Key Service for managing IDE plugin authentication.
 """
 from __future__ import annotations
 from app.core.logging import get_logger
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config_cache import VersionedConfigCache
 from app.models.api_key import APIKey, hash_api_key
 
 logger = get_logger(__name__)
 
+# last_used_at is refreshed at most this often per key and process.
+LAST_USED_TOUCH_INTERVAL_S = 60.0
+# Keys whose last touch is remembered per process; the oldest are forgotten
+# first, which only costs them one extra last_used_at write.
+LAST_TOUCHED_MAX_KEYS = 10_000
+
+
+class _APIKeyNotFound(Exception):
+    """Raised by the cache loader so unknown keys are never cached."""
+
 
 class APIKeyService:
-    """Service for API key management."""
-    
+    """Service for API key management.
+
+    ``verify_key`` serves lookups from a process cache of key rows keyed by
+    hash; ``revoke_key``/``delete_key`` invalidate it on every replica once
+    their transaction commits.
+    """
+
+    _cache: VersionedConfigCache[Dict[str, Any]] = VersionedConfigCache("api_keys", ttl_s=60.0)
+    _last_touched: "OrderedDict[UUID, float]" = OrderedDict()
+
     def __init__(self, session: AsyncSession):
         self.session = session
+
+    @classmethod
+    async def invalidate_cache(cls, session: Optional[AsyncSession] = None) -> None:
+        if session is not None:
+            await cls._cache.invalidate_on_commit(session)
+        else:
+            await cls._cache.invalidate()
+
+    @classmethod
+    def cached_tenant_id(cls, raw_key: Optional[str]) -> Optional[str]:
+        """Tenant of a key this process already verified; never hits the DB."""
+        if not raw_key or not raw_key.startswith("mlp_"):
+            return None
+        snapshot = cls._cache.peek(hash_api_key(raw_key))
+        if snapshot is None or not snapshot.get("tenant_id") or not APIKey(**snapshot).is_valid():
+            return None
+        return str(snapshot["tenant_id"])
     
     async def create_key(
         self,
@@ -69,28 +107,47 @@ class APIKeyService:
             return None
         
         key_hash = hash_api_key(raw_key)
-        
-        result = await self.session.execute(
-            select(APIKey).where(APIKey.key_hash == key_hash)
-        )
-        api_key = result.scalar_one_or_none()
-        
-        if not api_key:
+        loaded: List[APIKey] = []
+
+        async def _load() -> Dict[str, Any]:
+            result = await self.session.execute(
+                select(APIKey).where(APIKey.key_hash == key_hash)
+            )
+            row = result.scalar_one_or_none()
+            if row is None:
+                raise _APIKeyNotFound()
+            loaded.append(row)
+            return {attr.key: getattr(row, attr.key) for attr in inspect(APIKey).column_attrs}
+
+        try:
+            snapshot = await self._cache.get_or_load(key_hash, _load)
+        except _APIKeyNotFound:
             logger.warning(f"API key not found: {raw_key[:12]}...")
             return None
+        # Fresh row when this call loaded it; a detached copy on cache hits.
+        api_key = loaded[0] if loaded else APIKey(**snapshot)
         
         if not api_key.is_valid():
             logger.warning(f"API key invalid or expired: {api_key.name}")
             return None
         
-        # Update last_used_at
-        await self.session.execute(
-            update(APIKey)
-            .where(APIKey.id == api_key.id)
-            .values(last_used_at=datetime.utcnow())
-        )
+        now = time.monotonic()
+        if loaded or now - self._last_touched.get(api_key.id, 0.0) >= LAST_USED_TOUCH_INTERVAL_S:
+            self._remember_touch(api_key.id, now)
+            await self.session.execute(
+                update(APIKey)
+                .where(APIKey.id == api_key.id)
+                .values(last_used_at=datetime.utcnow())
+            )
         
         return api_key
+
+    @classmethod
+    def _remember_touch(cls, key_id: UUID, now: float) -> None:
+        cls._last_touched[key_id] = now
+        cls._last_touched.move_to_end(key_id)
+        while len(cls._last_touched) > LAST_TOUCHED_MAX_KEYS:
+            cls._last_touched.popitem(last=False)
     
     async def get_key_by_id(self, key_id: UUID) -> Optional[APIKey]:
         """Get API key by ID."""
@@ -130,6 +187,8 @@ class APIKeyService:
         await self.session.flush()
         
         if result.rowcount > 0:
+            await self.invalidate_cache(self.session)
+            self._last_touched.pop(key_id, None)
             logger.info(f"Revoked API key {key_id}")
             return True
         return False
@@ -140,6 +199,8 @@ class APIKeyService:
         if api_key:
             await self.session.delete(api_key)
             await self.session.flush()
+            await self.invalidate_cache(self.session)
+            self._last_touched.pop(key_id, None)
             logger.info(f"Deleted API key {key_id}")
             return True
         return False
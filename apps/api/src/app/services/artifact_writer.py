@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, BinaryIO, Callable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,6 +23,36 @@ class ArtifactWriter:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    async def write_stream(
+        self,
+        *,
+        chat_id: str,
+        owner_id: str,
+        filename: str,
+        produce: Callable[[BinaryIO], Optional[dict[str, Any]]],
+        content_type: Optional[str],
+        metadata: Optional[dict[str, Any]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> GeneratedArtifact:
+        """Like ``write``, but ``produce`` streams the body into storage.
+
+        Metadata ``produce`` returns is merged into the artifact metadata.
+        """
+        if not chat_id:
+            raise ValueError("Generated artifacts require a chat context")
+        if not owner_id:
+            raise ValueError("Generated artifacts require an owner")
+        attachment, recorded = await ChatAttachmentService(self.session).create_generated_attachment_stream(
+            chat_id=chat_id,
+            owner_id=owner_id,
+            filename=filename,
+            produce=produce,
+            content_type=content_type,
+            metadata=metadata,
+            max_bytes=max_bytes,
+        )
+        return self._artifact(attachment, filename, content_type, recorded)
+
     async def write(
         self,
         *,
@@ -45,6 +75,17 @@ class ArtifactWriter:
             content_type=content_type,
             metadata=metadata,
         )
+        return self._artifact(attachment, filename, content_type, metadata, default_size=len(content))
+
+    @staticmethod
+    def _artifact(
+        attachment: dict[str, Any],
+        filename: str,
+        content_type: Optional[str],
+        metadata: Optional[dict[str, Any]],
+        *,
+        default_size: int = 0,
+    ) -> GeneratedArtifact:
         artifact_id = str(attachment.get("artifact_id") or "")
         if not artifact_id:
             raise RuntimeError("Generated attachment was not registered as an artifact")
@@ -52,6 +93,6 @@ class ArtifactWriter:
             artifact_id=artifact_id,
             file_name=str(attachment.get("file_name") or filename),
             content_type=attachment.get("content_type") or content_type,
-            size_bytes=int(attachment.get("size_bytes") or len(content)),
+            size_bytes=int(attachment.get("size_bytes") or default_size),
             metadata=metadata or {},
         )
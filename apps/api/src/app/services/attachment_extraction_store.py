@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from app.adapters.s3_client import s3_manager
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACT_VERSION = "v1"
+# Upper bound for the persisted text.  Previews are always much smaller; the
+# cap only protects storage from pathological documents.
+MAX_ARTIFACT_CHARS = 2_000_000
+TRUNCATION_MARKER = "\n...[truncated]"
+# Worst-case UTF-8 width, used to size ranged reads for a char budget.
+_MAX_UTF8_BYTES_PER_CHAR = 4
+
+
+@dataclass(frozen=True)
+class ExtractionManifest:
+    """Persisted description of a single attachment extraction."""
+
+    checksum: str
+    status: str
+    parser: str = ""
+    content_kind: str = ""
+    total_chars: int = 0
+    total_bytes: int = 0
+    # Each page is {"char_start": int, "byte_start": int}; a document without
+    # explicit page breaks has a single page starting at zero.
+    pages: list[dict[str, int]] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    version: str = ARTIFACT_VERSION
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "ExtractionManifest":
+        return cls(
+            checksum=str(payload.get("checksum") or ""),
+            status=str(payload.get("status") or "unreadable"),
+            parser=str(payload.get("parser") or ""),
+            content_kind=str(payload.get("content_kind") or ""),
+            total_chars=int(payload.get("total_chars") or 0),
+            total_bytes=int(payload.get("total_bytes") or 0),
+            pages=[
+                {"char_start": int(item.get("char_start") or 0), "byte_start": int(item.get("byte_start") or 0)}
+                for item in payload.get("pages") or []
+                if isinstance(item, dict)
+            ],
+            warnings=[str(item) for item in payload.get("warnings") or []],
+            version=str(payload.get("version") or ARTIFACT_VERSION),
+        )
+
+    @property
+    def readable(self) -> bool:
+        return self.status == "ready" and self.total_chars > 0
+
+
+@dataclass(frozen=True)
+class AttachmentSnippet:
+    text: str
+    status: str
+
+    @property
+    def readable(self) -> bool:
+        return bool(self.text)
+
+    @property
+    def truncated(self) -> bool:
+        return self.status == "truncated"
+
+
+def build_page_index(text: str) -> list[dict[str, int]]:
+    """Return char/byte offsets of every page start.
+
+    Extractors separate pages with form feeds (pdfminer does this natively),
+    so page boundaries are recovered without re-parsing the source.
+    """
+    pages = [{"char_start": 0, "byte_start": 0}]
+    char_pos = 0
+    byte_pos = 0
+    for segment in text.split("\f")[:-1]:
+        char_pos += len(segment) + 1
+        byte_pos += len(segment.encode("utf-8")) + 1
+        pages.append({"char_start": char_pos, "byte_start": byte_pos})
+    return pages
+
+
+def _bounded_snippet(text: str, *, max_chars: int, total_chars: Optional[int] = None) -> AttachmentSnippet:
+    if not text:
+        return AttachmentSnippet(text="", status="unreadable")
+    max_chars = max(1, int(max_chars))
+    total = len(text) if total_chars is None else total_chars
+    if total > max_chars:
+        return AttachmentSnippet(text=f"{text[:max_chars]}{TRUNCATION_MARKER}", status="truncated")
+    return AttachmentSnippet(text=text[:max_chars], status="ready")
+
+
+class AttachmentExtractionStore:
+    """Extraction artifacts persisted next to chat attachment objects.
+
+    Artifacts are keyed by the attachment storage key and content checksum, so
+    the original object is downloaded and parsed once; later turns fetch a
+    small manifest and a bounded byte range of the extracted text.
+    """
+
+    def __init__(self, storage: Any = None) -> None:
+        self.storage = storage or s3_manager
+
+    @staticmethod
+    def artifact_prefix(storage_key: str) -> str:
+        return f"{storage_key}.extraction/"
+
+    @classmethod
+    def text_key(cls, storage_key: str, checksum: str) -> str:
+        return f"{cls.artifact_prefix(storage_key)}{checksum}_{ARTIFACT_VERSION}.txt"
+
+    @classmethod
+    def manifest_key(cls, storage_key: str, checksum: str) -> str:
+        return f"{cls.artifact_prefix(storage_key)}{checksum}_{ARTIFACT_VERSION}.json"
+
+    async def get_manifest(self, *, bucket: str, storage_key: str, checksum: str) -> Optional[ExtractionManifest]:
+        raw = await self.storage.get_object_range(bucket, self.manifest_key(storage_key, checksum))
+        if not raw:
+            return None
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning("Ignoring corrupt extraction manifest for %s", storage_key)
+            return None
+        manifest = ExtractionManifest.from_payload(payload)
+        if manifest.checksum != checksum or manifest.version != ARTIFACT_VERSION:
+            return None
+        return manifest
+
+    async def ensure(
+        self,
+        *,
+        bucket: str,
+        storage_key: str,
+        checksum: str,
+        file_name: str,
+        content_type: Optional[str],
+    ) -> Optional[ExtractionManifest]:
+        """Return the stored manifest, extracting and persisting it on first use.
+
+        Returns None when the original object is missing; that outcome is not
+        persisted because the object may still be in flight.
+        """
+        manifest, _ = await self._ensure(
+            bucket=bucket,
+            storage_key=storage_key,
+            checksum=checksum,
+            file_name=file_name,
+            content_type=content_type,
+        )
+        return manifest
+
+    async def _ensure(
+        self,
+        *,
+        bucket: str,
+        storage_key: str,
+        checksum: str,
+        file_name: str,
+        content_type: Optional[str],
+    ) -> tuple[Optional[ExtractionManifest], Optional[str]]:
+        manifest = await self.get_manifest(bucket=bucket, storage_key=storage_key, checksum=checksum)
+        if manifest is not None:
+            return manifest, None
+
+        payload = await self.storage.get_object(bucket, storage_key)
+        if not payload:
+            return None, None
+        from app.services.document_extraction_service import DocumentExtractionService, ExtractionRequest
+
+        result = await DocumentExtractionService().extract(
+            ExtractionRequest(
+                payload=payload,
+                filename=file_name or "",
+                content_type=content_type,
+                profile="chat_preview",
+                max_chars=MAX_ARTIFACT_CHARS,
+            )
+        )
+        text = result.text or ""
+        encoded = text.encode("utf-8")
+        manifest = ExtractionManifest(
+            checksum=checksum,
+            status="ready" if text else "unreadable",
+            parser=result.parser,
+            content_kind=result.content_kind,
+            total_chars=len(text),
+            total_bytes=len(encoded),
+            pages=build_page_index(text) if text else [],
+            warnings=list(result.warnings),
+        )
+        if text:
+            stored = await self.storage.upload_content_sync(
+                bucket,
+                self.text_key(storage_key, checksum),
+                encoded,
+                content_type="text/plain; charset=utf-8",
+                metadata={"checksum": checksum},
+            )
+            if not stored:
+                # Serve this turn from memory; the next turn retries persisting.
+                logger.warning("Failed to persist extracted text for %s", storage_key)
+                return manifest, text
+        await self.storage.upload_content_sync(
+            bucket,
+            self.manifest_key(storage_key, checksum),
+            json.dumps(asdict(manifest), ensure_ascii=False).encode("utf-8"),
+            content_type="application/json",
+            metadata={"checksum": checksum},
+        )
+        return manifest, text
+
+    async def read_snippet(
+        self,
+        *,
+        bucket: str,
+        storage_key: str,
+        manifest: ExtractionManifest,
+        max_chars: int,
+        page: int = 1,
+    ) -> AttachmentSnippet:
+        """Read at most ``max_chars`` characters starting at ``page`` (1-based)."""
+        if not manifest.readable:
+            return AttachmentSnippet(text="", status="unreadable")
+        max_chars = max(1, int(max_chars))
+        pages = manifest.pages or [{"char_start": 0, "byte_start": 0}]
+        start = pages[min(max(page, 1), len(pages)) - 1]
+        remaining_chars = manifest.total_chars - start["char_start"]
+        end_byte = min(
+            manifest.total_bytes,
+            start["byte_start"] + max_chars * _MAX_UTF8_BYTES_PER_CHAR,
+        ) - 1
+        raw = await self.storage.get_object_range(
+            bucket, self.text_key(storage_key, manifest.checksum), start["byte_start"], end_byte,
+        )
+        if raw is None:
+            return AttachmentSnippet(text="", status="missing")
+        # A range may end inside a multi-byte sequence; drop the partial tail.
+        text = raw.decode("utf-8", errors="ignore")
+        return _bounded_snippet(text, max_chars=max_chars, total_chars=remaining_chars)
+
+    async def load_snippet(
+        self,
+        *,
+        bucket: str,
+        storage_key: str,
+        checksum: str,
+        file_name: str,
+        content_type: Optional[str],
+        max_chars: int,
+    ) -> AttachmentSnippet:
+        manifest, fresh_text = await self._ensure(
+            bucket=bucket,
+            storage_key=storage_key,
+            checksum=checksum,
+            file_name=file_name,
+            content_type=content_type,
+        )
+        if manifest is None:
+            return AttachmentSnippet(text="", status="missing")
+        if fresh_text is not None:
+            # The turn that paid for extraction slices it in memory.
+            return _bounded_snippet(fresh_text, max_chars=max_chars)
+        return await self.read_snippet(
+            bucket=bucket, storage_key=storage_key, manifest=manifest, max_chars=max_chars,
+        )
+
+    async def delete(self, *, bucket: str, storage_key: str) -> bool:
+        return await self.storage.delete_folder(bucket, self.artifact_prefix(storage_key))
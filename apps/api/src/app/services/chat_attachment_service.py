@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterable, List, Optional
+from typing import Any, BinaryIO, Callable, Iterable, List, Optional
 
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
@@ -19,6 +20,7 @@ from app.models.chat_attachment import ChatAttachment
 from app.models.platform_settings import PlatformSettings
 from app.core.exceptions import ChatAttachmentNotFoundError
 from app.runtime.contracts import AttachmentContext, AttachmentRef
+from app.services.attachment_extraction_store import AttachmentExtractionStore, AttachmentSnippet
 from app.services.upload_intake_policy import UploadIntakePolicy
 from app.services.chat_artifact_reference_service import (
     ArtifactTarget,
@@ -172,6 +174,105 @@ class ChatAttachmentService:
         if not uploaded:
             raise RuntimeError(f"Failed to upload generated file to s3://{bucket}/{key}")
 
+        return await self._register_generated_object(
+            attachment_id=attachment_id,
+            chat_id=chat_id,
+            owner_id=owner_id,
+            safe_name=safe_name,
+            extension=extension,
+            content_type=content_type,
+            size_bytes=len(content),
+            checksum=checksum,
+            bucket=bucket,
+            key=key,
+            supplied_metadata=supplied_metadata,
+        )
+
+    async def create_generated_attachment_stream(
+        self,
+        *,
+        chat_id: Optional[str],
+        owner_id: str,
+        filename: str,
+        produce: Callable[[BinaryIO], Optional[dict[str, Any]]],
+        content_type: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Stream a generated file straight into S3.
+
+        ``produce`` runs in a worker thread and writes into a multipart
+        upload sink; the object is only completed if it returns normally.
+        It may return extra metadata (row counts and the like), which is
+        recorded with the artifact. Returns the artifact metadata and the
+        full recorded metadata.
+        """
+        safe_name = self._sanitize_filename(filename)
+        extension = safe_name.rsplit(".", 1)[-1].strip().lower() if "." in safe_name else "txt"
+        attachment_id = uuid.uuid4()
+        # The checksum is only known once the last byte is written.
+        if chat_id:
+            key = f"chats/{chat_id}/generated/{attachment_id}/{safe_name}"
+        else:
+            key = f"artifacts/generated/{owner_id}/{attachment_id}/{safe_name}"
+        bucket = self.settings.S3_BUCKET_CHAT_UPLOADS
+        await self._ensure_bucket(bucket)
+        object_metadata = {"owner_id": owner_id, "generated": "true"}
+        if chat_id:
+            object_metadata["chat_id"] = chat_id
+        writer = s3_manager.open_multipart_writer(
+            bucket,
+            key,
+            content_type=content_type or "application/octet-stream",
+            metadata=object_metadata,
+            max_bytes=max_bytes,
+        )
+
+        def _run() -> Optional[dict[str, Any]]:
+            try:
+                produced = produce(writer)
+                writer.close()
+            except BaseException:
+                writer.abort()
+                raise
+            return produced
+
+        produced = await asyncio.to_thread(_run)
+        supplied_metadata = {
+            **(metadata or {}),
+            **(produced or {}),
+            "size_bytes": writer.bytes_written,
+        }
+        attachment = await self._register_generated_object(
+            attachment_id=attachment_id,
+            chat_id=chat_id,
+            owner_id=owner_id,
+            safe_name=safe_name,
+            extension=extension,
+            content_type=content_type,
+            size_bytes=writer.bytes_written,
+            checksum=writer.checksum,
+            bucket=bucket,
+            key=key,
+            supplied_metadata=supplied_metadata,
+        )
+        return attachment, supplied_metadata
+
+    async def _register_generated_object(
+        self,
+        *,
+        attachment_id: uuid.UUID,
+        chat_id: Optional[str],
+        owner_id: str,
+        safe_name: str,
+        extension: str,
+        content_type: Optional[str],
+        size_bytes: int,
+        checksum: str,
+        bucket: str,
+        key: str,
+        supplied_metadata: dict[str, Any],
+    ) -> dict[str, Any]:
         row = None
         try:
             row = await self._create_attachment_row(
@@ -181,7 +282,7 @@ class ChatAttachmentService:
                 file_name=safe_name,
                 file_ext=extension,
                 content_type=content_type,
-                size_bytes=len(content),
+                size_bytes=size_bytes,
                 checksum=checksum,
                 bucket=bucket,
                 key=key,
@@ -403,14 +504,11 @@ class ChatAttachmentService:
                 row = await self.session.get(ChatAttachment, target_id)
                 if row is None or str(row.chat_id) != str(chat_id) or str(row.owner_id) != str(owner_id):
                     raise ChatAttachmentNotFoundError("Artifact attachment was not found or access denied")
-                snippet = await self._load_text_content(row, max_chars=max_chars_per_file) or ""
-                readable = bool(snippet)
-                truncated = snippet.endswith("\n...[truncated]")
-                if readable:
-                    snippet_status = "truncated" if truncated else "ready"
-                else:
-                    payload = await s3_manager.get_object(row.storage_bucket, row.storage_key)
-                    snippet_status = "unreadable" if payload else "missing"
+                loaded = await self._load_text_content(row, max_chars=max_chars_per_file)
+                snippet = loaded.text
+                readable = loaded.readable
+                truncated = loaded.truncated
+                snippet_status = loaded.status
             contexts.append(
                 AttachmentContext(
                     ref=AttachmentRef(
@@ -453,9 +551,11 @@ class ChatAttachmentService:
         owner_id: str,
     ) -> int:
         rows = await self.list_owned_attachments_for_chat(chat_id=chat_id, owner_id=owner_id)
+        extraction_store = AttachmentExtractionStore()
         for row in rows:
             try:
                 await s3_manager.delete_object(row.storage_bucket, row.storage_key)
+                await extraction_store.delete(bucket=row.storage_bucket, storage_key=row.storage_key)
             except Exception as exc:
                 logger.warning(
                     "Failed to delete chat attachment object %s: %s",
@@ -506,27 +606,20 @@ class ChatAttachmentService:
         await self.session.flush()
         return int(result.rowcount or 0)
 
-    async def _load_text_content(self, row: ChatAttachment, *, max_chars: int) -> Optional[str]:
-        payload = await s3_manager.get_object(row.storage_bucket, row.storage_key)
-        if not payload:
-            return None
-        from app.services.document_extraction_service import DocumentExtractionService, ExtractionRequest
+    async def _load_text_content(self, row: ChatAttachment, *, max_chars: int) -> AttachmentSnippet:
+        """Serve a bounded snippet from the persisted extraction artifact.
 
-        result = await DocumentExtractionService().extract(
-            ExtractionRequest(
-                payload=payload,
-                filename=row.file_name or "",
-                content_type=row.content_type,
-                profile="chat_preview",
-                max_chars=max_chars,
-            )
+        The original object is downloaded and parsed only when no artifact
+        exists yet for this storage key and checksum.
+        """
+        return await AttachmentExtractionStore().load_snippet(
+            bucket=row.storage_bucket,
+            storage_key=row.storage_key,
+            checksum=row.checksum,
+            file_name=row.file_name or "",
+            content_type=row.content_type,
+            max_chars=max_chars,
         )
-        if not result.text:
-            return None
-        decoded = result.text
-        if len(decoded) <= max_chars:
-            return decoded
-        return f"{decoded[:max_chars]}\n...[truncated]"
 
     async def _get_platform_settings_row(self) -> PlatformSettings | None:
         result = await self.session.execute(select(PlatformSettings).limit(1))
@@ -0,0 +1,118 @@
+"""
+Coalesce streamed answer deltas before they become chat SSE frames.
+
+Fast models emit hundreds of tiny chunks per second; one SSE frame (and one
+socket write) per chunk costs more than the text itself. ``ChatStreamBatcher``
+merges consecutive ``delta`` service events and groups the events that are
+ready together into one batch, which the router writes as a single chunk.
+
+A merged delta is flushed when any of these holds:
+
+* it reached ``max_bytes`` (UTF-8);
+* ``max_delay_s`` passed since its first chunk arrived;
+* the last chunk ends a sentence or line (``flush_on_sentence``);
+* a non-delta event (status, pause, final, error, ...) arrives — it is
+  emitted right behind the flushed delta in the same batch.
+
+``max_bytes <= 0`` disables coalescing: every event is its own batch.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import get_settings
+
+_SENTENCE_ENDINGS = (".", "!", "?", "…", "\n", "。")
+
+
+@dataclass(frozen=True)
+class ChatStreamBatcher:
+    max_bytes: int = 512
+    max_delay_s: float = 0.04
+    flush_on_sentence: bool = True
+
+    @classmethod
+    def from_settings(cls) -> "ChatStreamBatcher":
+        settings = get_settings()
+        return cls(
+            max_bytes=settings.CHAT_SSE_COALESCE_MAX_BYTES,
+            max_delay_s=settings.CHAT_SSE_COALESCE_MAX_DELAY_MS / 1000.0,
+            flush_on_sentence=settings.CHAT_SSE_COALESCE_SENTENCE_FLUSH,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    async def batches(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Re-chunk ``events`` into ordered batches; closes ``events`` when done."""
+        iterator = events.__aiter__()
+        if not self.enabled:
+            async for event in iterator:
+                yield [event]
+            return
+
+        loop = asyncio.get_running_loop()
+        chunks: List[str] = []
+        size = 0
+        deadline: Optional[float] = None
+        pending: Optional[asyncio.Future] = None
+
+        def _take_delta() -> List[Dict[str, Any]]:
+            nonlocal size, deadline
+            if not chunks:
+                return []
+            merged = {"type": "delta", "content": "".join(chunks)}
+            chunks.clear()
+            size, deadline = 0, None
+            return [merged]
+
+        try:
+            while True:
+                if deadline is None and pending is None:
+                    # Nothing buffered: no timer to honour, read directly.
+                    try:
+                        event = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                else:
+                    # Read in a task so a flush timeout never cancels the upstream generator.
+                    if pending is None:
+                        pending = asyncio.ensure_future(iterator.__anext__())
+                    timeout = None if deadline is None else max(deadline - loop.time(), 0.0)
+                    done, _ = await asyncio.wait({pending}, timeout=timeout)
+                    if not done:
+                        yield _take_delta()
+                        continue
+                    future, pending = pending, None
+                    try:
+                        event = future.result()
+                    except StopAsyncIteration:
+                        break
+
+                if event.get("type") != "delta":
+                    yield _take_delta() + [event]
+                    continue
+                content = str(event.get("content") or "")
+                if not content:
+                    continue
+                chunks.append(content)
+                size += len(content.encode("utf-8"))
+                if deadline is None:
+                    deadline = loop.time() + self.max_delay_s
+                if size >= self.max_bytes or (
+                    self.flush_on_sentence and content.rstrip(" ").endswith(_SENTENCE_ENDINGS)
+                ):
+                    yield _take_delta()
+            tail = _take_delta()
+            if tail:
+                yield tail
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,119 @@
+"""
+Short-lived Redis replay buffer for chat SSE streams.
+
+The chat turn runs inside the streaming request, so a client whose
+connection drops (typically a mobile network switch the server has not
+noticed yet) cannot re-attach to the pipeline itself. Instead every chunk
+written to the client is also appended to a bounded Redis stream per chat,
+and its stream entry id is sent as the SSE ``id``. A reconnect with
+``Last-Event-ID`` replays the entries after that id and then keeps reading
+new ones until the stream's terminal ``done`` chunk.
+
+Buffer failures never break the live stream: chunks are then sent without
+an id and reconnects fall back to reloading chat state.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, AsyncGenerator, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.schemas.chat_events import ChatSSEEventType, ErrorPayload, format_chat_sse, format_chat_sse_done
+
+logger = get_logger(__name__)
+
+_ENTRY_ID = re.compile(r"^\d+-\d+$")
+
+
+def _key(chat_id: str) -> str:
+    return f"chat:sse:{chat_id}"
+
+
+def with_event_id(chunk: str, event_id: str) -> str:
+    """Tag the last SSE frame of ``chunk`` with ``id: event_id``."""
+    body = chunk[:-2] if chunk.endswith("\n\n") else chunk
+    head, sep, last = body.rpartition("\n\n")
+    return f"{head}{sep}id: {event_id}\n{last}\n\n"
+
+
+class ChatStreamReplayBuffer:
+    """Records one chat's SSE chunks and replays them for ``Last-Event-ID`` reconnects."""
+
+    def __init__(self, redis: Any, chat_id: str) -> None:
+        settings = get_settings()
+        self._redis = redis
+        self._key = _key(chat_id)
+        self._maxlen = settings.CHAT_SSE_REPLAY_MAXLEN
+        self._ttl_s = settings.CHAT_SSE_REPLAY_TTL_SECONDS
+        self._idle_s = settings.CHAT_SSE_REPLAY_IDLE_SECONDS
+        self._heartbeat_s = settings.SANDBOX_SSE_HEARTBEAT_SECONDS
+        self._expires_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._maxlen > 0
+
+    async def reset(self) -> None:
+        """Start a new stream for the chat; earlier entries are dropped."""
+        if not self.enabled:
+            return
+        try:
+            await self._redis.delete(self._key)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("chat_sse_replay_reset_failed: %s", exc)
+
+    async def record(self, chunk: str, *, end: bool = False) -> str:
+        """Append ``chunk`` and return it tagged with its replay id."""
+        if not self.enabled:
+            return chunk
+        fields = {"frame": chunk, "end": "1"} if end else {"frame": chunk}
+        try:
+            entry_id = await self._redis.xadd(self._key, fields, maxlen=self._maxlen, approximate=True)
+            now = asyncio.get_running_loop().time()
+            if end or now >= self._expires_at:
+                # Refresh the TTL a few times per TTL window, not per chunk.
+                await self._redis.expire(self._key, self._ttl_s)
+                self._expires_at = now + self._ttl_s / 4
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("chat_sse_replay_append_failed: %s", exc)
+            return chunk
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode("ascii")
+        return with_event_id(chunk, entry_id) if isinstance(entry_id, str) else chunk
+
+    async def exists(self) -> bool:
+        return bool(self.enabled and await self._redis.exists(self._key))
+
+    async def follow(self, last_event_id: Optional[str]) -> AsyncGenerator[str, None]:
+        """Replay chunks after ``last_event_id``, then tail new ones until the stream ends.
+
+        Gives up with an ``interrupted`` error when no chunk arrives for
+        ``CHAT_SSE_REPLAY_IDLE_SECONDS`` (the producing request is gone).
+        """
+        cursor = last_event_id if last_event_id and _ENTRY_ID.match(last_event_id) else "0-0"
+        loop = asyncio.get_running_loop()
+        idle_deadline = loop.time() + self._idle_s
+        while True:
+            response = await self._redis.xread({self._key: cursor}, count=100, block=self._heartbeat_s * 1000)
+            entries = _entries(response)
+            if not entries:
+                if loop.time() >= idle_deadline or not await self._redis.exists(self._key):
+                    yield format_chat_sse(ChatSSEEventType.ERROR, ErrorPayload(
+                        error="Stream interrupted", code="stream_interrupted", recoverable=True,
+                    ))
+                    yield format_chat_sse_done()
+                    return
+                yield ": ping\n\n"
+                continue
+            idle_deadline = loop.time() + self._idle_s
+            for entry_id, fields in entries:
+                cursor = entry_id
+                yield with_event_id(str(fields.get("frame") or ""), entry_id)
+                if fields.get("end"):
+                    return
+
+
+def _entries(response: Any) -> list[tuple[str, dict]]:
+    return [entry for _name, entries in response or [] for entry in entries]
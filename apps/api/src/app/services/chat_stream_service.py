@@ -353,7 +353,9 @@ class ChatStreamService:
             # the one shared transport for sandbox and chat; chat accepts only
             # its safe progress projection and never raw journal events.
             tail_subscriber = RuntimeTailSubscriber(stream_key=str(runtime_run_id))
-            progress_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+            progress_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+                maxsize=tail_subscriber.consumer_buffer,
+            )
             listener_task: Optional[asyncio.Task[None]] = None
 
             async def _listen_progress() -> None:
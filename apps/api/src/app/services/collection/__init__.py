@@ -13,6 +13,7 @@ from app.services.collection.ddl import (
     apply_typed_binds,
     VECTOR_INFRA_ALTER_SQL,
     VECTOR_STATUS_INDEX_SQL,
+    VECTOR_PENDING_INDEX_SQL,
 )
 from app.services.collection.field_coercion import (
     coerce_value,
@@ -35,6 +36,7 @@ __all__ = [
     "apply_typed_binds",
     "VECTOR_INFRA_ALTER_SQL",
     "VECTOR_STATUS_INDEX_SQL",
+    "VECTOR_PENDING_INDEX_SQL",
     "coerce_value",
     "validate_and_prepare_payload",
     "parse_string_bool",
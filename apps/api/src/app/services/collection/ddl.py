@@ -101,3 +101,10 @@ VECTOR_STATUS_INDEX_SQL = (
     "CREATE INDEX IF NOT EXISTS idx_{table_name}_vector_status "
     "ON {table_name} (_vector_status)"
 )
+
+# The vectorize worker polls ``_vector_status = 'pending'``; once a table is
+# mostly vectorized this partial index is tiny and the poll never scans.
+VECTOR_PENDING_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_{table_name}_vector_pending "
+    "ON {table_name} (id) WHERE _vector_status = 'pending'"
+)
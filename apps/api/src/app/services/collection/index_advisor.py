@@ -0,0 +1,713 @@
+"""
+Index advisor for dynamic collection tables.
+
+``build_indexes_sql`` gives every filterable/sortable field its own index,
+chosen when the collection is created.  Real workloads filter on two or
+three fields at once, group and sort, and poll ``_vector_status`` — shapes
+no single-column index serves.  This module:
+
+- records the shape (equality / range / sort / group columns, constant
+  predicate, covered columns) of queries issued by the search, aggregate,
+  row and vectorize paths.  Counts are kept per process and flushed to a
+  Redis hash per table at most every ``flush_interval_s`` by a background
+  task, so recording never adds a round-trip to an ordinary request;
+- turns recorded shapes into composite / partial / covering btree
+  proposals.  Columns follow equality → group/sort → range order, and
+  proposals an existing index (or a longer proposal) already serves are
+  dropped.  Benefit is estimated from ``pg_class``/``pg_stats`` as rows a
+  sequential scan reads minus rows the index would return, times hits;
+- applies a proposal with ``CREATE INDEX CONCURRENTLY`` on an autocommit
+  connection, so writers are never blocked.  Builds run in a worker task;
+  an interrupted build's INVALID index is dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.collection import Collection, FieldType
+
+logger = get_logger(__name__)
+
+SHAPE_KEY_PREFIX = "collection_index_advisor:shapes:"
+SHAPE_TTL_S = 7 * 24 * 3600
+# Bounds local memory if a caller generates unbounded distinct shapes.
+MAX_PENDING_SHAPES = 2000
+
+EQUALITY_OPS = frozenset({"eq", "in", "is_null"})
+RANGE_OPS = frozenset({"gt", "gte", "lt", "lte", "range"})
+
+INDEX_MAX_KEY_COLUMNS = 4
+INDEX_MAX_INCLUDE_COLUMNS = 3
+DEFAULT_MIN_HITS = 5
+DEFAULT_MIN_TABLE_ROWS = 1000
+
+# Planner defaults (selfuncs.h) when pg_stats has nothing better.
+DEFAULT_EQ_SELECTIVITY = 0.005
+DEFAULT_RANGE_SELECTIVITY = 1.0 / 3.0
+
+VECTOR_PENDING_PREDICATE = ("_vector_status", "pending")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _default_redis() -> Any:
+    from app.core.redis import get_redis
+
+    return get_redis()
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """Index-relevant structure of one query against a collection table."""
+
+    source: str
+    equality: Tuple[str, ...] = ()
+    range: Tuple[str, ...] = ()
+    sort: Tuple[str, ...] = ()
+    group: Tuple[str, ...] = ()
+    predicate: Optional[Tuple[str, str]] = None
+    include: Tuple[str, ...] = ()
+
+    @property
+    def is_indexable(self) -> bool:
+        keyed = {*self.equality, *self.range, *self.sort, *self.group} - {"id"}
+        return bool(keyed or self.predicate)
+
+    def key(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def from_key(cls, raw: str) -> "QueryShape":
+        data = json.loads(raw)
+        predicate = data.get("predicate")
+        return cls(
+            source=str(data.get("source") or ""),
+            equality=tuple(data.get("equality") or ()),
+            range=tuple(data.get("range") or ()),
+            sort=tuple(data.get("sort") or ()),
+            group=tuple(data.get("group") or ()),
+            predicate=tuple(predicate) if predicate else None,
+            include=tuple(data.get("include") or ()),
+        )
+
+
+def _unique(names: Iterable[Optional[str]], exclude: Iterable[str] = ()) -> Tuple[str, ...]:
+    seen = set(exclude)
+    result: List[str] = []
+    for name in names:
+        if name and name not in seen and _IDENTIFIER.match(name):
+            seen.add(name)
+            result.append(name)
+    return tuple(result)
+
+
+def shape_from_dsl(
+    source: str,
+    filters: Optional[Dict[str, Any]],
+    *,
+    sort: Sequence[str] = (),
+    group: Sequence[str] = (),
+    include: Sequence[str] = (),
+    predicate: Optional[Tuple[str, str]] = None,
+) -> QueryShape:
+    """Shape of a query using the collection tools' filter DSL.
+
+    Only ``and`` conditions and plain ``field: value`` pairs can narrow an
+    index scan; ``or`` groups, ``neq``/``not_in`` and pattern matches cannot
+    and are ignored.
+    """
+    filters = filters or {}
+    equality: List[str] = []
+    ranges: List[str] = []
+    for cond in filters.get("and", []) or []:
+        op = cond.get("op", "eq")
+        if op in EQUALITY_OPS:
+            equality.append(cond.get("field"))
+        elif op in RANGE_OPS:
+            ranges.append(cond.get("field"))
+    for key in filters:
+        if key not in ("and", "or"):
+            equality.append(key)
+
+    eq = tuple(sorted(_unique(equality)))
+    return QueryShape(
+        source=source,
+        equality=eq,
+        range=tuple(sorted(_unique(ranges, exclude=eq))),
+        sort=_unique(sort),
+        group=_unique(group),
+        predicate=predicate,
+        include=tuple(sorted(_unique(include))),
+    )
+
+
+def shape_from_row_filters(
+    collection: Collection,
+    filters: Optional[Dict[str, Any]],
+    *,
+    sort: Sequence[str] = (),
+) -> QueryShape:
+    """Shape of ``CollectionRowService.search`` filters (``{field: value}``)."""
+    equality: List[str] = []
+    ranges: List[str] = []
+    for field_def in collection.get_filterable_fields():
+        name = field_def["name"]
+        if name not in (filters or {}):
+            continue
+        value = filters[name]
+        data_type = field_def.get("data_type")
+        if isinstance(value, dict):
+            ranges.append(name)
+        elif isinstance(value, str) and data_type in (
+            FieldType.STRING.value,
+            FieldType.TEXT.value,
+            FieldType.ENUM.value,
+        ):
+            # ILIKE '%…%' — a trigram index already covers it.
+            continue
+        else:
+            equality.append(name)
+    eq = tuple(sorted(_unique(equality)))
+    return QueryShape(
+        source="rows",
+        equality=eq,
+        range=tuple(sorted(_unique(ranges, exclude=eq))),
+        sort=_unique(sort),
+    )
+
+
+class QueryShapeRecorder:
+    """Per-process shape counters flushed to Redis in batches."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        flush_interval_s: float = 10.0,
+        flush_timeout_s: float = 0.5,
+        ttl_s: int = SHAPE_TTL_S,
+        redis_factory: Callable[[], Any] = _default_redis,
+    ) -> None:
+        self.enabled = enabled
+        self.flush_interval_s = float(flush_interval_s)
+        self.flush_timeout_s = float(flush_timeout_s)
+        self.ttl_s = int(ttl_s)
+        self._redis_factory = redis_factory
+        self._pending: Counter[Tuple[str, str]] = Counter()
+        self._last_flush = 0.0
+        self._flushing: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "QueryShapeRecorder":
+        return cls(enabled=bool(get_settings().COLLECTION_INDEX_ADVISOR_ENABLED))
+
+    @staticmethod
+    def redis_key(table_name: str) -> str:
+        return f"{SHAPE_KEY_PREFIX}{table_name}"
+
+    async def record(self, table_name: Optional[str], shape: QueryShape) -> None:
+        """Count one query; never raises or waits on Redis."""
+        if not self.enabled or not table_name or not shape.is_indexable:
+            return
+        key = (table_name, shape.key())
+        if key in self._pending or len(self._pending) < MAX_PENDING_SHAPES:
+            self._pending[key] += 1
+        if self._flushing is None and time.monotonic() - self._last_flush >= self.flush_interval_s:
+            self._last_flush = time.monotonic()
+            self._flushing = asyncio.create_task(self.flush())
+            self._flushing.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        if self._flushing is task:
+            self._flushing = None
+
+    async def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+        try:
+            await asyncio.wait_for(self._write(pending), timeout=self.flush_timeout_s)
+        except Exception as exc:
+            # Advice is best-effort; dropping a window of counts is fine.
+            logger.debug("Query shape flush failed, dropping %d shapes: %r", len(pending), exc)
+
+    async def _write(self, pending: Counter[Tuple[str, str]]) -> None:
+        pipe = self._redis_factory().pipeline(transaction=False)
+        tables = set()
+        for (table_name, shape_key), count in pending.items():
+            pipe.hincrby(self.redis_key(table_name), shape_key, count)
+            tables.add(table_name)
+        for table_name in tables:
+            pipe.expire(self.redis_key(table_name), self.ttl_s)
+        await pipe.execute()
+
+    async def load(self, table_name: str) -> Dict[QueryShape, int]:
+        """Recorded shape counts for ``table_name`` (Redis plus unflushed)."""
+        counts: Counter[QueryShape] = Counter()
+        try:
+            raw = await self._redis_factory().hgetall(self.redis_key(table_name)) or {}
+        except Exception as exc:
+            logger.warning("Failed to load query shapes for %s: %r", table_name, exc)
+            raw = {}
+        for shape_key, count in raw.items():
+            try:
+                counts[QueryShape.from_key(shape_key)] += int(count)
+            except (ValueError, TypeError):
+                continue
+        for (pending_table, shape_key), count in self._pending.items():
+            if pending_table == table_name:
+                counts[QueryShape.from_key(shape_key)] += count
+        return dict(counts)
+
+    async def reset(self, table_name: str) -> None:
+        self._pending = Counter(
+            {key: count for key, count in self._pending.items() if key[0] != table_name}
+        )
+        await self._redis_factory().delete(self.redis_key(table_name))
+
+
+_recorder: Optional[QueryShapeRecorder] = None
+
+
+def get_query_shape_recorder() -> QueryShapeRecorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = QueryShapeRecorder.from_settings()
+    return _recorder
+
+
+async def record_shape_now(table_name: Optional[str], shape: QueryShape) -> None:
+    """Record and flush on a short-lived Redis client.
+
+    For Celery tasks: each runs on a fresh event loop, so the process-wide
+    client (and a buffer waiting for the next flush) cannot be reused.
+    """
+    settings = get_settings()
+    if not settings.COLLECTION_INDEX_ADVISOR_ENABLED:
+        return
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        recorder = QueryShapeRecorder(flush_interval_s=float("inf"), redis_factory=lambda: client)
+        await recorder.record(table_name, shape)
+        await recorder.flush()
+    finally:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+
+# ── Advice ────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ExistingIndex:
+    name: str
+    columns: Tuple[str, ...]
+    predicate: Optional[str] = None
+    method: str = "btree"
+    valid: bool = True
+
+
+@dataclass
+class ColumnStats:
+    n_distinct: float = 0.0
+    null_frac: float = 0.0
+    most_common: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class IndexProposal:
+    name: str
+    table_name: str
+    columns: Tuple[str, ...]
+    equality_prefix: int
+    include: Tuple[str, ...] = ()
+    predicate: Optional[str] = None
+    sources: List[str] = field(default_factory=list)
+    hits: int = 0
+    selectivity: float = 1.0
+    estimated_rows_before: float = 0.0
+    estimated_rows_after: float = 0.0
+
+    @property
+    def kind(self) -> str:
+        if self.predicate:
+            return "partial"
+        if self.include:
+            return "covering"
+        return "composite" if len(self.columns) > 1 else "single"
+
+    @property
+    def estimated_benefit(self) -> float:
+        """Rows not read across the recorded window."""
+        return max(0.0, self.estimated_rows_before - self.estimated_rows_after) * self.hits
+
+    @property
+    def sql(self) -> str:
+        sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table_name} ({', '.join(self.columns)})"
+        if self.include:
+            sql += f" INCLUDE ({', '.join(self.include)})"
+        if self.predicate:
+            sql += f" WHERE {self.predicate}"
+        return sql
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "columns": list(self.columns),
+            "include": list(self.include),
+            "predicate": self.predicate,
+            "sources": sorted(set(self.sources)),
+            "hits": self.hits,
+            "estimated_rows_before": round(self.estimated_rows_before),
+            "estimated_rows_after": round(self.estimated_rows_after),
+            "estimated_benefit": round(self.estimated_benefit),
+            "sql": self.sql,
+        }
+
+
+def render_predicate(predicate: Tuple[str, str]) -> str:
+    column, value = predicate
+    return f"{column} = '{str(value).replace(chr(39), chr(39) * 2)}'"
+
+
+def normalize_predicate(predicate: Optional[str]) -> Optional[str]:
+    """Canonical form of ``pg_get_expr`` output for comparison."""
+    if not predicate:
+        return None
+    normalized = re.sub(r"::[a-z ]+", "", predicate)
+    normalized = normalized.replace("(", "").replace(")", "")
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def _proposal_name(table_name: str, columns: Sequence[str], include: Sequence[str], predicate: Optional[str]) -> str:
+    digest = hashlib.sha1(
+        json.dumps([table_name, list(columns), list(include), predicate]).encode("utf-8")
+    ).hexdigest()[:10]
+    return f"idx_{table_name[:36]}_adv_{digest}"
+
+
+def _serves(index_columns: Sequence[str], columns: Sequence[str], equality_prefix: int) -> bool:
+    """Whether an index on ``index_columns`` serves a lookup on ``columns``.
+
+    The first ``equality_prefix`` columns are equality matches and may
+    appear in any order; the rest must follow in sequence.
+    """
+    if len(index_columns) < len(columns):
+        return False
+    head = set(index_columns[:equality_prefix])
+    return head == set(columns[:equality_prefix]) and tuple(
+        index_columns[equality_prefix:len(columns)]
+    ) == tuple(columns[equality_prefix:])
+
+
+class CollectionIndexAdvisor:
+    """Propose and apply indexes for one collection table."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        recorder: Optional[QueryShapeRecorder] = None,
+    ) -> None:
+        self.session = session
+        self.recorder = recorder or get_query_shape_recorder()
+
+    async def advise(
+        self,
+        collection: Collection,
+        *,
+        min_hits: int = DEFAULT_MIN_HITS,
+        min_table_rows: int = DEFAULT_MIN_TABLE_ROWS,
+    ) -> Dict[str, Any]:
+        table_name = str(collection.table_name or "")
+        shapes = await self.recorder.load(table_name)
+        row_estimate = await self._row_estimate(table_name)
+        existing = await self._existing_indexes(table_name)
+        columns = {c for shape in shapes for c in (*shape.equality, *shape.range)}
+        columns |= {shape.predicate[0] for shape in shapes if shape.predicate}
+        stats = await self._column_stats(table_name, sorted(columns))
+
+        proposals = self.propose(
+            table_name,
+            shapes,
+            existing=existing,
+            stats=stats,
+            row_estimate=row_estimate,
+            min_hits=min_hits,
+        )
+        if row_estimate < min_table_rows:
+            # Sequential scans of small tables are cheaper than index upkeep.
+            proposals = []
+        return {
+            "table_name": table_name,
+            "row_estimate": round(row_estimate),
+            "shapes": [
+                {**asdict(shape), "hits": hits}
+                for shape, hits in sorted(shapes.items(), key=lambda item: -item[1])
+            ],
+            "existing_indexes": [asdict(index) for index in existing],
+            "proposals": [proposal.to_dict() for proposal in proposals],
+        }
+
+    @staticmethod
+    def propose(
+        table_name: str,
+        shapes: Dict[QueryShape, int],
+        *,
+        existing: Sequence[ExistingIndex] = (),
+        stats: Optional[Dict[str, ColumnStats]] = None,
+        row_estimate: float = 0.0,
+        min_hits: int = DEFAULT_MIN_HITS,
+    ) -> List[IndexProposal]:
+        stats = stats or {}
+
+        def eq_selectivity(column: str) -> float:
+            column_stats = stats.get(column)
+            if column_stats is None or not column_stats.n_distinct:
+                return DEFAULT_EQ_SELECTIVITY
+            n_distinct = column_stats.n_distinct
+            if n_distinct < 0:
+                n_distinct = -n_distinct * max(row_estimate, 1.0)
+            return max(1.0 / n_distinct, 1.0 / max(row_estimate, 1.0))
+
+        def predicate_selectivity(predicate: Tuple[str, str]) -> float:
+            column_stats = stats.get(predicate[0])
+            if column_stats is None:
+                return DEFAULT_EQ_SELECTIVITY
+            if predicate[1] in column_stats.most_common:
+                return column_stats.most_common[predicate[1]]
+            return min(eq_selectivity(predicate[0]), 1.0 - sum(column_stats.most_common.values()))
+
+        candidates: Dict[Tuple, IndexProposal] = {}
+        for shape, hits in shapes.items():
+            if not shape.is_indexable:
+                continue
+            equality = sorted(shape.equality, key=eq_selectivity)
+            if shape.predicate:
+                equality = [c for c in equality if c != shape.predicate[0]]
+            ordered = list(equality)
+            for column in (*shape.group, *shape.sort):
+                if column not in ordered:
+                    ordered.append(column)
+            if shape.range and shape.range[0] not in ordered:
+                ordered.append(shape.range[0])
+            ordered = [c for c in ordered if c != "id"][:INDEX_MAX_KEY_COLUMNS]
+            if not ordered:
+                if not shape.predicate:
+                    continue
+                ordered = ["id"]
+            equality_prefix = min(len(equality), len(ordered))
+            include = tuple(c for c in shape.include if c not in ordered)[:INDEX_MAX_INCLUDE_COLUMNS]
+            predicate = render_predicate(shape.predicate) if shape.predicate else None
+
+            selectivity = 1.0
+            for column in equality[:equality_prefix]:
+                selectivity *= eq_selectivity(column)
+            if shape.range and shape.range[0] in ordered:
+                selectivity *= DEFAULT_RANGE_SELECTIVITY
+            if shape.predicate:
+                selectivity *= predicate_selectivity(shape.predicate)
+
+            key = (tuple(ordered), include, predicate)
+            proposal = candidates.get(key)
+            if proposal is None:
+                proposal = IndexProposal(
+                    name=_proposal_name(table_name, ordered, include, predicate),
+                    table_name=table_name,
+                    columns=tuple(ordered),
+                    equality_prefix=equality_prefix,
+                    include=include,
+                    predicate=predicate,
+                    selectivity=selectivity,
+                )
+                candidates[key] = proposal
+            proposal.hits += hits
+            proposal.sources.append(shape.source)
+            proposal.selectivity = max(proposal.selectivity, selectivity)
+
+        # A longer index serves every proposal that is its prefix.
+        merged: List[IndexProposal] = []
+        for proposal in sorted(candidates.values(), key=lambda p: -len(p.columns)):
+            host = next(
+                (
+                    other
+                    for other in merged
+                    if other.predicate == proposal.predicate
+                    and set(proposal.include) <= set(other.include) | set(other.columns)
+                    and _serves(other.columns, proposal.columns, proposal.equality_prefix)
+                ),
+                None,
+            )
+            if host is not None:
+                host.hits += proposal.hits
+                host.sources.extend(proposal.sources)
+                continue
+            merged.append(proposal)
+
+        results: List[IndexProposal] = []
+        for proposal in merged:
+            if proposal.hits < min_hits:
+                continue
+            if any(
+                index.valid
+                and index.method == "btree"
+                and normalize_predicate(index.predicate) == normalize_predicate(proposal.predicate)
+                and _serves(index.columns, proposal.columns, proposal.equality_prefix)
+                for index in existing
+            ):
+                continue
+            proposal.estimated_rows_before = row_estimate
+            proposal.estimated_rows_after = max(1.0, row_estimate * proposal.selectivity)
+            if proposal.estimated_benefit <= 0:
+                continue
+            results.append(proposal)
+        results.sort(key=lambda p: -p.estimated_benefit)
+        return results
+
+    async def find_proposal(self, collection: Collection, name: str) -> Optional[Dict[str, Any]]:
+        """Return the current proposal called ``name``, or None."""
+        advice = await self.advise(collection, min_hits=1, min_table_rows=0)
+        return next((p for p in advice["proposals"] if p["name"] == name), None)
+
+    async def apply(
+        self,
+        collection: Collection,
+        name: str,
+        *,
+        engine: Optional[AsyncEngine] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Create the proposal called ``name``; None if it is not proposed.
+
+        Builds can take minutes on large tables, so callers run this from a
+        worker task rather than a request.
+        """
+        table_name = collection.table_name
+        proposal = await self.find_proposal(collection, name)
+        if proposal is None:
+            return None
+        # CONCURRENTLY waits for every open transaction, the catalog reads
+        # above included.
+        await self.session.commit()
+        if engine is None:
+            from app.core.db import get_engine
+
+            engine = get_engine()
+
+        # A failed earlier attempt leaves an INVALID index that
+        # IF NOT EXISTS would silently accept.
+        await drop_invalid_index(engine, name)
+        started = time.monotonic()
+        try:
+            # CONCURRENTLY cannot run inside a transaction block.
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text(proposal["sql"]))
+        except BaseException:
+            # Cancellation and worker time limits land here too: an
+            # interrupted build leaves an INVALID index behind.  The build
+            # connection may be unusable, so clean up on a fresh one.
+            try:
+                await asyncio.shield(drop_invalid_index(engine, name))
+            except Exception as exc:
+                logger.warning("collection_index_cleanup_failed", extra={"index": name, "error": str(exc)})
+            raise
+        logger.info(
+            "collection_index_created",
+            extra={
+                "table_name": table_name,
+                "index": name,
+                "duration_s": round(time.monotonic() - started, 3),
+            },
+        )
+        return proposal
+
+    # ── Catalog reads ─────────────────────────────────────────────────────────
+
+    async def _row_estimate(self, table_name: str) -> float:
+        result = await self.session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name},
+        )
+        return max(0.0, float(result.scalar() or 0.0))
+
+    async def _existing_indexes(self, table_name: str) -> List[ExistingIndex]:
+        result = await self.session.execute(
+            text(
+                "SELECT ic.relname AS name, am.amname AS method, ix.indisvalid AS valid, "
+                "pg_get_expr(ix.indpred, ix.indrelid) AS predicate, "
+                "ARRAY(SELECT a.attname FROM unnest(ix.indkey[0:ix.indnkeyatts - 1]) WITH ORDINALITY AS k(attnum, ord) "
+                "JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum "
+                "ORDER BY k.ord) AS columns "
+                "FROM pg_index ix "
+                "JOIN pg_class ic ON ic.oid = ix.indexrelid "
+                "JOIN pg_am am ON am.oid = ic.relam "
+                "WHERE ix.indrelid = to_regclass(:table_name)"
+            ),
+            {"table_name": table_name},
+        )
+        return [
+            ExistingIndex(
+                name=row["name"],
+                columns=tuple(row["columns"] or ()),
+                predicate=row["predicate"],
+                method=row["method"],
+                valid=bool(row["valid"]),
+            )
+            for row in result.mappings().all()
+        ]
+
+    async def _column_stats(self, table_name: str, columns: Sequence[str]) -> Dict[str, ColumnStats]:
+        if not columns:
+            return {}
+        result = await self.session.execute(
+            text(
+                "SELECT attname, n_distinct, null_frac, "
+                "most_common_vals::text::text[] AS mcv, most_common_freqs AS mcf "
+                "FROM pg_stats WHERE schemaname = current_schema() "
+                "AND tablename = :table_name AND attname = ANY(:columns)"
+            ),
+            {"table_name": table_name, "columns": list(columns)},
+        )
+        stats: Dict[str, ColumnStats] = {}
+        for row in result.mappings().all():
+            values = row["mcv"] or []
+            freqs = row["mcf"] or []
+            stats[row["attname"]] = ColumnStats(
+                n_distinct=float(row["n_distinct"] or 0.0),
+                null_frac=float(row["null_frac"] or 0.0),
+                most_common={str(v): float(f) for v, f in zip(values, freqs)},
+            )
+        return stats
+
+
+async def drop_invalid_index(engine: AsyncEngine, name: str) -> bool:
+    """Drop index ``name`` if ``pg_index`` marks it INVALID; True if dropped."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        invalid = await conn.execute(
+            text("SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid"),
+            {"name": name},
+        )
+        if invalid.first() is None:
+            return False
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    logger.info("collection_index_invalid_dropped", extra={"index": name})
+    return True
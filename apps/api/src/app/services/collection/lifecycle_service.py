@@ -13,7 +13,9 @@ from app.models.agent import Agent
 from app.models.rbac import ResourceType
 from app.models.tool_instance import ToolInstance
 from app.services.rbac_cleanup_service import RbacCleanupService
+from app.services.collection.ddl import VECTOR_PENDING_INDEX_SQL
 from app.services.collection.vector_lifecycle import get_vector_config_model_aliases
+from app.services.collection.rollup_service import CollectionRollupService
 
 
 def _expected_data_connector_subtype(collection_type: str) -> Optional[str]:
@@ -220,6 +222,9 @@ class CollectionLifecycleService:
                         f"ON {table_name} (_vector_status)"
                     )
                 )
+                await self.session.execute(
+                    text(VECTOR_PENDING_INDEX_SQL.format(table_name=table_name))
+                )
 
             await self.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             for index_sql in self.host._build_indexes_sql(table_name, fields):
@@ -362,6 +367,7 @@ class CollectionLifecycleService:
 
         if drop_table and table_name:
             await self.session.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE"))
+            await CollectionRollupService(self.session).drop_for_base_table(table_name)
 
         if qdrant_collection_name:
             await self.host.vector.cleanup_model_scoped_qdrant_collections(
@@ -0,0 +1,384 @@
+"""
+CollectionRollupService — materialized rollups for collection aggregates.
+
+Fields declared with ``"rollup": "dimension"`` or ``"rollup": "measure"``
+define one rollup table per collection, keyed by the dimensions plus a day
+bucket of ``time_column``.  Each rollup row stores the source row count and,
+per measure, SUM and non-null COUNT — the aggregates that stay exact under
+deletes — so ``collection.aggregate`` can answer count/sum/avg (and
+count/count_distinct over dimensions) without scanning the base table.
+
+Consistency model:
+- the rollup table name hashes the base table and the rollup spec, so a
+  schema change points readers and writers at a table that does not exist
+  yet instead of a stale one;
+- ``rebuild`` creates and fills the table in one transaction while holding
+  SHARE on the base table, so it is never visible half-built;
+- row writes hold ROW EXCLUSIVE on the base table before looking the rollup
+  table up and apply signed deltas in the same transaction, so every write
+  lands either in the rebuild snapshot or in the new table, never both;
+- the background refresh builds missing rollups, drops stale ones and
+  rebuilds periodically to fold away groups whose count fell to zero.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.collection import Collection, CollectionType, FieldType
+from app.services.collection.ddl import FIELD_TYPE_TO_PG
+
+logger = get_logger(__name__)
+
+ROLLUP_DIMENSION = "dimension"
+ROLLUP_MEASURE = "measure"
+ROLLUP_ROLES = (ROLLUP_DIMENSION, ROLLUP_MEASURE)
+
+ROLLUP_DIMENSION_TYPES = frozenset({
+    FieldType.STRING.value,
+    FieldType.ENUM.value,
+    FieldType.BOOLEAN.value,
+    FieldType.INTEGER.value,
+    FieldType.DATE.value,
+})
+ROLLUP_MEASURE_TYPES = frozenset({FieldType.INTEGER.value, FieldType.FLOAT.value})
+ROLLUP_TIME_TYPES = frozenset({FieldType.DATE.value, FieldType.DATETIME.value})
+
+# Rollups store day buckets; coarser intervals re-aggregate exactly.
+ROLLUP_BUCKET_GRAIN = "day"
+ROLLUP_BUCKET_INTERVALS = frozenset({"day", "week", "month", "year"})
+
+BUCKET_COLUMN = "_bucket"
+ROWS_COLUMN = "_rows"
+BUILT_AT_COMMENT_PREFIX = "rollup built_at="
+
+_SAFE_IDENTIFIER = re.compile(r"^[a-z0-9_]*$")
+
+# Row ids per delta statement when a write touches many rows.
+DELTA_BATCH_SIZE = 500
+
+_SUM_PG_TYPES = {
+    FieldType.INTEGER.value: "NUMERIC",
+    FieldType.FLOAT.value: "DOUBLE PRECISION",
+}
+
+
+def _short_hash(value: Any, length: int) -> str:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:length]
+
+
+def rollup_table_prefix(base_table: str) -> str:
+    """Prefix shared by every rollup table of ``base_table``."""
+    return f"{base_table[:40]}__r{_short_hash(base_table, 6)}_"
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """Declared rollup shape of one collection."""
+
+    base_table: str
+    dimensions: Tuple[Tuple[str, str], ...]
+    measures: Tuple[Tuple[str, str], ...]
+    time_column: Optional[str] = None
+    time_column_type: Optional[str] = None
+
+    @classmethod
+    def from_collection(cls, collection: Collection) -> Optional["RollupSpec"]:
+        if collection.collection_type != CollectionType.TABLE.value:
+            return None
+        base_table = str(getattr(collection, "table_name", "") or "").strip()
+        if not base_table:
+            return None
+
+        dimensions: List[Tuple[str, str]] = []
+        measures: List[Tuple[str, str]] = []
+        for field in collection.get_business_fields():
+            role = field.get("rollup")
+            data_type = field.get("data_type")
+            if role == ROLLUP_DIMENSION and data_type in ROLLUP_DIMENSION_TYPES:
+                dimensions.append((field["name"], data_type))
+            elif role == ROLLUP_MEASURE and data_type in ROLLUP_MEASURE_TYPES:
+                measures.append((field["name"], data_type))
+        if not dimensions and not measures:
+            return None
+
+        time_column = None
+        time_column_type = None
+        if collection.time_column:
+            time_field = collection.get_field_by_name(collection.time_column)
+            if time_field and time_field.get("data_type") in ROLLUP_TIME_TYPES:
+                time_column = collection.time_column
+                time_column_type = time_field["data_type"]
+        if not dimensions and time_column is None:
+            # Nothing to group by: a rollup would be a single row that every
+            # write contends on.
+            return None
+
+        return cls(
+            base_table=base_table,
+            dimensions=tuple(dimensions),
+            measures=tuple(measures),
+            time_column=time_column,
+            time_column_type=time_column_type,
+        )
+
+    # ── Naming ────────────────────────────────────────────────────────────────
+
+    @property
+    def dimension_names(self) -> List[str]:
+        return [name for name, _ in self.dimensions]
+
+    @property
+    def measure_names(self) -> List[str]:
+        return [name for name, _ in self.measures]
+
+    @property
+    def source_columns(self) -> set[str]:
+        columns = {*self.dimension_names, *self.measure_names}
+        if self.time_column:
+            columns.add(self.time_column)
+        return columns
+
+    @property
+    def key_columns(self) -> List[str]:
+        keys = self.dimension_names
+        if self.time_column:
+            keys = keys + [BUCKET_COLUMN]
+        return keys
+
+    @property
+    def table_prefix(self) -> str:
+        return rollup_table_prefix(self.base_table)
+
+    @property
+    def signature(self) -> str:
+        return _short_hash(
+            {
+                "dimensions": self.dimensions,
+                "measures": self.measures,
+                "time": [self.time_column, self.time_column_type],
+                "grain": ROLLUP_BUCKET_GRAIN,
+            },
+            8,
+        )
+
+    @property
+    def table_name(self) -> str:
+        return f"{self.table_prefix}{self.signature}"
+
+    @staticmethod
+    def sum_column(measure: str) -> str:
+        return f"_sum_{measure}"
+
+    @staticmethod
+    def count_column(measure: str) -> str:
+        return f"_cnt_{measure}"
+
+    @property
+    def bucket_expression(self) -> str:
+        return f"date_trunc('{ROLLUP_BUCKET_GRAIN}', {self.time_column})"
+
+    # ── SQL ───────────────────────────────────────────────────────────────────
+
+    def build_create_table_sql(self, table_name: Optional[str] = None) -> str:
+        table_name = table_name or self.table_name
+        columns = [f"{name} {FIELD_TYPE_TO_PG[data_type]}" for name, data_type in self.dimensions]
+        if self.time_column:
+            columns.append(f"{BUCKET_COLUMN} TIMESTAMPTZ")
+        columns.append(f"{ROWS_COLUMN} BIGINT NOT NULL DEFAULT 0")
+        for name, data_type in self.measures:
+            columns.append(f"{self.sum_column(name)} {_SUM_PG_TYPES[data_type]} NOT NULL DEFAULT 0")
+            columns.append(f"{self.count_column(name)} BIGINT NOT NULL DEFAULT 0")
+        columns.append(
+            f"CONSTRAINT {self.key_constraint(table_name)} "
+            f"UNIQUE NULLS NOT DISTINCT ({', '.join(self.key_columns)})"
+        )
+        columns_sql = ",\n    ".join(columns)
+        return f"CREATE TABLE {table_name} (\n    {columns_sql}\n)"
+
+    @staticmethod
+    def key_constraint(table_name: str) -> str:
+        return f"{table_name}_key"
+
+    def _grouped_select_sql(self, where_sql: str, *, signed: bool) -> str:
+        sign = ":sign * " if signed else ""
+        select_parts = list(self.dimension_names)
+        if self.time_column:
+            select_parts.append(self.bucket_expression)
+        key_count = len(select_parts)
+        select_parts.append(f"{sign}COUNT(*)")
+        for name in self.measure_names:
+            select_parts.append(f"{sign}COALESCE(SUM({name}), 0)")
+            select_parts.append(f"{sign}COUNT({name})")
+        group_by = ", ".join(str(idx) for idx in range(1, key_count + 1))
+        return (
+            f"SELECT {', '.join(select_parts)} "
+            f"FROM {self.base_table} "
+            f"WHERE {where_sql} "
+            f"GROUP BY {group_by}"
+        )
+
+    def _value_columns(self) -> List[str]:
+        columns = [ROWS_COLUMN]
+        for name in self.measure_names:
+            columns.extend([self.sum_column(name), self.count_column(name)])
+        return columns
+
+    def build_populate_sql(self, table_name: Optional[str] = None) -> str:
+        table_name = table_name or self.table_name
+        columns = [*self.key_columns, *self._value_columns()]
+        return (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) "
+            f"{self._grouped_select_sql('TRUE', signed=False)}"
+        )
+
+    def build_delta_sql(self, where_sql: str, table_name: Optional[str] = None) -> str:
+        """Upsert ``:sign`` × the contribution of base rows matching ``where_sql``."""
+        table_name = table_name or self.table_name
+        value_columns = self._value_columns()
+        columns = [*self.key_columns, *value_columns]
+        assignments = ", ".join(
+            f"{column} = {table_name}.{column} + EXCLUDED.{column}" for column in value_columns
+        )
+        return (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) "
+            f"{self._grouped_select_sql(where_sql, signed=True)} "
+            f"ON CONFLICT ON CONSTRAINT {self.key_constraint(table_name)} "
+            f"DO UPDATE SET {assignments}"
+        )
+
+
+def rollup_spec_for(collection: Collection) -> Optional[RollupSpec]:
+    """Rollup spec of ``collection`` or None when rollups do not apply."""
+    if not get_settings().COLLECTION_ROLLUPS_ENABLED:
+        return None
+    return RollupSpec.from_collection(collection)
+
+
+def _id_params(ids: Sequence[uuid.UUID]) -> tuple[str, Dict[str, Any]]:
+    placeholders = ", ".join(f":id_{i}" for i in range(len(ids)))
+    params: Dict[str, Any] = {f"id_{i}": id_val for i, id_val in enumerate(ids)}
+    return f"id IN ({placeholders})", params
+
+
+class CollectionRollupService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    async def table_exists(self, table_name: str) -> bool:
+        result = await self.session.execute(
+            text("SELECT to_regclass(:table_name) IS NOT NULL"),
+            {"table_name": table_name},
+        )
+        return bool(result.scalar())
+
+    async def built_at(self, spec: RollupSpec) -> Optional[float]:
+        """Epoch seconds of the last rebuild, or None if the rollup is missing."""
+        result = await self.session.execute(
+            text("SELECT obj_description(to_regclass(:table_name), 'pg_class')"),
+            {"table_name": spec.table_name},
+        )
+        comment = result.scalar()
+        if comment is None:
+            return None if not await self.table_exists(spec.table_name) else 0.0
+        try:
+            return float(str(comment).removeprefix(BUILT_AT_COMMENT_PREFIX))
+        except ValueError:
+            return 0.0
+
+    # ── Incremental maintenance ───────────────────────────────────────────────
+
+    async def lock_for_write(self, spec: RollupSpec) -> bool:
+        """Serialize with rebuilds and report whether the rollup exists.
+
+        Must run before the base-table write whose deltas it guards.
+        """
+        await self.session.execute(text(f"LOCK TABLE {spec.base_table} IN ROW EXCLUSIVE MODE"))
+        return await self.table_exists(spec.table_name)
+
+    async def lock_rows(self, spec: RollupSpec, ids: Sequence[uuid.UUID]) -> None:
+        """Row-lock ``ids`` so concurrent writers cannot apply the same delta twice."""
+        for start in range(0, len(ids), DELTA_BATCH_SIZE):
+            where_sql, params = _id_params(ids[start:start + DELTA_BATCH_SIZE])
+            await self.session.execute(
+                text(f"SELECT id FROM {spec.base_table} WHERE {where_sql} FOR UPDATE"),
+                params,
+            )
+
+    async def apply_rows(self, spec: RollupSpec, ids: Sequence[uuid.UUID], sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) the current state of ``ids``."""
+        for start in range(0, len(ids), DELTA_BATCH_SIZE):
+            where_sql, params = _id_params(ids[start:start + DELTA_BATCH_SIZE])
+            await self.session.execute(
+                text(spec.build_delta_sql(where_sql)),
+                {**params, "sign": int(sign)},
+            )
+
+    # ── Rebuild / cleanup ─────────────────────────────────────────────────────
+
+    async def rebuild(self, spec: RollupSpec) -> int:
+        """Recreate the rollup from the base table; returns rollup row count."""
+        table_name = spec.table_name
+        await self.session.execute(text(f"LOCK TABLE {spec.base_table} IN SHARE MODE"))
+        await self.session.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        await self.session.execute(text(spec.build_create_table_sql(table_name)))
+        result = await self.session.execute(text(spec.build_populate_sql(table_name)))
+        await self.session.execute(
+            text(f"COMMENT ON TABLE {table_name} IS '{BUILT_AT_COMMENT_PREFIX}{int(time.time())}'")
+        )
+        return int(result.rowcount or 0)
+
+    async def drop_tables(self, prefix: str, *, keep: Optional[str] = None) -> None:
+        """Drop every rollup table starting with ``prefix`` except ``keep``."""
+        for name in (prefix, keep or ""):
+            if not _SAFE_IDENTIFIER.match(name):
+                raise ValueError(f"Unsafe rollup table name: {name!r}")
+        pattern = prefix.replace("_", "\\_") + "%"
+        # One server-side statement: no result set to read back, and the
+        # list cannot go stale between reading and dropping.
+        await self.session.execute(
+            text(
+                "DO $$ DECLARE t text; BEGIN "
+                "FOR t IN SELECT tablename FROM pg_tables "
+                f"WHERE schemaname = current_schema() AND tablename LIKE '{pattern}' "
+                f"AND tablename <> '{keep or ''}' "
+                "LOOP EXECUTE format('DROP TABLE IF EXISTS %I', t); END LOOP; END $$"
+            )
+        )
+
+    async def drop_for_base_table(self, base_table: str) -> None:
+        await self.drop_tables(rollup_table_prefix(base_table))
+
+    async def refresh(
+        self,
+        base_table: str,
+        spec: Optional[RollupSpec],
+        *,
+        max_age_s: float,
+    ) -> Dict[str, Any]:
+        """Build a missing/old rollup for ``base_table`` and drop stale ones."""
+        if spec is None:
+            await self.drop_for_base_table(base_table)
+            return {"status": "disabled"}
+
+        built_at = await self.built_at(spec)
+        status = "fresh"
+        groups: Optional[int] = None
+        if built_at is None or time.time() - built_at >= max_age_s:
+            groups = await self.rebuild(spec)
+            status = "built" if built_at is None else "rebuilt"
+        await self.drop_tables(spec.table_prefix, keep=spec.table_name)
+        return {"status": status, "table": spec.table_name, "groups": groups}
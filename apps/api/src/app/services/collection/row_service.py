@@ -17,11 +17,14 @@ from app.core.exceptions import CollectionNotFoundError, RowValidationError, App
 from app.models.collection import Collection, FieldType, CollectionType
 from app.services.collection.ddl import apply_typed_binds
 from app.services.collection.field_coercion import validate_and_prepare_payload
+from app.services.collection.index_advisor import get_query_shape_recorder, shape_from_row_filters
+from app.services.collection.rollup_service import CollectionRollupService, rollup_spec_for
 
 
 class CollectionRowService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.rollups = CollectionRollupService(session)
 
     @staticmethod
     def _require_table_name(collection: Collection) -> str:
@@ -62,6 +65,10 @@ class CollectionRowService:
 
         sortable_fields = {f["name"] for f in collection.get_sortable_fields()}
         sort_column, sort_order = self._resolve_sort(collection, sortable_fields)
+        await get_query_shape_recorder().record(
+            table_name,
+            shape_from_row_filters(collection, filters, sort=[sort_column]),
+        )
 
         sql_query = text(
             f"SELECT * FROM {table_name} "
@@ -122,6 +129,10 @@ class CollectionRowService:
             raise
         row_id = result.scalar_one()
 
+        rollup_spec = rollup_spec_for(collection)
+        if rollup_spec and await self.rollups.table_exists(rollup_spec.table_name):
+            await self.rollups.apply_rows(rollup_spec, [row_id], 1)
+
         collection.total_rows = (collection.total_rows or 0) + 1
         await self.session.flush()
 
@@ -155,6 +166,14 @@ class CollectionRowService:
         update_sql = apply_typed_binds(update_sql, field_defs)
 
         params = {**prepared, "row_id": row_id}
+        rollup_spec = rollup_spec_for(collection)
+        if rollup_spec and not rollup_spec.source_columns.intersection(prepared):
+            rollup_spec = None
+        if rollup_spec and await self.rollups.lock_for_write(rollup_spec):
+            await self.rollups.lock_rows(rollup_spec, [row_id])
+            await self.rollups.apply_rows(rollup_spec, [row_id], -1)
+        else:
+            rollup_spec = None
         try:
             result = await self.session.execute(update_sql, params)
         except IntegrityError as exc:
@@ -165,6 +184,8 @@ class CollectionRowService:
             raise
         if not result.rowcount:
             return None
+        if rollup_spec:
+            await self.rollups.apply_rows(rollup_spec, [row_id], 1)
 
         if (
             not skip_vectorization
@@ -194,17 +215,25 @@ class CollectionRowService:
         field_names = [f["name"] for f in collection.get_row_writable_fields()]
         columns = ", ".join(field_names)
         placeholders = ", ".join([f":{name}" for name in field_names])
+        rollup_spec = rollup_spec_for(collection)
+        returning = " RETURNING id" if rollup_spec else ""
         insert_sql = text(
-            f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+            f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders}){returning}"
         )
         typed_field_defs = [
             f for f in collection.get_row_writable_fields() if f["name"] in field_names
         ]
         insert_sql = apply_typed_binds(insert_sql, typed_field_defs)
 
+        inserted_ids: List[uuid.UUID] = []
         for row in rows:
             filtered_row = {name: row.get(name) for name in field_names}
-            await self.session.execute(insert_sql, filtered_row)
+            result = await self.session.execute(insert_sql, filtered_row)
+            if rollup_spec:
+                inserted_ids.append(result.scalar_one())
+
+        if rollup_spec and await self.rollups.table_exists(rollup_spec.table_name):
+            await self.rollups.apply_rows(rollup_spec, inserted_ids, 1)
 
         collection.total_rows += len(rows)
         await self.session.flush()
@@ -221,6 +250,11 @@ class CollectionRowService:
         placeholders = ", ".join([f":id_{i}" for i in range(len(ids))])
         params: dict[str, Any] = {f"id_{i}": id_val for i, id_val in enumerate(ids)}
 
+        rollup_spec = rollup_spec_for(collection)
+        if rollup_spec and await self.rollups.lock_for_write(rollup_spec):
+            await self.rollups.lock_rows(rollup_spec, ids)
+            await self.rollups.apply_rows(rollup_spec, ids, -1)
+
         result = await self.session.execute(
             text(
                 f"DELETE FROM {table_name} WHERE id IN ({placeholders})"
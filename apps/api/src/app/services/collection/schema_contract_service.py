@@ -6,6 +6,12 @@ from typing import List
 
 from app.core.exceptions import InvalidSchemaError
 from app.models.collection import Collection, CollectionType, FieldCategory, FieldType
+from app.services.collection.rollup_service import (
+    ROLLUP_DIMENSION,
+    ROLLUP_DIMENSION_TYPES,
+    ROLLUP_MEASURE_TYPES,
+    ROLLUP_ROLES,
+)
 
 VALID_SLUG_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
 
@@ -332,6 +338,20 @@ class CollectionSchemaContractService:
                     f"Field '{name}': sortable is not valid for data_type '{field_type}'"
                 )
 
+            rollup = field.get("rollup")
+            if rollup is not None:
+                if rollup not in ROLLUP_ROLES:
+                    raise InvalidSchemaError(
+                        f"Field '{name}': rollup must be one of {', '.join(ROLLUP_ROLES)}"
+                    )
+                allowed_types = (
+                    ROLLUP_DIMENSION_TYPES if rollup == ROLLUP_DIMENSION else ROLLUP_MEASURE_TYPES
+                )
+                if field_type not in allowed_types:
+                    raise InvalidSchemaError(
+                        f"Field '{name}': rollup {rollup} is not valid for data_type '{field_type}'"
+                    )
+
     def validate_admin_defined_fields(self, fields: List[dict], collection_type: str) -> None:
         specific_names = self.get_specific_field_names(collection_type)
         for field in fields:
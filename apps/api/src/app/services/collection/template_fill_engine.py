@@ -1,11 +1,14 @@
 """Fill XLSX/XLSM templates from their deterministic marker contract."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from copy import copy
+import hashlib
 import io
 import re
+import threading
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Union
 
 from app.services.collection.template_contract import (
     DocumentFormat,
@@ -15,6 +18,17 @@ from app.services.collection.template_contract import (
 )
 from app.services.collection.template_layout_parser import _parse_placeholder_expr
 
+_PLACEHOLDER = re.compile(r"\{\{([^{}]+)\}\}")
+
+# Literal text or a (key, original token) pair.
+_Part = Union[str, tuple[str, str]]
+
+# Placeholder cell coordinates per template digest. The same template is
+# filled over and over, and the scan is the only whole-workbook pass left.
+_PLACEHOLDER_CELLS_CACHE_SIZE = 32
+_placeholder_cells_cache: "OrderedDict[str, dict[str, list[tuple[int, int]]]]" = OrderedDict()
+_placeholder_cells_lock = threading.Lock()
+
 
 @dataclass
 class FillResult:
@@ -51,13 +65,14 @@ class TemplateFillEngine:
         normalized = self.contract.normalize_values(values)
         scalar_values = {item.key: _lookup(normalized, item.key) for item in self.contract.scalar_fields()}
         used_scalars: set[str] = set()
-        for ws in wb.worksheets:
-            for row in ws.iter_rows():
-                for cell in row:
-                    if isinstance(cell.value, str):
-                        value, used = _substitute(cell.value, scalar_values)
-                        cell.value = value
-                        used_scalars.update(used)
+        if scalar_values:
+            placeholder_cells = _placeholder_cells(wb, template_bytes)
+            for ws in wb.worksheets:
+                for row, column in placeholder_cells.get(ws.title, ()):
+                    cell = ws.cell(row, column)
+                    value, used = _substitute(cell.value, scalar_values)
+                    cell.value = value
+                    used_scalars.update(used)
 
         filled_tables: list[str] = []
         missing_tables: list[str] = []
@@ -102,53 +117,107 @@ class TemplateFillEngine:
             return True, None
         height = ws.row_dimensions[marker_row].height
         hidden = ws.row_dimensions[marker_row].hidden
+        if len(rows) > 1:
+            # One shift for the whole block; inserting row by row moves every
+            # cell below the marker once per output row.
+            ws.insert_rows(marker_row + 1, amount=len(rows) - 1)
+        # Style ids point into the workbook's shared font/fill/border tables,
+        # so copying the id array is enough to reproduce the marker styling.
+        styles = [(cell.column, cell._style) for cell in source if cell.has_style]
+        templates = [
+            _compile_placeholders(value) if isinstance(value, str) and "{{" in value else None
+            for value in values
+        ]
         for index, row in enumerate(rows):
             target = marker_row + index
             if index:
-                ws.insert_rows(target)
-                self._copy_row(ws, source, target, height, hidden)
-            self._write_row(ws, source, values, target, key, row)
+                self._copy_row(ws, styles, target, height, hidden)
+            self._write_row(ws, source, values, templates, target, key, row)
         return True, None
 
     @staticmethod
-    def _copy_row(ws: Any, source: list[Any], target_row: int, height: Any, hidden: Any) -> None:
+    def _copy_row(ws: Any, styles: list[tuple[int, Any]], target_row: int, height: Any, hidden: Any) -> None:
         ws.row_dimensions[target_row].height = height
         ws.row_dimensions[target_row].hidden = hidden
-        for cell in source:
-            target = ws.cell(target_row, cell.column)
-            if cell.has_style:
-                target._style = copy(cell._style)
-            target.number_format = copy(cell.number_format)
-            target.font = copy(cell.font)
-            target.fill = copy(cell.fill)
-            target.border = copy(cell.border)
-            target.alignment = copy(cell.alignment)
-            target.protection = copy(cell.protection)
+        for column, style in styles:
+            ws.cell(target_row, column)._style = copy(style)
 
     @staticmethod
-    def _write_row(ws: Any, source: list[Any], source_values: list[Any], target_row: int, table_key: str, row: dict[str, Any]) -> None:
+    def _write_row(
+        ws: Any,
+        source: list[Any],
+        source_values: list[Any],
+        templates: list[list[_Part] | None],
+        target_row: int,
+        table_key: str,
+        row: dict[str, Any],
+    ) -> None:
         values = {f"{table_key}.{path}": value for path, value in _flatten(row).items()}
-        for cell, raw in zip(source, source_values):
+        for cell, raw, parts in zip(source, source_values, templates):
             target = ws.cell(target_row, cell.column)
-            target.value = _substitute(raw, values)[0] if isinstance(raw, str) else raw
+            target.value = _render(parts, values)[0] if parts is not None else raw
+
+
+def _placeholder_cells(wb: Any, template_bytes: bytes) -> dict[str, list[tuple[int, int]]]:
+    """Coordinates of string cells containing ``{{`` per sheet, cached per template.
+
+    Only stored cells are visited; ``iter_rows`` would materialise every
+    empty cell of each sheet's bounding box.
+    """
+    digest = hashlib.sha256(template_bytes).hexdigest()
+    with _placeholder_cells_lock:
+        cached = _placeholder_cells_cache.get(digest)
+        if cached is not None:
+            _placeholder_cells_cache.move_to_end(digest)
+            return cached
+    cells = {
+        ws.title: sorted(
+            coordinate
+            for coordinate, cell in ws._cells.items()
+            if isinstance(cell.value, str) and "{{" in cell.value
+        )
+        for ws in wb.worksheets
+    }
+    with _placeholder_cells_lock:
+        _placeholder_cells_cache[digest] = cells
+        while len(_placeholder_cells_cache) > _PLACEHOLDER_CELLS_CACHE_SIZE:
+            _placeholder_cells_cache.popitem(last=False)
+    return cells
+
+
+def _compile_placeholders(text: str) -> list[_Part]:
+    parts: list[_Part] = []
+    last = 0
+    for match in _PLACEHOLDER.finditer(text):
+        parts.append(text[last:match.start()])
+        parsed = _parse_placeholder_expr(match.group(1))
+        parts.append((parsed[0], match.group(0)) if parsed else match.group(0))
+        last = match.end()
+    parts.append(text[last:])
+    return parts
 
 
-def _substitute(text: str, values: dict[str, Any]) -> tuple[str, set[str]]:
+def _render(parts: list[_Part], values: dict[str, Any]) -> tuple[str, set[str]]:
     used: set[str] = set()
-    def replace(match: re.Match[str]) -> str:
-        parsed = _parse_placeholder_expr(match.group(1))
-        if not parsed:
-            return match.group(0)
-        key = parsed[0]
+    out: list[str] = []
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        key, token = part
         if key not in values:
-            return match.group(0)
-        value = _lookup(values, key)
+            out.append(token)
+            continue
+        value = values[key]
         if value not in (None, ""):
             used.add(key)
-            return str(value)
+            out.append(str(value))
         # A token is technical data, not user-visible fallback text.
-        return ""
-    return re.sub(r"\{\{([^{}]+)\}\}", replace, text), used
+    return "".join(out), used
+
+
+def _substitute(text: str, values: dict[str, Any]) -> tuple[str, set[str]]:
+    return _render(_compile_placeholders(text), values)
 
 
 def _flatten(value: Any, prefix: str = "") -> dict[str, Any]:
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
 from app.models.collection import Collection, CollectionType, FieldCategory, FieldType
+from app.services.collection.ddl import VECTOR_PENDING_INDEX_SQL
 
 logger = get_logger(__name__)
 
@@ -142,6 +143,9 @@ class CollectionVectorLifecycleService:
                 f"ON {collection.table_name} (_vector_status)"
             )
         )
+        await self.session.execute(
+            text(VECTOR_PENDING_INDEX_SQL.format(table_name=collection.table_name))
+        )
 
     async def drop_table_vector_infra(self, collection: Collection) -> None:
         if collection.collection_type not in {CollectionType.TABLE.value, CollectionType.TEMPLATE.value}:
@@ -154,6 +158,7 @@ class CollectionVectorLifecycleService:
             )
 
         await self.session.execute(text(f"DROP INDEX IF EXISTS idx_{collection.table_name}_vector_status"))
+        await self.session.execute(text(f"DROP INDEX IF EXISTS idx_{collection.table_name}_vector_pending"))
         await self.session.execute(
             text(
                 f"ALTER TABLE {collection.table_name} "
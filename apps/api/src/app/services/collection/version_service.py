@@ -17,6 +17,7 @@ from app.models.collection import (
     CollectionVersion,
     CollectionVersionStatus,
 )
+from app.services.permission_service import PermissionService
 
 
 class CollectionVersionService:
@@ -120,6 +121,7 @@ class CollectionVersionService:
         version_obj.status = CollectionVersionStatus.PUBLISHED.value
         self.session.add(version_obj)
         await self.session.flush()
+        await PermissionService.invalidate_cache(self.session)
         return version_obj
 
     async def archive_version(self, collection_id: UUID, version: int) -> CollectionVersion:
@@ -140,6 +142,7 @@ class CollectionVersionService:
         version_obj.status = CollectionVersionStatus.ARCHIVED.value
         self.session.add(version_obj)
         await self.session.flush()
+        await PermissionService.invalidate_cache(self.session)
         return version_obj
 
     async def delete_version(self, collection_id: UUID, version: int) -> None:
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from io import BytesIO
 from typing import Any, Awaitable, Callable, Optional
 
+from app.services.extraction_pool import PdfRangeResult, get_extraction_pool
 from app.services.extractors import ExtractResult, ExtractorRegistry
 
 
@@ -72,9 +73,21 @@ class DocumentExtractionService:
                               warnings=output.warnings, duration_ms=int((asyncio.get_running_loop().time() - started_at) * 1000))
                 return output
 
-            result: ExtractResult = await asyncio.to_thread(
-                ExtractorRegistry.extract, request.payload, detected
-            )
+            pool = get_extraction_pool()
+            if pool.should_offload(request.payload, detected):
+                async def observe_range(part: PdfRangeResult) -> None:
+                    await observe(
+                        "page_range", first_page=part.first_page + 1,
+                        last_page=part.last_page + 1, output_chars=len(part.text),
+                    )
+
+                result: ExtractResult = await pool.extract(
+                    request.payload, detected, on_range=observe_range,
+                )
+            else:
+                result = await asyncio.to_thread(
+                    ExtractorRegistry.extract, request.payload, detected
+                )
             warnings = list(result.warnings)
             text = result.text or ""
             truncated = False
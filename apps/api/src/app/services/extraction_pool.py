@@ -0,0 +1,344 @@
+"""
+Process-pool extraction engine for heavy document formats.
+
+pdfminer, python-docx and openpyxl are pure Python and hold the GIL, so
+``asyncio.to_thread`` only keeps the event loop responsive — a large document
+is still parsed on a single core.  This module runs extractors in worker
+processes with a per-job wall-clock limit and an address-space limit, and
+splits large PDFs into page ranges that are parsed in parallel and merged in
+page order.
+
+If the pool cannot be started (for example inside a daemonic Celery prefork
+child, which may not spawn processes) the engine transparently falls back to
+thread execution.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from contextlib import aclosing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.services.extractors.base import ExtractResult
+
+logger = get_logger(__name__)
+
+HEAVY_EXTENSIONS = {"pdf", "doc", "docx", "xlsx"}
+
+
+class ExtractionJobError(RuntimeError):
+    """Extraction worker crashed or was killed (e.g. memory limit)."""
+
+
+class ExtractionTimeoutError(ExtractionJobError):
+    """Extraction job exceeded its wall-clock limit."""
+
+
+@dataclass
+class PdfRangeResult:
+    first_page: int
+    last_page: int
+    text: str
+    warnings: List[str] = field(default_factory=list)
+    failed: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Worker-side functions (module level so they can be pickled)
+# ---------------------------------------------------------------------------
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except Exception:  # pragma: no cover - platform specific
+        pass
+
+
+def _run_registry_extract(payload: bytes, filename: str) -> ExtractResult:
+    from app.services.extractors import ExtractorRegistry
+
+    return ExtractorRegistry.extract(payload, filename)
+
+
+def _run_extractor(extractor: Any, payload: bytes, filename: str) -> ExtractResult:
+    return extractor.extract(payload, filename)
+
+
+def _extract_pdf_range(payload: bytes, first_page: int, last_page: int) -> PdfRangeResult:
+    """Extract pages ``first_page..last_page`` (0-based, inclusive) via pdfminer."""
+    try:
+        from pdfminer.high_level import extract_text as pdf_extract_text  # type: ignore
+
+        text = pdf_extract_text(
+            BytesIO(payload), page_numbers=list(range(first_page, last_page + 1))
+        ) or ""
+        return PdfRangeResult(first_page=first_page, last_page=last_page, text=text)
+    except Exception as exc:
+        return PdfRangeResult(
+            first_page=first_page,
+            last_page=last_page,
+            text="",
+            warnings=[f"PDF pages {first_page + 1}-{last_page + 1} failed via pdfminer: {exc!r}"],
+            failed=True,
+        )
+
+
+def count_pdf_pages(payload: bytes) -> int:
+    """Cheap page count without text extraction; 0 when unknown."""
+    for module_name in ("pypdf", "PyPDF2"):
+        try:
+            module = __import__(module_name)
+            return len(module.PdfReader(BytesIO(payload)).pages)
+        except Exception:
+            continue
+    return 0
+
+
+def _detect_ext(filename: str) -> str:
+    name = (filename or "").lower()
+    if "." not in name:
+        return ""
+    return name[name.rfind(".") + 1:]
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+class ExtractionPool:
+    """Bounded process pool with per-job time and memory limits."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        max_workers: int = 0,
+        min_bytes: int = 0,
+        job_timeout_s: float = 300.0,
+        memory_limit_mb: int = 0,
+        pdf_pages_per_job: int = 16,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.max_workers = max_workers or max(1, os.cpu_count() or 1)
+        self.min_bytes = max(0, int(min_bytes))
+        self.job_timeout_s = float(job_timeout_s)
+        self.memory_limit_mb = int(memory_limit_mb)
+        self.pdf_pages_per_job = max(1, int(pdf_pages_per_job))
+        self._executor_factory = executor_factory or self._default_executor
+        self._executor: Optional[Executor] = None
+        # Jobs awaited per executor, and executors retired after a timeout or
+        # crash; a retired executor is killed once its last job settles.
+        self._inflight: Dict[Executor, int] = {}
+        self._retired: Dict[Executor, bool] = {}
+        self._unavailable = False
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionPool":
+        settings = get_settings()
+        return cls(
+            enabled=settings.EXTRACTION_POOL_ENABLED,
+            max_workers=settings.EXTRACTION_POOL_MAX_WORKERS,
+            min_bytes=settings.EXTRACTION_POOL_MIN_BYTES,
+            job_timeout_s=settings.EXTRACTION_JOB_TIMEOUT_SECONDS,
+            memory_limit_mb=settings.EXTRACTION_JOB_MEMORY_LIMIT_MB,
+            pdf_pages_per_job=settings.EXTRACTION_PDF_PAGES_PER_JOB,
+        )
+
+    def _default_executor(self, max_workers: int) -> Executor:
+        # spawn: forking a process that owns an event loop, DB pools and
+        # boto clients is unsafe; workers import only the extractor modules.
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.memory_limit_mb,),
+        )
+
+    def should_offload(self, payload: bytes, filename: str) -> bool:
+        return (
+            self.enabled
+            and not self._unavailable
+            and _detect_ext(filename) in HEAVY_EXTENSIONS
+            and len(payload) >= self.min_bytes
+        )
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in a worker process under the job time limit."""
+        if not self.enabled or self._unavailable:
+            return await asyncio.to_thread(fn, *args)
+        try:
+            executor = self._get_executor()
+            future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except (AssertionError, OSError, RuntimeError) as exc:
+            logger.warning("Extraction process pool unavailable, using threads: %r", exc)
+            self._unavailable = True
+            return await asyncio.to_thread(fn, *args)
+        self._inflight[executor] = self._inflight.get(executor, 0) + 1
+        try:
+            return await asyncio.wait_for(future, timeout=self.job_timeout_s)
+        except asyncio.TimeoutError as exc:
+            # A running job cannot be cancelled; retire its pool so the
+            # runaway worker is killed once the pool's other jobs settle.
+            self._retire(executor, kill=True)
+            raise ExtractionTimeoutError(
+                f"Extraction job exceeded {self.job_timeout_s:.0f}s limit"
+            ) from exc
+        except BrokenProcessPool as exc:
+            # Only jobs of this pool fail; a newer pool is left alone.
+            self._retire(executor, kill=True)
+            raise ExtractionJobError("Extraction worker terminated unexpectedly") from exc
+        finally:
+            self._settle(executor)
+
+    async def extract(
+        self,
+        payload: bytes,
+        filename: str,
+        *,
+        on_range: Optional[Callable[[PdfRangeResult], Awaitable[None]]] = None,
+    ) -> ExtractResult:
+        """Extract via the registry, splitting large PDFs into page ranges."""
+        if _detect_ext(filename) == "pdf":
+            # pypdf parses the cross-reference table; keep it off the event loop.
+            page_count = await asyncio.to_thread(count_pdf_pages, payload)
+            if page_count > self.pdf_pages_per_job:
+                result = await self.extract_pdf_parallel(
+                    payload, filename, page_count=page_count, on_range=on_range,
+                )
+                if result is not None:
+                    return result
+        return await self.run(_run_registry_extract, payload, filename)
+
+    async def extract_with(self, extractor: Any, payload: bytes, filename: str) -> ExtractResult:
+        """Run a specific (picklable) extractor instance in the pool."""
+        return await self.run(_run_extractor, extractor, payload, filename)
+
+    async def iter_pdf_ranges(self, payload: bytes, page_count: int) -> AsyncIterator[PdfRangeResult]:
+        """Yield page-range results in page order.
+
+        At most ``max_workers`` ranges are in flight, which bounds the number
+        of payload copies shipped to workers.
+        """
+        ranges = [
+            (start, min(start + self.pdf_pages_per_job, page_count) - 1)
+            for start in range(0, page_count, self.pdf_pages_per_job)
+        ]
+        pending: list[asyncio.Task] = []
+        next_index = 0
+        try:
+            while next_index < len(ranges) or pending:
+                while next_index < len(ranges) and len(pending) < self.max_workers:
+                    first, last = ranges[next_index]
+                    pending.append(asyncio.create_task(self.run(_extract_pdf_range, payload, first, last)))
+                    next_index += 1
+                head = pending.pop(0)
+                yield await head
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def extract_pdf_parallel(
+        self,
+        payload: bytes,
+        filename: str,
+        *,
+        page_count: int,
+        on_range: Optional[Callable[[PdfRangeResult], Awaitable[None]]] = None,
+    ) -> Optional[ExtractResult]:
+        """Parallel pdfminer extraction; None means fall back to the single-job path."""
+        parts: list[str] = []
+        warnings: list[str] = []
+        jobs = 0
+        async with aclosing(self.iter_pdf_ranges(payload, page_count)) as results:
+            async for part in results:
+                if part.failed:
+                    logger.info("Parallel PDF extraction failed for %s, falling back: %s", filename, part.warnings)
+                    return None
+                jobs += 1
+                parts.append(part.text)
+                warnings.extend(part.warnings)
+                if on_range is not None:
+                    await on_range(part)
+        text = "".join(parts)
+        if not text.strip():
+            warnings.append("PDF appears to have no extractable text (maybe scanned). Consider OCR later.")
+        return ExtractResult(
+            text=text,
+            kind="pdf",
+            meta={"pages": page_count, "parallel_jobs": jobs},
+            warnings=warnings,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the current pool and kill retired ones, even with jobs left."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            self._stop(executor, kill=False)
+        for retired, kill in list(self._retired.items()):
+            self._stop(retired, kill=kill)
+        self._retired.clear()
+        self._inflight.clear()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory(self.max_workers)
+        return self._executor
+
+    def _retire(self, executor: Executor, *, kill: bool) -> None:
+        # New jobs go to a fresh pool; this one is stopped when idle.
+        if self._executor is executor:
+            self._executor = None
+        self._retired[executor] = self._retired.get(executor, False) or kill
+
+    def _settle(self, executor: Executor) -> None:
+        remaining = self._inflight.get(executor, 1) - 1
+        if remaining > 0:
+            self._inflight[executor] = remaining
+            return
+        self._inflight.pop(executor, None)
+        if executor in self._retired:
+            self._stop(executor, kill=self._retired.pop(executor))
+
+    @staticmethod
+    def _stop(executor: Executor, *, kill: bool) -> None:
+        if kill:
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                try:
+                    process.kill()
+                except Exception:
+                    pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide extraction pool (created lazily on first heavy job)."""
+    global _pool
+    if _pool is None:
+        _pool = ExtractionPool.from_settings()
+    return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the process-wide pool's workers (no-op if it was never used)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
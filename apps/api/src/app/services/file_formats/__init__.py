@@ -1,6 +1,14 @@
 """Shared file format metadata and generation codecs."""
 
 from app.services.file_formats.registry import FileCodecRegistry
+from app.services.file_formats.tabular import TabularCodec, TabularCodecRegistry
 from app.services.file_formats.types import EncodedFile, FileCodec, FileFormat
 
-__all__ = ["EncodedFile", "FileCodec", "FileCodecRegistry", "FileFormat"]
+__all__ = [
+    "EncodedFile",
+    "FileCodec",
+    "FileCodecRegistry",
+    "FileFormat",
+    "TabularCodec",
+    "TabularCodecRegistry",
+]
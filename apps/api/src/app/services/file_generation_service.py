@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.services.artifact_writer import ArtifactWriter, GeneratedArtifact
-from app.services.file_formats import FileCodecRegistry
+from app.services.file_formats import FileCodecRegistry, TabularCodecRegistry
 
 
 MAX_GENERATED_FILE_BYTES = 2 * 1024 * 1024
@@ -46,3 +47,37 @@ class FileGenerationService:
             },
         )
         return artifact
+
+    async def generate_table(
+        self,
+        *,
+        chat_id: str,
+        owner_id: str,
+        filename: str,
+        format_name: str,
+        columns: Sequence[str],
+        rows: Iterable[Any],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> GeneratedArtifact:
+        """Stream a table into storage row by row (csv, jsonl or xlsx).
+
+        Nothing is buffered beyond one upload part, so the limit is
+        ``GENERATED_FILE_STREAM_MAX_BYTES`` rather than the in-memory one.
+        """
+        columns = [str(column) for column in columns]
+        if not columns:
+            raise ValueError("Table columns must not be empty")
+        codec = TabularCodecRegistry.get(format_name)
+        return await ArtifactWriter(self.session).write_stream(
+            chat_id=chat_id,
+            owner_id=owner_id,
+            filename=codec.filename(filename),
+            produce=lambda sink: {"row_count": codec.write(columns, rows, sink)},
+            content_type=codec.format.content_type,
+            metadata={
+                "format": codec.format.name,
+                "columns": columns,
+                **(metadata or {}),
+            },
+            max_bytes=get_settings().GENERATED_FILE_STREAM_MAX_BYTES,
+        )
@@ -1,4 +1,4 @@
-"""Glossary catalogue operations; matching is deliberately not part of v1."""
+"""Glossary catalogue operations and the compiled runtime glossary index."""
 from __future__ import annotations
 
 from uuid import UUID
@@ -6,14 +6,41 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config_cache import VersionedConfigCache
 from app.models.glossary import GlossaryEntry, GlossaryScope, GlossaryStatus
 from app.models.project import Project
+from app.runtime.memory.glossary_index import GlossaryIndex
 
 
 class GlossaryService:
+    # Projects and confirmed global terms are the same for every tenant, so
+    # one compiled index per process serves all turns until a write bumps
+    # the generation (``invalidate_index``).
+    _index_cache: VersionedConfigCache[GlossaryIndex] = VersionedConfigCache("glossary_index", ttl_s=300.0)
+
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    @classmethod
+    async def invalidate_index(cls, session: AsyncSession | None = None) -> None:
+        """Drop the compiled index everywhere; with ``session``, once it commits."""
+        if session is not None:
+            await cls._index_cache.invalidate_on_commit(session)
+        else:
+            await cls._index_cache.invalidate()
+
+    async def load_index(self, *, limit: int) -> GlossaryIndex:
+        """Compiled project + confirmed global glossary index (cached)."""
+
+        async def _load() -> GlossaryIndex:
+            return GlossaryIndex(
+                await self.list_project_terms(limit=limit),
+                await self.list_confirmed_global_terms(limit=limit),
+                version=self._index_cache.generation,
+            )
+
+        return await self._index_cache.get_or_load(str(limit), _load)
+
     async def list_active(self) -> list[GlossaryEntry]:
         rows = await self._session.execute(
             select(GlossaryEntry).where(GlossaryEntry.is_active.is_(True)).order_by(GlossaryEntry.canonical_term)
@@ -73,4 +100,5 @@ class GlossaryService:
         )
         self._session.add(entry)
         await self._session.flush()
+        await self.invalidate_index(self._session)
         return entry
@@ -8,7 +8,7 @@ from typing import Any, Dict, Optional
 from app.models.model_registry import Model
 from app.models.tool_instance import ToolInstance
 from app.services.health.base import HealthCheckAdapter, HealthProbeResult, HealthStatus
-from app.services.mcp_jsonrpc_client import mcp_initialize
+from app.services.mcp_jsonrpc_client import mcp_ping
 from app.adapters.interfaces.embeddings import EmbeddingInterface
 from app.adapters.embeddings import EmbeddingServiceFactory
 from app.adapters.interfaces.llm import LLMClient
@@ -33,10 +33,11 @@ class MCPHealthAdapter(HealthCheckAdapter):
         start_time = time.time()
         
         try:
-            # Use MCP initialize to check connectivity
-            result = await mcp_initialize(
-                base_url=target.url,
-                timeout=10.0  # 10 second timeout for health check
+            # Ping over the pooled session; initialize only runs when the
+            # cached session is missing or expired
+            result = await mcp_ping(
+                provider_url=target.url,
+                timeout_s=10.0  # 10 second timeout for health check
             )
             
             latency_ms = int((time.time() - start_time) * 1000)
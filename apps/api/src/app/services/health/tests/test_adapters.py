@@ -34,7 +34,7 @@ class TestMCPHealthAdapter:
     @pytest.mark.asyncio
     async def test_probe_success(self, adapter, mcp_instance):
         """Test successful MCP probe."""
-        with patch('app.services.health.adapters.mcp_initialize') as mock_init:
+        with patch('app.services.health.adapters.mcp_ping') as mock_init:
             mock_init.return_value = {
                 "protocol_version": "2024-11-05",
                 "capabilities": {"tools": {}},
@@ -47,8 +47,8 @@ class TestMCPHealthAdapter:
             assert result.latency_ms is not None
             assert result.details["protocol_version"] == "2024-11-05"
             mock_init.assert_called_once_with(
-                base_url=mcp_instance.url,
-                timeout=10.0
+                provider_url=mcp_instance.url,
+                timeout_s=10.0
             )
     
     @pytest.mark.asyncio
@@ -64,7 +64,7 @@ class TestMCPHealthAdapter:
     @pytest.mark.asyncio
     async def test_probe_invalid_response(self, adapter, mcp_instance):
         """Test MCP probe with invalid response."""
-        with patch('app.services.health.adapters.mcp_initialize') as mock_init:
+        with patch('app.services.health.adapters.mcp_ping') as mock_init:
             mock_init.return_value = {"invalid": "response"}
             
             result = await adapter.probe(mcp_instance)
@@ -75,7 +75,7 @@ class TestMCPHealthAdapter:
     @pytest.mark.asyncio
     async def test_probe_exception(self, adapter, mcp_instance):
         """Test MCP probe with exception."""
-        with patch('app.services.health.adapters.mcp_initialize') as mock_init:
+        with patch('app.services.health.adapters.mcp_ping') as mock_init:
             mock_init.side_effect = Exception("Connection failed")
             
             result = await adapter.probe(mcp_instance)
@@ -0,0 +1,293 @@
+"""
+Process-wide MCP client manager.
+
+Every MCP consumer (operation executor, tool discovery, health probes, SQL
+schema discovery) talks to the same handful of provider URLs.  Opening a new
+``httpx.AsyncClient`` and running a full ``initialize`` handshake per call
+costs a TCP/TLS setup plus an extra round-trip each time.  This manager keeps
+one pooled client per provider URL and caches the negotiated session id for
+``MCP_SESSION_TTL_S``; when a provider reports the session as gone the call
+is transparently re-initialized and retried once.
+
+httpx clients are bound to the event loop that created them.  Celery tasks
+run each task on a fresh loop, so clients (and locks) are dropped whenever
+the running loop changes; session ids are plain server-side tokens and
+survive the switch.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.http.tls import outbound_http_verify
+from app.core.logging import get_logger
+from app.services.mcp_jsonrpc_client import (
+    MCP_ACCEPT_HEADER,
+    MCP_PROTOCOL_VERSION,
+    parse_mcp_response,
+)
+
+logger = get_logger(__name__)
+
+# Statuses providers use for an unknown/expired ``mcp-session-id``.  404 is
+# what the streamable HTTP transport specifies; the rest are seen in the wild.
+SESSION_EXPIRED_STATUSES = frozenset({400, 401, 403, 404, 410})
+
+
+@dataclass
+class MCPSession:
+    session_id: str
+    expires_at: float
+    protocol_version: Optional[str] = None
+    capabilities: Dict[str, Any] = field(default_factory=dict)
+    server_info: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class MCPPoolMetrics:
+    clients_opened: int = 0
+    handshakes: int = 0
+    handshake_failures: int = 0
+    session_reuses: int = 0
+    session_expirations: int = 0
+    requests: int = 0
+
+
+class MCPClientManager:
+    """Pooled HTTP clients and cached sessions per MCP provider URL."""
+
+    def __init__(
+        self,
+        *,
+        session_ttl_s: float = 300.0,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry_s: float = 60.0,
+        transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+    ) -> None:
+        self.session_ttl_s = float(session_ttl_s)
+        self._limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(0, int(max_keepalive)),
+            keepalive_expiry=float(keepalive_expiry_s),
+        )
+        self._transport_factory = transport_factory
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._sessions: Dict[str, MCPSession] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = MCPPoolMetrics()
+
+    @classmethod
+    def from_settings(cls) -> "MCPClientManager":
+        settings = get_settings()
+        return cls(
+            session_ttl_s=max(30, int(settings.MCP_SESSION_TTL_S or 300)),
+            max_connections=settings.MCP_POOL_MAX_CONNECTIONS,
+            max_keepalive=settings.MCP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry_s=settings.MCP_POOL_KEEPALIVE_EXPIRY_S,
+        )
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def get_client(self, provider_url: str) -> httpx.AsyncClient:
+        """Pooled client for ``provider_url``; pass per-request timeouts to it."""
+        self._bind_loop()
+        client = self._clients.get(provider_url)
+        if client is None or client.is_closed:
+            kwargs: Dict[str, Any] = {
+                "timeout": 30,
+                "verify": outbound_http_verify(),
+                "limits": self._limits,
+            }
+            if self._transport_factory is not None:
+                kwargs["transport"] = self._transport_factory()
+            client = httpx.AsyncClient(**kwargs)
+            self._clients[provider_url] = client
+            self._metrics.clients_opened += 1
+        return client
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and self._clients:
+            # The previous loop is gone (or elsewhere); its clients cannot be
+            # awaited here, so drop them and let the GC close the sockets.
+            logger.debug("MCP client manager: event loop changed, dropping %d clients", len(self._clients))
+        self._clients = {}
+        self._session_locks = {}
+        self._loop = loop
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def get_session(
+        self,
+        provider_url: str,
+        timeout_s: Optional[float] = None,
+    ) -> MCPSession:
+        """Return a live session, running ``initialize`` only when needed."""
+        self._bind_loop()
+        cached = self._sessions.get(provider_url)
+        if cached is not None and cached.expires_at > time.monotonic():
+            self._metrics.session_reuses += 1
+            return cached
+
+        lock = self._session_locks.setdefault(provider_url, asyncio.Lock())
+        async with lock:
+            cached = self._sessions.get(provider_url)
+            if cached is not None and cached.expires_at > time.monotonic():
+                self._metrics.session_reuses += 1
+                return cached
+            session = await self._initialize(provider_url, timeout_s)
+            self._sessions[provider_url] = session
+            return session
+
+    async def get_session_id(self, provider_url: str, timeout_s: Optional[float] = None) -> str:
+        return (await self.get_session(provider_url, timeout_s)).session_id
+
+    def invalidate_session(self, provider_url: str, session_id: Optional[str] = None) -> None:
+        """Forget the cached session (only if it is still ``session_id``)."""
+        cached = self._sessions.get(provider_url)
+        if cached is None:
+            return
+        if session_id is None or cached.session_id == session_id:
+            self._sessions.pop(provider_url, None)
+            self._metrics.session_expirations += 1
+
+    async def _initialize(self, provider_url: str, timeout_s: Optional[float]) -> MCPSession:
+        client = self.get_client(provider_url)
+        self._metrics.handshakes += 1
+        try:
+            response = await client.post(
+                provider_url,
+                headers={"Content-Type": "application/json", "Accept": MCP_ACCEPT_HEADER},
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "initialize",
+                    "params": {
+                        "protocolVersion": MCP_PROTOCOL_VERSION,
+                        "capabilities": {},
+                        "clientInfo": {"name": "ml-portal", "version": "1.0"},
+                    },
+                },
+                timeout=timeout_s or 30,
+            )
+            response.raise_for_status()
+            session_id = response.headers.get("mcp-session-id")
+            if not session_id:
+                raise ValueError(f"MCP initialize response missing mcp-session-id for {provider_url}")
+        except Exception:
+            self._metrics.handshake_failures += 1
+            raise
+
+        result: Dict[str, Any] = {}
+        try:
+            result = parse_mcp_response(response.text).get("result") or {}
+        except (ValueError, AttributeError):
+            # Session id is what matters; server metadata is informational.
+            pass
+        return MCPSession(
+            session_id=session_id,
+            expires_at=time.monotonic() + self.session_ttl_s,
+            protocol_version=result.get("protocolVersion"),
+            capabilities=result.get("capabilities") or {},
+            server_info=result.get("serverInfo") or {},
+        )
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+
+    async def post(
+        self,
+        provider_url: str,
+        payload: Dict[str, Any],
+        *,
+        session_id: str,
+        timeout_s: Optional[float] = None,
+    ) -> httpx.Response:
+        self._metrics.requests += 1
+        return await self.get_client(provider_url).post(
+            provider_url,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": MCP_ACCEPT_HEADER,
+                "mcp-session-id": session_id,
+            },
+            json=payload,
+            timeout=timeout_s or 30,
+        )
+
+    async def rpc(
+        self,
+        provider_url: str,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        timeout_s: Optional[float] = None,
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send one JSON-RPC request; re-initialize once if the session expired."""
+        payload = {"jsonrpc": "2.0", "id": 2, "method": method, "params": params or {}}
+        if not session_id:
+            session_id = await self.get_session_id(provider_url, timeout_s)
+        response = await self.post(provider_url, payload, session_id=session_id, timeout_s=timeout_s)
+        if response.status_code in SESSION_EXPIRED_STATUSES:
+            self.invalidate_session(provider_url, session_id)
+            session_id = await self.get_session_id(provider_url, timeout_s)
+            response = await self.post(provider_url, payload, session_id=session_id, timeout_s=timeout_s)
+        response.raise_for_status()
+        return parse_mcp_response(response.text)
+
+    async def ping(self, provider_url: str, timeout_s: Optional[float] = None) -> MCPSession:
+        """Round-trip over the cached session; used by health probes."""
+        data = await self.rpc(provider_url, "ping", timeout_s=timeout_s)
+        error = data.get("error")
+        # -32601 (method not found): the server answered, which is all a
+        # liveness probe needs.
+        if isinstance(error, dict) and error.get("code") != -32601:
+            raise ValueError(str(error.get("message") or "MCP ping failed"))
+        session = self._sessions.get(provider_url)
+        return session if session is not None else await self.get_session(provider_url, timeout_s)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        snapshot: Dict[str, Any] = asdict(self._metrics)
+        snapshot["pooled_providers"] = sum(1 for c in self._clients.values() if not c.is_closed)
+        snapshot["cached_sessions"] = sum(1 for s in self._sessions.values() if s.expires_at > now)
+        return snapshot
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._sessions.clear()
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+
+_manager: Optional[MCPClientManager] = None
+
+
+def get_mcp_client_manager() -> MCPClientManager:
+    """Process-wide MCP client manager (created lazily)."""
+    global _manager
+    if _manager is None:
+        _manager = MCPClientManager.from_settings()
+    return _manager
@@ -3,18 +3,11 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, Optional
 
-import httpx
-from app.core.http.tls import outbound_http_verify
-
 
 MCP_ACCEPT_HEADER = "application/json, text/event-stream"
 MCP_PROTOCOL_VERSION = "2024-11-05"
 
 
-def _mcp_http_verify() -> bool | str:
-    return outbound_http_verify()
-
-
 def parse_mcp_response(body: str) -> Dict[str, Any]:
     payload = (body or "").strip()
     if not payload:
@@ -44,29 +37,27 @@ async def mcp_initialize(
     provider_url: str,
     timeout_s: int = 20,
 ) -> str:
-    async with httpx.AsyncClient(timeout=timeout_s, verify=_mcp_http_verify()) as client:
-        response = await client.post(
-            provider_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": MCP_ACCEPT_HEADER,
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": MCP_PROTOCOL_VERSION,
-                    "capabilities": {},
-                    "clientInfo": {"name": "ml-portal", "version": "1.0"},
-                },
-            },
-        )
-        response.raise_for_status()
-        session_id = response.headers.get("mcp-session-id")
-        if not session_id:
-            raise ValueError("MCP initialize response missing mcp-session-id")
-        return session_id
+    """Return a session id for ``provider_url`` (pooled, reused until its TTL)."""
+    from app.services.mcp_client_manager import get_mcp_client_manager
+
+    return await get_mcp_client_manager().get_session_id(provider_url, timeout_s)
+
+
+async def mcp_ping(
+    *,
+    provider_url: str,
+    timeout_s: float = 10,
+) -> Dict[str, Any]:
+    """Liveness round-trip over the pooled session; returns server metadata."""
+    from app.services.mcp_client_manager import get_mcp_client_manager
+
+    session = await get_mcp_client_manager().ping(provider_url, timeout_s)
+    return {
+        "session_id": session.session_id,
+        "protocol_version": session.protocol_version,
+        "capabilities": session.capabilities,
+        "server_info": session.server_info,
+    }
 
 
 async def mcp_list_tools(
@@ -74,87 +65,41 @@ async def mcp_list_tools(
     provider_url: str,
     timeout_s: int = 30,
 ) -> list[Dict[str, Any]]:
-    """Initialize an MCP session and return the full tools list."""
-    async with httpx.AsyncClient(timeout=timeout_s, verify=_mcp_http_verify()) as client:
-        init_response = await client.post(
-            provider_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": MCP_ACCEPT_HEADER,
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": MCP_PROTOCOL_VERSION,
-                    "capabilities": {},
-                    "clientInfo": {"name": "ml-portal", "version": "1.0"},
-                },
-            },
-        )
-        init_response.raise_for_status()
-        session_id = init_response.headers.get("mcp-session-id")
-        if not session_id:
-            raise ValueError(f"MCP initialize missing session id for {provider_url}")
-
-        tools_response = await client.post(
-            provider_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": MCP_ACCEPT_HEADER,
-                "mcp-session-id": session_id,
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {},
-            },
-        )
-        tools_response.raise_for_status()
-        payload = parse_mcp_response(tools_response.text)
-        tools = payload.get("result", {}).get("tools", [])
-        if not isinstance(tools, list):
-            raise ValueError("MCP tools/list response does not contain a tools array")
-        return tools
+    """Return the full tools list over the pooled MCP session."""
+    from app.services.mcp_client_manager import get_mcp_client_manager
+
+    payload = await get_mcp_client_manager().rpc(provider_url, "tools/list", timeout_s=timeout_s)
+    tools = payload.get("result", {}).get("tools", [])
+    if not isinstance(tools, list):
+        raise ValueError("MCP tools/list response does not contain a tools array")
+    return tools
 
 
 async def mcp_call_tool(
     *,
     provider_url: str,
-    session_id: str,
+    session_id: Optional[str] = None,
     tool_name: str,
     arguments: Optional[Dict[str, Any]] = None,
     timeout_s: int = 30,
 ) -> Dict[str, Any]:
-    async with httpx.AsyncClient(timeout=timeout_s, verify=_mcp_http_verify()) as client:
-        response = await client.post(
-            provider_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": MCP_ACCEPT_HEADER,
-                "mcp-session-id": session_id,
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments or {},
-                },
-            },
-        )
-        response.raise_for_status()
-        payload = parse_mcp_response(response.text)
-        if payload.get("error"):
-            message = str((payload.get("error") or {}).get("message") or "MCP rpc error")
-            raise ValueError(message)
-        result = payload.get("result")
-        if not isinstance(result, dict):
-            raise ValueError("Invalid MCP tools/call response: missing result object")
-        return result
+    """Call a tool; an expired ``session_id`` is re-initialized transparently."""
+    from app.services.mcp_client_manager import get_mcp_client_manager
+
+    payload = await get_mcp_client_manager().rpc(
+        provider_url,
+        "tools/call",
+        {"name": tool_name, "arguments": arguments or {}},
+        timeout_s=timeout_s,
+        session_id=session_id,
+    )
+    if payload.get("error"):
+        message = str((payload.get("error") or {}).get("message") or "MCP rpc error")
+        raise ValueError(message)
+    result = payload.get("result")
+    if not isinstance(result, dict):
+        raise ValueError("Invalid MCP tools/call response: missing result object")
+    return result
 
 
 def mcp_result_error_message(result: Dict[str, Any]) -> Optional[str]:
@@ -6,25 +6,25 @@ ModelResolver — единая точка резолвинга модельны
 
 ModelResolver:
   1. Резолвит slug → provider_model_name (для вызова LLM)
-  2. Кэширует маппинг в памяти (TTL-based)
+  2. Кэширует маппинг в памяти (TTL + кластерная инвалидация через Redis)
   3. Единственное место в коде, где происходит этот резолвинг
 """
 from __future__ import annotations
 
-import time
-from typing import Optional, Dict
+from typing import Any, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config_cache import VersionedConfigCache
 from app.core.logging import get_logger
 from app.models.model_registry import Model
 
 logger = get_logger(__name__)
 
-# In-memory cache: alias → (provider_model_name, cached_at)
-_cache: Dict[str, tuple[str, float]] = {}
+# In-memory cache: alias → provider_model_name
 _CACHE_TTL_S = 300  # 5 minutes
+_cache: VersionedConfigCache[str] = VersionedConfigCache("model_aliases", ttl_s=_CACHE_TTL_S)
 
 
 class ModelResolver:
@@ -51,14 +51,9 @@ class ModelResolver:
         if not alias:
             return None
 
-        # 1. Check in-memory cache
-        cached = _cache.get(alias)
-        if cached:
-            provider_name, cached_at = cached
-            if time.time() - cached_at < _CACHE_TTL_S:
-                return provider_name
+        return await _cache.get_or_load(alias, lambda: self._lookup(alias))
 
-        # 2. Query DB
+    async def _lookup(self, alias: str) -> str:
         result = await self.session.execute(
             select(Model.provider_model_name).where(
                 Model.alias == alias,
@@ -69,11 +64,10 @@ class ModelResolver:
 
         if provider_model_name:
             normalized_provider_name = str(provider_model_name).strip()
-            _cache[alias] = (normalized_provider_name, time.time())
             logger.debug(f"Resolved model alias '{alias}' → '{normalized_provider_name}'")
             return normalized_provider_name
 
-        # 3. Fallback: alias might already be a provider_model_name (either
+        # Fallback: alias might already be a provider_model_name (either
         # legacy data, or a value that has already passed through the resolver
         # once). Check by provider_model_name before logging a warning — this
         # is normal for the wrapped LLM client path.
@@ -84,7 +78,6 @@ class ModelResolver:
             ).limit(1)
         )
         if already_resolved.scalar_one_or_none():
-            _cache[alias] = (alias, time.time())
             return alias
 
         logger.warning(
@@ -104,9 +97,13 @@ class ModelResolver:
         return resolved
 
     @staticmethod
-    def invalidate_cache(alias: Optional[str] = None) -> None:
-        """Invalidate cache entry or entire cache."""
-        if alias:
-            _cache.pop(alias.strip(), None)
+    async def invalidate_cache(alias: Optional[str] = None, *, session: Optional[Any] = None) -> None:
+        """Invalidate cache entry or entire cache (on every replica).
+
+        With ``session`` the invalidation waits for its transaction to commit.
+        """
+        key = alias.strip() if alias else None
+        if session is not None:
+            await _cache.invalidate_on_commit(session, key)
         else:
-            _cache.clear()
+            await _cache.invalidate(key)
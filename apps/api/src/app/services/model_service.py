@@ -109,6 +109,10 @@ class ModelService:
         model = Model(**data)
         self.session.add(model)
         await self.session.flush()
+
+        # The alias may have been resolved earlier through the legacy fallback.
+        from app.services.model_resolver import ModelResolver
+        await ModelResolver.invalidate_cache(session=self.session)
         
         logger.info(f"Created model: {model.alias} (type={model.type}, provider={model.provider})")
         if model.type == ModelType.EMBEDDING:
@@ -219,7 +223,7 @@ class ModelService:
         
         # Invalidate ModelResolver cache for this alias
         from app.services.model_resolver import ModelResolver
-        ModelResolver.invalidate_cache(model.alias)
+        await ModelResolver.invalidate_cache(model.alias, session=self.session)
         
         logger.info(f"Updated model: {model.alias}")
         if model.type == ModelType.EMBEDDING:
@@ -252,6 +256,9 @@ class ModelService:
         model.enabled = False
         await self.session.flush()
 
+        from app.services.model_resolver import ModelResolver
+        await ModelResolver.invalidate_cache(model.alias, session=self.session)
+
         logger.info(f"Deleted model: {model.alias}")
         if model.type == ModelType.EMBEDDING:
             self._enqueue_embedding_status_reconcile()
@@ -9,14 +9,17 @@ from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.config_cache import VersionedConfigCache
 from app.models.orchestration_settings import OrchestrationSettings
 from app.models.agent_version import AgentVersion
 
 
 class OrchestrationSettingsProvider:
-    """Singleton provider for cached orchestration settings."""
+    """Singleton provider for cached orchestration settings (cluster-invalidated)."""
     _instance: Optional['OrchestrationSettingsProvider'] = None
-    _settings_cache: Optional[Dict[str, Any]] = None
+    _settings_cache: VersionedConfigCache[Dict[str, Any]] = VersionedConfigCache(
+        "orchestration_settings", ttl_s=60.0,
+    )
 
     @classmethod
     def get_instance(cls) -> 'OrchestrationSettingsProvider':
@@ -25,30 +28,33 @@ class OrchestrationSettingsProvider:
         return cls._instance
 
     @classmethod
-    def invalidate_cache(cls) -> None:
-        cls._settings_cache = None
+    async def invalidate_cache(cls, session: Optional[AsyncSession] = None) -> None:
+        """Drop cached settings everywhere; with ``session``, once it commits."""
+        if session is not None:
+            await cls._settings_cache.invalidate_on_commit(session)
+        else:
+            await cls._settings_cache.invalidate()
 
     async def _ensure_cache(self, db: AsyncSession) -> Dict[str, Any]:
-        if self._settings_cache is not None:
-            return self._settings_cache
-
-        result = await db.execute(select(OrchestrationSettings).limit(1))
-        settings = result.scalar_one_or_none()
-        if not settings:
-            settings = OrchestrationSettings()
-            db.add(settings)
-            await db.flush()
-
-        self._settings_cache = {
-            "executor_model": settings.executor_model,
-            "executor_temperature": settings.executor_temperature,
-            "tool_use_guard": settings.tool_use_guard,
-            "retry_instruction": settings.retry_instruction,
-            "intent_messages": settings.intent_messages,
-            "prompt_budgets": settings.prompt_budgets,
-            "prompt_labels": settings.prompt_labels,
-        }
-        return self._settings_cache
+        async def load() -> Dict[str, Any]:
+            result = await db.execute(select(OrchestrationSettings).limit(1))
+            settings = result.scalar_one_or_none()
+            if not settings:
+                settings = OrchestrationSettings()
+                db.add(settings)
+                await db.flush()
+
+            return {
+                "executor_model": settings.executor_model,
+                "executor_temperature": settings.executor_temperature,
+                "tool_use_guard": settings.tool_use_guard,
+                "retry_instruction": settings.retry_instruction,
+                "intent_messages": settings.intent_messages,
+                "prompt_budgets": settings.prompt_budgets,
+                "prompt_labels": settings.prompt_labels,
+            }
+
+        return await self._settings_cache.get_or_load("", load)
 
     async def get_config(self, db: AsyncSession) -> Dict[str, Any]:
         """Get cached orchestration settings as dict."""
@@ -98,5 +104,5 @@ class OrchestrationService:
                 setattr(settings, key, value)
 
         await self.db.flush()
-        OrchestrationSettingsProvider.invalidate_cache()
+        await OrchestrationSettingsProvider.invalidate_cache(self.db)
         return settings
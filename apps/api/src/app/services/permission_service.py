@@ -6,14 +6,22 @@ Resolution priority: user > tenant > platform.
 Default for unresolved resources: deny.
 
 Runtime consumers use EffectivePermissions dataclass — interface unchanged.
+
+Resolved rules are compiled per (tenant, user) into plain slug → effect maps
+and cached in-process and in Redis under a global RBAC generation. Rule
+writes and agent/collection publication changes call
+``PermissionService.invalidate_cache(session)``, which bumps the generation
+once the write commits so every replica recompiles on its next lookup.
 """
+import json
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config_cache import VersionedConfigCache
 from app.core.logging import get_logger
 from app.models.rbac import RbacRule
 from app.repositories.rbac_repository import RbacRuleRepository
@@ -82,6 +90,53 @@ class EffectivePermissions:
         return [a for a in agent_slugs if self.is_agent_allowed(a)]
 
 
+@dataclass(frozen=True)
+class CompiledPermissions:
+    """Resolved RBAC effects for one (tenant, user), independent of defaults."""
+    instance_permissions: Dict[str, bool] = field(default_factory=dict)
+    agent_permissions: Dict[str, bool] = field(default_factory=dict)
+    collection_permissions: Dict[str, bool] = field(default_factory=dict)
+    denied_reasons: Dict[str, str] = field(default_factory=dict)
+
+    def to_effective(self, default_collection_allow: bool = False) -> EffectivePermissions:
+        # Copies keep callers from mutating the shared cached maps.
+        return EffectivePermissions(
+            instance_permissions=dict(self.instance_permissions),
+            agent_permissions=dict(self.agent_permissions),
+            collection_permissions=dict(self.collection_permissions),
+            denied_reasons=dict(self.denied_reasons),
+            default_collection_allow=default_collection_allow,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "instance": self.instance_permissions,
+            "agent": self.agent_permissions,
+            "collection": self.collection_permissions,
+            "denied": self.denied_reasons,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CompiledPermissions":
+        data = json.loads(raw)
+        return cls(
+            instance_permissions={str(k): bool(v) for k, v in data.get("instance", {}).items()},
+            agent_permissions={str(k): bool(v) for k, v in data.get("agent", {}).items()},
+            collection_permissions={str(k): bool(v) for k, v in data.get("collection", {}).items()},
+            denied_reasons={str(k): str(v) for k, v in data.get("denied", {}).items()},
+        )
+
+
+SNAPSHOT_KEY_PREFIX = "rbac:effective:"
+SNAPSHOT_TTL_S = 600
+
+
+def _default_redis() -> Any:
+    from app.core.redis import get_redis
+
+    return get_redis()
+
+
 # ── Slug lookup helpers (batch) ──────────────────────────────────────────
 
 _RESOURCE_SLUG_MODELS = {
@@ -157,10 +212,28 @@ class PermissionService:
             ...
     """
 
+    _cache: VersionedConfigCache[CompiledPermissions] = VersionedConfigCache(
+        "rbac_effective_permissions", ttl_s=60.0
+    )
+    _snapshot_redis: Callable[[], Any] = staticmethod(_default_redis)
+
     def __init__(self, session: AsyncSession):
         self.session = session
         self.rule_repo = RbacRuleRepository(session)
 
+    @classmethod
+    async def invalidate_cache(cls, session: Optional[AsyncSession] = None) -> None:
+        """Bump the RBAC generation; every replica recompiles on next lookup.
+
+        Pass the writer's ``session`` so the bump happens after it commits;
+        bumping earlier lets a peer compile the old rules under the new
+        generation and serve them until the TTL.
+        """
+        if session is not None:
+            await cls._cache.invalidate_on_commit(session)
+        else:
+            await cls._cache.invalidate()
+
     async def resolve_permissions(
         self,
         user_id: Optional[UUID] = None,
@@ -173,11 +246,38 @@ class PermissionService:
 
         Priority: user > tenant > platform > default deny.
 
+        Served from the compiled cache; the database is read only when the
+        (tenant, user) pair has no snapshot for the current RBAC generation.
+
         Tool-level RBAC is not part of this contract.
         """
-        effective = EffectivePermissions(
-            default_collection_allow=default_collection_allow,
-        )
+        cache_key = f"{tenant_id or '-'}:{user_id or '-'}"
+
+        async def load() -> CompiledPermissions:
+            generation = self._cache.generation
+            snapshot_key = (
+                f"{SNAPSHOT_KEY_PREFIX}{generation}:{cache_key}" if generation is not None else None
+            )
+            if snapshot_key:
+                compiled = await self._read_snapshot(snapshot_key)
+                if compiled is not None:
+                    return compiled
+            compiled = await self.compile_permissions(user_id=user_id, tenant_id=tenant_id)
+            if snapshot_key:
+                await self._write_snapshot(snapshot_key, compiled)
+            return compiled
+
+        compiled = await self._cache.get_or_load(cache_key, load)
+        return compiled.to_effective(default_collection_allow)
+
+    async def compile_permissions(
+        self,
+        *,
+        user_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+    ) -> CompiledPermissions:
+        """Read the applicable rules and fold them into slug → effect maps."""
+        compiled = CompiledPermissions()
 
         # Load all applicable rules in priority order
         platform_rules = await self.rule_repo.list_platform_rules()
@@ -215,7 +315,7 @@ class PermissionService:
                 self.session, rtype, ids
             )
 
-        # Apply resolved effects to EffectivePermissions
+        # Apply resolved effects to the compiled maps
         for (rtype, rid), (effect, level) in resolved.items():
             resolved_target = slug_maps.get(rtype, {}).get(rid)
             if not resolved_target:
@@ -225,27 +325,39 @@ class PermissionService:
             is_allowed = effect == "allow"
 
             if logical_resource_type == "instance":
-                effective.instance_permissions[slug] = is_allowed
+                compiled.instance_permissions[slug] = is_allowed
             elif logical_resource_type == "agent":
-                effective.agent_permissions[slug] = is_allowed
+                compiled.agent_permissions[slug] = is_allowed
             elif logical_resource_type == "collection":
-                effective.collection_permissions[slug] = is_allowed
+                compiled.collection_permissions[slug] = is_allowed
 
             if not is_allowed:
-                effective.denied_reasons[slug] = (
+                compiled.denied_reasons[slug] = (
                     f"Denied by RBAC rule ({level} level)"
                 )
 
         logger.debug(
-            f"Resolved permissions for user={user_id}, tenant={tenant_id}: "
-            f"instances: allowed={len(effective.get_allowed_instances())}, "
-            f"denied={len(effective.get_denied_instances())}; "
-            f"agents: allowed={len(effective.get_allowed_agents())}, "
-            f"denied={len(effective.get_denied_agents())}; "
-            f"collections: {len(effective.collection_permissions)} rules"
+            f"Compiled permissions for user={user_id}, tenant={tenant_id}: "
+            f"instances: {len(compiled.instance_permissions)} rules; "
+            f"agents: {len(compiled.agent_permissions)} rules; "
+            f"collections: {len(compiled.collection_permissions)} rules"
         )
 
-        return effective
+        return compiled
+
+    async def _read_snapshot(self, key: str) -> Optional[CompiledPermissions]:
+        try:
+            raw = await self._snapshot_redis().get(key)
+            return CompiledPermissions.from_json(raw) if raw else None
+        except Exception as exc:
+            logger.debug(f"RBAC snapshot read failed for {key}: {exc!r}")
+            return None
+
+    async def _write_snapshot(self, key: str, compiled: CompiledPermissions) -> None:
+        try:
+            await self._snapshot_redis().set(key, compiled.to_json(), ex=SNAPSHOT_TTL_S)
+        except Exception as exc:
+            logger.debug(f"RBAC snapshot write failed for {key}: {exc!r}")
 
     async def check_instance_permission(
         self,
@@ -10,6 +10,7 @@ from sqlalchemy import select
 
 from app.models.platform_settings import PlatformSettings
 from app.repositories.platform_settings_repository import PlatformSettingsRepository
+from app.core.config_cache import VersionedConfigCache
 from app.core.logging import get_logger
 from app.services.platform_settings_defaults import build_platform_runtime_config
 
@@ -17,9 +18,13 @@ logger = get_logger(__name__)
 
 
 class PlatformSettingsProvider:
-    """Singleton provider for cached platform settings (policies + gates)."""
+    """Singleton provider for cached platform settings (policies + gates).
+
+    The cache is process-local and invalidated cluster-wide through a Redis
+    generation counter (see ``VersionedConfigCache``).
+    """
     _instance: Optional[PlatformSettingsProvider] = None
-    _cache: Optional[Dict[str, Any]] = None
+    _cache: VersionedConfigCache[Dict[str, Any]] = VersionedConfigCache("platform_settings", ttl_s=60.0)
 
     @classmethod
     def get_instance(cls) -> PlatformSettingsProvider:
@@ -28,23 +33,26 @@ class PlatformSettingsProvider:
         return cls._instance
 
     @classmethod
-    def invalidate_cache(cls) -> None:
-        cls._cache = None
+    async def invalidate_cache(cls, session: Optional[AsyncSession] = None) -> None:
+        """Drop cached settings everywhere; with ``session``, once it commits."""
+        if session is not None:
+            await cls._cache.invalidate_on_commit(session)
+        else:
+            await cls._cache.invalidate()
 
     async def get_config(self, db: AsyncSession) -> Dict[str, Any]:
         """Get cached platform settings as dict."""
-        if self._cache is not None:
-            return self._cache
 
-        result = await db.execute(select(PlatformSettings).limit(1))
-        settings = result.scalar_one_or_none()
-        if not settings:
-            settings = PlatformSettings()
-            db.add(settings)
-            await db.flush()
+        async def load() -> Dict[str, Any]:
+            result = await db.execute(select(PlatformSettings).limit(1))
+            settings = result.scalar_one_or_none()
+            if not settings:
+                settings = PlatformSettings()
+                db.add(settings)
+                await db.flush()
+            return build_platform_runtime_config(settings)
 
-        self._cache = build_platform_runtime_config(settings)
-        return self._cache
+        return await self._cache.get_or_load("", load)
 
 
 class PlatformSettingsService:
@@ -58,14 +66,14 @@ class PlatformSettingsService:
         """Get platform settings (creates if not exists)."""
         settings = await self.repo.get_or_create()
         if getattr(settings, "_defaults_applied", False):
-            PlatformSettingsProvider.invalidate_cache()
+            await PlatformSettingsProvider.invalidate_cache(self.session)
             setattr(settings, "_defaults_applied", False)
         return settings
 
     async def fill_defaults(self) -> PlatformSettings:
         """Fill missing values from Python defaults without overwriting explicit values."""
         settings = await self.repo.get_or_create()
-        PlatformSettingsProvider.invalidate_cache()
+        await PlatformSettingsProvider.invalidate_cache(self.session)
         return settings
 
     async def update(
@@ -122,6 +130,6 @@ class PlatformSettingsService:
             settings.chat_upload_allowed_extensions = chat_upload_allowed_extensions
 
         result = await self.repo.update(settings)
-        PlatformSettingsProvider.invalidate_cache()
+        await PlatformSettingsProvider.invalidate_cache(self.session)
         logger.info("Updated platform settings")
         return result
@@ -269,13 +269,25 @@ class RAGEventSubscriber:
     Два режима:
       subscribe_aggregate(is_admin, tenant_id) — канал rag:agg:admin или rag:agg:tenant:{id}
       subscribe_document(doc_id)               — канал rag:doc:{doc_id}
+
+    С ``hub`` подписка идёт через общий процессный pub/sub (RedisPubSubHub),
+    без отдельного соединения на каждый SSE-поток; без него — собственный
+    pubsub на ``redis_client``.
     """
 
-    def __init__(self, redis_client: Any, tenant_id: Optional[UUID] = None, is_admin: bool = False):
+    def __init__(
+        self,
+        redis_client: Any,
+        tenant_id: Optional[UUID] = None,
+        is_admin: bool = False,
+        hub: Optional[Any] = None,
+    ):
         self.redis = redis_client
+        self.hub = hub
         self.tenant_id = str(tenant_id) if tenant_id else None
         self.is_admin = is_admin
         self.pubsub = None
+        self._subscription = None
         self._channel: Optional[str] = None
 
         if self.is_admin:
@@ -286,32 +298,44 @@ class RAGEventSubscriber:
             self._channel = RAGEventPublisher.CHANNEL_AGG_TENANT_FMT.format(tenant_id=self.tenant_id)
 
     @classmethod
-    def for_document(cls, redis_client: Any, doc_id: UUID) -> "RAGEventSubscriber":
+    def for_document(cls, redis_client: Any, doc_id: UUID, hub: Optional[Any] = None) -> "RAGEventSubscriber":
         """Create subscriber for a specific document's per-step events."""
         inst = cls.__new__(cls)
         inst.redis = redis_client
+        inst.hub = hub
         inst.tenant_id = None
         inst.is_admin = False
         inst.pubsub = None
+        inst._subscription = None
         inst._channel = RAGEventPublisher.CHANNEL_DOC_FMT.format(doc_id=str(doc_id))
         return inst
 
     async def subscribe(self) -> None:
         """Subscribe to the configured channel."""
-        self.pubsub = self.redis.pubsub()
-        await self.pubsub.subscribe(self._channel)
+        if self.hub is not None:
+            self._subscription = await self.hub.subscribe(self._channel)
+        else:
+            self.pubsub = self.redis.pubsub()
+            await self.pubsub.subscribe(self._channel)
         logger.info(f"Subscribed to {self._channel}")
 
+    async def _raw_messages(self):
+        if self._subscription is not None:
+            async for data in self._subscription:
+                yield data
+            return
+        async for message in self.pubsub.listen():
+            if message["type"] == "message":
+                yield message["data"]
+
     async def listen(self):
         """Yield decoded events from the subscribed channel."""
-        if not self.pubsub:
+        if not self.pubsub and self._subscription is None:
             await self.subscribe()
 
-        async for message in self.pubsub.listen():
-            if message["type"] != "message":
-                continue
+        async for data in self._raw_messages():
             try:
-                yield json.loads(message["data"])
+                yield json.loads(data)
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to decode SSE event: {e}")
             except Exception as e:
@@ -319,6 +343,10 @@ class RAGEventSubscriber:
 
     async def unsubscribe(self) -> None:
         """Unsubscribe and close pubsub connection."""
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
+            logger.info(f"Unsubscribed from {self._channel}")
         if self.pubsub:
             await self.pubsub.unsubscribe(self._channel)
             await self.pubsub.close()
@@ -7,6 +7,7 @@ from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.rbac import RbacRule
+from app.services.permission_service import PermissionService
 
 
 class RbacCleanupService:
@@ -28,8 +29,7 @@ class RbacCleanupService:
         if owner_tenant_id is not None:
             stmt = stmt.where(RbacRule.owner_tenant_id == owner_tenant_id)
 
-        result = await self.session.execute(stmt)
-        return int(result.rowcount or 0)
+        return await self._delete(stmt)
 
     async def remove_rules_for_resource(
         self,
@@ -41,5 +41,11 @@ class RbacCleanupService:
             RbacRule.resource_type == resource_type,
             RbacRule.resource_id == resource_id,
         )
+        return await self._delete(stmt)
+
+    async def _delete(self, stmt) -> int:
         result = await self.session.execute(stmt)
-        return int(result.rowcount or 0)
+        removed = int(result.rowcount or 0)
+        if removed:
+            await PermissionService.invalidate_cache(self.session)
+        return removed
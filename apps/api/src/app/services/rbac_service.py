@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import RbacRuleNotFoundError, RbacRuleDuplicateError, ValidationError
 from app.models.rbac import RbacRule, RbacLevel, ResourceType, RbacEffect
 from app.repositories.rbac_repository import RbacRuleRepository
+from app.services.permission_service import PermissionService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -61,6 +62,7 @@ class RbacService:
             created_by_user_id=created_by_user_id,
         )
         result = await self.rule_repo.create(rule)
+        await PermissionService.invalidate_cache(self.session)
         owner = "platform" if owner_platform else (
             f"user:{owner_user_id}" if owner_user_id else f"tenant:{owner_tenant_id}"
         )
@@ -91,6 +93,7 @@ class RbacService:
         if resource_id is not None:
             rule.resource_id = resource_id
         result = await self.rule_repo.update(rule)
+        await PermissionService.invalidate_cache(self.session)
         logger.info(
             f"Updated RBAC rule {rule_id}: effect={rule.effect}, resource_type={rule.resource_type}, resource_id={rule.resource_id}"
         )
@@ -99,6 +102,7 @@ class RbacService:
     async def delete_rule(self, rule_id: UUID) -> None:
         rule = await self.get_rule(rule_id)
         await self.rule_repo.delete(rule)
+        await PermissionService.invalidate_cache(self.session)
         logger.info(f"Deleted RBAC rule {rule_id}")
 
     async def list_rules(
@@ -171,6 +175,7 @@ class RbacService:
             effect=RbacEffect.DENY.value,
         )
         result = await self.rule_repo.create(rule)
+        await PermissionService.invalidate_cache(self.session)
         logger.info(f"Auto-created platform deny for {resource_type}:{resource_id}")
         return result
 
@@ -187,16 +192,18 @@ class RbacService:
         existing = await self.rule_repo._find_platform_rule(resource_type, resource_id)
         if existing:
             existing.effect = effect
-            return await self.rule_repo.update(existing)
-
-        rule = RbacRule(
-            level=RbacLevel.PLATFORM.value,
-            owner_platform=True,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            effect=effect,
-        )
-        return await self.rule_repo.create(rule)
+            result = await self.rule_repo.update(existing)
+        else:
+            rule = RbacRule(
+                level=RbacLevel.PLATFORM.value,
+                owner_platform=True,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                effect=effect,
+            )
+            result = await self.rule_repo.create(rule)
+        await PermissionService.invalidate_cache(self.session)
+        return result
 
     # ─── Enriched listing ─────────────────────────────────────────────
 
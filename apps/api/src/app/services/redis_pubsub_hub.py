@@ -0,0 +1,310 @@
+"""
+Process-wide multiplexed Redis pub/sub subscriber.
+
+SSE endpoints (chat turns, sandbox runs, RAG status streams) and runtime
+cancel listeners each used to open their own Redis connection plus a
+``PubSub`` for one channel, so Redis connection count grew with open tabs.
+The hub keeps a single ``PubSub`` connection per process and a reader task
+that dispatches every message to the subscriptions of its channel.
+
+* Channels are reference-counted: ``SUBSCRIBE`` is sent for the first
+  subscription of a channel, ``UNSUBSCRIBE`` after the last one closes.
+  ``subscribe()`` returns once the reader has seen Redis confirm the
+  channel, so a caller may start the publisher right after it.
+* Each subscription has a bounded queue. A consumer that falls behind
+  loses its oldest messages (counted as ``messages_dropped``) instead of
+  growing memory or stalling the reader for everyone else.
+* ``metrics()`` reports channel/subscription counts and fan-out lag (time
+  from the reader receiving a message to the consumer taking it).
+
+redis-py reconnects a ``PubSub`` transparently and re-subscribes its
+channels, so a dropped connection only costs the messages published while
+it was down. Like the MCP client manager, the hub is bound to the event
+loop that created its connection and starts over when the loop changes.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set
+
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.prometheus_metrics import record_pubsub_fanout_lag
+
+logger = get_logger(__name__)
+
+_RECONNECT_BACKOFF_S = (0.1, 0.5, 1.0, 2.0, 5.0)
+_SUBSCRIBE_ACK_TIMEOUT_S = 5.0
+_CLOSED = object()
+
+
+@dataclass
+class PubSubHubMetrics:
+    messages_received: int = 0
+    messages_delivered: int = 0
+    messages_dropped: int = 0
+    reader_errors: int = 0
+    fanout_lag_ms_last: float = 0.0
+    fanout_lag_ms_max: float = 0.0
+
+
+class PubSubSubscription:
+    """One consumer of one channel; iterate it to receive raw message data."""
+
+    def __init__(self, hub: "RedisPubSubHub", channel: str, maxsize: int) -> None:
+        self.channel = channel
+        self._hub = hub
+        self._maxsize = max(1, int(maxsize))
+        self._buffer: Deque[tuple[float, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    def _push(self, received_at: float, data: Any) -> bool:
+        dropped = False
+        if len(self._buffer) >= self._maxsize:
+            self._buffer.popleft()
+            dropped = True
+        self._buffer.append((received_at, data))
+        self._ready.set()
+        return dropped
+
+    async def get(self) -> Any:
+        """Next message payload, waiting until one arrives."""
+        data = await self._next()
+        if data is _CLOSED:
+            raise RuntimeError(f"subscription to {self.channel} is closed")
+        return data
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            data = await self._next()
+            if data is _CLOSED:
+                return
+            yield data
+
+    async def _next(self) -> Any:
+        while not self._buffer:
+            if self._closed:
+                return _CLOSED
+            self._ready.clear()
+            await self._ready.wait()
+        received_at, data = self._buffer.popleft()
+        self._hub._record_delivery(time.monotonic() - received_at)
+        return data
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._ready.set()
+        await self._hub._release(self)
+
+
+class RedisPubSubHub:
+    """Shares one Redis pub/sub connection between all in-process subscribers."""
+
+    def __init__(
+        self,
+        *,
+        redis_factory: Optional[Callable[[], Any]] = None,
+        queue_size: int = 1000,
+    ) -> None:
+        self._redis_factory = redis_factory or _default_redis
+        self._queue_size = max(1, int(queue_size))
+        self._redis: Any = None
+        self._pubsub: Any = None
+        self._reader: Optional[asyncio.Task] = None
+        self._channels: Dict[str, Set[PubSubSubscription]] = {}
+        # channel -> resolved when Redis confirms its SUBSCRIBE
+        self._acks: Dict[str, asyncio.Future] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = PubSubHubMetrics()
+
+    @classmethod
+    def from_settings(cls) -> "RedisPubSubHub":
+        return cls(queue_size=get_settings().REDIS_PUBSUB_QUEUE_SIZE)
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    async def subscribe(self, channel: str, *, maxsize: Optional[int] = None) -> PubSubSubscription:
+        """Register a consumer; returns once Redis has acknowledged the channel.
+
+        If no acknowledgement arrives within ``_SUBSCRIBE_ACK_TIMEOUT_S`` the
+        subscription is returned anyway (with a warning); messages published
+        before Redis processes the ``SUBSCRIBE`` are then lost.
+        """
+        self._bind_loop()
+        subscription = PubSubSubscription(self, channel, maxsize or self._queue_size)
+        async with self._lock:
+            consumers = self._channels.get(channel)
+            if consumers is None:
+                self._acks[channel] = asyncio.get_running_loop().create_future()
+                await self._ensure_pubsub().subscribe(channel)
+                consumers = self._channels[channel] = set()
+            consumers.add(subscription)
+            self._ensure_reader()
+            ack = self._acks.get(channel)
+        if ack is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(ack), timeout=_SUBSCRIBE_ACK_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                logger.warning("Redis pub/sub subscribe to %s not acknowledged in %.0fs", channel, _SUBSCRIBE_ACK_TIMEOUT_S)
+        return subscription
+
+    async def _release(self, subscription: PubSubSubscription) -> None:
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            return
+        async with self._lock:
+            consumers = self._channels.get(subscription.channel)
+            if consumers is None or subscription not in consumers:
+                return
+            consumers.discard(subscription)
+            if consumers:
+                return
+            del self._channels[subscription.channel]
+            self._resolve_ack(subscription.channel)
+            try:
+                await self._pubsub.unsubscribe(subscription.channel)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Redis pub/sub unsubscribe failed for %s: %r", subscription.channel, exc)
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    def _ensure_pubsub(self) -> Any:
+        if self._pubsub is None:
+            self._redis = self._redis_factory()
+            self._pubsub = self._redis.pubsub()
+        return self._pubsub
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop(), name="redis-pubsub-hub")
+
+    async def _read_loop(self) -> None:
+        failures = 0
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=False, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._metrics.reader_errors += 1
+                delay = _RECONNECT_BACKOFF_S[min(failures, len(_RECONNECT_BACKOFF_S) - 1)]
+                failures += 1
+                logger.warning("Redis pub/sub reader failed (retry in %.1fs): %r", delay, exc)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            if message is None:
+                continue
+            if message.get("type") == "message":
+                self._dispatch(message)
+            elif message.get("type") == "subscribe":
+                self._resolve_ack(_channel_name(message.get("channel")))
+
+    def _resolve_ack(self, channel: str) -> None:
+        ack = self._acks.pop(channel, None)
+        if ack is not None and not ack.done():
+            ack.set_result(None)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        channel = _channel_name(message.get("channel"))
+        self._metrics.messages_received += 1
+        received_at = time.monotonic()
+        for subscription in tuple(self._channels.get(channel) or ()):
+            if subscription._push(received_at, message.get("data")):
+                self._metrics.messages_dropped += 1
+
+    def _record_delivery(self, lag_s: float) -> None:
+        lag_ms = lag_s * 1000.0
+        self._metrics.messages_delivered += 1
+        self._metrics.fanout_lag_ms_last = lag_ms
+        self._metrics.fanout_lag_ms_max = max(self._metrics.fanout_lag_ms_max, lag_ms)
+        record_pubsub_fanout_lag(lag_s)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and self._channels:
+            # The previous loop is gone; its connection and reader cannot be
+            # awaited here, so drop them and let the GC close the socket.
+            logger.debug("Redis pub/sub hub: event loop changed, dropping %d channels", len(self._channels))
+        self._redis = None
+        self._pubsub = None
+        self._reader = None
+        self._channels = {}
+        self._acks = {}
+        self._lock = asyncio.Lock()
+        self._loop = loop
+
+    # ------------------------------------------------------------------
+    # Lifecycle / observability
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = asdict(self._metrics)
+        snapshot["channels"] = len(self._channels)
+        snapshot["subscriptions"] = sum(len(consumers) for consumers in self._channels.values())
+        snapshot["max_queue_depth"] = max(
+            (s.depth for consumers in self._channels.values() for s in consumers),
+            default=0,
+        )
+        # The max is per scrape interval; reset it once reported.
+        self._metrics.fanout_lag_ms_max = 0.0
+        return snapshot
+
+    async def aclose(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is not None and not reader.done():
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        for consumers in self._channels.values():
+            for subscription in consumers:
+                subscription._closed = True
+                subscription._ready.set()
+        self._channels = {}
+        for channel in list(self._acks):
+            self._resolve_ack(channel)
+        pubsub, self._pubsub = self._pubsub, None
+        redis_client, self._redis = self._redis, None
+        try:
+            if pubsub is not None:
+                await pubsub.aclose()
+            if redis_client is not None:
+                await redis_client.aclose()
+        except Exception:
+            pass
+
+
+def _channel_name(channel: Any) -> Any:
+    return channel.decode("utf-8") if isinstance(channel, bytes) else channel
+
+
+def _default_redis() -> Any:
+    return aioredis.from_url(get_settings().REDIS_URL, decode_responses=True)
+
+
+_hub: Optional[RedisPubSubHub] = None
+
+
+def get_pubsub_hub() -> RedisPubSubHub:
+    """Process-wide pub/sub hub (created lazily)."""
+    global _hub
+    if _hub is None:
+        _hub = RedisPubSubHub.from_settings()
+    return _hub
@@ -1,8 +1,20 @@
-"""Transactional persisted budget ledger."""
+"""Transactional persisted budget ledger.
+
+Limits are enforced from in-memory counters. Each counter row is read and
+locked (``FOR UPDATE``) the first time a service instance touches it, so
+the instance is the only writer for the rest of the turn's transaction.
+Ledger entries are added to the session without flushing and go to the
+database with the next flush — at the latest at a checkpoint (every
+``checkpoint_every`` entries, and when the run ends). They commit or roll
+back together with the plan state they account for, so a crash cannot
+leave the ledger and the counters out of step. ``budget_consumed`` events
+are aggregated per counter and emitted at checkpoints; rejections are
+emitted immediately.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy import select
@@ -11,6 +23,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.runtime_observability import RuntimeBudgetCounter, RuntimeBudgetEntry
 from app.runtime.events import RuntimeEvent, RuntimeEventType
 
+DEFAULT_CHECKPOINT_EVERY = 20
+
+_CounterKey = Tuple[str, str, str]
+
 
 @dataclass(frozen=True)
 class BudgetDecision:
@@ -21,10 +37,28 @@ class BudgetDecision:
     reason: str
 
 
+@dataclass
+class _PendingConsumption:
+    delta: int = 0
+    entries: int = 0
+    reasons: List[str] = field(default_factory=list)
+    causation_event_id: Optional[UUID] = None
+
+
 class RuntimeBudgetService:
-    def __init__(self, session: AsyncSession, event_sink: Optional[object] = None) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        event_sink: Optional[object] = None,
+        *,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
         self.session = session
         self.event_sink = event_sink
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self._counters: Dict[_CounterKey, RuntimeBudgetCounter] = {}
+        self._pending: Dict[_CounterKey, _PendingConsumption] = {}
+        self._pending_entries = 0
 
     async def consume(
         self, *, run_id: UUID, owner_type: str, owner_id: str, metric: str,
@@ -33,18 +67,9 @@ class RuntimeBudgetService:
     ) -> BudgetDecision:
         if amount <= 0:
             return BudgetDecision(True, metric, 0, limit, reason)
-        result = await self.session.execute(select(RuntimeBudgetCounter).where(
-            RuntimeBudgetCounter.owner_type == owner_type,
-            RuntimeBudgetCounter.owner_id == owner_id,
-            RuntimeBudgetCounter.metric == metric,
-        ).with_for_update())
-        counter = result.scalar_one_or_none()
-        if counter is None:
-            counter = RuntimeBudgetCounter(id=uuid4(), run_id=run_id, owner_type=owner_type,
-                                          owner_id=owner_id, metric=metric, consumed=0, limit_value=limit)
-            self.session.add(counter)
-            await self.session.flush()
-        elif limit is not None:
+        key = (owner_type, owner_id, metric)
+        counter = await self._counter(key, run_id=run_id, limit=limit)
+        if limit is not None:
             counter.limit_value = limit
         before = counter.consumed
         after = before + amount
@@ -64,16 +89,55 @@ class RuntimeBudgetService:
             metric=metric, delta=amount, before_value=before, after_value=after,
             limit_value=effective_limit, reason=reason, causation_event_id=causation_event_id,
         ))
-        await self.session.flush()
-        await self._emit(RuntimeEvent(
-            RuntimeEventType.BUDGET_CONSUMED,
-            {"entity_type": owner_type, "entity_id": owner_id,
-             "caused_by_event_id": str(causation_event_id) if causation_event_id else None,
-             "metric": metric, "delta": amount, "consumed": after,
-             "limit": effective_limit, "reason": reason},
-        ))
+        pending = self._pending.setdefault(key, _PendingConsumption())
+        pending.delta += amount
+        pending.entries += 1
+        if reason not in pending.reasons:
+            pending.reasons.append(reason)
+        pending.causation_event_id = causation_event_id or pending.causation_event_id
+        self._pending_entries += 1
+        if self._pending_entries >= self.checkpoint_every:
+            await self.checkpoint()
         return BudgetDecision(True, metric, after, effective_limit, reason)
 
+    async def checkpoint(self) -> None:
+        """Flush buffered ledger entries and emit one event per counter."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_entries = 0
+        await self.session.flush()
+        for (owner_type, owner_id, metric), item in pending.items():
+            counter = self._counters[(owner_type, owner_id, metric)]
+            await self._emit(RuntimeEvent(
+                RuntimeEventType.BUDGET_CONSUMED,
+                {"entity_type": owner_type, "entity_id": owner_id,
+                 "caused_by_event_id": str(item.causation_event_id) if item.causation_event_id else None,
+                 "metric": metric, "delta": item.delta, "consumed": counter.consumed,
+                 "limit": counter.limit_value, "reason": ",".join(item.reasons),
+                 "entries": item.entries},
+            ))
+
+    async def _counter(self, key: _CounterKey, *, run_id: UUID, limit: Optional[int]) -> RuntimeBudgetCounter:
+        counter = self._counters.get(key)
+        if counter is not None:
+            return counter
+        owner_type, owner_id, metric = key
+        # Lock once; the row stays ours until the turn's transaction ends.
+        result = await self.session.execute(select(RuntimeBudgetCounter).where(
+            RuntimeBudgetCounter.owner_type == owner_type,
+            RuntimeBudgetCounter.owner_id == owner_id,
+            RuntimeBudgetCounter.metric == metric,
+        ).with_for_update())
+        counter = result.scalar_one_or_none()
+        if counter is None:
+            counter = RuntimeBudgetCounter(id=uuid4(), run_id=run_id, owner_type=owner_type,
+                                          owner_id=owner_id, metric=metric, consumed=0, limit_value=limit)
+            self.session.add(counter)
+            await self.session.flush()
+        self._counters[key] = counter
+        return counter
+
     async def _emit(self, event: RuntimeEvent) -> None:
         if self.event_sink is not None:
             await self.event_sink(event)
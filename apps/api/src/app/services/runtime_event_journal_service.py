@@ -1,7 +1,7 @@
 """Read model for the canonical runtime event journal."""
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import func, select
@@ -14,12 +14,13 @@ class RuntimeEventJournalService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def list_run_events(self, run_id: UUID) -> Sequence[RuntimeExecutionEvent]:
-        result = await self._session.execute(
-            select(RuntimeExecutionEvent)
-            .where(RuntimeExecutionEvent.run_id == run_id)
-            .order_by(RuntimeExecutionEvent.sequence)
-        )
+    async def list_run_events(
+        self, run_id: UUID, *, after_sequence: Optional[int] = None,
+    ) -> Sequence[RuntimeExecutionEvent]:
+        query = select(RuntimeExecutionEvent).where(RuntimeExecutionEvent.run_id == run_id)
+        if after_sequence is not None:
+            query = query.where(RuntimeExecutionEvent.sequence > after_sequence)
+        result = await self._session.execute(query.order_by(RuntimeExecutionEvent.sequence))
         return result.scalars().all()
 
     async def count_run_events(self, run_id: UUID) -> int:
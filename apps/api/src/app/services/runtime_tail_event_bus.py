@@ -1,5 +1,28 @@
+"""
+Runtime tail transport: progress and journal projections of a live run.
+
+Two transports share one interface, chosen by ``RUNTIME_TAIL_TRANSPORT``:
+
+* ``pubsub`` — fire-and-forget ``PUBLISH`` on ``runtime:tail:{key}``.
+  Subscribers ride the process-wide pub/sub hub; anything published before
+  they attach, or beyond their buffer while they lag, is lost.
+* ``streams`` — ``XADD`` to a per-run stream ``runtime:tail:stream:{key}``
+  trimmed with ``MAXLEN ~`` and expired after the run goes quiet.
+  Subscribers ``XREAD BLOCK`` from a cursor, so events published by the
+  Celery memory finalizer or agent children arrive in order, a subscriber
+  may start from the beginning of the run (``from_start``), and a slow
+  consumer simply reads later — the backlog stays in Redis, bounded by
+  retention, instead of being dropped in process memory.
+
+Only under ``streams`` may a local consumer bound its queue
+(``consumer_buffer``): a paused pub/sub reader loses what it does not take.
+Blocking stream reads hold their connection for up to
+``RUNTIME_TAIL_STREAM_BLOCK_MS``, so they use a dedicated pool
+(``get_stream_reader``) rather than the shared ``get_redis()`` one.
+"""
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Optional
@@ -8,6 +31,7 @@ import redis.asyncio as aioredis
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.services.redis_pubsub_hub import PubSubSubscription, RedisPubSubHub, get_pubsub_hub
 
 logger = get_logger(__name__)
 
@@ -16,15 +40,48 @@ def _channel(stream_key: str) -> str:
     return f"runtime:tail:{stream_key}"
 
 
+def _stream(stream_key: str) -> str:
+    return f"runtime:tail:stream:{stream_key}"
+
+
 def _control_channel(run_id: str) -> str:
     return f"runtime:control:{run_id}"
 
 
+_STREAM_RETRY_BACKOFF_S = (0.1, 0.5, 1.0, 2.0, 5.0)
+
+_stream_reader: Optional[aioredis.Redis] = None
+
+
+def get_stream_reader() -> aioredis.Redis:
+    """Process-wide client for tail stream reads, on its own sized pool."""
+    global _stream_reader
+    if _stream_reader is None:
+        settings = get_settings()
+        pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.RUNTIME_TAIL_STREAM_MAX_CONNECTIONS,
+            timeout=settings.RUNTIME_TAIL_STREAM_BLOCK_MS / 1000.0,
+            decode_responses=True,
+        )
+        _stream_reader = aioredis.Redis(connection_pool=pool)
+    return _stream_reader
+
+
+async def close_stream_reader() -> None:
+    global _stream_reader
+    reader, _stream_reader = _stream_reader, None
+    if reader is not None:
+        await reader.aclose()
+        await reader.connection_pool.disconnect()
+
+
 class RuntimeTailEventBus:
-    """Redis pub/sub bridge for async runtime tail events."""
+    """Publishes async runtime tail events on the configured transport."""
 
-    def __init__(self, redis_client: Optional[Any] = None) -> None:
+    def __init__(self, redis_client: Optional[Any] = None, *, transport: Optional[str] = None) -> None:
         self._redis = redis_client
+        self._transport = transport or get_settings().RUNTIME_TAIL_TRANSPORT
 
     def _redis_client(self):
         if self._redis is not None:
@@ -36,56 +93,143 @@ class RuntimeTailEventBus:
         redis_client = self._redis_client()
         data = dict(payload)
         data.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
-        await redis_client.publish(_channel(stream_key), json.dumps(data, ensure_ascii=False, default=str))
+        encoded = json.dumps(data, ensure_ascii=False, default=str)
+        if self._transport == "streams":
+            settings = get_settings()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.xadd(
+                _stream(stream_key), {"data": encoded},
+                maxlen=settings.RUNTIME_TAIL_STREAM_MAXLEN, approximate=True,
+            )
+            pipe.expire(_stream(stream_key), settings.RUNTIME_TAIL_STREAM_TTL_SECONDS)
+            await pipe.execute()
+        else:
+            await redis_client.publish(_channel(stream_key), encoded)
         if self._redis is None:
             await redis_client.aclose()
 
 
 class RuntimeTailSubscriber:
-    """Subscriber for runtime tail events of a single stream key."""
+    """Subscriber for runtime tail events of a single stream key.
+
+    With pub/sub it rides the process-wide hub, so an open stream costs a
+    buffered queue rather than a Redis connection. With streams,
+    ``subscribe()`` pins the read position (the run's start when
+    ``from_start``, otherwise its current end) and ``listen()`` reads from
+    there only as fast as it is iterated; after ``stop_at_end()`` it returns
+    once it has read everything already in the stream.
+    """
 
-    def __init__(self, *, stream_key: str, redis_client: Optional[Any] = None) -> None:
+    def __init__(
+        self,
+        *,
+        stream_key: str,
+        hub: Optional[RedisPubSubHub] = None,
+        redis_client: Optional[Any] = None,
+        transport: Optional[str] = None,
+        from_start: bool = False,
+    ) -> None:
         self._stream_key = stream_key
+        self._hub = hub
         self._redis = redis_client
-        self._owned_client = None
-        self._pubsub = None
+        self._transport = transport or get_settings().RUNTIME_TAIL_TRANSPORT
+        self._from_start = from_start
+        self._subscription: Optional[PubSubSubscription] = None
+        self._cursor: Optional[str] = None
+        self._stop_at_end = False
+
+    @property
+    def is_stream(self) -> bool:
+        return self._transport == "streams"
+
+    @property
+    def consumer_buffer(self) -> int:
+        """``asyncio.Queue`` maxsize for a local consumer (0 = unbounded)."""
+        return get_settings().RUNTIME_TAIL_CONSUMER_BUFFER if self.is_stream else 0
+
+    def stop_at_end(self) -> None:
+        """Let a streams ``listen()`` finish at the current end of the stream."""
+        self._stop_at_end = True
+
+    def _redis_client(self):
+        if self._redis is None:
+            self._redis = get_stream_reader()
+        return self._redis
 
     async def subscribe(self) -> None:
-        redis_client = self._redis
-        if redis_client is None:
-            settings = get_settings()
-            redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-            self._owned_client = redis_client
-        self._pubsub = redis_client.pubsub()
-        await self._pubsub.subscribe(_channel(self._stream_key))
+        if self.is_stream:
+            self._cursor = "0-0"
+            if not self._from_start:
+                latest = await self._redis_client().xrevrange(_stream(self._stream_key), count=1)
+                if latest:
+                    self._cursor = latest[0][0]
+            return
+        hub = self._hub or get_pubsub_hub()
+        self._subscription = await hub.subscribe(_channel(self._stream_key))
 
     async def listen(self) -> AsyncGenerator[dict[str, Any], None]:
-        if self._pubsub is None:
+        if self.is_stream:
+            async for message in self._listen_stream():
+                yield message
+            return
+        if self._subscription is None:
             await self.subscribe()
-        assert self._pubsub is not None
-        async for message in self._pubsub.listen():
-            if message.get("type") != "message":
-                continue
+        assert self._subscription is not None
+        async for raw in self._subscription:
+            decoded = _decode(raw)
+            if decoded is not None:
+                yield decoded
+
+    async def _listen_stream(self) -> AsyncGenerator[dict[str, Any], None]:
+        if self._cursor is None:
+            await self.subscribe()
+        settings = get_settings()
+        key = _stream(self._stream_key)
+        failures = 0
+        while self._cursor is not None:
             try:
-                raw = message.get("data")
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8")
-                if not isinstance(raw, str) or not raw:
-                    continue
-                decoded = json.loads(raw)
-                if isinstance(decoded, dict):
-                    yield decoded
+                stop_at_end = self._stop_at_end
+                response = await self._redis_client().xread(
+                    {key: self._cursor},
+                    count=settings.RUNTIME_TAIL_STREAM_READ_COUNT,
+                    block=None if stop_at_end else settings.RUNTIME_TAIL_STREAM_BLOCK_MS,
+                )
             except Exception as exc:  # noqa: BLE001
-                logger.warning("RuntimeTailSubscriber decode failed: %s", exc)
+                delay = _STREAM_RETRY_BACKOFF_S[min(failures, len(_STREAM_RETRY_BACKOFF_S) - 1)]
+                failures += 1
+                logger.warning("RuntimeTailSubscriber stream read failed (retry in %.1fs): %s", delay, exc)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            if stop_at_end and not any(entries for _name, entries in response or []):
+                return
+            for _name, entries in response or []:
+                for entry_id, fields in entries:
+                    if self._cursor is None:
+                        return
+                    self._cursor = entry_id
+                    decoded = _decode((fields or {}).get("data"))
+                    if decoded is not None:
+                        yield decoded
 
     async def unsubscribe(self) -> None:
-        if self._pubsub is not None:
-            await self._pubsub.unsubscribe(_channel(self._stream_key))
-            await self._pubsub.close()
-            self._pubsub = None
-        if self._owned_client is not None:
-            await self._owned_client.aclose()
-            self._owned_client = None
+        self._cursor = None
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
+
+
+def _decode(raw: Any) -> Optional[dict[str, Any]]:
+    try:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if not isinstance(raw, str) or not raw:
+            return None
+        decoded = json.loads(raw)
+        return decoded if isinstance(decoded, dict) else None
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("RuntimeTailSubscriber decode failed: %s", exc)
+        return None
 
 
 class RuntimeRunControlBus:
@@ -103,32 +247,25 @@ class RuntimeRunControlBus:
 class RuntimeRunControlSubscriber:
     """Wait for a cancellation signal without coupling execution to an SSE client."""
 
-    def __init__(self, *, run_id: str) -> None:
+    def __init__(self, *, run_id: str, hub: Optional[RedisPubSubHub] = None) -> None:
         self._run_id = run_id
-        self._redis = None
-        self._pubsub = None
+        self._hub = hub
+        self._subscription: Optional[PubSubSubscription] = None
 
     async def subscribe(self) -> None:
-        settings = get_settings()
-        self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-        self._pubsub = self._redis.pubsub()
-        await self._pubsub.subscribe(_control_channel(self._run_id))
+        hub = self._hub or get_pubsub_hub()
+        # Only the first "cancel" matters; a tiny buffer is enough.
+        self._subscription = await hub.subscribe(_control_channel(self._run_id), maxsize=8)
 
     async def wait_for_cancel(self) -> None:
-        if self._pubsub is None:
+        if self._subscription is None:
             await self.subscribe()
-        assert self._pubsub is not None
-        async for message in self._pubsub.listen():
-            if message.get("type") != "message":
-                continue
-            if str(message.get("data") or "") == "cancel":
+        assert self._subscription is not None
+        async for data in self._subscription:
+            if str(data or "") == "cancel":
                 return
 
     async def unsubscribe(self) -> None:
-        if self._pubsub is not None:
-            await self._pubsub.unsubscribe(_control_channel(self._run_id))
-            await self._pubsub.close()
-            self._pubsub = None
-        if self._redis is not None:
-            await self._redis.aclose()
-            self._redis = None
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
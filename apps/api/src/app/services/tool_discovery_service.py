@@ -9,6 +9,10 @@ ToolDiscoveryService — сканирование и кеширование ин
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
@@ -20,6 +24,7 @@ from sqlalchemy.orm import selectinload
 
 from app.agents.mcp_discovery import parse_discovered_operation
 from app.agents.registry import ToolRegistry
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.models.discovered_tool import DiscoveredTool
 from app.models.collection import Collection
@@ -55,6 +60,9 @@ logger = get_logger(__name__)
 # Keep a stable 8-byte key within bigint range.
 _RESCAN_ADVISORY_LOCK_KEY: int = 0x746F6F6C7363616E  # "toolscan"
 
+# Rows per bulk INSERT ... ON CONFLICT statement (11 bind params per row).
+_UPSERT_BATCH_SIZE = 500
+
 
 class ToolDiscoveryService:
     """Scan local registry + MCP providers → upsert into discovered_tools."""
@@ -62,6 +70,11 @@ class ToolDiscoveryService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self._last_mcp_scan_failures: List[Dict[str, str]] = []
+        self._last_mcp_provider_counts: Dict[str, int] = {}
+        self._last_mcp_unchanged = 0
+        settings = get_settings()
+        self._mcp_scan_concurrency = max(1, int(settings.TOOL_DISCOVERY_MAX_CONCURRENCY))
+        self._mcp_provider_timeout_s = float(settings.TOOL_DISCOVERY_PROVIDER_TIMEOUT_S)
 
     async def rescan_all(self) -> Dict[str, Any]:
         """
@@ -75,16 +88,24 @@ class ToolDiscoveryService:
         *,
         include_local: bool,
         provider_instance_id: Optional[UUID],
+        provider_instance_ids: Optional[Sequence[UUID]] = None,
     ) -> Dict[str, Any]:
         """
         Scoped rescan:
         - include_local=True -> local registry scan
         - provider_instance_id=<uuid> -> scan only one MCP provider
+        - provider_instance_ids=[...] -> scan exactly these MCP providers
         - provider_instance_id=None -> scan all active MCP providers
 
         Uses pg_try_advisory_lock to prevent concurrent rescans from racing
         against each other and against runtime tool resolution.
         """
+        if provider_instance_id is not None:
+            scope = "provider"
+        elif provider_instance_ids is not None:
+            scope = "providers"
+        else:
+            scope = "all"
         lock_result = await self.session.execute(
             sa_text("SELECT pg_try_advisory_xact_lock(:key)"),
             {"key": _RESCAN_ADVISORY_LOCK_KEY},
@@ -93,7 +114,7 @@ class ToolDiscoveryService:
         if not lock_acquired:
             logger.info("tool_discovery_rescan_skipped_lock_held")
             return {
-                "scope": "provider" if provider_instance_id else "all",
+                "scope": scope,
                 "provider_instance_id": str(provider_instance_id) if provider_instance_id else None,
                 "skipped": True,
                 "reason": "concurrent_rescan_in_progress",
@@ -109,23 +130,26 @@ class ToolDiscoveryService:
         mcp_count, scanned_provider_ids = await self._scan_mcp_providers(
             now,
             provider_instance_id=provider_instance_id,
+            provider_instance_ids=provider_instance_ids,
         )
 
         stale = await self._mark_stale(
             now,
             include_local=include_local,
-            full_mcp_scan=provider_instance_id is None,
+            full_mcp_scan=provider_instance_id is None and provider_instance_ids is None,
             scanned_provider_ids=scanned_provider_ids,
         )
         deleted_inactive = await self._delete_inactive_tools()
 
         await self.session.flush()
         return {
-            "scope": "provider" if provider_instance_id else "all",
+            "scope": scope,
             "provider_instance_id": str(provider_instance_id) if provider_instance_id else None,
             "local_upserted": local_count,
             "system_upserted": system_count,
             "mcp_upserted": mcp_count,
+            "mcp_unchanged": self._last_mcp_unchanged,
+            "mcp_provider_counts": dict(self._last_mcp_provider_counts),
             "mcp_scanned_providers": [str(pid) for pid in scanned_provider_ids],
             "mcp_failed_providers": list(self._last_mcp_scan_failures),
             "marked_inactive": stale,
@@ -339,54 +363,115 @@ class ToolDiscoveryService:
         now: datetime,
         *,
         provider_instance_id: Optional[UUID],
+        provider_instance_ids: Optional[Sequence[UUID]] = None,
     ) -> Tuple[int, List[UUID]]:
-        """Scan MCP providers and upsert their tools."""
-        providers = await self._load_mcp_providers(provider_instance_id)
+        """Scan MCP providers concurrently and bulk-upsert their tools.
+
+        Network fetches run in parallel (bounded by TOOL_DISCOVERY_MAX_CONCURRENCY,
+        each capped by TOOL_DISCOVERY_PROVIDER_TIMEOUT_S), so a dead provider
+        costs one timeout instead of delaying every provider after it.  The
+        session is not safe for concurrent use, so DB work runs afterwards.
+        """
+        if provider_instance_ids is not None:
+            providers = await self._load_mcp_providers_by_ids(provider_instance_ids)
+        else:
+            providers = await self._load_mcp_providers(provider_instance_id)
+        providers = [provider for provider in providers if provider.url]
+
+        fetched = await self._fetch_mcp_tools_concurrently(providers)
 
-        total = 0
-        scanned_provider_ids: List[UUID] = []
+        scanned: List[Tuple[ToolInstance, List[Dict[str, Any]]]] = []
         failed_providers: List[Dict[str, str]] = []
-        for provider in providers:
-            if not provider.url:
-                continue
-            try:
-                tools = await self._fetch_mcp_tools(provider.url)
-                scanned_provider_ids.append(provider.id)
-                mcp_domains = await self._resolve_mcp_domains(provider)
-                for tool in tools:
-                    tool_name = tool.get("name", "")
-                    if not tool_name:
-                        continue
-
-                    discovered = parse_discovered_operation(
-                        tool_name=tool_name,
-                        description=tool.get("description", ""),
-                        input_schema=tool.get("inputSchema"),
-                        output_schema=tool.get("outputSchema"),
+        for provider, tools, error in fetched:
+            if error is None:
+                try:
+                    mcp_domains = await self._resolve_mcp_domains(provider)
+                    scanned.append((provider, self._build_mcp_rows(provider, tools or [], mcp_domains)))
+                    continue
+                except Exception as exc:
+                    logger.exception("MCP scan failed for provider %s (%s)", provider.slug, provider.url)
+                    error = exc
+            failed_providers.append(
+                {
+                    "provider_instance_id": str(provider.id),
+                    "provider_slug": str(provider.slug),
+                    "error": str(error),
+                }
+            )
+
+        rows = [row for _, provider_rows in scanned for row in provider_rows]
+        self._last_mcp_unchanged = await self._write_mcp_rows(rows, now) if rows else 0
+        self._last_mcp_scan_failures = failed_providers
+        self._last_mcp_provider_counts = {
+            str(provider.id): len(provider_rows) for provider, provider_rows in scanned
+        }
+        return len(rows), [provider.id for provider, _ in scanned]
+
+    async def _fetch_mcp_tools_concurrently(
+        self,
+        providers: Sequence[ToolInstance],
+    ) -> List[Tuple[ToolInstance, Optional[List[Dict[str, Any]]], Optional[BaseException]]]:
+        semaphore = asyncio.Semaphore(self._mcp_scan_concurrency)
+
+        async def _fetch(provider: ToolInstance):
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    tools = await asyncio.wait_for(
+                        self._fetch_mcp_tools(provider.url),
+                        timeout=self._mcp_provider_timeout_s,
                     )
-                    await self._upsert(
-                        slug=discovered.name,
-                        name=discovered.name,
-                        description=discovered.description,
-                        source="mcp",
-                        provider_instance_id=provider.id,
-                        domains=mcp_domains,
-                        input_schema=discovered.input_schema,
-                        output_schema=discovered.output_schema,
-                        now=now,
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "MCP scan timed out for provider %s (%s) after %.0fs",
+                        provider.slug, provider.url, self._mcp_provider_timeout_s,
                     )
-                    total += 1
-            except Exception as e:
-                logger.exception("MCP scan failed for provider %s (%s)", provider.slug, provider.url)
-                failed_providers.append(
-                    {
-                        "provider_instance_id": str(provider.id),
-                        "provider_slug": str(provider.slug),
-                        "error": str(e),
-                    }
+                    return provider, None, TimeoutError(
+                        f"tools/list timed out after {self._mcp_provider_timeout_s:.0f}s"
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "MCP scan failed for provider %s (%s): %s",
+                        provider.slug, provider.url, exc, exc_info=True,
+                    )
+                    return provider, None, exc
+                logger.debug(
+                    "MCP scan fetched %d tools from %s in %dms",
+                    len(tools), provider.slug, int((time.monotonic() - started) * 1000),
                 )
-        self._last_mcp_scan_failures = failed_providers
-        return total, scanned_provider_ids
+                return provider, tools, None
+
+        return list(await asyncio.gather(*(_fetch(provider) for provider in providers)))
+
+    @staticmethod
+    def _build_mcp_rows(
+        provider: ToolInstance,
+        tools: List[Dict[str, Any]],
+        domains: List[str],
+    ) -> List[Dict[str, Any]]:
+        """Parse a provider's tools into discovered_tools rows (last duplicate wins)."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for tool in tools:
+            tool_name = tool.get("name", "")
+            if not tool_name:
+                continue
+            discovered = parse_discovered_operation(
+                tool_name=tool_name,
+                description=tool.get("description", ""),
+                input_schema=tool.get("inputSchema"),
+                output_schema=tool.get("outputSchema"),
+            )
+            rows[discovered.name] = {
+                "slug": discovered.name,
+                "name": discovered.name,
+                "description": discovered.description,
+                "source": "mcp",
+                "provider_instance_id": provider.id,
+                "domains": list(domains),
+                "input_schema": discovered.input_schema,
+                "output_schema": discovered.output_schema,
+            }
+        return list(rows.values())
 
     async def _load_mcp_providers(self, provider_instance_id: Optional[UUID]) -> Sequence[ToolInstance]:
         if provider_instance_id is None:
@@ -403,6 +488,17 @@ class ToolDiscoveryService:
         provider = await self._get_mcp_provider(provider_instance_id)
         return [provider]
 
+    async def _load_mcp_providers_by_ids(self, provider_instance_ids: Sequence[UUID]) -> Sequence[ToolInstance]:
+        if not provider_instance_ids:
+            return []
+        stmt = select(ToolInstance).where(
+            ToolInstance.id.in_(list(provider_instance_ids)),
+            ToolInstance.is_active == True,  # noqa: E712
+        )
+        result = await self.session.execute(stmt)
+        providers = list(result.scalars().all())
+        return [provider for provider in providers if self._is_discovery_mcp_provider(provider)]
+
     async def _get_mcp_provider(self, provider_instance_id: UUID) -> ToolInstance:
         stmt = select(ToolInstance).where(ToolInstance.id == provider_instance_id)
         result = await self.session.execute(stmt)
@@ -582,6 +678,95 @@ class ToolDiscoveryService:
             )
         await self.session.execute(stmt)
 
+    @staticmethod
+    def _tool_fingerprint(row: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [row.get("name"), row.get("description"), list(row.get("domains") or []),
+             row.get("input_schema"), row.get("output_schema")],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _load_existing_mcp_fingerprints(
+        self,
+        provider_ids: Sequence[UUID],
+    ) -> Dict[Tuple[UUID, str], Tuple[UUID, str, bool]]:
+        """(provider_id, slug) -> (row id, content fingerprint, is_active)."""
+        stmt = select(
+            DiscoveredTool.id,
+            DiscoveredTool.provider_instance_id,
+            DiscoveredTool.slug,
+            DiscoveredTool.name,
+            DiscoveredTool.description,
+            DiscoveredTool.domains,
+            DiscoveredTool.input_schema,
+            DiscoveredTool.output_schema,
+            DiscoveredTool.is_active,
+        ).where(DiscoveredTool.provider_instance_id.in_(list(provider_ids)))
+        result = await self.session.execute(stmt)
+        existing: Dict[Tuple[UUID, str], Tuple[UUID, str, bool]] = {}
+        for row in result.mappings().all():
+            existing[(row["provider_instance_id"], row["slug"])] = (
+                row["id"],
+                self._tool_fingerprint(row),
+                bool(row["is_active"]),
+            )
+        return existing
+
+    async def _write_mcp_rows(self, rows: List[Dict[str, Any]], now: datetime) -> int:
+        """Diff rows against discovered_tools and apply them in bulk.
+
+        Unchanged active tools only get ``last_seen_at`` bumped (one UPDATE);
+        new or changed tools go through batched INSERT ... ON CONFLICT.
+        Returns the number of unchanged tools.
+        """
+        provider_ids = list({row["provider_instance_id"] for row in rows})
+        existing = await self._load_existing_mcp_fingerprints(provider_ids)
+
+        unchanged_ids: List[UUID] = []
+        changed: List[Dict[str, Any]] = []
+        for row in rows:
+            current = existing.get((row["provider_instance_id"], row["slug"]))
+            if current is not None and current[2] and current[1] == self._tool_fingerprint(row):
+                unchanged_ids.append(current[0])
+            else:
+                changed.append(row)
+
+        if unchanged_ids:
+            await self.session.execute(
+                update(DiscoveredTool)
+                .where(DiscoveredTool.id.in_(unchanged_ids))
+                .values(last_seen_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        for start in range(0, len(changed), _UPSERT_BATCH_SIZE):
+            await self.session.execute(
+                self._bulk_upsert_statement(changed[start:start + _UPSERT_BATCH_SIZE], now)
+            )
+        return len(unchanged_ids)
+
+    @staticmethod
+    def _bulk_upsert_statement(rows: List[Dict[str, Any]], now: datetime):
+        """INSERT ... ON CONFLICT for provider-bound rows (uq_discovered_slug_provider)."""
+        values = [{**row, "is_active": True, "last_seen_at": now, "updated_at": now} for row in rows]
+        stmt = pg_insert(DiscoveredTool).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=["slug", "provider_instance_id"],
+            index_where=DiscoveredTool.provider_instance_id.isnot(None),
+            set_={
+                "name": stmt.excluded.name,
+                "description": stmt.excluded.description,
+                "domains": stmt.excluded.domains,
+                "input_schema": stmt.excluded.input_schema,
+                "output_schema": stmt.excluded.output_schema,
+                "is_active": True,
+                "last_seen_at": now,
+                "updated_at": now,
+            },
+        )
+
     async def _mark_stale(
         self,
         scan_time: datetime,
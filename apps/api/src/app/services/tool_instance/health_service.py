@@ -4,7 +4,7 @@ from urllib.parse import quote, urlparse
 
 from app.core.http.tls import outbound_http_verify
 from app.services.credential_service import CredentialService
-from app.services.mcp_jsonrpc_client import mcp_call_tool, mcp_initialize, mcp_result_error_message
+from app.services.mcp_jsonrpc_client import mcp_call_tool, mcp_initialize, mcp_ping, mcp_result_error_message
 from app.services.tool_instance.types import HealthCheckResult
 
 
@@ -85,11 +85,11 @@ class ToolInstanceHealthService:
                 message="MCP connector has empty URL",
             )
         try:
-            session_id = await mcp_initialize(provider_url=provider_url, timeout_s=10)
+            probe = await mcp_ping(provider_url=provider_url, timeout_s=10)
             return HealthCheckResult(
                 status="healthy",
                 message="MCP session initialized",
-                details={"mcp_session_id_prefix": session_id[:8]},
+                details={"mcp_session_id_prefix": probe["session_id"][:8]},
             )
         except Exception as exc:
             return HealthCheckResult(
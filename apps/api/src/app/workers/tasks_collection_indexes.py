@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from celery import Task
+
+from app.celery_app import app as celery_app
+from app.core.cache import get_cache
+from app.core.logging import get_logger
+from app.workers.session_factory import get_worker_session
+
+logger = get_logger(__name__)
+
+INDEX_BUILD_TTL_SECONDS = 24 * 60 * 60
+INDEX_BUILD_META_PREFIX = "collection_index_build:"
+ACTIVE_INDEX_BUILD_STATUSES = frozenset({"pending", "running"})
+
+
+def index_build_meta_key(collection_id: str, name: str) -> str:
+    return f"{INDEX_BUILD_META_PREFIX}{collection_id}:{name}"
+
+
+async def set_index_build_meta(collection_id: str, name: str, **fields: Any) -> Dict[str, Any]:
+    cache = await get_cache()
+    key = index_build_meta_key(collection_id, name)
+    meta = {
+        **(await cache.get(key) or {}),
+        **fields,
+        "name": name,
+        "collection_id": collection_id,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    await cache.set(key, meta, ttl=INDEX_BUILD_TTL_SECONDS)
+    return meta
+
+
+async def get_index_build_meta(collection_id: str, name: str) -> Optional[Dict[str, Any]]:
+    cache = await get_cache()
+    return await cache.get(index_build_meta_key(collection_id, name))
+
+
+@celery_app.task(
+    queue="maintenance.default",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=0,
+)
+def build_collection_index(self: Task, *, collection_id: str, name: str) -> Dict[str, Any]:
+    """Run ``CREATE INDEX CONCURRENTLY`` for an advisor proposal off the request path."""
+
+    async def _run() -> Dict[str, Any]:
+        from app.services.collection.index_advisor import CollectionIndexAdvisor
+        from app.services.collection_service import CollectionService
+
+        await set_index_build_meta(collection_id, name, status="running", error=None)
+        started = time.monotonic()
+        try:
+            async with get_worker_session() as session:
+                collection = await CollectionService(session).get_by_id(uuid.UUID(collection_id))
+                if not collection or not collection.is_local or not collection.table_name:
+                    await set_index_build_meta(collection_id, name, status="failed", error="collection_not_found")
+                    return {"status": "failed", "error": "collection_not_found"}
+                proposal = await CollectionIndexAdvisor(session).apply(collection, name)
+        except BaseException as exc:
+            logger.error(
+                "collection_index_build_failed",
+                extra={"collection_id": collection_id, "index": name, "error": repr(exc)},
+            )
+            await set_index_build_meta(collection_id, name, status="failed", error=str(exc) or repr(exc))
+            raise
+        if proposal is None:
+            await set_index_build_meta(collection_id, name, status="failed", error="proposal_not_found")
+            return {"status": "failed", "error": "proposal_not_found"}
+        duration_s = round(time.monotonic() - started, 3)
+        await set_index_build_meta(collection_id, name, status="ready", proposal=proposal, duration_s=duration_s)
+        return {"status": "ready", "index": name, "duration_s": duration_s}
+
+    return asyncio.run(_run())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+from sqlalchemy import select
+
+from app.celery_app import app as celery_app
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.collection import Collection, CollectionType
+from app.services.collection.rollup_service import CollectionRollupService, rollup_spec_for
+from app.workers.session_factory import get_worker_session
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(
+    queue="maintenance.default",
+    bind=True,
+    max_retries=1,
+)
+def refresh_collection_rollups(self) -> Dict[str, Any]:
+    """Build missing collection rollups, rebuild old ones, drop stale tables."""
+    max_age_s = float(get_settings().COLLECTION_ROLLUP_REBUILD_HOURS) * 3600.0
+
+    async def _run() -> Dict[str, Any]:
+        async with get_worker_session() as session:
+            collections = (
+                await session.execute(
+                    select(Collection).where(
+                        Collection.collection_type == CollectionType.TABLE.value,
+                        Collection.is_active.is_(True),
+                        Collection.table_name.is_not(None),
+                    )
+                )
+            ).scalars().all()
+
+            # Rollbacks expire ORM instances; read everything needed up front.
+            targets = [
+                (collection.slug, collection.table_name, rollup_spec_for(collection))
+                for collection in collections
+            ]
+
+            rollups = CollectionRollupService(session)
+            counts: Dict[str, int] = {}
+            failed = 0
+            for slug, base_table, spec in targets:
+                try:
+                    # One transaction per collection: a rebuild holds SHARE on
+                    # the base table, so keep it as short as possible.
+                    result = await rollups.refresh(base_table, spec, max_age_s=max_age_s)
+                    await session.commit()
+                except Exception as exc:
+                    await session.rollback()
+                    failed += 1
+                    logger.warning(
+                        "collection_rollup_refresh_failed",
+                        extra={"slug": slug, "error": str(exc)},
+                    )
+                    continue
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                if result["status"] in {"built", "rebuilt"}:
+                    logger.info(
+                        "collection_rollup_refreshed",
+                        extra={
+                            "slug": slug,
+                            "status": result["status"],
+                            "table": result["table"],
+                            "groups": result["groups"],
+                        },
+                    )
+
+            return {"scanned": len(targets), "failed": failed, **counts}
+
+    return asyncio.run(_run())
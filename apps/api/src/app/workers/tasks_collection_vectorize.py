@@ -237,6 +237,11 @@ def vectorize_collection_rows(
             build_model_scoped_qdrant_collections,
             get_vector_config_model_aliases,
         )
+        from app.services.collection.index_advisor import (
+            VECTOR_PENDING_PREDICATE,
+            QueryShape,
+            record_shape_now,
+        )
         from app.workers.session_factory import get_worker_session
 
         async with get_worker_session() as session:
@@ -292,6 +297,10 @@ def vectorize_collection_rows(
                 else:
                     params = {}
                     where = "_vector_status = 'pending'"
+                    await record_shape_now(
+                        table_name,
+                        QueryShape(source="vectorize", predicate=VECTOR_PENDING_PREDICATE),
+                    )
 
                 cols = ", ".join(["id::text AS id"] + vector_field_names)
                 q = sa_text(
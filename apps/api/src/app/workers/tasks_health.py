@@ -411,34 +411,39 @@ def rescan_discovery(self: Task) -> Dict[str, Any]:
                 result = await session.execute(stmt)
                 mcp_instances = result.scalars().all()
                 
+                # One scoped rescan: providers are fetched concurrently, so the
+                # task takes as long as the slowest provider, not the sum.
+                scan_result = await discovery_service.rescan(
+                    include_local=False,
+                    provider_instance_id=None,
+                    provider_instance_ids=[instance.id for instance in mcp_instances],
+                )
+                if scan_result.get("skipped"):
+                    logger.info(f"Discovery rescan skipped: {scan_result.get('reason')}")
+                    return {"status": "skipped", "reason": scan_result.get("reason")}
+                provider_counts = scan_result.get("mcp_provider_counts") or {}
+                failures = {
+                    item["provider_instance_id"]: item.get("error")
+                    for item in scan_result.get("mcp_failed_providers") or []
+                }
+
                 rescan_results = []
-                
                 for instance in mcp_instances:
-                    try:
-                        # Rescan tools for this MCP provider (local tools are excluded here)
-                        scan_result = await discovery_service.rescan(
-                            include_local=False,
-                            provider_instance_id=instance.id,
-                        )
-
+                    instance_id = str(instance.id)
+                    if instance_id in provider_counts:
+                        tools_found = provider_counts[instance_id]
                         rescan_results.append({
-                            "instance_id": str(instance.id),
+                            "instance_id": instance_id,
                             "slug": instance.slug,
-                            "tools_found": scan_result.get("mcp_upserted", 0),
-                            "tools_updated": scan_result.get("mcp_upserted", 0),
-                            "tools_removed": scan_result.get("marked_inactive", 0),
-                            "scan_meta": scan_result,
+                            "tools_found": tools_found,
+                            "tools_updated": tools_found,
                             "success": True
                         })
-                        
-                        logger.info(f"Discovery rescan for {instance.slug}: {scan_result}")
-                        
-                    except Exception as e:
-                        logger.error(f"Discovery rescan failed for {instance.slug}: {e}")
+                    else:
                         rescan_results.append({
-                            "instance_id": str(instance.id),
+                            "instance_id": instance_id,
                             "slug": instance.slug,
-                            "error": str(e),
+                            "error": failures.get(instance_id) or "provider skipped",
                             "success": False
                         })
                 
@@ -451,7 +456,8 @@ def rescan_discovery(self: Task) -> Dict[str, Any]:
                     "failed_scans": sum(1 for r in rescan_results if not r["success"]),
                     "total_tools_found": sum(r.get("tools_found", 0) for r in rescan_results),
                     "total_tools_updated": sum(r.get("tools_updated", 0) for r in rescan_results),
-                    "total_tools_removed": sum(r.get("tools_removed", 0) for r in rescan_results),
+                    "total_tools_unchanged": scan_result.get("mcp_unchanged", 0),
+                    "total_tools_removed": scan_result.get("marked_inactive", 0),
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                     "details": rescan_results
                 }
@@ -424,6 +424,11 @@ def finalize_memory_task(self, payload_dict: Dict[str, Any]) -> Dict[str, Any]:
                 # close unless this task owns an explicit commit boundary.
                 # Persist the completed writeback before emitting diagnostics.
                 await checkpoint_commit(session, "finalize_memory", "facts_writeback")
+                # Fact vector index writes run after that commit; finish them
+                # before asyncio.run() tears the loop down.
+                from app.runtime.memory.fact_index import wait_for_index_writes
+
+                await wait_for_index_writes()
                 diagnostics = turn_memory.memory_diagnostics or {}
                 write_status = diagnostics.get("memory_write_status", {})
                 results = [
@@ -594,3 +599,52 @@ def finalize_memory_inline_task(self, payload_dict: Dict[str, Any]) -> Dict[str,
     Same logic as finalize_memory but without queue routing.
     """
     return finalize_memory_task.run(self, payload_dict)
+
+
+@shared_task(
+    name="app.workers.tasks_memory.backfill_fact_vector_index",
+    bind=True,
+    max_retries=0,
+    queue="memory",
+)
+def backfill_fact_vector_index_task(self, batch_size: int = 200, after_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Embed active confirmed facts written before the fact vector index existed.
+
+    Points are keyed by fact id, so re-running is safe; ``after_id`` resumes
+    from the ``last_id`` of an interrupted run.
+    """
+
+    async def _backfill() -> Dict[str, Any]:
+        from sqlalchemy import select
+
+        from app.models.memory import Fact, FactStatus
+        from app.runtime.memory.fact_index import FactVectorIndex
+        from app.runtime.memory.fact_reconciler import FactReconciler
+
+        indexed = 0
+        cursor = UUID(after_id) if after_id else None
+        async with get_worker_session() as session:
+            vector_index = FactVectorIndex.from_settings(session)
+            if vector_index is None:
+                return {"status": "skipped", "reason": "fact_vector_index_disabled"}
+            reconciler = FactReconciler(session, vector_index=vector_index)
+            while True:
+                stmt = select(Fact).where(
+                    Fact.superseded_by.is_(None),
+                    Fact.status == FactStatus.CONFIRMED.value,
+                ).order_by(Fact.id).limit(batch_size)
+                if cursor is not None:
+                    stmt = stmt.where(Fact.id > cursor)
+                rows = list((await session.execute(stmt)).scalars().all())
+                if not rows:
+                    break
+                # Read-only pass: there is no commit to wait for.
+                await reconciler.sync_vector_index(confirmed=rows, after_commit=False)
+                indexed += len(rows)
+                cursor = rows[-1].id
+                session.expunge_all()
+        logger.info("Fact vector index backfill indexed %d facts", indexed)
+        return {"status": "ok", "indexed": indexed, "last_id": str(cursor) if cursor else None}
+
+    return asyncio.run(_backfill())
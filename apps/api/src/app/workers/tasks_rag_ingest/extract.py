@@ -17,6 +17,7 @@ from app.services.document_artifacts import (
 )
 from app.services.extractors import ExtractorRegistry
 from app.services.document_extraction_service import DocumentExtractionService, ExtractionRequest
+from app.services.extraction_pool import get_extraction_pool
 from app.storage.paths import get_extracted_path, calculate_text_checksum
 from app.workers.tasks_rag_ingest.stage_context import IngestStageContext, run_stage
 from app.workers.tasks_rag_ingest.stage_results import ExtractResult
@@ -139,7 +140,7 @@ def extract_document(self: Task, source_id: str, tenant_id: str) -> Dict[str, An
                 ext,
                 getattr(extractor, "kind", type(extractor).__name__),
             )
-            parser_result = extractor.extract(file_content, filename)
+            parser_result = await get_extraction_pool().extract_with(extractor, file_content, filename)
             extracted_text = parser_result.text.strip()
             extractor_kind = parser_result.kind
             extraction_warnings = parser_result.warnings
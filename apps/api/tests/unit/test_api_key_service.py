@@ -2,6 +2,7 @@
 Unit tests for APIKeyService
 """
 import pytest
+from collections import OrderedDict
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 from datetime import datetime, timezone, timedelta
@@ -266,6 +267,35 @@ class TestRevokeKey(TestAPIKeyService):
         
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_revoke_key_invalidates_cache_on_commit(self, api_key_service, mock_session):
+        """Cache invalidation is deferred to the caller's commit"""
+        key_id = uuid4()
+        mock_result = MagicMock()
+        mock_result.rowcount = 1
+        mock_session.execute.return_value = mock_result
+        cache = MagicMock(invalidate=AsyncMock(), invalidate_on_commit=AsyncMock())
+        
+        with patch.object(APIKeyService, "_cache", cache):
+            await api_key_service.revoke_key(key_id)
+        
+        cache.invalidate_on_commit.assert_awaited_once_with(mock_session)
+        cache.invalidate.assert_not_awaited()
+
+
+class TestLastTouched(TestAPIKeyService):
+    """Test the per-process last_used_at throttle"""
+
+    def test_remembered_touches_are_bounded(self):
+        """Oldest keys are forgotten beyond the bound"""
+        with patch.object(APIKeyService, "_last_touched", OrderedDict()), \
+                patch("app.services.api_key_service.LAST_TOUCHED_MAX_KEYS", 2):
+            first, second, third = uuid4(), uuid4(), uuid4()
+            for index, key_id in enumerate((first, second, third)):
+                APIKeyService._remember_touch(key_id, float(index))
+
+            assert list(APIKeyService._last_touched) == [second, third]
+
 
 class TestDeleteKey(TestAPIKeyService):
     """Test deleting API keys"""
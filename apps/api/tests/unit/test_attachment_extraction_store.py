@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+
+from app.services.attachment_extraction_store import (
+    AttachmentExtractionStore,
+    build_page_index,
+)
+
+
+class _MemoryStorage:
+    def __init__(self, objects: Optional[dict[str, bytes]] = None) -> None:
+        self.objects = dict(objects or {})
+        self.full_reads: list[str] = []
+        self.range_reads: list[tuple[str, int, Optional[int]]] = []
+
+    async def get_object(self, bucket: str, key: str) -> Optional[bytes]:
+        self.full_reads.append(key)
+        return self.objects.get(key)
+
+    async def get_object_range(self, bucket: str, key: str, start: int = 0, end: Optional[int] = None):
+        self.range_reads.append((key, start, end))
+        data = self.objects.get(key)
+        if data is None:
+            return None
+        return data[start:] if end is None else data[start:end + 1]
+
+    async def upload_content_sync(self, bucket, key, content, content_type="", metadata=None) -> bool:
+        self.objects[key] = content
+        return True
+
+
+def _load(store: AttachmentExtractionStore, key: str, *, max_chars: int = 100):
+    return store.load_snippet(
+        bucket="chat",
+        storage_key=key,
+        checksum="abc",
+        file_name=key.rsplit("/", 1)[-1],
+        content_type=None,
+        max_chars=max_chars,
+    )
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_once_and_later_turns_use_ranged_reads():
+    storage = _MemoryStorage({"chats/1/notes.txt": ("привет мир " * 50).encode("utf-8")})
+    store = AttachmentExtractionStore(storage)
+
+    first = await _load(store, "chats/1/notes.txt", max_chars=20)
+    second = await _load(store, "chats/1/notes.txt", max_chars=20)
+
+    assert storage.full_reads == ["chats/1/notes.txt"]
+    assert first.text == second.text
+    assert second.status == "truncated"
+    assert second.text.startswith("привет мир привет ми")
+    text_key = store.text_key("chats/1/notes.txt", "abc")
+    assert (text_key, 0, 79) in storage.range_reads
+
+
+@pytest.mark.asyncio
+async def test_unreadable_and_missing_are_distinguished_without_second_download():
+    storage = _MemoryStorage({"chats/1/blob.bin": b"\x00\x01binary"})
+    store = AttachmentExtractionStore(storage)
+
+    unreadable = await _load(store, "chats/1/blob.bin")
+    again = await _load(store, "chats/1/blob.bin")
+    missing = await _load(store, "chats/1/absent.txt")
+
+    assert unreadable.status == again.status == "unreadable"
+    assert missing.status == "missing"
+    assert storage.full_reads == ["chats/1/blob.bin", "chats/1/absent.txt"]
+
+
+@pytest.mark.asyncio
+async def test_read_snippet_starts_at_requested_page():
+    storage = _MemoryStorage({"chats/1/doc.txt": "first page\fвторая\fthird".encode("utf-8")})
+    store = AttachmentExtractionStore(storage)
+    manifest = await store.ensure(
+        bucket="chat", storage_key="chats/1/doc.txt", checksum="abc",
+        file_name="doc.txt", content_type="text/plain",
+    )
+
+    snippet = await store.read_snippet(
+        bucket="chat", storage_key="chats/1/doc.txt", manifest=manifest, max_chars=6, page=2,
+    )
+
+    assert len(manifest.pages) == 3
+    assert snippet.text.startswith("вторая")
+    assert snippet.truncated is True
+
+
+def test_build_page_index_tracks_char_and_byte_offsets():
+    assert build_page_index("ab\fвг\fd") == [
+        {"char_start": 0, "byte_start": 0},
+        {"char_start": 3, "byte_start": 3},
+        {"char_start": 6, "byte_start": 8},
+    ]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import zlib
+
+import pytest
+
+from app.core.sse import gzip_sse_stream
+from app.services.chat_stream_batcher import ChatStreamBatcher
+
+
+async def _events(*items, pause_after=None, pause_s=0.0):
+    for index, item in enumerate(items):
+        yield item
+        if index == pause_after:
+            await asyncio.sleep(pause_s)
+
+
+def _delta(content):
+    return {"type": "delta", "content": content}
+
+
+async def _collect(batcher, events):
+    return [batch async for batch in batcher.batches(events)]
+
+
+@pytest.mark.asyncio
+async def test_merges_deltas_until_sentence_size_or_control_event():
+    batcher = ChatStreamBatcher(max_bytes=16, max_delay_s=5.0)
+    batches = await _collect(batcher, _events(
+        _delta("Hel"), _delta("lo"), _delta(" world."),
+        _delta("0123456789"), _delta("abcdefgh"),
+        _delta("tail"), {"type": "status", "stage": "x"},
+        _delta("end"),
+    ))
+
+    assert batches == [
+        [_delta("Hello world.")],
+        [_delta("0123456789abcdefgh")],
+        [_delta("tail"), {"type": "status", "stage": "x"}],
+        [_delta("end")],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_buffered_delta_when_upstream_stalls():
+    batcher = ChatStreamBatcher(max_bytes=1024, max_delay_s=0.01, flush_on_sentence=False)
+    batches = await _collect(batcher, _events(_delta("a"), _delta("b"), _delta("c"), pause_after=1, pause_s=0.1))
+
+    assert batches == [[_delta("ab")], [_delta("c")]]
+
+
+@pytest.mark.asyncio
+async def test_disabled_batcher_passes_events_through():
+    batcher = ChatStreamBatcher(max_bytes=0)
+    batches = await _collect(batcher, _events(_delta("a"), _delta("b")))
+
+    assert batches == [[_delta("a")], [_delta("b")]]
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_flushes_each_chunk_decodably():
+    async def _chunks():
+        yield "event: delta\ndata: hi\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    decoder = zlib.decompressobj(31)
+    parts = [decoder.decompress(blob) async for blob in gzip_sse_stream(_chunks())]
+
+    assert parts[0] == b"event: delta\ndata: hi\n\n"
+    assert b"".join(parts) == b"event: delta\ndata: hi\n\nevent: done\ndata: {}\n\n"
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.chat_stream_replay import ChatStreamReplayBuffer, with_event_id
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.counter = 0
+
+    async def delete(self, key):
+        self.streams.pop(key, None)
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.counter += 1
+        entry_id = f"{self.counter}-0"
+        self.streams.setdefault(key, []).append((entry_id, dict(fields)))
+        return entry_id
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def exists(self, key):
+        return int(key in self.streams)
+
+    async def xread(self, streams, count=None, block=None):
+        (key, cursor), = streams.items()
+        after = tuple(map(int, cursor.split("-")))
+        entries = [
+            (entry_id, fields) for entry_id, fields in self.streams.get(key, [])
+            if tuple(map(int, entry_id.split("-"))) > after
+        ][:count]
+        return [[key, entries]] if entries else []
+
+
+def test_with_event_id_tags_last_frame_of_batch():
+    chunk = "event: delta\ndata: a\n\nevent: status\ndata: {}\n\n"
+
+    assert with_event_id(chunk, "7-0") == "event: delta\ndata: a\n\nid: 7-0\nevent: status\ndata: {}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_follow_replays_after_last_event_id_until_done():
+    redis = _Redis()
+    buffer = ChatStreamReplayBuffer(redis, "chat-1")
+    await buffer.reset()
+
+    first = await buffer.record("event: delta\ndata: Hel\n\n")
+    await buffer.record("event: delta\ndata: lo\n\n")
+    await buffer.record("event: done\ndata: [DONE]\n\n", end=True)
+
+    assert first == "id: 1-0\nevent: delta\ndata: Hel\n\n"
+    assert await buffer.exists()
+    replayed = [chunk async for chunk in buffer.follow("1-0")]
+    assert replayed == ["id: 2-0\nevent: delta\ndata: lo\n\n", "id: 3-0\nevent: done\ndata: [DONE]\n\n"]
+    assert len([chunk async for chunk in buffer.follow("not-an-id")]) == 3
+
+
+@pytest.mark.asyncio
+async def test_follow_reports_interruption_when_stream_vanishes():
+    redis = _Redis()
+    buffer = ChatStreamReplayBuffer(redis, "chat-2")
+    await buffer.record("event: delta\ndata: partial\n\n")
+    await redis.delete("chat:sse:chat-2")
+
+    replayed = [chunk async for chunk in buffer.follow(None)]
+
+    assert "stream_interrupted" in replayed[0]
+    assert replayed[-1].startswith("event: done")
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.collection.index_advisor import (
+    VECTOR_PENDING_PREDICATE,
+    CollectionIndexAdvisor,
+    ColumnStats,
+    ExistingIndex,
+    QueryShape,
+    QueryShapeRecorder,
+    shape_from_dsl,
+)
+
+TABLE = "coll_test_orders"
+
+
+class _FakePipeline:
+    def __init__(self, store: dict) -> None:
+        self.store = store
+        self.ops: list[tuple] = []
+
+    def hincrby(self, key, field, amount):
+        self.ops.append(("hincrby", key, field, amount))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    async def execute(self):
+        for op in self.ops:
+            if op[0] == "hincrby":
+                bucket = self.store.setdefault(op[1], {})
+                bucket[op[2]] = bucket.get(op[2], 0) + op[3]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict = {}
+        self.pipelines: list[_FakePipeline] = []
+
+    def pipeline(self, transaction=True):
+        pipe = _FakePipeline(self.store)
+        self.pipelines.append(pipe)
+        return pipe
+
+    async def hgetall(self, key):
+        return {k: str(v) for k, v in self.store.get(key, {}).items()}
+
+
+def test_shape_from_dsl_keeps_only_index_narrowing_conditions():
+    shape = shape_from_dsl(
+        "search",
+        {
+            "status": "paid",
+            "and": [
+                {"field": "region", "op": "in", "value": ["eu"]},
+                {"field": "amount", "op": "gte", "value": 10},
+                {"field": "note", "op": "contains", "value": "x"},
+            ],
+            "or": [{"field": "channel", "op": "eq", "value": "web"}],
+        },
+        sort=["ordered_on", "id"],
+    )
+
+    assert shape.equality == ("region", "status")
+    assert shape.range == ("amount",)
+    assert shape.sort == ("ordered_on", "id")
+    assert QueryShape.from_key(shape.key()) == shape
+
+
+@pytest.mark.asyncio
+async def test_recorder_buffers_until_flush_interval():
+    redis = _FakeRedis()
+    recorder = QueryShapeRecorder(flush_interval_s=3600, redis_factory=lambda: redis)
+    recorder._last_flush = time.monotonic()
+    shape = QueryShape(source="search", equality=("status",))
+
+    for _ in range(5):
+        await recorder.record(TABLE, shape)
+
+    assert redis.pipelines == []
+    assert await recorder.load(TABLE) == {shape: 5}
+
+    await recorder.flush()
+    assert len(redis.pipelines) == 1
+    assert redis.store[QueryShapeRecorder.redis_key(TABLE)] == {shape.key(): 5}
+    assert await recorder.load(TABLE) == {shape: 5}
+
+
+
+@pytest.mark.asyncio
+async def test_due_flush_runs_in_the_background_instead_of_the_recording_request():
+    redis = _FakeRedis()
+    release = asyncio.Event()
+    pipeline = redis.pipeline
+
+    def slow_pipeline(transaction=True):
+        pipe = pipeline(transaction)
+        execute = pipe.execute
+
+        async def _execute():
+            await release.wait()
+            await execute()
+
+        pipe.execute = _execute
+        return pipe
+
+    redis.pipeline = slow_pipeline
+    recorder = QueryShapeRecorder(flush_interval_s=0, redis_factory=lambda: redis)
+    shape = QueryShape(source="search", equality=("status",))
+
+    await asyncio.wait_for(recorder.record(TABLE, shape), timeout=0.1)
+    await asyncio.wait_for(recorder.record(TABLE, shape), timeout=0.1)
+    assert len(redis.pipelines) == 1
+
+    release.set()
+    await recorder._flushing
+    assert redis.store[QueryShapeRecorder.redis_key(TABLE)] == {shape.key(): 1}
+    assert recorder._flushing is None
+    assert await recorder.load(TABLE) == {shape: 2}
+
+def test_propose_orders_equality_then_sort_then_range_and_merges_prefixes():
+    shapes = {
+        QueryShape(source="search", equality=("status", "region"), range=("amount",), sort=("ordered_on",)): 40,
+        QueryShape(source="rows", equality=("region",)): 10,
+    }
+    stats = {
+        "region": ColumnStats(n_distinct=50),
+        "status": ColumnStats(n_distinct=4),
+    }
+
+    proposals = CollectionIndexAdvisor.propose(
+        TABLE, shapes, stats=stats, row_estimate=100_000, min_hits=5
+    )
+
+    assert len(proposals) == 1
+    proposal = proposals[0]
+    assert proposal.columns == ("region", "status", "ordered_on", "amount")
+    assert proposal.hits == 50
+    assert sorted(set(proposal.sources)) == ["rows", "search"]
+    assert proposal.sql.startswith(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {proposal.name} ON {TABLE} (region, status, ordered_on, amount)"
+    )
+
+
+def test_propose_skips_shapes_served_by_existing_indexes():
+    shapes = {
+        QueryShape(source="vectorize", predicate=VECTOR_PENDING_PREDICATE): 20,
+        QueryShape(source="aggregate", equality=("status",), group=("region",), include=("amount",)): 20,
+    }
+    existing = [
+        ExistingIndex(
+            name=f"idx_{TABLE}_vector_pending",
+            columns=("id",),
+            predicate="(_vector_status = 'pending'::text)",
+        ),
+    ]
+
+    proposals = CollectionIndexAdvisor.propose(
+        TABLE, shapes, existing=existing, row_estimate=100_000
+    )
+
+    assert [p.kind for p in proposals] == ["covering"]
+    assert proposals[0].sql.endswith("(status, region) INCLUDE (amount)")
+
+    without_partial = CollectionIndexAdvisor.propose(TABLE, shapes, row_estimate=100_000)
+    partial = next(p for p in without_partial if p.kind == "partial")
+    assert partial.sql.endswith("(id) WHERE _vector_status = 'pending'")
+
+
+class _FakeConnection:
+    def __init__(self, engine: "_FakeEngine") -> None:
+        self.engine = engine
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.engine.statements.append(sql)
+        if sql.startswith("CREATE INDEX"):
+            self.engine.invalid = True
+            await asyncio.sleep(10)
+        if sql.startswith("DROP INDEX"):
+            self.engine.invalid = False
+        return SimpleNamespace(first=lambda: (1,) if self.engine.invalid else None)
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.invalid = False
+
+    def connect(self):
+        engine = self
+
+        class _Context:
+            async def __aenter__(self):
+                return _FakeConnection(engine)
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return _Context()
+
+
+class _FakeSession:
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cancelled_build_drops_the_invalid_index():
+    engine = _FakeEngine()
+    advisor = CollectionIndexAdvisor(_FakeSession())
+    name = "ix_orders_status"
+
+    async def find_proposal(collection, proposal_name):
+        return {"name": proposal_name, "sql": f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {TABLE} (status)"}
+
+    advisor.find_proposal = find_proposal
+    build = asyncio.ensure_future(advisor.apply(SimpleNamespace(table_name=TABLE), name, engine=engine))
+    while not engine.invalid:
+        await asyncio.sleep(0)
+    build.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await build
+
+    assert engine.statements[-1] == f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+    assert engine.invalid is False
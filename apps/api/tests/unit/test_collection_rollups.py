@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.agents.builtins.collection_aggregate import SQL_BUILDER
+from app.core.exceptions import InvalidSchemaError
+from app.models.collection import Collection, CollectionType, FieldCategory, FieldType
+from app.services.collection.row_service import CollectionRowService
+from app.services.collection.rollup_service import RollupSpec
+from app.services.collection.schema_contract_service import CollectionSchemaContractService
+
+
+def _field(name: str, data_type: str, rollup: str | None = None) -> dict:
+    field = {
+        "name": name,
+        "category": FieldCategory.USER.value,
+        "data_type": data_type,
+        "required": False,
+        "filterable": True,
+        "sortable": False,
+        "used_in_retrieval": False,
+        "used_in_prompt_context": False,
+    }
+    if rollup:
+        field["rollup"] = rollup
+    return field
+
+
+def _orders_collection(*, time_type: str = FieldType.DATE.value, extra_fields=()) -> Collection:
+    return Collection(
+        id=uuid4(),
+        data_instance_id=uuid4(),
+        tenant_id=uuid4(),
+        collection_type=CollectionType.TABLE.value,
+        slug="orders",
+        name="Orders",
+        table_name="coll_test_orders",
+        time_column="ordered_on",
+        fields=[
+            _field("region", FieldType.STRING.value, "dimension"),
+            _field("status", FieldType.ENUM.value, "dimension"),
+            _field("amount", FieldType.FLOAT.value, "measure"),
+            _field("note", FieldType.TEXT.value),
+            _field("ordered_on", time_type),
+            *extra_fields,
+        ],
+    )
+
+
+def test_spec_names_follow_declared_shape():
+    spec = RollupSpec.from_collection(_orders_collection())
+
+    assert spec.key_columns == ["region", "status", "_bucket"]
+    assert spec.measure_names == ["amount"]
+    assert spec.table_name.startswith("coll_test_orders__r")
+    assert len(spec.key_constraint(spec.table_name)) <= 63
+
+    widened = RollupSpec.from_collection(
+        _orders_collection(extra_fields=[_field("channel", FieldType.STRING.value, "dimension")])
+    )
+    assert widened.table_prefix == spec.table_prefix
+    assert widened.table_name != spec.table_name
+
+    undeclared = _orders_collection()
+    undeclared.fields = [{**f, "rollup": None} for f in undeclared.fields]
+    assert RollupSpec.from_collection(undeclared) is None
+
+
+def test_delta_sql_upserts_signed_grouped_contribution():
+    spec = RollupSpec.from_collection(_orders_collection())
+
+    sql = spec.build_delta_sql("id IN (:id_0)")
+
+    assert (
+        f"INSERT INTO {spec.table_name} (region, status, _bucket, _rows, _sum_amount, _cnt_amount) "
+        "SELECT region, status, date_trunc('day', ordered_on), :sign * COUNT(*), "
+        ":sign * COALESCE(SUM(amount), 0), :sign * COUNT(amount) "
+        "FROM coll_test_orders WHERE id IN (:id_0) GROUP BY 1, 2, 3"
+    ) in sql
+    assert f"ON CONFLICT ON CONSTRAINT {spec.table_name}_key" in sql
+    assert f"_rows = {spec.table_name}._rows + EXCLUDED._rows" in sql
+
+
+def test_covered_aggregate_is_rewritten_onto_rollup():
+    spec = RollupSpec.from_collection(_orders_collection())
+
+    sql, params = SQL_BUILDER.build_rollup_aggregate_sql(
+        spec=spec,
+        metrics=[
+            {"function": "count"},
+            {"function": "avg", "field": "amount", "alias": "avg_amount"},
+        ],
+        group_by=["region"],
+        filters={"status": "paid", "and": [{"field": "ordered_on", "op": "gte", "value": "2026-01-01"}]},
+        time_bucket={"field": "ordered_on", "interval": "month"},
+        having=[{"function": "sum", "field": "amount", "op": "gt", "value": 10}],
+    )
+
+    assert f"FROM {spec.table_name}" in sql
+    assert "date_trunc('month', _bucket) as time_bucket" in sql
+    assert "COALESCE(SUM(_rows), 0)::bigint as metric_0" in sql
+    assert "SUM(_sum_amount) / NULLIF(SUM(_cnt_amount), 0) as avg_amount" in sql
+    assert "WHERE _bucket::date >= :p0 AND status = :p1" in sql
+    assert "GROUP BY region, date_trunc('month', _bucket)" in sql
+    assert "HAVING SUM(_rows) > 0 AND CASE WHEN SUM(_cnt_amount) > 0 THEN SUM(_sum_amount) END > :h2" in sql
+    assert params == {"p0": "2026-01-01", "p1": "paid", "h2": 10}
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"metrics": [{"function": "max", "field": "amount"}]},
+        {"group_by": ["note"]},
+        {"filters": {"note": "x"}},
+        {"time_bucket": {"field": "ordered_on", "interval": "hour"}},
+    ],
+)
+def test_uncovered_aggregate_falls_back(overrides):
+    spec = RollupSpec.from_collection(_orders_collection())
+    query = {
+        "metrics": [{"function": "count"}],
+        "group_by": ["region"],
+        "filters": {},
+        "time_bucket": None,
+        **overrides,
+    }
+
+    assert SQL_BUILDER.build_rollup_aggregate_sql(spec=spec, **query) is None
+
+
+def test_datetime_time_column_filters_are_not_covered():
+    spec = RollupSpec.from_collection(_orders_collection(time_type=FieldType.DATETIME.value))
+
+    planned = SQL_BUILDER.build_rollup_aggregate_sql(
+        spec=spec,
+        metrics=[{"function": "count"}],
+        group_by=[],
+        filters={"and": [{"field": "ordered_on", "op": "gte", "value": "2026-01-01T10:00:00"}]},
+        time_bucket={"field": "ordered_on", "interval": "day"},
+    )
+
+    assert planned is None
+
+
+def test_contract_rejects_rollup_on_incompatible_type():
+    contract = CollectionSchemaContractService()
+
+    with pytest.raises(InvalidSchemaError, match="rollup measure"):
+        contract.validate_fields([_field("title", FieldType.STRING.value, "measure")], "table")
+
+
+def _recording_session():
+    session = MagicMock()
+    session.flush = AsyncMock()
+    executed: list[str] = []
+
+    async def execute(statement, params=None):
+        sql = str(statement)
+        executed.append(sql)
+        result = MagicMock()
+        result.scalar.return_value = True
+        result.rowcount = 1
+        return result
+
+    session.execute = AsyncMock(side_effect=execute)
+    return session, executed
+
+
+@pytest.mark.asyncio
+async def test_delete_subtracts_rows_from_rollup_before_deleting():
+    session, executed = _recording_session()
+    collection = _orders_collection()
+    collection.total_rows = 3
+    spec = RollupSpec.from_collection(collection)
+
+    deleted = await CollectionRowService(session).delete_rows(collection, [uuid4()])
+
+    assert deleted == 1
+    delete_idx = next(i for i, sql in enumerate(executed) if sql.startswith("DELETE FROM coll_test_orders"))
+    delta_idx = next(i for i, sql in enumerate(executed) if sql.startswith(f"INSERT INTO {spec.table_name}"))
+    assert executed[0] == "LOCK TABLE coll_test_orders IN ROW EXCLUSIVE MODE"
+    assert delta_idx < delete_idx
+
+
+@pytest.mark.asyncio
+async def test_update_outside_rollup_columns_skips_rollup(monkeypatch):
+    session, executed = _recording_session()
+    collection = _orders_collection()
+    service = CollectionRowService(session)
+    monkeypatch.setattr(service, "get_row_by_id", AsyncMock(return_value=SimpleNamespace()))
+
+    await service.update_row(collection, uuid4(), {"note": "updated"}, skip_vectorization=True)
+
+    assert not any("LOCK TABLE" in sql or "__r" in sql for sql in executed)
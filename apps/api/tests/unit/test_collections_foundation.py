@@ -829,3 +829,50 @@ def test_row_payload_validation_coerces_supported_types():
     assert isinstance(prepared["opened_at"], datetime)
     assert isinstance(prepared["due_date"], date)
     assert prepared["meta"] == {"team": "ops"}
+
+
+def test_collection_search_keyset_page_token_round_trip_and_predicate():
+    from app.agents.builtins.collection_search import PageTokenError, decode_page_token, encode_page_token
+
+    collection = _table_collection()
+    collection.default_sort = {"field": "_created_at", "order": "desc"}
+    tool = CollectionSearchTool()
+    order_keys = tool._resolve_order_keys(collection, [])  # noqa: SLF001
+    assert order_keys == [("_created_at", "DESC"), ("id", "DESC")]
+
+    signature = tool._search_signature(collection, {}, "router", order_keys)  # noqa: SLF001
+    row_id = uuid4()
+    token = encode_page_token(signature, [datetime(2024, 5, 1, 12, 0), row_id])
+    assert decode_page_token(token, signature) == [datetime(2024, 5, 1, 12, 0), row_id]
+    try:
+        decode_page_token(token, "other-search")
+    except PageTokenError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("token from another search must be rejected")
+
+    sql, params = tool._build_search_sql(  # noqa: SLF001
+        collection, {}, None, [], 51, 0, after=[datetime(2024, 5, 1, 12, 0), row_id]
+    )
+    assert "(_created_at, id) < (:k0, :k1)" in sql
+    assert "ORDER BY _created_at DESC, id DESC" in sql
+    assert "OFFSET" not in sql
+    assert params == {"k0": datetime(2024, 5, 1, 12, 0), "k1": row_id}
+
+
+def test_collection_search_keyset_handles_null_sort_values_and_capped_count():
+    collection = _table_collection()
+    tool = CollectionSearchTool()
+    order_keys = [("priority", "ASC"), ("id", "ASC")]
+
+    params: dict = {}
+    predicate = tool._build_keyset_predicate(order_keys, [None, "r-1"], params)  # noqa: SLF001
+    assert predicate == "((FALSE) OR (priority IS NULL AND (id > :k1 OR id IS NULL)))"
+    assert params == {"k1": "r-1"}
+    assert tool._build_keyset_predicate(order_keys, [3, "r-1"], {}) == (  # noqa: SLF001
+        "((priority, id) > (:k0, :k1) OR priority IS NULL)"
+    )
+
+    count_sql, _ = tool._build_count_sql(collection, {}, "x", cap=100)  # noqa: SLF001
+    assert count_sql.startswith("SELECT COUNT(*) FROM (SELECT 1 FROM")
+    assert count_sql.endswith("LIMIT 101) AS capped")
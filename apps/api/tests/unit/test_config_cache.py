@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config_cache import VersionedConfigCache
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.gets = 0
+
+    async def get(self, key: str):
+        self.gets += 1
+        value = self.values.get(key)
+        return None if value is None else str(value)
+
+    async def incr(self, key: str) -> int:
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+class _BrokenRedis:
+    async def get(self, key: str):
+        raise ConnectionError("redis down")
+
+    async def incr(self, key: str):
+        raise ConnectionError("redis down")
+
+
+def _counting_loader(value: str):
+    calls = {"count": 0}
+
+    async def load() -> str:
+        calls["count"] += 1
+        await asyncio.sleep(0)
+        return f"{value}-{calls['count']}"
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_values_are_served_from_memory_between_generation_checks():
+    redis = _FakeRedis()
+    cache = VersionedConfigCache("ns", generation_check_s=60, redis_factory=lambda: redis)
+    load, calls = _counting_loader("cfg")
+
+    assert await cache.get_or_load("k", load) == "cfg-1"
+    assert await cache.get_or_load("k", load) == "cfg-1"
+
+    assert calls["count"] == 1
+    assert redis.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_peer_invalidation_drops_local_entries():
+    redis = _FakeRedis()
+    replica_a = VersionedConfigCache("ns", generation_check_s=0, redis_factory=lambda: redis)
+    replica_b = VersionedConfigCache("ns", generation_check_s=0, redis_factory=lambda: redis)
+    load, calls = _counting_loader("cfg")
+
+    assert await replica_a.get_or_load("k", load) == "cfg-1"
+    await replica_b.invalidate()
+
+    assert await replica_a.get_or_load("k", load) == "cfg-2"
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_loader_call():
+    redis = _FakeRedis()
+    cache = VersionedConfigCache("ns", redis_factory=lambda: redis)
+    load, calls = _counting_loader("cfg")
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(5)))
+
+    assert results == ["cfg-1"] * 5
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_is_a_safety_net_when_redis_is_unavailable():
+    cache = VersionedConfigCache("ns", ttl_s=0, redis_factory=_BrokenRedis)
+    load, calls = _counting_loader("cfg")
+
+    await cache.get_or_load("k", load)
+    await cache.invalidate()
+    await cache.get_or_load("k", load)
+
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_on_commit_waits_for_commit_and_skips_rollback():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    redis = _FakeRedis()
+    cache = VersionedConfigCache("ns", generation_check_s=60, redis_factory=lambda: redis)
+    load, calls = _counting_loader("cfg")
+    await cache.get_or_load("k", load)
+    session = Session(create_engine("sqlite://"))
+
+    session.execute(text("select 1"))
+    await cache.invalidate_on_commit(session, "k")
+    await cache.invalidate_on_commit(session, "k")
+    assert await cache.get_or_load("k", load) == "cfg-1"
+    session.rollback()
+    await asyncio.sleep(0)
+    assert redis.values == {}
+
+    session.execute(text("select 1"))
+    await cache.invalidate_on_commit(session, None)
+    session.commit()
+    await asyncio.sleep(0)
+
+    assert redis.values == {cache.generation_key: 1}
+    assert await cache.get_or_load("k", load) == "cfg-2"
+    session.close()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import extraction_pool as pool_module
+from app.services.extraction_pool import (
+    ExtractionPool,
+    ExtractionTimeoutError,
+    PdfRangeResult,
+)
+
+
+def _thread_pool(**kwargs) -> ExtractionPool:
+    return ExtractionPool(executor_factory=lambda workers: ThreadPoolExecutor(workers), **kwargs)
+
+
+def test_should_offload_only_heavy_formats_above_threshold():
+    pool = _thread_pool(min_bytes=10)
+
+    assert pool.should_offload(b"x" * 10, "report.pdf") is True
+    assert pool.should_offload(b"x" * 9, "report.pdf") is False
+    assert pool.should_offload(b"x" * 100, "notes.txt") is False
+    assert _thread_pool(enabled=False).should_offload(b"x" * 100, "report.docx") is False
+
+
+@pytest.mark.asyncio
+async def test_parallel_pdf_ranges_are_merged_in_page_order(monkeypatch):
+    def fake_range(payload: bytes, first: int, last: int) -> PdfRangeResult:
+        # Earlier ranges finish last to prove ordering does not follow completion.
+        time.sleep(0.01 * (10 - first))
+        return PdfRangeResult(first_page=first, last_page=last, text=f"[{first}-{last}]\f")
+
+    monkeypatch.setattr(pool_module, "_extract_pdf_range", fake_range)
+    monkeypatch.setattr(pool_module, "count_pdf_pages", lambda payload: 7)
+    pool = _thread_pool(max_workers=3, pdf_pages_per_job=2)
+    seen: list[int] = []
+
+    async def on_range(part: PdfRangeResult) -> None:
+        seen.append(part.first_page)
+
+    result = await pool.extract(b"%PDF-", "doc.pdf", on_range=on_range)
+
+    assert result.text == "[0-1]\f[2-3]\f[4-5]\f[6-6]\f"
+    assert result.meta == {"pages": 7, "parallel_jobs": 4}
+    assert seen == [0, 2, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_failed_range_falls_back_to_single_job(monkeypatch):
+    monkeypatch.setattr(
+        pool_module,
+        "_extract_pdf_range",
+        lambda payload, first, last: PdfRangeResult(first, last, "", failed=True),
+    )
+    monkeypatch.setattr(pool_module, "count_pdf_pages", lambda payload: 40)
+    monkeypatch.setattr(
+        pool_module,
+        "_run_registry_extract",
+        lambda payload, filename: pool_module.ExtractResult(text="whole", kind="pdf"),
+    )
+
+    result = await _thread_pool(pdf_pages_per_job=8).extract(b"%PDF-", "doc.pdf")
+
+    assert result.text == "whole"
+
+
+@pytest.mark.asyncio
+async def test_job_timeout_raises_and_recycles_executor():
+    pool = _thread_pool(job_timeout_s=0.05)
+
+    with pytest.raises(ExtractionTimeoutError):
+        await pool.run(time.sleep, 0.3)
+
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_pdf_page_count_runs_off_the_event_loop(monkeypatch):
+    counted_on: list[threading.Thread] = []
+
+    def fake_count(payload: bytes) -> int:
+        counted_on.append(threading.current_thread())
+        return 1
+
+    monkeypatch.setattr(pool_module, "count_pdf_pages", fake_count)
+    monkeypatch.setattr(
+        pool_module,
+        "_run_registry_extract",
+        lambda payload, filename: pool_module.ExtractResult(text="one", kind="pdf"),
+    )
+
+    await _thread_pool().extract(b"%PDF-", "doc.pdf")
+
+    assert counted_on and counted_on[0] is not threading.main_thread()
+
+
+class _TrackedExecutor(ThreadPoolExecutor):
+    def __init__(self, workers: int) -> None:
+        super().__init__(workers)
+        self.stopped = False
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.stopped = True
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+@pytest.mark.asyncio
+async def test_timeout_retires_only_its_pool_and_lets_other_jobs_finish():
+    executors: list[_TrackedExecutor] = []
+
+    def factory(workers: int) -> _TrackedExecutor:
+        executors.append(_TrackedExecutor(workers))
+        return executors[-1]
+
+    pool = ExtractionPool(executor_factory=factory, max_workers=3, job_timeout_s=0.2)
+    runaway = asyncio.create_task(pool.run(time.sleep, 0.5))
+    await asyncio.sleep(0.1)
+    slow = asyncio.create_task(pool.run(time.sleep, 0.15))
+    with pytest.raises(ExtractionTimeoutError):
+        await runaway
+
+    first = executors[0]
+    assert pool._executor is None and not first.stopped
+    await slow
+    assert first.stopped
+
+    assert await pool.run(len, "abc") == 3
+    second = executors[1]
+    pool._retire(first, kill=True)
+    pool._settle(first)
+    assert pool._executor is second and not second.stopped
+
+    pool.shutdown()
+    assert second.stopped and pool._executor is None
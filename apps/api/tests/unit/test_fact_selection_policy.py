@@ -5,7 +5,7 @@ from uuid import uuid4
 
 from app.models.memory import FactScope, FactSource
 from app.runtime.memory.dto import FactDTO
-from app.runtime.memory.fact_selection import FactSelectionPolicy, LexicalFactRanker
+from app.runtime.memory.fact_selection import FactSelectionPolicy, HybridFactRanker, LexicalFactRanker
 
 
 def _fact(
@@ -129,3 +129,34 @@ def test_policy_marks_contradictions_and_keeps_both_values():
     assert ("incident.owner", "team-bravo") in selected_subject_values
     contradictions = set(result.diagnostics.get("contradiction_subjects") or [])
     assert "incident.owner" in contradictions
+
+
+def test_hybrid_ranker_surfaces_semantically_related_stale_fact():
+    now = datetime.now(timezone.utc)
+    uid = uuid4()
+    related_old = _fact(
+        scope=FactScope.USER,
+        subject="infra.cloud",
+        value="deploys everything to kubernetes on aws",
+        observed_at=now - timedelta(days=400),
+        user_id=uid,
+    )
+    recent = _fact(
+        scope=FactScope.USER,
+        subject="office.coffee",
+        value="prefers espresso",
+        observed_at=now - timedelta(hours=1),
+        user_id=uid,
+    )
+    query = "which cluster hosts our services"
+
+    lexical = FactSelectionPolicy(ranker=LexicalFactRanker()).select(query=query, facts=[recent, related_old], limit=2)
+    assert related_old.id not in {item.fact.id for item in lexical.selected}
+
+    hybrid = FactSelectionPolicy(
+        ranker=HybridFactRanker(similarity={related_old.id: 0.82, recent.id: 0.05}),
+    ).select(query=query, facts=[recent, related_old], limit=2)
+
+    assert hybrid.selected[0].fact.id == related_old.id
+    assert hybrid.selected[0].similarity == 0.82
+    assert hybrid.diagnostics["ranker"] == "HybridFactRanker"
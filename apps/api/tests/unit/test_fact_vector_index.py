@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.models.memory import FactScope, FactSource
+from app.runtime.memory.dto import FactDTO
+from app.runtime.memory.fact_index import FactVectorIndex, fact_collection_name
+from app.runtime.memory.fact_store import FactStore
+from app.runtime.memory.writer import MemoryWriter
+
+
+class _Embedder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class _Store:
+    def __init__(self, hits=None) -> None:
+        self.ensured: list[tuple[str, int]] = []
+        self.upserts: list[tuple[str, list, list]] = []
+        self.deleted: list[tuple[str, dict]] = []
+        self.searches: list[dict] = []
+        self.hits = hits or []
+
+    async def ensure_collection(self, name, dim):
+        self.ensured.append((name, dim))
+
+    async def upsert(self, collection, vectors, payloads, ids=None):
+        self.upserts.append((collection, list(ids), list(payloads)))
+
+    async def delete_by_filter(self, collection, filter):
+        self.deleted.append((collection, filter))
+
+    async def search(self, *, collection, query, top_k, filter):
+        self.searches.append({"collection": collection, "top_k": top_k, "filter": filter})
+        return self.hits
+
+
+def _fact(value: str, **kwargs) -> FactDTO:
+    owner_id = kwargs.pop("owner_id", uuid4())
+    return FactDTO(
+        scope=FactScope.USER, subject="infra.cloud", value=value, source=FactSource.USER_UTTERANCE,
+        owner_type="user", owner_id=owner_id, tenant_id=uuid4(), id=uuid4(), **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_supersede_embeds_only_the_new_fact_and_drops_the_old_point():
+    embedder, store = _Embedder(), _Store()
+    index = FactVectorIndex(MagicMock(), model_alias="e5-small", vector_store=store, embedder=embedder)
+    fact_store = FactStore(MagicMock(), vector_index=index)
+    old = _fact("aws")
+    new = _fact("gcp", owner_id=old.owner_id)
+    fact_store.get_active_by_key = AsyncMock(return_value=old)
+    fact_store.add = AsyncMock(side_effect=lambda dto: dto)
+    fact_store.mark_superseded = AsyncMock()
+
+    await fact_store.upsert_with_supersede(new)
+
+    collection = fact_collection_name("e5-small")
+    assert collection == "runtime_facts__e5_small"
+    assert embedder.calls == [["infra.cloud: gcp"]]
+    assert store.ensured == [(collection, 2)]
+    assert store.upserts[0][1] == [str(new.id)]
+    assert store.upserts[0][2][0]["owner_id"] == str(old.owner_id)
+    assert store.deleted == [(collection, {"must": [("fact_id", [str(old.id)])]})]
+
+    # Same value only refreshes the row; nothing is re-embedded.
+    fact_store.get_active_by_key = AsyncMock(return_value=new)
+    fact_store._session.execute = AsyncMock()
+    await fact_store.upsert_with_supersede(_fact("gcp", owner_id=old.owner_id))
+    assert len(embedder.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_similar_scopes_search_to_owner_and_tolerates_store_errors():
+    fact_id = uuid4()
+    store = _Store(hits=[{"id": str(fact_id), "score": 0.8, "payload": {"fact_id": str(fact_id)}}])
+    index = FactVectorIndex(MagicMock(), model_alias="e5-small", vector_store=store, embedder=_Embedder())
+    owner_id = uuid4()
+
+    scores = await index.similar(
+        "where do we deploy", scopes=[FactScope.USER], owner_type="user", owner_id=owner_id,
+        tenant_id=None, limit=5,
+    )
+
+    assert scores == {fact_id: 0.8}
+    assert store.searches[0]["filter"] == {"must": [
+        ("owner_type", "user"), ("owner_id", str(owner_id)), ("scope", ["user"]),
+    ]}
+
+    store.search = AsyncMock(side_effect=RuntimeError("qdrant down"))
+    assert await index.similar(
+        "q", scopes=[FactScope.USER], owner_type="user", owner_id=owner_id, tenant_id=None, limit=5,
+    ) == {}
+
+
+@pytest.mark.asyncio
+async def test_memory_writer_indexes_confirmed_facts_and_drops_superseded_ones(monkeypatch):
+    embedder, store = _Embedder(), _Store()
+    user_id, tenant_id, old_id = uuid4(), uuid4(), uuid4()
+    session = MagicMock()
+    session.add = MagicMock(side_effect=lambda row: setattr(row, "id", getattr(row, "id", None) or uuid4()))
+    session.flush = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock(
+        scalar_one_or_none=MagicMock(return_value=None),
+        all=MagicMock(return_value=[(old_id, tenant_id)]),
+    ))
+    index = FactVectorIndex(session, model_alias="e5-small", vector_store=store, embedder=embedder)
+    monkeypatch.setattr(FactVectorIndex, "from_settings", classmethod(lambda cls, _session: index))
+    writer = MemoryWriter(session=session, llm_client=MagicMock())
+    writer._fact_reconciler.current_for = AsyncMock(return_value=[])
+    writer._glossary_reconciler.current_for = AsyncMock(return_value=[])
+    writer._glossary_reconciler.apply = AsyncMock(return_value=0)
+    candidate = FactDTO(
+        scope=FactScope.USER, subject="infra.cloud", value="gcp", source=FactSource.USER_UTTERANCE,
+        metadata={
+            "compaction_action": "supersede",
+            "compaction_target_ids": [str(old_id)],
+            "evidence": [{"source_type": "user_message", "source_ref": "run-1"}],
+        },
+    )
+    writer._fact_compactor.compact = AsyncMock(return_value=[candidate])
+    memory = SimpleNamespace(
+        user_id=user_id, tenant_id=tenant_id, chat_id=uuid4(), project_memory_candidates=[], fact_evidence=[],
+    )
+
+    saved, changes = await writer._compact_and_write_facts(memory, [candidate])
+
+    collection = fact_collection_name("e5-small")
+    assert saved == 1 and changes[0]["change_type"] == "confirmed"
+    assert embedder.calls == [["infra.cloud: gcp"]]
+    assert store.upserts[0][2][0]["owner_id"] == str(user_id)
+    assert store.deleted == [(collection, {"must": [("fact_id", [str(old_id)])]})]
+
+
+@pytest.mark.asyncio
+async def test_index_writes_wait_for_commit_and_are_dropped_on_rollback():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    from app.runtime.memory.fact_index import wait_for_index_writes
+
+    embedder, store = _Embedder(), _Store()
+    session = Session(create_engine("sqlite://"))
+    index = FactVectorIndex(session, model_alias="e5-small", vector_store=store, embedder=embedder)
+    rolled_back, committed, retired = _fact("aws"), _fact("gcp"), _fact("azure")
+
+    session.execute(text("select 1"))
+    await index.index_after_commit([rolled_back])
+    await index.remove_after_commit([retired.id], tenant_id=retired.tenant_id)
+    assert embedder.calls == [["infra.cloud: aws"]]
+    session.rollback()
+    await wait_for_index_writes()
+    assert store.upserts == [] and store.deleted == []
+
+    session.execute(text("select 1"))
+    await index.index_after_commit([committed])
+    await index.remove_after_commit([retired.id], tenant_id=retired.tenant_id)
+    assert store.upserts == []
+    session.commit()
+    await wait_for_index_writes()
+
+    assert [ids for _collection, ids, _payloads in store.upserts] == [[str(committed.id)]]
+    assert store.deleted == [(fact_collection_name("e5-small"), {"must": [("fact_id", [str(retired.id)])]})]
+    session.close()
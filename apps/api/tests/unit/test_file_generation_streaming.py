@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app.adapters.s3_client import S3MultipartWriter
+from app.services.file_formats import TabularCodecRegistry
+from app.services.file_generation_service import FileGenerationService
+
+
+class _FakeS3:
+    def __init__(self, *, fail_complete: bool = False) -> None:
+        self.fail_complete = fail_complete
+        self.parts: list[bytes] = []
+        self.objects: dict[str, bytes] = {}
+        self.aborted: list[str] = []
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, *, Body, PartNumber, **kwargs):
+        self.parts.append(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, *, Key, MultipartUpload, **kwargs):
+        if self.fail_complete:
+            raise RuntimeError("complete failed")
+        assert [p["PartNumber"] for p in MultipartUpload["Parts"]] == list(range(1, len(self.parts) + 1))
+        self.objects[Key] = b"".join(self.parts)
+
+    def put_object(self, *, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def abort_multipart_upload(self, *, UploadId, **kwargs):
+        self.aborted.append(UploadId)
+
+
+def test_multipart_writer_uploads_fixed_size_parts_and_completes():
+    s3 = _FakeS3()
+    writer = S3MultipartWriter(s3, "bucket", "key", part_size=4)
+
+    writer.write(b"abcdefghij")
+    writer.close()
+
+    assert s3.parts == [b"abcd", b"efgh", b"ij"]
+    assert s3.objects["key"] == b"abcdefghij"
+    assert writer.bytes_written == 10
+
+
+def test_multipart_writer_uses_single_put_for_small_objects():
+    s3 = _FakeS3()
+    writer = S3MultipartWriter(s3, "bucket", "key", part_size=64)
+
+    writer.write(b"small")
+    writer.close()
+
+    assert s3.parts == []
+    assert s3.objects["key"] == b"small"
+
+
+def test_multipart_writer_aborts_on_failure_and_limit():
+    s3 = _FakeS3(fail_complete=True)
+    writer = S3MultipartWriter(s3, "bucket", "key", part_size=4)
+    writer.write(b"abcdef")
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert s3.aborted == ["upload-1"]
+
+    limited = S3MultipartWriter(_FakeS3(), "bucket", "key", part_size=4, max_bytes=5)
+    with pytest.raises(ValueError, match="exceeds limit"):
+        limited.write(b"abcdef")
+
+
+def test_xlsx_codec_streams_rows_through_multipart_sink():
+    openpyxl = pytest.importorskip("openpyxl")
+    s3 = _FakeS3()
+    writer = S3MultipartWriter(s3, "bucket", "export.xlsx", part_size=5 * 1024)
+    rows = ({"id": i, "name": f"row{i}", "tags": ["a"]} for i in range(2000))
+
+    count = TabularCodecRegistry.get("xlsx").write(["id", "name", "tags"], rows, writer)
+    writer.close()
+
+    assert count == 2000
+    assert len(s3.parts) > 1
+    ws = openpyxl.load_workbook(io.BytesIO(s3.objects["export.xlsx"]), read_only=True).active
+    values = list(ws.iter_rows(values_only=True))
+    assert values[0] == ("id", "name", "tags")
+    assert values[-1] == (1999, "row1999", '["a"]')
+
+
+@pytest.mark.asyncio
+async def test_generate_table_records_row_count_and_size(monkeypatch):
+    captured: dict = {}
+
+    async def create_stream(*, filename, produce, metadata, max_bytes, **kwargs):
+        s3 = _FakeS3()
+        sink = S3MultipartWriter(s3, "bucket", filename, part_size=1024)
+        produced = produce(sink)
+        sink.close()
+        captured["filename"] = filename
+        captured["body"] = s3.objects[filename].decode("utf-8")
+        recorded = {**metadata, **produced, "size_bytes": sink.bytes_written}
+        return {"artifact_id": "artifact-1", "file_name": filename, "size_bytes": sink.bytes_written}, recorded
+
+    monkeypatch.setattr(
+        "app.services.artifact_writer.ChatAttachmentService",
+        lambda _session: SimpleNamespace(create_generated_attachment_stream=create_stream),
+    )
+
+    artifact = await FileGenerationService(SimpleNamespace()).generate_table(
+        chat_id="chat",
+        owner_id="owner",
+        filename="export.txt",
+        format_name="csv",
+        columns=["id", "name"],
+        rows=[[1, "a"], {"id": 2, "name": None}],
+    )
+
+    assert captured["filename"] == "export.csv"
+    assert artifact.metadata["row_count"] == 2
+    assert artifact.metadata["format"] == "csv"
+    assert artifact.size_bytes == artifact.metadata["size_bytes"] > 0
+    assert list(csv.reader(io.StringIO(captured["body"]))) == [["id", "name"], ["1", "a"], ["2", ""]]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+from redis.exceptions import NoScriptError
+
+from app.core.rate_limit import GlobalRateLimiter, RateLimitClass, parse_limit_classes
+
+
+class _LuaRedis:
+    """Executes the limiter script's semantics and counts round trips."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.round_trips = 0
+        self.scripts: set[str] = set()
+
+    async def evalsha(self, sha, numkeys, *args):
+        self.round_trips += 1
+        if sha not in self.scripts:
+            raise NoScriptError("NOSCRIPT No matching script")
+        return self._run(*args)
+
+    async def eval(self, script, numkeys, *args):
+        self.round_trips += 1
+        self.scripts.add(hashlib.sha1(script.encode()).hexdigest())
+        return self._run(*args)
+
+    def _run(self, *args):
+        keys, limits, granted = args[: len(args) // 2], args[len(args) // 2 : -1], args[-1]
+        for index in range(0, len(keys), 2):
+            minute, hour = self.values.get(keys[index], 0), self.values.get(keys[index + 1], 0)
+            if minute >= limits[index]:
+                return [0, 1]
+            if hour >= limits[index + 1]:
+                return [0, 2]
+            granted = min(granted, limits[index] - minute, limits[index + 1] - hour)
+        for key in keys:
+            self.values[key] = self.values.get(key, 0) + granted
+        return [granted, 0]
+
+
+NOW = 1_700_000_000.0  # 20s into a minute
+
+
+def _limiter(redis, **kwargs) -> GlobalRateLimiter:
+    kwargs.setdefault("default", RateLimitClass("default", 3, 100))
+    return GlobalRateLimiter(redis_factory=lambda: redis, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_one_round_trip_per_request_and_rejections_are_answered_locally():
+    redis = _LuaRedis()
+    limiter = _limiter(redis)
+
+    results = [await limiter.hit(path="/api/v1/chats", client_ip="1.1.1.1", now=NOW) for _ in range(5)]
+
+    assert results[:3] == [None, None, None]
+    assert results[3] == results[4] == 60 - int(NOW) % 60
+    # First call falls back from EVALSHA to EVAL once; the 5th request never reaches Redis.
+    assert redis.round_trips == 5
+    assert redis.values[f"ratelimit:global:ip:1.1.1.1:minute:{int(NOW) // 60}"] == 3
+    # Next minute window starts fresh.
+    assert await limiter.hit(path="/api/v1/chats", client_ip="1.1.1.1", now=NOW + 60) is None
+
+
+@pytest.mark.asyncio
+async def test_route_and_tenant_classes_use_their_own_budgets():
+    tenant = "6f1c1d4e-0000-4000-8000-000000000001"
+    redis = _LuaRedis()
+    limiter = _limiter(
+        redis,
+        route_classes=parse_limit_classes("/api/v1/auth/=1/10, /api/=5/50, broken"),
+        tenant_classes=parse_limit_classes(f"{tenant}=2/20", per_tenant=True),
+    )
+
+    assert limiter.classify("/api/v1/auth/login", tenant).name == "/api/v1/auth/"
+    assert await limiter.hit(path="/api/v1/auth/login", client_ip="1.1.1.1", now=NOW) is None
+    assert await limiter.hit(path="/api/v1/auth/login", client_ip="1.1.1.1", now=NOW) is not None
+
+    limiter.route_classes, limiter._route_prefixes = {}, []
+    # Tenant budget is shared across client IPs.
+    assert await limiter.hit(path="/api/v1/chats", client_ip="1.1.1.1", tenant_id=tenant, now=NOW) is None
+    assert await limiter.hit(path="/api/v1/chats", client_ip="2.2.2.2", tenant_id=tenant, now=NOW) is None
+    assert await limiter.hit(path="/api/v1/chats", client_ip="3.3.3.3", tenant_id=tenant, now=NOW) is not None
+    assert await limiter.hit(path="/api/v1/chats", client_ip="3.3.3.3", now=NOW) is None
+
+
+@pytest.mark.asyncio
+async def test_tenant_class_still_charges_the_per_ip_default():
+    tenant = "6f1c1d4e-0000-4000-8000-000000000001"
+    redis = _LuaRedis()
+    limiter = _limiter(
+        redis,
+        default=RateLimitClass("default", 2, 100),
+        tenant_classes=parse_limit_classes(f"{tenant}=50/500", per_tenant=True),
+    )
+
+    results = [
+        await limiter.hit(path="/api/v1/chats", client_ip="1.1.1.1", tenant_id=tenant, now=NOW) for _ in range(3)
+    ]
+
+    assert results[:2] == [None, None] and results[2] is not None
+    minute = int(NOW) // 60
+    assert redis.values[f"ratelimit:global:ip:1.1.1.1:minute:{minute}"] == 2
+    assert redis.values[f"ratelimit:global:{tenant}:tenant:{tenant}:minute:{minute}"] == 2
+
+
+@pytest.mark.asyncio
+async def test_local_batch_leases_requests_and_fails_open():
+    redis = _LuaRedis()
+    limiter = _limiter(redis, default=RateLimitClass("default", 10, 100), local_batch=4)
+
+    allowed = [await limiter.hit(path="/x", client_ip="1.1.1.1", now=NOW) is None for _ in range(12)]
+
+    assert allowed == [True] * 10 + [False] * 2
+    # Leases of 4 + 4 + 2, plus the NOSCRIPT retry and one rejection.
+    assert redis.round_trips == 5
+
+    class _Down:
+        async def evalsha(self, *args):
+            raise ConnectionError("redis down")
+
+    assert await _limiter(_Down()).hit(path="/x", client_ip="1.1.1.1", now=NOW) is None
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.config_cache import VersionedConfigCache
+from app.runtime.memory.glossary_index import GLOSSARY, PROJECT, GlossaryIndex
+from app.services.glossary_service import GlossaryService
+
+PROJECTS = [
+    {"id": uuid4(), "key": "nemesis", "name": "Немезида", "aliases": ["Нема"]},
+    {"id": uuid4(), "key": "atlas", "name": "Атлас", "aliases": ["Нема"]},
+]
+TERMS = [{"id": uuid4(), "term": "СРК", "description": "Система резервного копирования", "aliases": ["бэкап-система"]}]
+
+
+def test_match_reports_normalized_whole_word_spans_and_shared_aliases():
+    index = GlossaryIndex(PROJECTS, TERMS)
+    text = "Нужен ёще доступ к срк и  Немезиде, а также Нема"
+
+    hits = index.match(text)
+
+    assert [(hit.kind, hit.index, text[hit.start:hit.end]) for hit in hits] == [
+        (GLOSSARY, 0, "срк"),
+        (PROJECT, 0, "Нема"),
+        (PROJECT, 1, "Нема"),
+    ]
+    assert index.match("срки и atlases") == []
+    # "Немезиде" is an inflected form of the project name (and of the alias's stem).
+    assert [(hit.index, hit.surface) for hit in index.near_matches(text)] == [(0, "немези"), (0, "нем"), (1, "нем")]
+    assert index.near_matches("Немезида") == []
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.generation = 0
+
+    async def get(self, key):
+        return self.generation
+
+    async def incr(self, key):
+        self.generation += 1
+        return self.generation
+
+
+@pytest.mark.asyncio
+async def test_load_index_is_shared_until_glossary_changes(monkeypatch):
+    redis = _Redis()
+    monkeypatch.setattr(
+        GlossaryService, "_index_cache",
+        VersionedConfigCache("glossary_index", generation_check_s=0.0, redis_factory=lambda: redis),
+    )
+    session = MagicMock()
+    session.flush = AsyncMock()
+    service = GlossaryService(session)
+    service.list_project_terms = AsyncMock(return_value=PROJECTS)
+    service.list_confirmed_global_terms = AsyncMock(return_value=TERMS)
+
+    first = await service.load_index(limit=200)
+    assert await GlossaryService(session).load_index(limit=200) is first
+    assert service.list_project_terms.await_count == 1
+
+    await service.create(
+        scope=MagicMock(value="global"), canonical_term="EVPN", aliases=[], entity_type="term",
+        entity_id=None, description=None, tenant_id=None, project_id=None,
+    )
+    second = await service.load_index(limit=200)
+    assert second is not first and second.version == 1
+    assert service.list_project_terms.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_glossary_writes_invalidate_the_index_only_after_commit(monkeypatch):
+    import asyncio
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    redis = _Redis()
+    monkeypatch.setattr(
+        GlossaryService, "_index_cache",
+        VersionedConfigCache("glossary_index", generation_check_s=0.0, redis_factory=lambda: redis),
+    )
+    session = Session(create_engine("sqlite://"))
+
+    session.execute(text("select 1"))
+    await GlossaryService.invalidate_index(session)
+    await asyncio.sleep(0)
+    assert redis.generation == 0
+    session.rollback()
+    await asyncio.sleep(0)
+    assert redis.generation == 0
+
+    session.execute(text("select 1"))
+    await GlossaryService.invalidate_index(session)
+    session.commit()
+    await asyncio.sleep(0)
+    assert redis.generation == 1
+    session.close()
+
+
+@pytest.mark.asyncio
+async def test_confirmed_project_aliases_invalidate_the_index_only_when_they_change(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.runtime.memory.fact_reconciler import FactReconciler
+
+    project = SimpleNamespace(id=uuid4(), name="Немезида", aliases=["Нема"])
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = project
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    invalidate = AsyncMock()
+    monkeypatch.setattr(GlossaryService, "invalidate_index", invalidate)
+    reconciler = FactReconciler(session, vector_index=MagicMock())
+    fact = SimpleNamespace(project_id=project.id)
+
+    await reconciler._apply_confirmed_project_aliases(fact, ["нема", "немезида", " Nemesis "])
+    await reconciler._apply_confirmed_project_aliases(fact, ["NEMESIS"])
+
+    assert project.aliases == ["Нема", "Nemesis"]
+    invalidate.assert_awaited_once_with(session)
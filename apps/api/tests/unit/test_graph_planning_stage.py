@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.runtime.stages.graph_planning_stage import GraphPlanningStage
+
+
+class _BudgetExhausted(RuntimeError):
+    pass
+
+
+def _stage(run) -> tuple[GraphPlanningStage, AsyncMock]:
+    checkpoint = AsyncMock()
+    orchestrator = SimpleNamespace(run=run, budget_service=SimpleNamespace(checkpoint=checkpoint, event_sink=None))
+    plan = SimpleNamespace(id=uuid4(), goal="goal", status="running")
+    store = SimpleNamespace(get_by_run=AsyncMock(return_value=plan))
+    return GraphPlanningStage(orchestrator=orchestrator, store=store, max_steps=5), checkpoint
+
+
+def _run_kwargs() -> dict:
+    return {
+        "runtime_state": SimpleNamespace(
+            run_id=uuid4(), continuation=None, attachment_contexts=[], deleted_artifact_ids=set(),
+        ),
+        "request": SimpleNamespace(chat_id=None, sandbox_overrides=None, messages=[], model=None),
+        "ctx": SimpleNamespace(extra={}),
+        "user_id": uuid4(),
+        "tenant_id": uuid4(),
+        "available_agents": [],
+        "platform_config": {},
+    }
+
+
+def _event():
+    return SimpleNamespace(to_runtime_event=lambda: SimpleNamespace(type="status", data={}))
+
+
+@pytest.mark.asyncio
+async def test_budget_checkpoint_runs_when_the_orchestrator_raises():
+    async def run(**kwargs):
+        yield _event()
+        raise _BudgetExhausted("tokens")
+
+    stage, checkpoint = _stage(run)
+
+    with pytest.raises(_BudgetExhausted):
+        async for _ in stage.run(**_run_kwargs()):
+            pass
+
+    checkpoint.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_budget_checkpoint_runs_when_the_consumer_closes_early():
+    async def run(**kwargs):
+        while True:
+            yield _event()
+
+    stage, checkpoint = _stage(run)
+    events = stage.run(**_run_kwargs())
+
+    await anext(events)
+    await events.aclose()
+
+    checkpoint.assert_awaited_once()
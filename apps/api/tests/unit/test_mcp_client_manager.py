@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.services.mcp_client_manager import MCPClientManager
+
+
+class _FakeProvider:
+    def __init__(self) -> None:
+        self.sessions_issued = 0
+        self.live_sessions: set[str] = set()
+        self.methods: list[str] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        method = body["method"]
+        self.methods.append(method)
+        if method == "initialize":
+            self.sessions_issued += 1
+            session_id = f"session-{self.sessions_issued}"
+            self.live_sessions.add(session_id)
+            return httpx.Response(
+                200,
+                headers={"mcp-session-id": session_id},
+                json={
+                    "jsonrpc": "2.0",
+                    "id": body["id"],
+                    "result": {
+                        "protocolVersion": "2024-11-05",
+                        "capabilities": {"tools": {}},
+                        "serverInfo": {"name": "fake"},
+                    },
+                },
+            )
+        if request.headers.get("mcp-session-id") not in self.live_sessions:
+            return httpx.Response(404, json={"error": "unknown session"})
+        if method == "tools/list":
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"tools": [{"name": "t"}]}})
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {}})
+
+
+def _manager(provider: _FakeProvider, **kwargs) -> MCPClientManager:
+    return MCPClientManager(transport_factory=lambda: httpx.MockTransport(provider.handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_session_and_client_are_reused_across_calls():
+    provider = _FakeProvider()
+    manager = _manager(provider)
+
+    for _ in range(3):
+        data = await manager.rpc("http://mcp:8080/mcp", "tools/list")
+        assert data["result"]["tools"] == [{"name": "t"}]
+
+    assert provider.methods == ["initialize", "tools/list", "tools/list", "tools/list"]
+    stats = manager.metrics()
+    assert stats["handshakes"] == 1
+    assert stats["clients_opened"] == 1
+    assert stats["cached_sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_reinitialized_transparently():
+    provider = _FakeProvider()
+    manager = _manager(provider)
+    await manager.rpc("http://mcp:8080/mcp", "tools/list")
+    provider.live_sessions.clear()
+
+    data = await manager.rpc("http://mcp:8080/mcp", "tools/list")
+
+    assert data["result"]["tools"] == [{"name": "t"}]
+    assert provider.sessions_issued == 2
+    assert manager.metrics()["session_expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_forces_new_handshake():
+    provider = _FakeProvider()
+    manager = _manager(provider, session_ttl_s=0)
+
+    await manager.get_session("http://mcp:8080/mcp")
+    await manager.get_session("http://mcp:8080/mcp")
+
+    assert provider.sessions_issued == 2
+
+
+@pytest.mark.asyncio
+async def test_ping_returns_negotiated_server_metadata():
+    provider = _FakeProvider()
+    manager = _manager(provider)
+
+    session = await manager.ping("http://mcp:8080/mcp", timeout_s=5)
+
+    assert session.session_id == "session-1"
+    assert session.protocol_version == "2024-11-05"
+    assert session.server_info == {"name": "fake"}
+    assert provider.methods == ["initialize", "ping"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.runtime.memory.components import (
+    MemoryAssembler,
+    MemoryBudget,
+    MemoryComponentRegistry,
+    MemoryItem,
+    MemoryQueryContext,
+    MemorySection,
+)
+from app.runtime.memory.dto import SummaryDTO
+
+
+class _Component:
+    def __init__(self, name: str, priority: int, *, delay: float = 0.0, text: str = "x" * 10, fail: bool = False):
+        self.name = name
+        self.priority = priority
+        self.delay = delay
+        self.text = text
+        self.fail = fail
+
+    async def collect(self, ctx: MemoryQueryContext) -> MemorySection:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        item = MemoryItem(text=self.text, source=self.name)
+        return MemorySection(name=self.name, priority=self.priority, items=[item], budget_used_chars=item.size_chars)
+
+
+def _ctx(platform_config: dict | None = None, total_chars: int = 8_000) -> MemoryQueryContext:
+    return MemoryQueryContext(
+        goal="goal",
+        chat_id=None,
+        user_id=uuid4(),
+        tenant_id=uuid4(),
+        summary=SummaryDTO.empty(uuid4()),
+        budget=MemoryBudget(total_chars=total_chars),
+        platform_config=platform_config or {},
+    )
+
+
+@pytest.mark.asyncio
+async def test_components_run_concurrently_and_slow_ones_degrade():
+    slow = _Component("slow", 10, delay=5.0)
+    fast = _Component("fast", 20, delay=0.05)
+    broken = _Component("broken", 30, fail=True)
+    assembler = MemoryAssembler(registry=MemoryComponentRegistry([fast, broken, slow]))
+    config = {"memory": {"component_timeout_ms": 1_000, "components": {"slow": {"timeout_ms": 100}}}}
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    bundle = await assembler.assemble(_ctx(config))
+
+    assert loop.time() - started < 1.0
+    assert [section.name for section in bundle.sections] == ["slow", "fast", "broken"]
+    assert bundle.section("slow").selection_reason == "component_timeout"
+    assert bundle.section("broken").selection_reason == "component_failed"
+    assert bundle.section("fast").status == "ok"
+    assert bundle.diagnostics["timed_out_components"] == ["slow"]
+    assert bundle.diagnostics["degraded_components"] == ["slow", "broken"]
+    assert set(bundle.diagnostics["component_timings_ms"]) == {"slow", "fast", "broken"}
+
+
+@pytest.mark.asyncio
+async def test_total_budget_trim_follows_priority_not_completion_order():
+    # The low-priority-number component finishes last but still keeps its budget.
+    first = _Component("first", 10, delay=0.05, text="a" * 60)
+    second = _Component("second", 20, text="b" * 60)
+    assembler = MemoryAssembler(registry=MemoryComponentRegistry([second, first]))
+
+    bundle = await assembler.assemble(_ctx(total_chars=100))
+
+    assert bundle.items_for("first")[0].text == "a" * 60
+    assert bundle.items_for("second") == []
+    assert bundle.section("second").omitted_count == 1
+    assert bundle.total_budget_used_chars == 60
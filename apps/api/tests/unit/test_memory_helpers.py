@@ -275,7 +275,7 @@ async def test_memory_preparer_selects_only_llm_indexed_context() -> None:
 
 @pytest.mark.asyncio
 async def test_memory_preparer_degrades_to_empty_context() -> None:
-    preparer = MemoryPreparer(session=AsyncMock(), llm_client=AsyncMock())
+    preparer = MemoryPreparer(session=AsyncMock(), llm_client=AsyncMock(), fast_path_max_facts=0)
     preparer._structured.invoke = AsyncMock(side_effect=RuntimeError("offline"))
 
     result = await preparer.prepare(
@@ -287,6 +287,46 @@ async def test_memory_preparer_degrades_to_empty_context() -> None:
     assert result.items == []
 
 
+@pytest.mark.asyncio
+async def test_memory_preparer_selects_verbatim_terms_without_llm() -> None:
+    preparer = MemoryPreparer(session=AsyncMock(), llm_client=AsyncMock())
+    preparer._structured.invoke = AsyncMock(side_effect=AssertionError("LLM must not be called"))
+    facts = [FactDTO(scope=FactScope.USER, subject="user.role", value="network engineer", source=FactSource.USER_UTTERANCE)]
+
+    result = await preparer.prepare(
+        request_text="Настрой бэкап в СРК для проекта Немезида", facts=facts,
+        project_glossary=[
+            {"id": uuid4(), "key": "nemesis", "name": "Немезида", "aliases": ["Нема"]},
+            {"id": uuid4(), "key": "atlas", "name": "Атлас", "aliases": []},
+        ],
+        glossary=[{"term": "срк", "description": "Система резервного копирования", "aliases": []}],
+        user_id=None, tenant_id=None, chat_id=None, sandbox_overrides=None,
+    )
+
+    assert result.strategy == "local" and result.fallback is False
+    assert [item["type"] for item in result.items] == ["fact", "project", "glossary"]
+    assert result.items[1]["key"] == "nemesis"
+
+
+@pytest.mark.asyncio
+async def test_memory_preparer_memoizes_llm_selection_per_candidate_set() -> None:
+    preparer = MemoryPreparer(session=AsyncMock(), llm_client=AsyncMock(), fast_path_max_facts=0)
+    preparer._structured.invoke = AsyncMock(return_value=_llm_result(_PreparationOutput(fact_indexes=[0])))
+    facts = [FactDTO(scope=FactScope.USER, subject="user.city", value=f"city-{uuid4()}", source=FactSource.USER_UTTERANCE)]
+    kwargs = dict(
+        project_glossary=[], glossary=[], user_id=None, tenant_id=None, chat_id=None, sandbox_overrides=None,
+    )
+
+    first = await preparer.prepare(request_text="Где я живу?", facts=facts, **kwargs)
+    second = await preparer.prepare(request_text="где  я живу?", facts=facts, **kwargs)
+    facts.append(FactDTO(scope=FactScope.USER, subject="user.job", value="dev", source=FactSource.USER_UTTERANCE))
+    third = await preparer.prepare(request_text="Где я живу?", facts=facts, **kwargs)
+
+    assert (first.strategy, second.strategy, third.strategy) == ("llm", "cache", "llm")
+    assert second.items == first.items
+    assert preparer._structured.invoke.await_count == 2
+
+
 @pytest.mark.asyncio
 async def test_fact_extractor_rejects_project_fact_even_with_evidence(extractor) -> None:
     extractor._structured.invoke = AsyncMock(return_value=_llm_result(
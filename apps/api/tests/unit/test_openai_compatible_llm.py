@@ -173,7 +173,7 @@ async def test_connection_resolver_strips_model_selector(monkeypatch: pytest.Mon
 
 @pytest.mark.asyncio
 async def test_model_resolver_strips_alias_and_provider_name():
-    _cache.clear()
+    _cache.invalidate_local()
     session = SimpleNamespace(
         execute=AsyncMock(
             side_effect=[
@@ -187,4 +187,4 @@ async def test_model_resolver_strips_alias_and_provider_name():
 
     assert resolved == "provider/model"
     assert session.execute.await_count == 1
-    assert _cache["alias/model"][0] == "provider/model"
+    assert _cache.peek("alias/model") == "provider/model"
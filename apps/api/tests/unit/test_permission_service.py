@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 from uuid import UUID
 
 import pytest
 
+from app.core.config_cache import VersionedConfigCache
 from app.services import permission_service as permission_service_module
 from app.services.permission_service import EffectivePermissions, PermissionService
 
@@ -57,3 +60,96 @@ async def test_permission_service_maps_instance_rules_to_collection_permissions(
 
     assert perms.is_collection_allowed("docs") is True
     assert perms.collection_permissions["docs"] is True
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+
+def _cached_service(monkeypatch, redis, rules):
+    cache = VersionedConfigCache(
+        "rbac_effective_permissions", generation_check_s=0, redis_factory=lambda: redis
+    )
+    monkeypatch.setattr(PermissionService, "_cache", cache)
+    monkeypatch.setattr(PermissionService, "_snapshot_redis", staticmethod(lambda: redis))
+    agent_id = UUID("33333333-3333-3333-3333-333333333333")
+
+    async def _fake_batch_resolve(_session, resource_type, resource_ids):
+        return {agent_id: ("helper", "agent")}
+
+    monkeypatch.setattr(permission_service_module, "_batch_resolve_resource_targets", _fake_batch_resolve)
+    service = PermissionService(session=AsyncMock())
+    service.rule_repo.list_platform_rules = AsyncMock(side_effect=lambda: [
+        SimpleNamespace(resource_type="agent", resource_id=agent_id, effect=rules["effect"]),
+    ])
+    service.rule_repo.list_by_tenant = AsyncMock(return_value=[])
+    service.rule_repo.list_by_user = AsyncMock(return_value=[])
+    return service
+
+
+@pytest.mark.asyncio
+async def test_resolve_permissions_serves_compiled_snapshot_until_generation_bump(monkeypatch):
+    redis = _FakeRedis()
+    rules = {"effect": "allow"}
+    service = _cached_service(monkeypatch, redis, rules)
+    tenant_id = UUID("22222222-2222-2222-2222-222222222222")
+
+    first = await service.resolve_permissions(tenant_id=tenant_id)
+    second = await service.resolve_permissions(tenant_id=tenant_id, default_collection_allow=True)
+
+    assert first.is_agent_allowed("helper") and second.is_agent_allowed("helper")
+    assert second.default_collection_allow is True
+    assert service.rule_repo.list_platform_rules.await_count == 1
+
+    # Another replica with a cold in-process cache reuses the Redis snapshot.
+    PermissionService._cache.invalidate_local()
+    await service.resolve_permissions(tenant_id=tenant_id)
+    assert service.rule_repo.list_platform_rules.await_count == 1
+
+    rules["effect"] = "deny"
+    await PermissionService.invalidate_cache()
+    third = await service.resolve_permissions(tenant_id=tenant_id)
+
+    assert third.is_agent_allowed("helper") is False
+    assert service.rule_repo.list_platform_rules.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rule_write_bumps_generation_only_after_commit(monkeypatch):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    from app.services.rbac_service import RbacService
+
+    redis = _FakeRedis()
+    rules = {"effect": "allow"}
+    permissions = _cached_service(monkeypatch, redis, rules)
+    tenant_id = UUID("22222222-2222-2222-2222-222222222222")
+    await permissions.resolve_permissions(tenant_id=tenant_id)
+    session = Session(create_engine("sqlite://"))
+    session.execute(text("select 1"))
+    rbac = RbacService(session)
+    rbac.get_rule = AsyncMock(return_value=SimpleNamespace())
+    rbac.rule_repo.delete = AsyncMock()
+
+    rules["effect"] = "deny"
+    await rbac.delete_rule(UUID("44444444-4444-4444-4444-444444444444"))
+    before_commit = await permissions.resolve_permissions(tenant_id=tenant_id)
+    session.commit()
+    await asyncio.sleep(0)
+    after_commit = await permissions.resolve_permissions(tenant_id=tenant_id)
+    session.close()
+
+    assert before_commit.is_agent_allowed("helper") is True
+    assert after_commit.is_agent_allowed("helper") is False
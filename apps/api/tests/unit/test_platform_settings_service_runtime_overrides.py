@@ -35,7 +35,11 @@ async def test_platform_settings_service_updates_runtime_override_fields():
     service = PlatformSettingsService(session=SimpleNamespace())
     service.repo = _RepoStub(settings)
 
-    PlatformSettingsProvider._cache = {"cached": True}
+    async def _cached_config():
+        return {"cached": True}
+
+    await PlatformSettingsProvider._cache.get_or_load("", _cached_config)
+    assert PlatformSettingsProvider._cache.peek() == {"cached": True}
     await service.update(
         required_operation_retry_instruction="retry text",
         operations_rules_text="rules text",
@@ -47,5 +51,5 @@ async def test_platform_settings_service_updates_runtime_override_fields():
     assert settings.operations_rules_text == "rules text"
     assert settings.intent_messages == {"agent_start": "Start"}
     assert settings.synth_chunk_size == 11
-    assert PlatformSettingsProvider._cache is None
+    assert PlatformSettingsProvider._cache.peek() is None
 
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.redis_pubsub_hub import RedisPubSubHub
+from app.services.runtime_tail_event_bus import RuntimeRunControlSubscriber, RuntimeTailSubscriber
+
+
+class _FakePubSub:
+    def __init__(self) -> None:
+        self.commands: list[tuple[str, str]] = []
+        self.inbox: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.commands.append(("subscribe", channel))
+        self.inbox.put_nowait({"type": "subscribe", "channel": channel, "data": len(self.commands)})
+
+    async def unsubscribe(self, channel):
+        self.commands.append(("unsubscribe", channel))
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        return await self.inbox.get()
+
+    async def aclose(self):
+        pass
+
+    def publish(self, channel: str, data: str) -> None:
+        self.inbox.put_nowait({"type": "message", "channel": channel, "data": data})
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.pubsubs: list[_FakePubSub] = []
+
+    def pubsub(self):
+        self.pubsubs.append(_FakePubSub())
+        return self.pubsubs[-1]
+
+    async def aclose(self):
+        pass
+
+
+async def _drain() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_streams_share_one_connection_and_unsubscribe_is_refcounted():
+    redis = _FakeRedis()
+    hub = RedisPubSubHub(redis_factory=lambda: redis)
+    first = RuntimeTailSubscriber(stream_key="run-1", hub=hub)
+    second = RuntimeTailSubscriber(stream_key="run-1", hub=hub)
+    control = RuntimeRunControlSubscriber(run_id="run-1", hub=hub)
+    await first.subscribe()
+    await second.subscribe()
+    await control.subscribe()
+
+    assert len(redis.pubsubs) == 1
+    pubsub = redis.pubsubs[0]
+    assert pubsub.commands == [("subscribe", "runtime:tail:run-1"), ("subscribe", "runtime:control:run-1")]
+
+    pubsub.publish("runtime:tail:run-1", json.dumps({"type": "delta", "content": "hi"}))
+    pubsub.publish("runtime:control:run-1", "cancel")
+    await asyncio.wait_for(control.wait_for_cancel(), timeout=1)
+    assert await asyncio.wait_for(anext(first.listen()), timeout=1) == {"type": "delta", "content": "hi"}
+    assert await asyncio.wait_for(anext(second.listen()), timeout=1) == {"type": "delta", "content": "hi"}
+
+    await first.unsubscribe()
+    assert ("unsubscribe", "runtime:tail:run-1") not in pubsub.commands
+    await second.unsubscribe()
+    await control.unsubscribe()
+    assert pubsub.commands[-2:] == [("unsubscribe", "runtime:tail:run-1"), ("unsubscribe", "runtime:control:run-1")]
+    metrics = hub.metrics()
+    assert metrics["channels"] == 0 and metrics["subscriptions"] == 0
+    assert metrics["messages_received"] == 2 and metrics["messages_delivered"] == 3
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_without_blocking_others():
+    redis = _FakeRedis()
+    hub = RedisPubSubHub(redis_factory=lambda: redis, queue_size=2)
+    slow = await hub.subscribe("rag:agg:admin")
+    fast = await hub.subscribe("rag:agg:admin", maxsize=10)
+    pubsub = redis.pubsubs[0]
+
+    for index in range(4):
+        pubsub.publish("rag:agg:admin", str(index))
+    await _drain()
+
+    assert [await fast.get() for _ in range(4)] == ["0", "1", "2", "3"]
+    assert [await slow.get() for _ in range(2)] == ["2", "3"]
+    metrics = hub.metrics()
+    assert metrics["messages_dropped"] == 2
+    assert metrics["fanout_lag_ms_max"] >= 0.0
+    assert hub.metrics()["fanout_lag_ms_max"] == 0.0  # reset per scrape
+
+    await hub.aclose()
+    assert [item async for item in slow] == []
+
+
+@pytest.mark.asyncio
+async def test_subscribe_returns_only_after_redis_acknowledges_the_channel():
+    redis = _FakeRedis()
+    hub = RedisPubSubHub(redis_factory=lambda: redis)
+    pubsub = _FakePubSub()
+    pubsub.subscribe = lambda channel: _record(pubsub, channel)
+    redis.pubsub = lambda: pubsub
+
+    pending = asyncio.ensure_future(hub.subscribe("chat:1"))
+    await _drain()
+    assert pubsub.commands == [("subscribe", "chat:1")] and not pending.done()
+
+    pubsub.inbox.put_nowait({"type": "subscribe", "channel": "chat:1", "data": 1})
+    subscription = await asyncio.wait_for(pending, timeout=1)
+    pubsub.publish("chat:1", "first")
+    assert await asyncio.wait_for(subscription.get(), timeout=1) == "first"
+    await hub.aclose()
+
+
+async def _record(pubsub: _FakePubSub, channel: str) -> None:
+    # Sends SUBSCRIBE without Redis confirming it yet.
+    pubsub.commands.append(("subscribe", channel))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.models.runtime_observability import RuntimeBudgetCounter, RuntimeBudgetEntry
+from app.runtime.events import RuntimeEventType
+from app.services.runtime_budget_service import RuntimeBudgetService
+
+
+def _session(existing: RuntimeBudgetCounter | None = None):
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = existing
+    session.execute = AsyncMock(return_value=result)
+    session.flush = AsyncMock()
+    return session
+
+
+def _entries(session) -> list[RuntimeBudgetEntry]:
+    return [call.args[0] for call in session.add.call_args_list if isinstance(call.args[0], RuntimeBudgetEntry)]
+
+
+@pytest.mark.asyncio
+async def test_consume_locks_counter_once_and_defers_events_to_checkpoint():
+    session = _session()
+    events = []
+    service = RuntimeBudgetService(session, event_sink=AsyncMock(side_effect=events.append))
+    run_id = uuid4()
+
+    for _ in range(3):
+        decision = await service.consume(
+            run_id=run_id, owner_type="run", owner_id=str(run_id), metric="task_attempts", limit=5, reason="task_started",
+        )
+        assert decision.allowed
+
+    assert session.execute.await_count == 1
+    assert [e.after_value for e in _entries(session)] == [1, 2, 3]
+    assert events == []
+
+    await service.checkpoint()
+
+    assert [e.type for e in events] == [RuntimeEventType.BUDGET_CONSUMED]
+    assert events[0].data["delta"] == 3
+    assert events[0].data["consumed"] == 3
+    assert events[0].data["entries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_limit_is_enforced_from_memory_with_persisted_baseline():
+    run_id = uuid4()
+    counter = RuntimeBudgetCounter(
+        id=uuid4(), run_id=run_id, owner_type="run", owner_id=str(run_id),
+        metric="plan_revisions", consumed=1, limit_value=2,
+    )
+    session = _session(counter)
+    events = []
+    service = RuntimeBudgetService(session, event_sink=AsyncMock(side_effect=events.append))
+
+    first = await service.consume(run_id=run_id, owner_type="run", owner_id=str(run_id), metric="plan_revisions")
+    second = await service.consume(run_id=run_id, owner_type="run", owner_id=str(run_id), metric="plan_revisions")
+
+    assert first.allowed and first.consumed == 2
+    assert not second.allowed and second.reason == "budget_exceeded"
+    assert [e.type for e in events] == [RuntimeEventType.BUDGET_REJECTED]
+    assert len(_entries(session)) == 1
+    assert counter.consumed == 2
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_runs_automatically_every_n_entries():
+    session = _session()
+    events = []
+    service = RuntimeBudgetService(session, event_sink=AsyncMock(side_effect=events.append), checkpoint_every=2)
+    run_id = uuid4()
+
+    for metric in ("task_attempts", "plan_revisions"):
+        await service.consume(run_id=run_id, owner_type="run", owner_id=str(run_id), metric=metric)
+
+    # One flush creating the first counter, one for the second, one at the checkpoint.
+    assert session.flush.await_count == 3
+    assert sorted(e.data["metric"] for e in events) == ["plan_revisions", "task_attempts"]
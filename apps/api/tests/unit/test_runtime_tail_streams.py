@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.runtime_tail_event_bus import RuntimeTailEventBus, RuntimeTailSubscriber
+
+
+class _Pipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._ops: list = []
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._ops.append(("xadd", key, fields, maxlen))
+
+    def expire(self, key, ttl):
+        self._ops.append(("expire", key, ttl))
+
+    async def execute(self):
+        for op in self._ops:
+            if op[0] == "xadd":
+                self._redis.add(op[1], op[2], op[3])
+            else:
+                self._redis.ttls[op[1]] = op[2]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.ttls: dict[str, int] = {}
+        self.maxlens: list = []
+        self._counter = 0
+        self._added = asyncio.Event()
+
+    def add(self, key, fields, maxlen):
+        self._counter += 1
+        self.streams.setdefault(key, []).append((f"{self._counter}-0", dict(fields)))
+        self.maxlens.append(maxlen)
+        self._added.set()
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        (key, cursor), = streams.items()
+        after = int(cursor.split("-")[0])
+        entries = [entry for entry in self.streams.get(key, []) if int(entry[0].split("-")[0]) > after][:count]
+        if not entries and block:
+            self._added.clear()
+            try:
+                await asyncio.wait_for(self._added.wait(), timeout=block / 1000)
+            except asyncio.TimeoutError:
+                return []
+            return await self.xread(streams, count=count)
+        return [[key, entries]] if entries else []
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribers_catch_up_and_read_in_order():
+    redis = _FakeRedis()
+    bus = RuntimeTailEventBus(redis, transport="streams")
+    await bus.publish(stream_key="run-1", payload={"type": "run_start", "sequence": 1})
+
+    late = RuntimeTailSubscriber(stream_key="run-1", redis_client=redis, transport="streams", from_start=True)
+    live = RuntimeTailSubscriber(stream_key="run-1", redis_client=redis, transport="streams")
+    await late.subscribe()
+    await live.subscribe()
+    for sequence in (2, 3):
+        await bus.publish(stream_key="run-1", payload={"type": "tool_call", "sequence": sequence})
+
+    late_iter, live_iter = late.listen(), live.listen()
+    late_seen = [(await asyncio.wait_for(anext(late_iter), timeout=1))["sequence"] for _ in range(3)]
+    live_seen = [(await asyncio.wait_for(anext(live_iter), timeout=1))["sequence"] for _ in range(2)]
+
+    assert late_seen == [1, 2, 3]
+    assert live_seen == [2, 3]
+    assert redis.ttls == {"runtime:tail:stream:run-1": 3600}
+    assert set(redis.maxlens) == {2000}
+    await late.unsubscribe()
+    await live.unsubscribe()
+
+
+@pytest.mark.asyncio
+async def test_stream_subscriber_waits_for_new_events():
+    redis = _FakeRedis()
+    subscriber = RuntimeTailSubscriber(stream_key="run-2", redis_client=redis, transport="streams")
+    await subscriber.subscribe()
+    pending = asyncio.ensure_future(anext(subscriber.listen()))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+
+    await RuntimeTailEventBus(redis, transport="streams").publish(stream_key="run-2", payload={"type": "delta"})
+
+    assert (await asyncio.wait_for(pending, timeout=1))["type"] == "delta"
+
+
+@pytest.mark.asyncio
+async def test_stream_drain_reads_past_a_full_local_queue_to_the_end(monkeypatch):
+    from app.api.v1.routers.sandbox.runs import _remaining_tail
+
+    monkeypatch.setattr(get_settings(), "RUNTIME_TAIL_CONSUMER_BUFFER", 2)
+    redis = _FakeRedis()
+    subscriber = RuntimeTailSubscriber(stream_key="run-3", redis_client=redis, transport="streams")
+    await subscriber.subscribe()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=subscriber.consumer_buffer)
+
+    async def listen() -> None:
+        async for message in subscriber.listen():
+            await queue.put(message)
+
+    listener = asyncio.create_task(listen())
+    bus = RuntimeTailEventBus(redis, transport="streams")
+    for sequence in range(1, 6):
+        await bus.publish(stream_key="run-3", payload={"type": "tool_call", "sequence": sequence})
+    await asyncio.sleep(0.01)
+    assert queue.full()
+
+    drained = [message["sequence"] async for message in _remaining_tail(subscriber, queue, listener)]
+
+    assert drained == [1, 2, 3, 4, 5]
+    await asyncio.wait_for(listener, timeout=1)
+    assert RuntimeTailSubscriber(stream_key="run-3", transport="pubsub").consumer_buffer == 0
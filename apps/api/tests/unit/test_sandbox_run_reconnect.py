@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.api.v1.routers.sandbox import runs
+
+RUN_ID = uuid.uuid4()
+OCCURRED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(sequence: int, event_type: str = "tool_call") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(), run_id=RUN_ID, sequence=sequence, event_type=event_type, occurred_at=OCCURRED_AT,
+        entity_type=None, entity_id=None, parent_entity_type=None, parent_entity_id=None,
+        caused_by_event_id=None, duration_ms=None, payload={},
+    )
+
+
+def _tail(row: SimpleNamespace) -> dict:
+    return {
+        "event_id": str(row.id), "run_id": str(RUN_ID), "sequence": row.sequence,
+        "type": row.event_type, "occurred_at": OCCURRED_AT.isoformat(),
+    }
+
+
+class _Subscriber:
+    is_stream = False
+    consumer_buffer = 0
+
+    def __init__(self, messages: list[dict]) -> None:
+        self._messages = messages
+
+    async def subscribe(self) -> None:
+        pass
+
+    async def listen(self):
+        for message in self._messages:
+            yield message
+        await asyncio.Event().wait()
+
+    def stop_at_end(self) -> None:
+        pass
+
+    async def unsubscribe(self) -> None:
+        pass
+
+
+def _install(monkeypatch, *, rows: list, tail: list[dict], statuses: list[str]) -> list:
+    journal_calls: list = []
+
+    class _Journal:
+        def __init__(self, db) -> None:
+            pass
+
+        async def list_run_events(self, run_id, after_sequence=None):
+            journal_calls.append(after_sequence)
+            return [row for row in rows if after_sequence is None or row.sequence > after_sequence]
+
+    class _Sandbox:
+        def __init__(self, db) -> None:
+            pass
+
+        async def get_run(self, run_id):
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            return SimpleNamespace(id=run_id, status=status)
+
+    monkeypatch.setattr(runs, "RuntimeEventJournalService", _Journal)
+    monkeypatch.setattr(runs, "SandboxService", _Sandbox)
+    monkeypatch.setattr(runs, "RuntimeTailSubscriber", lambda stream_key: _Subscriber(tail))
+    monkeypatch.setattr(runs, "_SETTLE_POLL_SECONDS", 0.01)
+    return journal_calls
+
+
+def _frames(chunks: list[str]) -> list[tuple[str | None, str, dict]]:
+    frames = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        frames.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return frames
+
+
+def test_last_event_id_becomes_the_replay_sequence():
+    def request(headers):
+        return SimpleNamespace(headers=headers)
+
+    assert runs._after_sequence(request({"Last-Event-ID": " 12 "})) == 12
+    assert runs._after_sequence(request({"Last-Event-ID": "1700000000-0"})) is None
+    assert runs._after_sequence(request({"Last-Event-ID": "-3"})) is None
+    assert runs._after_sequence(request({})) is None
+
+
+@pytest.mark.asyncio
+async def test_follow_replays_after_sequence_and_dedupes_tail_and_journal(monkeypatch):
+    rows = [_row(1), _row(2), _row(3), _row(4, "run_end")]
+    tail = [_tail(rows[2]), _tail(rows[3])]
+    journal_calls = _install(monkeypatch, rows=rows, tail=tail, statuses=["running", "failed"])
+    stream_db = SimpleNamespace(rollback=AsyncMock())
+
+    chunks = [chunk async for chunk in runs._follow_sandbox_run(run_id=RUN_ID, after_sequence=1, stream_db=stream_db)]
+    frames = _frames(chunks)
+
+    assert [(frame_id, event) for frame_id, event, _ in frames] == [
+        ("2", "journal"), ("3", "journal"), ("4", "journal"), (None, "error"), (None, "done"),
+    ]
+    assert frames[2][2]["event_type"] == "run_end"
+    assert frames[3][2] == {"run_id": str(RUN_ID), "error": "Sandbox execution failed"}
+    assert journal_calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_follow_of_a_settled_cancelled_run_ends_with_a_final_frame(monkeypatch):
+    rows = [_row(1), _row(2)]
+    _install(monkeypatch, rows=rows, tail=[], statuses=["cancelled"])
+    stream_db = SimpleNamespace(rollback=AsyncMock())
+
+    frames = _frames([chunk async for chunk in runs._follow_sandbox_run(run_id=RUN_ID, after_sequence=None, stream_db=stream_db)])
+
+    assert [(frame_id, event) for frame_id, event, _ in frames] == [
+        ("1", "journal"), ("2", "journal"), (None, "final"), (None, "done"),
+    ]
+    assert frames[2][2] == {"run_id": str(RUN_ID), "status": "cancelled"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("existing, expected_id", [([_row(1), _row(2), _row(5)], "5"), ([], "0")])
+async def test_run_started_carries_the_last_pre_existing_sequence(monkeypatch, existing, expected_id):
+    _install(monkeypatch, rows=existing, tail=[], statuses=["completed"])
+
+    async def start(**kwargs):
+        task = asyncio.create_task(asyncio.sleep(0))
+        await task
+        return task
+
+    monkeypatch.setattr(runs.sandbox_runtime_runner, "start", start)
+
+    frames = _frames([
+        chunk async for chunk in runs._observe_sandbox_runner(
+            run_id=RUN_ID, command=SimpleNamespace(), llm_client=None, session_factory=None, stream_db=None,
+        )
+    ])
+
+    assert frames[0] == (expected_id, "run_started", {"run_id": str(RUN_ID)})
+    # The earlier segment is not replayed into the resumed run's stream.
+    assert [event for _, event, _ in frames] == ["run_started", "done"]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core import startup
+from app.core.startup import StartupTask, get_startup_status, run_all
+
+
+class _Lock:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+
+    async def acquire(self):
+        await self._redis.mutex.acquire()
+        return True
+
+    async def release(self):
+        self._redis.mutex.release()
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.mutex = asyncio.Lock()
+        self.values: dict[str, str] = {}
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return _Lock(self)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+def _recorder(log: list[str], name: str, delay: float = 0.0, error: Exception | None = None):
+    async def _task(session_factory) -> None:
+        log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        log.append(f"end:{name}")
+
+    return _task
+
+
+@pytest.mark.asyncio
+async def test_independent_tasks_overlap_and_dependents_wait():
+    log: list[str] = []
+    tasks = (
+        StartupTask("catalog", _recorder(log, "catalog", 0.05)),
+        StartupTask("models", _recorder(log, "models", 0.05)),
+        StartupTask("discovery", _recorder(log, "discovery"), ("catalog",)),
+    )
+
+    await run_all(None, tasks=tasks, redis_factory=_Redis)
+
+    assert log[:2] == ["start:catalog", "start:models"]
+    assert log.index("start:discovery") > log.index("end:catalog")
+    assert {name: entry["state"] for name, entry in get_startup_status().items()} == {
+        "catalog": "ok", "models": "ok", "discovery": "ok",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_aborts_pending_tasks_and_timeouts_are_isolated(monkeypatch):
+    monkeypatch.setattr(startup.get_settings(), "STARTUP_TASK_TIMEOUT_SECONDS", 0.05)
+    log: list[str] = []
+    tasks = (
+        StartupTask("slow_probe", _recorder(log, "slow_probe", 1.0)),
+        StartupTask("contracts", _recorder(log, "contracts", error=RuntimeError("schema drift")), fail_fast=True),
+        StartupTask("connectors", _recorder(log, "connectors"), ("contracts",)),
+    )
+
+    with pytest.raises(RuntimeError, match="schema drift"):
+        await run_all(None, tasks=tasks, redis_factory=_Redis)
+
+    states = {name: entry["state"] for name, entry in get_startup_status().items()}
+    assert states == {"slow_probe": "timeout", "contracts": "failed", "connectors": "skipped"}
+    assert "start:connectors" not in log
+
+    with pytest.raises(ValueError):
+        await run_all(None, tasks=(StartupTask("a", _recorder(log, "a"), ("b",)),))
+
+
+@pytest.mark.asyncio
+async def test_only_one_replica_runs_cluster_tasks_per_build():
+    redis = _Redis()
+    log: list[str] = []
+    tasks = (
+        StartupTask("sync_tool_catalog", _recorder(log, "catalog", 0.02), cluster=True),
+        StartupTask("register_embedding_models", _recorder(log, "models")),
+    )
+
+    await asyncio.gather(
+        run_all(None, tasks=tasks, redis_factory=lambda: redis),
+        run_all(None, tasks=tasks, redis_factory=lambda: redis),
+    )
+
+    assert log.count("start:catalog") == 1
+    assert log.count("start:models") == 2
+    assert not redis.mutex.locked()
+
+
+@pytest.mark.asyncio
+async def test_cluster_marker_is_keyed_on_build_identity_and_needs_every_task_to_succeed():
+    redis = _Redis()
+    log: list[str] = []
+    failing = (
+        StartupTask("sync_tool_catalog", _recorder(log, "catalog"), cluster=True),
+        StartupTask("rescan_local_instances", _recorder(log, "rescan", error=RuntimeError("1 error")), cluster=True),
+    )
+
+    await run_all(None, tasks=failing, redis_factory=lambda: redis, build_identity=lambda: "abc")
+
+    assert get_startup_status()["rescan_local_instances"]["state"] == "failed"
+    assert redis.values == {}
+
+    healthy = (StartupTask("sync_tool_catalog", _recorder(log, "catalog"), cluster=True),)
+    for identity in ("abc", "abc", "def"):
+        await run_all(None, tasks=healthy, redis_factory=lambda: redis, build_identity=lambda: identity)
+
+    assert log.count("start:catalog") == 3
+    assert set(redis.values) == {"startup:cluster_sync:abc", "startup:cluster_sync:def"}
@@ -80,3 +80,25 @@ def test_non_excel_template_is_rejected() -> None:
     result = TemplateFillEngine(_contract()).fill(b"x", {}, "users.docx")
     assert not result.success
     assert "xlsx" in str(result.error)
+
+
+def test_block_insert_shifts_content_below_marker_once() -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    from openpyxl.styles import Font
+
+    wb = openpyxl.load_workbook(io.BytesIO(_workbook()))
+    ws = wb.active
+    ws["A2"].font = Font(bold=True)
+    ws["A4"] = "Итого: {{company}}"
+    stream = io.BytesIO()
+    wb.save(stream)
+
+    users = [{"name": f"user{i}", "login": f"login{i}"} for i in range(500)]
+    result = TemplateFillEngine(_contract()).fill(stream.getvalue(), {"company": "Acme", "users": users}, "users.xlsx")
+
+    assert result.success, result.error
+    ws = openpyxl.load_workbook(io.BytesIO(result.content)).active
+    assert [ws["A2"].value, ws["B501"].value] == ["user0", "login499"]
+    assert ws["A501"].font.bold and ws["A300"].font.bold
+    assert ws["A503"].value == "Итого: Acme"
+    assert ws.row_dimensions[501].height == 31
@@ -313,3 +313,72 @@ async def test_resolve_mcp_domains_prefers_collection_fk_runtime_domain():
 def test_local_provider_kind_includes_templates():
     assert LocalProviderKind.to_domain("local_templates") == "collection.template"
     assert "local_templates" in LocalProviderKind.known_kinds()
+
+
+@pytest.mark.asyncio
+async def test_scan_mcp_providers_times_out_slow_provider_without_blocking_others():
+    import asyncio
+
+    service = ToolDiscoveryService(session=MagicMock())
+    service._mcp_provider_timeout_s = 0.05
+    fast = SimpleNamespace(id=uuid4(), slug="fast", url="http://fast/mcp", config={})
+    slow = SimpleNamespace(id=uuid4(), slug="slow", url="http://slow/mcp", config={})
+    service._load_mcp_providers = AsyncMock(return_value=[slow, fast])
+    service._resolve_mcp_domains = AsyncMock(return_value=["jira"])
+    service._write_mcp_rows = AsyncMock(return_value=0)
+
+    async def _fetch(url):
+        if url == slow.url:
+            await asyncio.sleep(1)
+        return [{"name": "jira.issue.get"}, {"name": "jira.issue.get"}, {"name": ""}]
+
+    service._fetch_mcp_tools = _fetch
+
+    total, scanned_ids = await service._scan_mcp_providers(
+        now=datetime.now(timezone.utc),
+        provider_instance_id=None,
+    )
+
+    assert scanned_ids == [fast.id]
+    assert total == 1
+    assert service._last_mcp_provider_counts == {str(fast.id): 1}
+    assert service._last_mcp_scan_failures[0]["provider_slug"] == "slow"
+    assert "timed out" in service._last_mcp_scan_failures[0]["error"]
+
+
+@pytest.mark.asyncio
+async def test_write_mcp_rows_only_upserts_changed_tools():
+    service = ToolDiscoveryService(session=MagicMock())
+    service.session.execute = AsyncMock()
+    provider_id = uuid4()
+    now = datetime.now(timezone.utc)
+    unchanged = {
+        "slug": "a", "name": "a", "description": "A", "source": "mcp",
+        "provider_instance_id": provider_id, "domains": ["jira"],
+        "input_schema": {"type": "object"}, "output_schema": None,
+    }
+    changed = {**unchanged, "slug": "b", "name": "b", "description": "B v2"}
+    unchanged_id = uuid4()
+    service._load_existing_mcp_fingerprints = AsyncMock(
+        return_value={
+            (provider_id, "a"): (unchanged_id, ToolDiscoveryService._tool_fingerprint(unchanged), True),
+            (provider_id, "b"): (uuid4(), ToolDiscoveryService._tool_fingerprint({**changed, "description": "B"}), True),
+        }
+    )
+
+    unchanged_count = await service._write_mcp_rows([unchanged, changed], now)
+
+    assert unchanged_count == 1
+    assert service.session.execute.await_count == 2
+    touch_sql, upsert_sql = (
+        str(call.args[0].compile(dialect=_pg_dialect())) for call in service.session.execute.await_args_list
+    )
+    assert touch_sql.startswith("UPDATE discovered_tools SET last_seen_at")
+    assert "ON CONFLICT (slug, provider_instance_id)" in upsert_sql
+    assert "description = excluded.description" in upsert_sql
+
+
+def _pg_dialect():
+    from sqlalchemy.dialects import postgresql
+
+    return postgresql.dialect()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import AgentUnavailableError
+from app.runtime.platform_config import PlatformSnapshot
+from app.runtime.stages import turn_bootstrap_stage as module
+from app.runtime.stages.turn_bootstrap_stage import TurnBootstrapStage
+
+
+class _SideSession:
+    def __init__(self, opened: list) -> None:
+        self.opened = opened
+        self.committed = False
+
+    async def __aenter__(self):
+        self.opened.append(self)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.committed = True
+
+
+def _patch_loads(monkeypatch, *, barrier: asyncio.Barrier | None = None, agents_error: Exception | None = None):
+    sessions: dict[str, object] = {}
+
+    async def _meet():
+        if barrier is not None:
+            await asyncio.wait_for(barrier.wait(), timeout=1)
+
+    class _Loader:
+        def __init__(self, session):
+            self.session = session
+
+        async def load(self):
+            sessions["platform"] = self.session
+            return PlatformSnapshot(config={"k": 1}, routable_agents=[{"slug": "helper"}])
+
+    class _Roles:
+        def __init__(self, session):
+            self.session = session
+
+        async def get_role_config(self, _role):
+            sessions["planner_role"] = self.session
+            await _meet()
+            return {"prompt": "plan", "model": "m"}
+
+    class _Glossary:
+        def __init__(self, session):
+            self.session = session
+
+        async def list_project_terms(self, *, limit):
+            sessions["glossary"] = self.session
+            await _meet()
+            return [{"term": "p"}]
+
+        async def list_confirmed_global_terms(self, *, limit):
+            return [{"term": "g"}]
+
+        async def load_index(self, *, limit):
+            return SimpleNamespace(
+                project_terms=await self.list_project_terms(limit=limit),
+                global_terms=await self.list_confirmed_global_terms(limit=limit),
+            )
+
+    class _Budgets:
+        def __init__(self, session):
+            self.session = session
+
+        async def resolve_run(self, config, overrides):
+            sessions["run_limits"] = self.session
+            return SimpleNamespace(plan_revisions=2)
+
+        async def resolve_orchestrator(self, role, overrides):
+            sessions["planner_limits"] = self.session
+            await _meet()
+            return SimpleNamespace(llm_calls=3)
+
+    async def _agents(session, *, platform, explicit_slug, user_id, tenant_id):
+        sessions["agents_rbac"] = session
+        if agents_error is not None:
+            raise agents_error
+        return list(platform.routable_agents), {"allowed": ["helper"]}
+
+    monkeypatch.setattr(module, "PlatformConfigLoader", _Loader)
+    monkeypatch.setattr(module, "SystemLLMRoleService", _Roles)
+    monkeypatch.setattr(module, "GlossaryService", _Glossary)
+    monkeypatch.setattr(module, "BudgetResolver", _Budgets)
+    monkeypatch.setattr(TurnBootstrapStage, "_resolve_available_agents_for_planner", staticmethod(_agents))
+    return sessions
+
+
+async def _run(stage: TurnBootstrapStage, explicit_slug: str | None = "helper"):
+    return await stage.run(
+        goal="goal", explicit_slug=explicit_slug, chat_id=None, user_id=uuid4(), tenant_id=uuid4(),
+        messages=[], attachments=[], sandbox_overrides=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_independent_loads_run_concurrently_on_side_sessions(monkeypatch):
+    # planner_role, planner_limits and glossary only finish if all three are in flight together.
+    sessions = _patch_loads(monkeypatch, barrier=asyncio.Barrier(3))
+    turn_session = object()
+    opened: list = []
+    memory = SimpleNamespace(build=AsyncMock(return_value="turn-memory"))
+    stage = TurnBootstrapStage(
+        session=turn_session, memory_builder=memory, session_factory=lambda: _SideSession(opened),
+    )
+
+    bootstrap = await _run(stage)
+
+    assert bootstrap.effective_agent_slug == "helper"
+    assert bootstrap.turn_memory == "turn-memory"
+    assert memory.build.await_args.kwargs["agent_slug"] == "helper"
+    assert (bootstrap.planner_prompt, bootstrap.planner_model) == ("plan", "m")
+    assert bootstrap.project_glossary == [{"term": "p"}]
+    assert sessions["platform"] is turn_session and sessions["agents_rbac"] is turn_session
+    side = {"planner_role", "planner_limits", "glossary", "run_limits"}
+    assert all(isinstance(sessions[name], _SideSession) for name in side)
+    assert len(opened) == 4 and all(s.committed for s in opened)
+
+    event = bootstrap.trace_event()
+    assert event.data["stage"] == "turn_bootstrap"
+    assert event.data["concurrent"] is True
+    assert {step["step"] for step in event.data["steps"]} == side | {"platform", "agents_rbac", "memory_build"}
+
+
+@pytest.mark.asyncio
+async def test_without_session_factory_every_load_uses_turn_session(monkeypatch):
+    sessions = _patch_loads(monkeypatch)
+    turn_session = object()
+    stage = TurnBootstrapStage(
+        session=turn_session, memory_builder=SimpleNamespace(build=AsyncMock(return_value="m")),
+    )
+
+    bootstrap = await _run(stage, explicit_slug="unknown")
+
+    assert bootstrap.effective_agent_slug is None
+    assert set(sessions.values()) == {turn_session}
+    assert bootstrap.trace_event().data["concurrent"] is False
+    assert all(step["session"] == "turn" for step in bootstrap.trace_event().data["steps"])
+
+
+@pytest.mark.asyncio
+async def test_rbac_failure_cancels_pending_loads(monkeypatch):
+    _patch_loads(
+        monkeypatch,
+        barrier=asyncio.Barrier(4),  # never reached: the side loads stay blocked
+        agents_error=AgentUnavailableError("gone", reason_code="agent_not_found"),
+    )
+    stage = TurnBootstrapStage(
+        session=object(),
+        memory_builder=SimpleNamespace(build=AsyncMock()),
+        session_factory=lambda: _SideSession([]),
+    )
+
+    with pytest.raises(AgentUnavailableError):
+        await _run(stage)
+
+    failed = [t for t in stage._timings if not t.ok]
+    assert {t.step for t in failed} >= {"agents_rbac", "planner_role", "planner_limits", "glossary"}
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import jwt
+import pytest
+
+from app.core import security
+from app.core.config_cache import VersionedConfigCache
+from app.core.exceptions import UnauthorizedError
+from app.core.security import VerifiedClaimsCache, create_access_token, decode_jwt, decode_jwt_for_request
+from app.models.api_key import APIKey, hash_api_key
+from app.services.api_key_service import APIKeyService
+
+
+@pytest.fixture
+def jwt_settings():
+    settings = MagicMock()
+    settings.JWT_SECRET = "test-secret-key-for-testing-only"
+    settings.JWT_ALGORITHM = "HS256"
+    settings.JWT_ISSUER = "test-issuer"
+    settings.JWT_AUDIENCE = "test-audience"
+    settings.JWT_ACCESS_TTL_MINUTES = 15
+    settings.JWT_KID = None
+    settings.JWT_PRIVATE_KEY = None
+    settings.JWT_PUBLIC_KEY = None
+    with patch("app.core.security.get_settings", return_value=settings), \
+            patch.object(security, "verified_claims_cache", VerifiedClaimsCache(8)):
+        yield settings
+
+
+def test_decode_jwt_verifies_once_and_respects_key_changes(jwt_settings):
+    token = create_access_token("user-1", "a@b.c", "reader", ["t1"], [])
+    with patch("app.core.security.jwt.decode", wraps=jwt.decode) as verify:
+        first = decode_jwt(token)
+        first["sub"] = "tampered"
+        assert decode_jwt(token)["sub"] == "user-1"
+        assert verify.call_count == 1
+
+        jwt_settings.JWT_SECRET = "rotated-secret-key-for-testing-only"
+        with pytest.raises(UnauthorizedError):
+            decode_jwt(token)
+        assert verify.call_count == 2
+
+
+def test_claims_cache_honours_exp_and_bound():
+    cache = VerifiedClaimsCache(2)
+    fingerprint = ("HS256", "k", "aud", "iss")
+    cache.put("expired", fingerprint, {"exp": time.time() - 1})
+    cache.put("no-exp", fingerprint, {"sub": "x"})
+    assert cache.get("expired", fingerprint) is None
+    assert cache.get("no-exp", fingerprint) is None
+
+    for token in ("a", "b", "c"):
+        cache.put(token, fingerprint, {"exp": time.time() + 60, "sub": token})
+    assert cache.get("a", fingerprint) is None
+    assert cache.get("c", fingerprint)["sub"] == "c"
+
+
+def test_decode_jwt_for_request_reuses_claims_in_request_state(jwt_settings):
+    token = create_access_token("user-2", "a@b.c", "reader", [], [])
+    state: dict = {}
+    with patch("app.core.security.decode_jwt", wraps=decode_jwt) as decode:
+        assert decode_jwt_for_request(state, token)["sub"] == "user-2"
+        assert decode_jwt_for_request(state, token)["sub"] == "user-2"
+        assert decode.call_count == 1
+
+
+class _GenerationRedis:
+    def __init__(self) -> None:
+        self.generation = 0
+
+    async def get(self, key):
+        return self.generation
+
+    async def incr(self, key):
+        self.generation += 1
+        return self.generation
+
+
+@pytest.mark.asyncio
+async def test_verify_key_serves_cache_hits_until_revoked(monkeypatch):
+    redis = _GenerationRedis()
+    monkeypatch.setattr(
+        APIKeyService, "_cache",
+        VersionedConfigCache("api_keys", generation_check_s=0.0, redis_factory=lambda: redis),
+    )
+    monkeypatch.setattr(APIKeyService, "_last_touched", OrderedDict())
+    raw_key = "mlp_cached_key_123456789012345678"
+    row = APIKey(
+        id=uuid4(), user_id=uuid4(), name="ci", key_prefix=raw_key[:12], key_hash=hash_api_key(raw_key),
+        scopes=["mcp"], is_active=True,
+    )
+    session = MagicMock()
+    select_result = MagicMock()
+    select_result.scalar_one_or_none.return_value = row
+    session.execute = AsyncMock(return_value=select_result)
+    session.flush = AsyncMock()
+    service = APIKeyService(session)
+
+    assert (await service.verify_key(raw_key)) is row
+    assert session.execute.call_count == 2  # select + last_used_at
+
+    cached = await service.verify_key(raw_key)
+    assert cached.id == row.id and cached.scopes == ["mcp"]
+    assert session.execute.call_count == 2  # served from cache, touch throttled
+
+    select_result.rowcount = 1
+    assert await service.revoke_key(row.id)
+    row.is_active = False
+    assert await service.verify_key(raw_key) is None